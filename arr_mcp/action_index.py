@@ -0,0 +1,271 @@
+"""
+Ranked search over the actions of a service's API client.
+
+``<service>_action`` with ``action="list_actions"`` returns 250+ bare method
+names for Sonarr or Radarr, so agents guess and miss. :class:`ActionIndex`
+is built once per ``Api`` class from each public method's name, docstring,
+HTTP verb, endpoint path and parameter names, and ranks them against a free
+text query with BM25. ``find_action`` and the unknown-action error return
+the top matches with their signatures instead of the whole list.
+
+CONCEPT:ARR-023 — Action Search
+"""
+
+import difflib
+import functools
+import importlib
+import inspect
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+SERVICES = ("sonarr", "radarr", "lidarr", "prowlarr", "bazarr", "seerr", "chaptarr")
+
+# Name tokens say the most about what an action does, so they count extra.
+NAME_WEIGHT = 3
+PATH_WEIGHT = 2
+
+_REQUEST = re.compile(r"""self\.request\(\s*["'](\w+)["']\s*,\s*f?["']([^"']+)["']""")
+_WORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+\d*|\d+")
+_NOISE = re.compile(r"api|v\d+")
+
+# Verbs used in queries and the HTTP methods / name prefixes they mean.
+_VERBS = {
+    "list": "get",
+    "show": "get",
+    "fetch": "get",
+    "find": "get",
+    "add": "post",
+    "create": "post",
+    "new": "post",
+    "update": "put",
+    "edit": "put",
+    "change": "put",
+    "set": "put",
+    "remove": "delete",
+    "del": "delete",
+}
+
+
+def _stem(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase, singular word tokens of snake_case, camelCase, paths and prose."""
+    words = (w.lower() for w in _WORD.findall(text or ""))
+    return [_stem(w) for w in words if not _NOISE.fullmatch(w)]
+
+
+@dataclass
+class ActionDoc:
+    """One indexed action: what it is called, what it does and how it is called."""
+
+    name: str
+    summary: str
+    signature: str
+    method: str | None = None
+    path: str | None = None
+    terms: Counter = field(default_factory=Counter)
+
+    def describe(self, score: float | None = None) -> dict[str, Any]:
+        doc: dict[str, Any] = {
+            "action": self.name,
+            "signature": self.signature,
+            "method": self.method,
+            "path": self.path,
+            "summary": self.summary,
+        }
+        if score is not None:
+            doc["score"] = round(score, 3)
+        return doc
+
+
+def _action_doc(name: str, func: Any) -> ActionDoc:
+    try:
+        signature = str(inspect.signature(func)).replace("(self, ", "(", 1)
+        signature = signature.replace("(self)", "()", 1)
+        params = [p for p in inspect.signature(func).parameters if p != "self"]
+    except (TypeError, ValueError):
+        signature, params = "(...)", []
+    summary = (inspect.getdoc(func) or "").strip().split("\n")[0]
+    try:
+        match = _REQUEST.search(inspect.getsource(func))
+    except (OSError, TypeError):
+        match = None
+    method, path = (match.group(1).upper(), match.group(2)) if match else (None, None)
+
+    terms: Counter = Counter()
+    for token in tokenize(name):
+        terms[token] += NAME_WEIGHT
+    for token in tokenize(path or ""):
+        terms[token] += PATH_WEIGHT
+    terms.update(tokenize(summary))
+    terms.update(tokenize(" ".join(params)))
+    if method:
+        terms[method.lower()] += 1
+    return ActionDoc(name, summary, f"{name}{signature}", method, path, terms)
+
+
+def _split(term: str, vocabulary: set[str]) -> tuple[str, str] | None:
+    for i in range(3, len(term) - 2):
+        head, tail = term[:i], _stem(term[i:])
+        if head in vocabulary and tail in vocabulary:
+            return head, tail
+    return None
+
+
+def _split_compounds(docs: list[ActionDoc]) -> None:
+    """
+    Also index ``episodefile`` as ``episode`` + ``file``.
+
+    Endpoint paths run words together (``qualityprofile``, ``episodefile``)
+    while queries and parameter names keep them apart; a term is split when
+    both halves occur on their own somewhere in the corpus.
+    """
+    vocabulary = {term for doc in docs for term in doc.terms}
+    for doc in docs:
+        for term, count in list(doc.terms.items()):
+            parts = _split(term, vocabulary) if len(term) >= 7 else None
+            for part in parts or ():
+                doc.terms[part] += count
+
+
+class ActionIndex:
+    """BM25 index over the public methods of one API client class."""
+
+    def __init__(self, api_class: type, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            api_class (type): The generated ``Api`` class to index.
+            k1 (float): BM25 term-frequency saturation.
+            b (float): BM25 document-length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self.docs = [
+            _action_doc(name, getattr(api_class, name))
+            for name in sorted(dir(api_class))
+            if not name.startswith("_")
+            and name != "request"
+            and callable(getattr(api_class, name, None))
+        ]
+        self.by_name = {doc.name: doc for doc in self.docs}
+        _split_compounds(self.docs)
+        self._lengths = [sum(doc.terms.values()) for doc in self.docs]
+        self._avg_length = sum(self._lengths) / max(len(self.docs), 1)
+        frequency: Counter = Counter()
+        for doc in self.docs:
+            frequency.update(doc.terms.keys())
+        n = len(self.docs)
+        self._idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in frequency.items()
+        }
+
+    @property
+    def names(self) -> list[str]:
+        return [doc.name for doc in self.docs]
+
+    def _query_terms(self, query: str) -> list[str]:
+        terms = tokenize(query)
+        return terms + [_VERBS[t] for t in terms if t in _VERBS]
+
+    def search(self, query: str, top_k: int = 5) -> list[tuple[ActionDoc, float]]:
+        """
+        Rank the indexed actions against ``query``.
+
+        Args:
+            query (str): Free text such as ``"delete episode file"`` or an
+                approximate action name such as ``get_movies_by_tag``.
+            top_k (int): Matches to return.
+
+        Returns:
+            List[Tuple[ActionDoc, float]]: Best matches first, with their score.
+        """
+        terms = self._query_terms(query)
+        scored = []
+        for doc, length in zip(self.docs, self._lengths, strict=True):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length)
+            for term in terms:
+                tf = doc.terms.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            if score > 0:
+                scored.append((doc, score))
+        scored.sort(key=lambda pair: (-pair[1], len(pair[0].name), pair[0].name))
+        return scored[: max(top_k, 0)]
+
+
+@functools.cache
+def index_for(api_class: type) -> ActionIndex:
+    """The index of ``api_class``, built on first use and shared afterwards."""
+    return ActionIndex(api_class)
+
+
+def service_index(service: str) -> ActionIndex:
+    """The index of a service's generated API client, e.g. ``"sonarr"``."""
+    service = service.strip().lower()
+    if service not in SERVICES:
+        raise ValueError(
+            f"Unknown service '{service}'; expected one of {', '.join(SERVICES)}"
+        )
+    module = importlib.import_module(f"arr_mcp.api.api_client_{service}")
+    return index_for(module.Api)
+
+
+def find_action(service: str, query: str, top_k: int = 5) -> dict[str, Any]:
+    """
+    Return the actions of ``service`` that best match ``query``.
+
+    Returns:
+        Dict: ``service``, ``query``, the number of ``indexed`` actions and the
+        ranked ``matches``, each with ``action``, ``signature``, ``method``,
+        ``path``, ``summary`` and ``score``.
+    """
+    if not query or not query.strip():
+        raise ValueError("query is required, e.g. 'delete episode file'")
+    index = service_index(service)
+    return {
+        "service": service.strip().lower(),
+        "query": query,
+        "indexed": len(index.docs),
+        "matches": [doc.describe(score) for doc, score in index.search(query, top_k)],
+    }
+
+
+def unknown_action_error(service: str, action: str, top_k: int = 3) -> ValueError:
+    """
+    A ``ValueError`` for an unknown ``action`` that names the closest matches.
+
+    Near-spellings (``get_movei``) come first, then the best ranked matches
+    for the words of the action name (``get_movies_by_tag``).
+    """
+    try:
+        index = service_index(service)
+    except ValueError:
+        index = None
+    matches: list[ActionDoc] = []
+    if index is not None:
+        close = difflib.get_close_matches(action, index.names, n=top_k)
+        matches = [index.by_name[name] for name in close]
+        for doc, _ in index.search(action, top_k):
+            if len(matches) < top_k and doc not in matches:
+                matches.append(doc)
+    hint = (
+        " Did you mean: " + "; ".join(doc.signature for doc in matches) + "?"
+        if matches
+        else ""
+    )
+    return ValueError(
+        f"Unknown action '{action}' on {service}.{hint} "
+        f"Search with find_action(service='{service}', query=...) or call "
+        f"action='list_actions' for every name."
+    )
@@ -5,13 +5,11 @@
 """
 
 from typing import Any
-from urllib.parse import urljoin
 
-import requests
-import urllib3
+from arr_mcp.api.base import BaseApi
 
 
-class Api:
+class Api(BaseApi):
     """
     API client for Bazarr.
 
@@ -24,6 +22,7 @@ def __init__(
         base_url: str,
         api_key: str | None = None,
         verify: bool = False,
+        cache: Any | None = None,
     ):
         """
         Initialize the Bazarr API client.
@@ -32,59 +31,11 @@ def __init__(
             base_url (str): The base URL of the Bazarr instance (e.g., http://localhost:6767).
             api_key (Optional[str]): The API key for authentication.
             verify (bool): Whether to verify SSL certificates. Defaults to False.
+            cache (Optional[Any]): Response cache consulted for cacheable GET requests,
+                e.g. an ``arr_mcp.cache.ResponseCache``.
         """
-        self.base_url = base_url
+        super().__init__(base_url, api_key, verify=verify, cache=cache)
         self.api_key = api_key
-        self._session = requests.Session()
-        self._session.verify = verify
-
-        if not verify:
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-        if api_key:
-            self._session.headers.update({"X-Api-Key": api_key})
-
-    def request(
-        self,
-        method: str,
-        endpoint: str,
-        params: dict[str, Any] | None = None,
-        data: dict[str, Any] | None = None,
-    ) -> Any:
-        """
-        Generic request method for the Bazarr API.
-
-        Args:
-            method (str): HTTP method (GET, POST, DELETE, etc.).
-            endpoint (str): API endpoint path.
-            params (Dict, optional): Query parameters for the request.
-            data (Dict, optional): JSON body data for the request.
-
-        Returns:
-            Any: The JSON response from the API or a success status dictionary.
-
-        Raises:
-            Exception: If the API returns a status code >= 400.
-        """
-        url = urljoin(self.base_url, endpoint)
-        response = self._session.request(
-            method=method, url=url, params=params, json=data
-        )
-        if response.status_code >= 400:
-            try:
-                error_text = response.text
-            except Exception:
-                error_text = "Unknown error"
-            raise Exception(f"API error: {response.status_code} - {error_text}")
-        if response.status_code == 204:
-            return {"status": "success"}
-        try:
-            result = response.json()
-            if isinstance(result, list):
-                return {"result": result}
-            return result
-        except Exception:
-            return {"status": "success", "text": response.text}
 
     def get_series(self, page: int = 1, page_size: int = 20) -> Any:
         """Get all series managed by Bazarr."""
@@ -0,0 +1,160 @@
+"""
+Base classes shared by the generated API clients.
+
+Every client talks to its service the same way: one ``requests`` session
+carrying the API key and the tracing response hook, and a ``request`` method
+that consults the response cache for GETs, runs inside a client span and
+wraps list responses as ``{"result": [...]}``; ``request_raw`` takes the same
+traced path for callers that need the status and headers themselves. The
+services with a command queue (Sonarr, Radarr, Lidarr, Chaptarr and
+Prowlarr) also share ``wait_for_commands``. ``scripts/generate_api.py`` emits
+clients that subclass these, so the plumbing lives in one place.
+"""
+
+from typing import Any
+from urllib.parse import urljoin
+
+import requests
+import urllib3
+
+from arr_mcp import tracing
+from arr_mcp.commands import wait_for_commands
+
+
+class BaseApi:
+    """Session setup and the cached, traced ``request`` method of every client."""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str | None = None,
+        verify: bool = False,
+        cache: Any | None = None,
+    ):
+        """
+        Open the session for one service instance.
+
+        Args:
+            base_url (str): The base URL of the instance.
+            api_key (Optional[str]): The API key, sent as ``X-Api-Key``.
+            verify (bool): Whether to verify SSL certificates. Defaults to False.
+            cache (Optional[Any]): Response cache consulted for cacheable GET requests,
+                e.g. an ``arr_mcp.cache.ResponseCache``.
+        """
+        self.base_url = base_url
+        self.cache = cache
+        self._session = requests.Session()
+        self._session.hooks["response"].append(tracing.record_response)
+        self._session.verify = verify
+
+        if not verify:
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+        if api_key:
+            self._session.headers.update({"X-Api-Key": api_key})
+
+    @tracing.traced_request
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | list[Any] | None = None,
+    ) -> Any:
+        """
+        Generic request method for the service's API.
+
+        Args:
+            method (str): HTTP method (GET, POST, DELETE, etc.).
+            endpoint (str): API endpoint path.
+            params (Dict, optional): Query parameters for the request.
+            data (Dict, optional): JSON body data for the request.
+
+        Returns:
+            Any: The JSON response from the API or a success status dictionary.
+
+        Raises:
+            Exception: If the API returns a status code >= 400.
+        """
+        cache = self.cache if method == "GET" else None
+        if cache is not None:
+            cached = cache.get(self.base_url, endpoint, params)
+            if cached is not None:
+                return cached
+        response = self._send(method, endpoint, params, data)
+        if response.status_code >= 400:
+            try:
+                error_text = response.text
+            except Exception:
+                error_text = "Unknown error"
+            raise Exception(f"API error: {response.status_code} - {error_text}")
+        if response.status_code == 204:
+            return {"status": "success"}
+        try:
+            result = response.json()
+        except Exception:
+            return {"status": "success", "text": response.text}
+        if isinstance(result, list):
+            result = {"result": result}
+        if cache is not None:
+            cache.set(self.base_url, endpoint, params, result)
+        return result
+
+    @tracing.traced_request
+    def request_raw(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | list[Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> requests.Response:
+        """
+        Send a request and return the response as is: no cache, no error check.
+
+        For reads such as ranged log downloads that act on the status code
+        and headers themselves.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): API endpoint path.
+            params (Dict, optional): Query parameters for the request.
+            data (Dict, optional): JSON body data for the request.
+            headers (Dict, optional): Extra request headers, e.g. ``Range``.
+
+        Returns:
+            requests.Response: The response, whatever its status.
+        """
+        return self._send(method, endpoint, params, data, headers)
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        data: dict[str, Any] | list[Any] | None,
+        headers: dict[str, str] | None = None,
+    ) -> requests.Response:
+        return self._session.request(
+            method=method,
+            url=urljoin(self.base_url, endpoint),
+            params=params,
+            json=data,
+            headers=headers,
+        )
+
+
+class CommandApi(BaseApi):
+    """A client whose service queues background commands (``post_command``)."""
+
+    def wait_for_commands(
+        self, command_ids: list[int], timeout: float = 300.0, interval: float = 1.0
+    ) -> dict:
+        """
+        Wait for commands queued with post_command to finish.
+
+        Polls one get_command listing per tick for all ids, backing off while
+        nothing changes, and returns once every command has finished or
+        ``timeout`` seconds have passed.
+        """
+        return wait_for_commands(self, command_ids, timeout=timeout, interval=interval)
@@ -0,0 +1,328 @@
+"""
+Cross-service consistency audit of an *arr stack.
+
+Drift between services (a movie Bazarr never picked up, a Prowlarr indexer
+that never synced to Sonarr, a tag that exists on one instance only, a root
+folder that ran out of space) only shows up by comparing listings from
+several services side by side. :func:`audit` fetches every listing it needs
+once, concurrently, and runs all comparisons locally as set and dictionary
+operations.
+
+CONCEPT:ARR-016 — Consistency Auditor
+"""
+
+import posixpath
+import time
+from collections.abc import Callable
+from typing import Any
+
+from arr_mcp.concurrency import bounded_map
+from arr_mcp.paging import records
+
+ARR_SERVICES = ("sonarr", "radarr", "lidarr", "chaptarr")
+
+# Prowlarr application implementation to the service it syncs indexers into.
+APP_SERVICES = {
+    "sonarr": "sonarr",
+    "radarr": "radarr",
+    "lidarr": "lidarr",
+    "readarr": "chaptarr",
+    "chaptarr": "chaptarr",
+}
+
+# Library listing and the Bazarr listing (and id field) that should mirror it.
+BAZARR_MIRRORS = {
+    "radarr": ("get_movie", "get_movies", "radarrId"),
+    "sonarr": ("get_series", "get_series", "sonarrSeriesId"),
+}
+
+CHECKS = ("bazarr", "indexers", "tags", "root_folders")
+
+_PROWLARR_SUFFIX = " (prowlarr)"
+_GIB = 1024**3
+
+
+def _bazarr_pages(fetch: Callable[..., Any], page_size: int = 500) -> list[Any]:
+    items: list[Any] = []
+    for page in range(1, 1000):
+        response = fetch(page=page, page_size=page_size)
+        batch = records(response)
+        items.extend(batch)
+        total = response.get("total") if isinstance(response, dict) else None
+        if len(batch) < page_size or (isinstance(total, int) and len(items) >= total):
+            break
+    return items
+
+
+def plan(clients: dict[str, Any], checks: list[str]) -> list[tuple[str, str]]:
+    """Return the ``(service, method)`` listings the requested checks need."""
+    wanted: list[tuple[str, str]] = []
+    arrs = [s for s in ARR_SERVICES if s in clients]
+    if "bazarr" in checks and "bazarr" in clients:
+        for service, (arr_method, bazarr_method, _) in BAZARR_MIRRORS.items():
+            if service in clients:
+                wanted += [(service, arr_method), ("bazarr", bazarr_method)]
+    if "indexers" in checks and "prowlarr" in clients:
+        wanted += [("prowlarr", "get_applications"), ("prowlarr", "get_indexer")]
+        wanted += [(s, "get_indexer") for s in arrs]
+    if "tags" in checks:
+        wanted += [(s, "get_tag_detail") for s in arrs]
+        if "prowlarr" in clients:
+            wanted.append(("prowlarr", "get_tag"))
+    if "root_folders" in checks:
+        wanted += [(s, m) for s in arrs for m in ("get_rootfolder", "get_diskspace")]
+    return list(dict.fromkeys(wanted))
+
+
+def fetch_all(
+    clients: dict[str, Any], wanted: list[tuple[str, str]], concurrency: int = 8
+) -> tuple[dict[tuple[str, str], list[Any]], dict[str, str]]:
+    """Fetch each listing once; returns the records and per-listing errors."""
+
+    def fetch(key: tuple[str, str]) -> list[Any]:
+        service, method = key
+        call = getattr(clients[service], method)
+        if service == "bazarr":
+            return _bazarr_pages(call)
+        return [r for r in records(call()) if isinstance(r, dict)]
+
+    data: dict[tuple[str, str], list[Any]] = {}
+    errors: dict[str, str] = {}
+    for key, value, error in bounded_map(fetch, wanted, concurrency):
+        if error is None:
+            data[key] = [r for r in value if isinstance(r, dict)]
+        else:
+            errors[f"{key[0]}.{key[1]}"] = str(error)
+    return data, errors
+
+
+def check_bazarr(data: dict[tuple[str, str], list[Any]]) -> dict[str, Any]:
+    """Library items Bazarr does not know about (and stale Bazarr entries)."""
+    report: dict[str, Any] = {}
+    for service, (arr_method, bazarr_method, id_field) in BAZARR_MIRRORS.items():
+        library = data.get((service, arr_method))
+        mirrored = data.get(("bazarr", bazarr_method))
+        if library is None or mirrored is None:
+            continue
+        titles = {item["id"]: item.get("title") for item in library if "id" in item}
+        known = {item.get(id_field) for item in mirrored}
+        missing = sorted(set(titles) - known)
+        report[service] = {
+            "library": len(titles),
+            "bazarr": len(known - {None}),
+            "missing_from_bazarr": [{"id": i, "title": titles[i]} for i in missing],
+            "unknown_in_bazarr": sorted(known - set(titles) - {None}),
+        }
+    return report
+
+
+def _base_url(app: dict[str, Any]) -> str | None:
+    for item in app.get("fields") or []:
+        if isinstance(item, dict) and item.get("name") == "baseUrl":
+            return str(item.get("value") or "").rstrip("/").lower() or None
+    return None
+
+
+def _indexer_name(name: Any) -> str:
+    name = str(name or "").strip().lower()
+    if name.endswith(_PROWLARR_SUFFIX):
+        name = name[: -len(_PROWLARR_SUFFIX)].strip()
+    return name
+
+
+def _enabled(indexer: dict[str, Any]) -> bool:
+    flags = [
+        indexer.get(k)
+        for k in ("enableRss", "enableAutomaticSearch", "enableInteractiveSearch")
+        if k in indexer
+    ]
+    return any(flags) if flags else bool(indexer.get("enable", True))
+
+
+def check_indexers(
+    data: dict[tuple[str, str], list[Any]], clients: dict[str, Any]
+) -> dict[str, Any]:
+    """Enabled Prowlarr indexers that are absent or disabled in the synced apps."""
+    apps = data.get(("prowlarr", "get_applications"))
+    indexers = data.get(("prowlarr", "get_indexer"))
+    if apps is None or indexers is None:
+        return {}
+    enabled = [i for i in indexers if i.get("enable", True)]
+    report: dict[str, Any] = {"unmatched_apps": []}
+    for app in apps:
+        service = APP_SERVICES.get(str(app.get("implementation", "")).lower())
+        if app.get("syncLevel") == "disabled" or service is None:
+            continue
+        client = clients.get(service)
+        app_url = _base_url(app)
+        client_url = str(getattr(client, "base_url", "") or "").rstrip("/").lower()
+        remote = data.get((service, "get_indexer"))
+        if remote is None or (app_url and client_url and app_url != client_url):
+            report["unmatched_apps"].append(app.get("name"))
+            continue
+        app_tags = set(app.get("tags") or [])
+        expected = {
+            _indexer_name(i.get("name")): i.get("name")
+            for i in enabled
+            if i.get("name") and (not app_tags or app_tags & set(i.get("tags") or []))
+        }
+        present = {_indexer_name(i["name"]): i for i in remote if i.get("name")}
+        report[service] = {
+            "application": app.get("name"),
+            "expected": len(expected),
+            "missing": sorted(expected[n] for n in set(expected) - set(present)),
+            "disabled": sorted(
+                present[n].get("name")
+                for n in set(expected) & set(present)
+                if not _enabled(present[n])
+            ),
+        }
+    return report
+
+
+def _used(detail: dict[str, Any]) -> bool:
+    return any(
+        isinstance(value, list) and value
+        for key, value in detail.items()
+        if key not in ("id", "label")
+    )
+
+
+def check_tags(data: dict[tuple[str, str], list[Any]]) -> dict[str, Any]:
+    """Tag labels in use on some services but missing on others."""
+    present: dict[str, set[str]] = {}
+    used: dict[str, set[str]] = {}
+    services = []
+    for (service, method), tags in data.items():
+        if method not in ("get_tag_detail", "get_tag"):
+            continue
+        services.append(service)
+        for tag in tags:
+            label = str(tag.get("label") or "").strip().lower()
+            if not label:
+                continue
+            present.setdefault(label, set()).add(service)
+            if method == "get_tag_detail" and _used(tag):
+                used.setdefault(label, set()).add(service)
+    report = {}
+    for label in sorted(used):
+        missing = sorted(set(services) - present[label])
+        if missing:
+            report[label] = {"used_in": sorted(used[label]), "missing_in": missing}
+    return report
+
+
+def _on_mount(path: str, mount: str) -> bool:
+    """Whether ``path`` lies under ``mount`` on a path boundary (/data2 is not on /data)."""
+    path, mount = (p.replace("\\", "/").rstrip("/") or "/" for p in (path, mount))
+    try:
+        return posixpath.commonpath([path, mount]) == mount
+    except ValueError:  # a relative path next to an absolute one
+        return False
+
+
+def check_root_folders(
+    data: dict[tuple[str, str], list[Any]], min_free_gb: float = 10.0
+) -> list[dict[str, Any]]:
+    """Root folders that are inaccessible or below ``min_free_gb`` free space."""
+    problems = []
+    for service in ARR_SERVICES:
+        folders = data.get((service, "get_rootfolder"))
+        if folders is None:
+            continue
+        disks = sorted(
+            data.get((service, "get_diskspace")) or [],
+            key=lambda d: len(str(d.get("path") or "")),
+            reverse=True,
+        )
+        for folder in folders:
+            path = str(folder.get("path") or "")
+            free = folder.get("freeSpace")
+            disk = next(
+                (d for d in disks if _on_mount(path, str(d.get("path") or ""))),
+                None,
+            )
+            if free is None and disk is not None:
+                free = disk.get("freeSpace")
+            issues = []
+            if folder.get("accessible") is False:
+                issues.append("inaccessible")
+            if free is not None and free < min_free_gb * _GIB:
+                issues.append("low_space")
+            if issues:
+                total = (disk or {}).get("totalSpace")
+                problems.append(
+                    {
+                        "service": service,
+                        "path": path,
+                        "free_gb": None if free is None else round(free / _GIB, 2),
+                        "total_gb": None if total is None else round(total / _GIB, 2),
+                        "issues": issues,
+                    }
+                )
+    return problems
+
+
+def _issue_count(checks: dict[str, Any]) -> int:
+    count = 0
+    for service in (checks.get("bazarr") or {}).values():
+        count += len(service["missing_from_bazarr"])
+    for name, service in (checks.get("indexers") or {}).items():
+        if name != "unmatched_apps":
+            count += len(service["missing"]) + len(service["disabled"])
+    count += len(checks.get("tags") or {})
+    count += len(checks.get("root_folders") or [])
+    return count
+
+
+def audit(
+    clients: dict[str, Any],
+    checks: list[str] | None = None,
+    min_free_gb: float = 10.0,
+    concurrency: int = 8,
+) -> dict[str, Any]:
+    """
+    Run the consistency checks over whichever services are configured.
+
+    Args:
+        clients (Dict[str, Any]): Service name to API client.
+        checks (Optional[List[str]]): Any of :data:`CHECKS`; all by default.
+        min_free_gb (float): Free space below which a root folder is flagged.
+        concurrency (int): Listings fetched in parallel.
+
+    Returns:
+        Dict: Per-check findings under ``checks``, the total ``issues``, the
+        number of ``fetches``, per-listing ``errors``, ``fetch_s`` and
+        ``compare_ms``.
+    """
+    checks = checks or list(CHECKS)
+    unknown = [c for c in checks if c not in CHECKS]
+    if unknown:
+        raise ValueError(
+            f"Unknown check {', '.join(unknown)}; expected any of {', '.join(CHECKS)}"
+        )
+    wanted = plan(clients, checks)
+    began = time.monotonic()
+    data, errors = fetch_all(clients, wanted, concurrency)
+    fetch_s = round(time.monotonic() - began, 3)
+
+    began = time.perf_counter()
+    findings: dict[str, Any] = {}
+    if "bazarr" in checks:
+        findings["bazarr"] = check_bazarr(data)
+    if "indexers" in checks:
+        findings["indexers"] = check_indexers(data, clients)
+    if "tags" in checks:
+        findings["tags"] = check_tags(data)
+    if "root_folders" in checks:
+        findings["root_folders"] = check_root_folders(data, min_free_gb)
+    compare_ms = round((time.perf_counter() - began) * 1000, 3)
+    return {
+        "services": sorted(clients),
+        "issues": _issue_count(findings),
+        "checks": findings,
+        "fetches": len(wanted),
+        "errors": errors,
+        "fetch_s": fetch_s,
+        "compare_ms": compare_ms,
+    }
@@ -4,11 +4,27 @@
 CONCEPT:OS-5.4 — OIDC & Credentials Governance
 """
 
+import os
 import sys
-from typing import TYPE_CHECKING
+import threading
+from typing import TYPE_CHECKING, Any
 
 from agent_utilities.base_utilities import get_logger
 from agent_utilities.core.config import setting
+from agent_utilities.core.paths import cache_dir
+
+from arr_mcp import workers
+from arr_mcp.cache import (
+    SEARCH_SERVICES,
+    CacheChain,
+    DiskCache,
+    MemoryCache,
+    Namespace,
+    RedisCache,
+    ResponseCache,
+    SearchCache,
+    open_store,
+)
 
 if TYPE_CHECKING:
     from arr_mcp.api.api_client_bazarr import Api as BazarrApi
@@ -21,82 +37,292 @@
 
 logger = get_logger(__name__)
 
+_response_cache: CacheChain | None = None
+_search_cache: SearchCache | None = None
+_response_cache_lock = threading.Lock()
+_cache_store: MemoryCache | DiskCache | RedisCache | None = None
+_cache_store_opened = False
+_cache_store_lock = threading.Lock()
+_namespaces: dict[str, Namespace] = {}
+
+DEFAULT_INSTANCE = "default"
+
+
+def get_cache_store() -> MemoryCache | DiskCache | RedisCache | None:
+    """Get the process-wide cache store selected by ``ARR_CACHE_BACKEND``.
+
+    ``disk`` (the default) keeps a SQLite file at ``ARR_CACHE_PATH`` bounded
+    by ``ARR_CACHE_MAX_ENTRIES`` and ``ARR_CACHE_MAX_BYTES``; ``memory`` keeps a
+    bounded LRU in this process; ``redis`` uses the server at ``ARR_CACHE_URL``
+    so container replicas share it. Returns ``None`` when ``ARR_CACHE_ENABLED``
+    is false or the store cannot be opened.
+    """
+    global _cache_store, _cache_store_opened
+    with _cache_store_lock:
+        if _cache_store_opened:
+            return _cache_store
+        _cache_store_opened = True
+        if not setting("ARR_CACHE_ENABLED", True):
+            return None
+        backend = setting("ARR_CACHE_BACKEND", "disk")
+        try:
+            _cache_store = open_store(
+                backend,
+                path=setting(
+                    "ARR_CACHE_PATH", str(cache_dir() / "arr-mcp" / "responses.sqlite3")
+                ),
+                url=setting("ARR_CACHE_URL", "redis://localhost:6379/0"),
+                max_entries=setting("ARR_CACHE_MAX_ENTRIES", 10000),
+                max_bytes=setting("ARR_CACHE_MAX_BYTES", 268435456),
+            )
+        except Exception as e:
+            logger.warning(f"Response cache disabled, cannot open {backend} store: {e}")
+            return None
+        if isinstance(_cache_store, MemoryCache) and workers.is_multi_worker():
+            logger.warning("ARR_CACHE_BACKEND=memory is not shared between workers")
+    return _cache_store
+
+
+def cache_namespace(name: str, ttl: float) -> Namespace:
+    """Get the ``name`` namespace of the cache store with its own TTL.
+
+    Falls back to a private in-process LRU when there is no store.
+    """
+    store = get_cache_store()
+    with _cache_store_lock:
+        if name not in _namespaces:
+            _namespaces[name] = Namespace(
+                store if store is not None else MemoryCache(), name, ttl
+            )
+        return _namespaces[name]
+
+
+def cache_stats() -> dict[str, Any]:
+    """Stats of the cache store plus the counters of each namespace in use."""
+    store = get_cache_store()
+    with _cache_store_lock:
+        namespaces = dict(_namespaces)
+    return {
+        "enabled": store is not None,
+        "store": store.stats() if store is not None else None,
+        "namespaces": {name: ns.stats() for name, ns in sorted(namespaces.items())},
+    }
+
+
+def clear_cache(namespace: str) -> None:
+    """Drop every entry of one cache namespace, e.g. ``search``."""
+    with _cache_store_lock:
+        target = _namespaces.get(namespace)
+        in_use = ", ".join(sorted(_namespaces)) or "none"
+    if target is None:
+        raise ValueError(f"Unknown cache namespace '{namespace}'; in use: {in_use}")
+    target.clear()
+
+
+def get_search_cache() -> SearchCache | None:
+    """Get the release search cache, or ``None`` when ``SEARCH_CACHE_TTL`` is 0."""
+    get_response_cache()
+    return _search_cache
+
 
-def get_sonarr_client() -> "SonarrApi":
-    """Get authenticated sonarr client."""
+def get_response_cache(service: str | None = None) -> CacheChain | None:
+    """Get the process-wide response cache shared by every client.
+
+    Metadata lookups (namespace ``lookup``) are kept for ``ARR_LOOKUP_CACHE_TTL``
+    seconds and release searches (namespace ``search``) for ``SEARCH_CACHE_TTL``
+    seconds (``0`` disables it), both in the store from :func:`get_cache_store`.
+    Without a store, searches fall back to an in-process LRU. Only clients of
+    the :data:`~arr_mcp.cache.SEARCH_SERVICES` get the search cache: Seerr,
+    Lidarr and Chaptarr serve metadata searches on the same path. Returns
+    ``None`` when no cache applies, in which case clients go straight to the
+    network.
+
+    Args:
+        service (Optional[str]): Service of the client the cache is for;
+            ``None`` returns the whole chain.
+    """
+    global _response_cache, _search_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            caches: list[ResponseCache] = []
+            if get_cache_store() is not None:
+                lookup_ttl = setting("ARR_LOOKUP_CACHE_TTL", 86400.0)
+                caches.append(ResponseCache(cache_namespace("lookup", lookup_ttl)))
+            search_ttl = setting("SEARCH_CACHE_TTL", 120.0)
+            if search_ttl > 0:
+                _search_cache = SearchCache(cache_namespace("search", search_ttl))
+                caches.append(_search_cache)
+            if not caches:
+                return None
+            _response_cache = CacheChain(*caches)
+    if service is None or service in SEARCH_SERVICES:
+        return _response_cache
+    lookups = [c for c in _response_cache.caches if not isinstance(c, SearchCache)]
+    return CacheChain(*lookups) if lookups else None
+
+
+def instance_prefix(service: str, instance: str | None = None) -> str:
+    """Settings prefix of a service instance.
+
+    The ``default`` instance (or ``None``) reads ``<SVC>_BASE_URL``, ``<SVC>_TOKEN``
+    and so on; a named instance such as ``4k`` reads ``<SVC>__4K__BASE_URL``,
+    ``<SVC>__4K__TOKEN``, ...
+    """
+    name = (instance or "").strip()
+    if not name or name.lower() == DEFAULT_INSTANCE:
+        return f"{service.upper()}_"
+    return f"{service.upper()}__{name.upper()}__"
+
+
+def list_instances(service: str) -> list[str]:
+    """Names of the configured instances of ``service``, ``default`` first."""
+    names = [DEFAULT_INSTANCE] if setting(f"{service.upper()}_BASE_URL") else []
+    head, tail = f"{service.upper()}__", "__BASE_URL"
+    for key in sorted(os.environ):
+        if key.startswith(head) and key.endswith(tail) and len(key) > len(head + tail):
+            if setting(key):
+                names.append(key[len(head) : -len(tail)].lower())
+    return names
+
+
+def get_sonarr_client(instance: str | None = None) -> "SonarrApi":
+    """Get an authenticated Sonarr client for the default or a named instance."""
+    prefix = instance_prefix("sonarr", instance)
     api_cls = sys.modules[__name__].SonarrApi
-    base_url = setting("SONARR_BASE_URL")
-    token = setting("SONARR_TOKEN")
-    verify = setting("SONARR_SSL_VERIFY", False)
+    base_url = setting(f"{prefix}BASE_URL")
+    token = setting(f"{prefix}TOKEN")
+    verify = setting(f"{prefix}SSL_VERIFY", False)
     if not base_url:
-        raise RuntimeError("SONARR_BASE_URL not set")
-    return api_cls(base_url=base_url, token=token, verify=verify)
+        raise RuntimeError(f"{prefix}BASE_URL not set")
+    client = api_cls(base_url=base_url, token=token, verify=verify)
+    client.cache = get_response_cache("sonarr")
+    return client
 
 
-def get_radarr_client() -> "RadarrApi":
-    """Get authenticated radarr client."""
+def get_radarr_client(instance: str | None = None) -> "RadarrApi":
+    """Get an authenticated Radarr client for the default or a named instance."""
+    prefix = instance_prefix("radarr", instance)
     api_cls = sys.modules[__name__].RadarrApi
-    base_url = setting("RADARR_BASE_URL")
-    token = setting("RADARR_TOKEN")
-    verify = setting("RADARR_SSL_VERIFY", False)
+    base_url = setting(f"{prefix}BASE_URL")
+    token = setting(f"{prefix}TOKEN")
+    verify = setting(f"{prefix}SSL_VERIFY", False)
     if not base_url:
-        raise RuntimeError("RADARR_BASE_URL not set")
-    return api_cls(base_url=base_url, token=token, verify=verify)
+        raise RuntimeError(f"{prefix}BASE_URL not set")
+    client = api_cls(base_url=base_url, token=token, verify=verify)
+    client.cache = get_response_cache("radarr")
+    return client
 
 
-def get_lidarr_client() -> "LidarrApi":
-    """Get authenticated lidarr client."""
+def get_lidarr_client(instance: str | None = None) -> "LidarrApi":
+    """Get an authenticated Lidarr client for the default or a named instance."""
+    prefix = instance_prefix("lidarr", instance)
     api_cls = sys.modules[__name__].LidarrApi
-    base_url = setting("LIDARR_BASE_URL")
-    token = setting("LIDARR_TOKEN")
-    verify = setting("LIDARR_SSL_VERIFY", False)
+    base_url = setting(f"{prefix}BASE_URL")
+    token = setting(f"{prefix}TOKEN")
+    verify = setting(f"{prefix}SSL_VERIFY", False)
     if not base_url:
-        raise RuntimeError("LIDARR_BASE_URL not set")
-    return api_cls(base_url=base_url, token=token, verify=verify)
+        raise RuntimeError(f"{prefix}BASE_URL not set")
+    client = api_cls(base_url=base_url, token=token, verify=verify)
+    client.cache = get_response_cache("lidarr")
+    return client
 
 
-def get_prowlarr_client() -> "ProwlarrApi":
-    """Get authenticated prowlarr client."""
+def get_prowlarr_client(instance: str | None = None) -> "ProwlarrApi":
+    """Get an authenticated Prowlarr client for the default or a named instance."""
+    prefix = instance_prefix("prowlarr", instance)
     api_cls = sys.modules[__name__].ProwlarrApi
-    base_url = setting("PROWLARR_BASE_URL")
-    token = setting("PROWLARR_TOKEN")
-    verify = setting("PROWLARR_SSL_VERIFY", False)
+    base_url = setting(f"{prefix}BASE_URL")
+    token = setting(f"{prefix}TOKEN")
+    verify = setting(f"{prefix}SSL_VERIFY", False)
     if not base_url:
-        raise RuntimeError("PROWLARR_BASE_URL not set")
-    return api_cls(base_url=base_url, token=token, verify=verify)
+        raise RuntimeError(f"{prefix}BASE_URL not set")
+    client = api_cls(base_url=base_url, token=token, verify=verify)
+    client.cache = get_response_cache("prowlarr")
+    return client
 
 
-def get_bazarr_client() -> "BazarrApi":
-    """Get authenticated bazarr client."""
+def get_bazarr_client(instance: str | None = None) -> "BazarrApi":
+    """Get an authenticated Bazarr client for the default or a named instance."""
+    prefix = instance_prefix("bazarr", instance)
     api_cls = sys.modules[__name__].BazarrApi
-    base_url = setting("BAZARR_BASE_URL")
-    api_key = setting("BAZARR_API_KEY")
-    verify = setting("BAZARR_SSL_VERIFY", False)
+    base_url = setting(f"{prefix}BASE_URL")
+    api_key = setting(f"{prefix}API_KEY")
+    verify = setting(f"{prefix}SSL_VERIFY", False)
     if not base_url:
-        raise RuntimeError("BAZARR_BASE_URL not set")
-    return api_cls(base_url=base_url, api_key=api_key, verify=verify)
+        raise RuntimeError(f"{prefix}BASE_URL not set")
+    client = api_cls(base_url=base_url, api_key=api_key, verify=verify)
+    client.cache = get_response_cache("bazarr")
+    return client
 
 
-def get_seerr_client() -> "SeerrApi":
-    """Get authenticated seerr client."""
+def get_seerr_client(instance: str | None = None) -> "SeerrApi":
+    """Get an authenticated Seerr client for the default or a named instance."""
+    prefix = instance_prefix("seerr", instance)
     api_cls = sys.modules[__name__].SeerrApi
-    base_url = setting("SEERR_BASE_URL")
-    api_key = setting("SEERR_API_KEY")
-    verify = setting("SEERR_SSL_VERIFY", False)
+    base_url = setting(f"{prefix}BASE_URL")
+    api_key = setting(f"{prefix}API_KEY")
+    verify = setting(f"{prefix}SSL_VERIFY", False)
     if not base_url:
-        raise RuntimeError("SEERR_BASE_URL not set")
-    return api_cls(base_url=base_url, api_key=api_key, verify=verify)
+        raise RuntimeError(f"{prefix}BASE_URL not set")
+    client = api_cls(base_url=base_url, api_key=api_key, verify=verify)
+    client.cache = get_response_cache("seerr")
+    return client
 
 
-def get_chaptarr_client() -> "ChaptarrApi":
-    """Get authenticated chaptarr client."""
+def get_chaptarr_client(instance: str | None = None) -> "ChaptarrApi":
+    """Get an authenticated Chaptarr client for the default or a named instance."""
+    prefix = instance_prefix("chaptarr", instance)
     api_cls = sys.modules[__name__].ChaptarrApi
-    base_url = setting("CHAPTARR_BASE_URL")
-    token = setting("CHAPTARR_TOKEN")
-    verify = setting("CHAPTARR_SSL_VERIFY", False)
+    base_url = setting(f"{prefix}BASE_URL")
+    token = setting(f"{prefix}TOKEN")
+    verify = setting(f"{prefix}SSL_VERIFY", False)
     if not base_url:
-        raise RuntimeError("CHAPTARR_BASE_URL not set")
-    return api_cls(base_url=base_url, token=token, verify=verify)
+        raise RuntimeError(f"{prefix}BASE_URL not set")
+    client = api_cls(base_url=base_url, token=token, verify=verify)
+    client.cache = get_response_cache("chaptarr")
+    return client
+
+
+CLIENT_FACTORIES = {
+    "sonarr": get_sonarr_client,
+    "radarr": get_radarr_client,
+    "lidarr": get_lidarr_client,
+    "prowlarr": get_prowlarr_client,
+    "bazarr": get_bazarr_client,
+    "seerr": get_seerr_client,
+    "chaptarr": get_chaptarr_client,
+}
+
+
+def get_clients(services: str | list[str] | None = None) -> dict[str, object]:
+    """Get a client for every requested service that is configured.
+
+    Args:
+        services: Comma-separated service names, a list of them, or ``None``/``"all"``
+            for every known service.
+
+    Services without a base URL are skipped rather than raising, so callers can
+    fan out over whatever subset of the stack is deployed.
+    """
+    if services is None or services == "all":
+        names = list(CLIENT_FACTORIES)
+    elif isinstance(services, str):
+        names = [s.strip().lower() for s in services.split(",") if s.strip()]
+    else:
+        names = [s.lower() for s in services]
+    unknown = [name for name in names if name not in CLIENT_FACTORIES]
+    if unknown:
+        raise ValueError(
+            f"Unknown service(s) {', '.join(unknown)}; "
+            f"expected any of {', '.join(CLIENT_FACTORIES)}"
+        )
+    clients: dict[str, object] = {}
+    for name in names:
+        try:
+            clients[name] = CLIENT_FACTORIES[name]()
+        except RuntimeError:
+            logger.debug(f"Skipping {name}: not configured")
+    return clients
 
 
 def __getattr__(name: str):
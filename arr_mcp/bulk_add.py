@@ -0,0 +1,268 @@
+"""
+Bulk add pipeline for Radarr, Sonarr, Lidarr and Chaptarr.
+
+Adding a list of titles one ``add_movie`` at a time costs a serial lookup plus
+a POST per title and fails on anything already owned. This pipeline fetches
+the owned external ids once, runs the lookups concurrently, drops titles that
+are owned or repeated in the batch, and submits the rest through the bulk
+import endpoint where the service has one (Radarr ``post_movie_import``,
+Sonarr ``post_series_import``), reporting an outcome for every input term.
+
+CONCEPT:ARR-007 — Bulk Add Pipeline
+"""
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from arr_mcp.concurrency import bounded_map
+from arr_mcp.paging import records
+
+_PREFIXED = re.compile(
+    r"^\s*(tmdb|tvdb|imdb|mb|musicbrainz|lidarr)\s*:\s*(\S+)\s*$", re.I
+)
+_IMDB = re.compile(r"^\s*(tt\d{5,})\s*$", re.I)
+
+
+def _first(response: Any) -> dict[str, Any] | None:
+    if isinstance(response, dict) and not any(
+        k in response for k in ("result", "records")
+    ):
+        return response or None
+    for item in records(response):
+        if isinstance(item, dict):
+            return item
+    return None
+
+
+def _lookup_movie(client: Any, term: str) -> dict[str, Any] | None:
+    prefixed = _PREFIXED.match(term)
+    imdb = _IMDB.match(term)
+    if prefixed and prefixed.group(1).lower() == "tmdb":
+        return _first(client.get_movie_lookup_tmdb(tmdbId=int(prefixed.group(2))))
+    if imdb or (prefixed and prefixed.group(1).lower() == "imdb"):
+        imdb_id = imdb.group(1) if imdb else prefixed.group(2)  # type: ignore[union-attr]
+        return _first(client.get_movie_lookup_imdb(imdbId=imdb_id))
+    return _first(client.get_movie_lookup(term=term))
+
+
+def _lookup_series(client: Any, term: str) -> dict[str, Any] | None:
+    return _first(client.get_series_lookup(term=term.strip()))
+
+
+def _lookup_artist(client: Any, term: str) -> dict[str, Any] | None:
+    prefixed = _PREFIXED.match(term)
+    if prefixed and prefixed.group(1).lower() in ("mb", "musicbrainz", "lidarr"):
+        term = f"lidarr:{prefixed.group(2)}"
+    return _first(client.get_artist_lookup(term=term.strip()))
+
+
+def _lookup_author(client: Any, term: str) -> dict[str, Any] | None:
+    return _first(client.get_author_lookup(term=term.strip()))
+
+
+@dataclass(frozen=True)
+class AddTarget:
+    """How one service looks up, identifies and submits new library entries."""
+
+    kind: str
+    id_field: str
+    owned_method: str
+    lookup: Callable[[Any, str], dict[str, Any] | None]
+    add_method: str
+    import_method: str | None
+    add_options: Callable[[bool], dict[str, Any]]
+    needs_metadata_profile: bool = False
+
+
+ADD_TARGETS: dict[str, AddTarget] = {
+    "radarr": AddTarget(
+        kind="movie",
+        id_field="tmdbId",
+        owned_method="get_movie",
+        lookup=_lookup_movie,
+        add_method="post_movie",
+        import_method="post_movie_import",
+        add_options=lambda search: {"searchForMovie": search, "monitor": "movieOnly"},
+    ),
+    "sonarr": AddTarget(
+        kind="series",
+        id_field="tvdbId",
+        owned_method="get_series",
+        lookup=_lookup_series,
+        add_method="post_series",
+        import_method="post_series_import",
+        add_options=lambda search: {
+            "searchForMissingEpisodes": search,
+            "monitor": "all",
+        },
+    ),
+    "lidarr": AddTarget(
+        kind="artist",
+        id_field="foreignArtistId",
+        owned_method="get_artist",
+        lookup=_lookup_artist,
+        add_method="post_artist",
+        import_method=None,
+        add_options=lambda search: {"searchForMissingAlbums": search, "monitor": "all"},
+        needs_metadata_profile=True,
+    ),
+    "chaptarr": AddTarget(
+        kind="author",
+        id_field="foreignAuthorId",
+        owned_method="get_author",
+        lookup=_lookup_author,
+        add_method="post_author",
+        import_method=None,
+        add_options=lambda search: {"searchForMissingBooks": search, "monitor": "all"},
+        needs_metadata_profile=True,
+    ),
+}
+
+
+def owned_ids(client: Any, target: AddTarget) -> set[str]:
+    """Return the external ids already in the library, fetched in one call."""
+    return {
+        str(item[target.id_field])
+        for item in records(getattr(client, target.owned_method)())
+        if isinstance(item, dict) and item.get(target.id_field) not in (None, "", 0)
+    }
+
+
+def bulk_add(
+    service: str,
+    client: Any,
+    terms: list[str],
+    quality_profile_id: int,
+    root_folder_path: str,
+    metadata_profile_id: int | None = None,
+    monitored: bool = True,
+    search: bool = False,
+    concurrency: int = 8,
+    chunk_size: int = 100,
+) -> dict[str, Any]:
+    """
+    Look up ``terms`` concurrently and add the ones not already owned.
+
+    Args:
+        service (str): One of ``radarr``, ``sonarr``, ``lidarr`` or ``chaptarr``.
+        client (Any): The service's API client.
+        terms (List[str]): Titles or prefixed ids (``tmdb:603``, ``tvdb:81189``,
+            ``tt0133093``, ``lidarr:<mbid>``).
+        quality_profile_id (int): Quality profile for every added entry.
+        root_folder_path (str): Root folder for every added entry.
+        metadata_profile_id (Optional[int]): Lidarr/Chaptarr metadata profile;
+            defaults to the first one configured.
+        monitored (bool): Whether added entries are monitored.
+        search (bool): Trigger a search for each entry once added.
+        concurrency (int): Maximum lookups (and single adds) in flight.
+        chunk_size (int): Entries per bulk import request.
+
+    Returns:
+        Dict: Per-term ``results`` with a ``status`` of ``added``, ``exists``,
+        ``duplicate``, ``not_found`` or ``error``, plus a ``summary`` count.
+    """
+    if service not in ADD_TARGETS:
+        raise ValueError(
+            f"Bulk add is not supported for '{service}'; "
+            f"expected one of {', '.join(ADD_TARGETS)}"
+        )
+    target = ADD_TARGETS[service]
+    owned = owned_ids(client, target)
+
+    if target.needs_metadata_profile and metadata_profile_id is None:
+        profile = _first(client.get_metadataprofile())
+        metadata_profile_id = profile.get("id") if profile else None
+
+    results: list[dict[str, Any]] = [{"term": term} for term in terms]
+    lookups = bounded_map(lambda t: target.lookup(client, t), terms, concurrency)
+
+    pending: list[tuple[int, dict[str, Any]]] = []
+    seen: set[str] = set()
+    for i, (_, found, error) in enumerate(lookups):
+        outcome = results[i]
+        if error is not None:
+            outcome.update(status="error", error=str(error))
+            continue
+        if not found or found.get(target.id_field) in (None, "", 0):
+            outcome["status"] = "not_found"
+            continue
+        ext_id = str(found[target.id_field])
+        outcome["title"] = (
+            found.get("title") or found.get("artistName") or found.get("authorName")
+        )
+        outcome[target.id_field] = found[target.id_field]
+        if ext_id in owned:
+            outcome["status"] = "exists"
+            continue
+        if ext_id in seen:
+            outcome["status"] = "duplicate"
+            continue
+        seen.add(ext_id)
+        payload = {
+            **found,
+            "qualityProfileId": quality_profile_id,
+            "rootFolderPath": root_folder_path,
+            "monitored": monitored,
+            "addOptions": target.add_options(search),
+        }
+        if target.needs_metadata_profile:
+            payload["metadataProfileId"] = metadata_profile_id
+        pending.append((i, payload))
+
+    _submit(client, target, pending, results, concurrency, chunk_size)
+
+    summary: dict[str, int] = {}
+    for outcome in results:
+        summary[outcome["status"]] = summary.get(outcome["status"], 0) + 1
+    return {"service": service, "summary": summary, "results": results}
+
+
+def _submit(
+    client: Any,
+    target: AddTarget,
+    pending: list[tuple[int, dict[str, Any]]],
+    results: list[dict[str, Any]],
+    concurrency: int,
+    chunk_size: int,
+) -> None:
+    """Post ``pending`` payloads, in bulk where possible, and record outcomes."""
+    singles: list[tuple[int, dict[str, Any]]] = []
+    if target.import_method is None:
+        singles = pending
+    else:
+        bulk = getattr(client, target.import_method)
+        for start in range(0, len(pending), max(1, chunk_size)):
+            chunk = pending[start : start + max(1, chunk_size)]
+            try:
+                created = records(bulk(data=[payload for _, payload in chunk]))
+            except Exception:
+                # One bad entry rejects the whole import; retry the chunk one
+                # by one so every term gets its own outcome.
+                singles.extend(chunk)
+                continue
+            created_ids = {
+                str(item.get(target.id_field)): item.get("id")
+                for item in created
+                if isinstance(item, dict) and item.get("id") is not None
+            }
+            for i, payload in chunk:
+                library_id = created_ids.get(str(payload[target.id_field]))
+                if library_id is None:
+                    # Not in the import response: the service skipped it, so
+                    # post it alone to get its own outcome.
+                    singles.append((i, payload))
+                else:
+                    results[i].update(status="added", id=library_id)
+
+    add = getattr(client, target.add_method)
+    for (i, _), created, error in bounded_map(
+        lambda p: add(data=p[1]), singles, concurrency
+    ):
+        if error is not None:
+            results[i].update(status="error", error=str(error))
+        else:
+            results[i]["status"] = "added"
+            if isinstance(created, dict) and created.get("id") is not None:
+                results[i]["id"] = created["id"]
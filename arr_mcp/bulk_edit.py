@@ -0,0 +1,383 @@
+"""
+Filtered bulk edits through the *arr editor endpoints.
+
+Mass monitor/unmonitor, retagging, root folder moves and profile changes
+would otherwise be one ``put_<item>_id`` per item. :func:`bulk_edit` lists the
+library once, resolves the filter (tags, quality profile, root folder, year
+range, monitored state) locally, drops items already in the requested state,
+and sends the rest to the service's editor or monitor endpoint in chunks.
+
+CONCEPT:ARR-011 — Bulk Editor
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from arr_mcp.concurrency import bounded_map
+from arr_mcp.paging import records
+
+EDITOR_FIELDS = (
+    "monitored",
+    "qualityProfileId",
+    "rootFolderPath",
+    "moveFiles",
+    "tags",
+    "applyTags",
+)
+
+
+@dataclass(frozen=True)
+class EditTarget:
+    """How one service lists, identifies and bulk-edits one kind of item."""
+
+    list_method: str
+    ids_field: str
+    editor_method: str
+    fields: tuple[str, ...]
+    parent: str | None = None
+    parent_key: str | None = None
+    per_parent: bool = False
+
+
+EDIT_TARGETS: dict[tuple[str, str], EditTarget] = {
+    ("radarr", "movie"): EditTarget(
+        "get_movie",
+        "movieIds",
+        "put_movie_editor",
+        EDITOR_FIELDS + ("minimumAvailability",),
+    ),
+    ("sonarr", "series"): EditTarget(
+        "get_series",
+        "seriesIds",
+        "put_series_editor",
+        EDITOR_FIELDS + ("seriesType", "seasonFolder"),
+    ),
+    ("lidarr", "artist"): EditTarget(
+        "get_artist",
+        "artistIds",
+        "put_artist_editor",
+        EDITOR_FIELDS + ("metadataProfileId",),
+    ),
+    ("chaptarr", "author"): EditTarget(
+        "get_author",
+        "authorIds",
+        "put_author_editor",
+        EDITOR_FIELDS + ("metadataProfileId",),
+    ),
+    ("sonarr", "episode"): EditTarget(
+        "get_episode",
+        "episodeIds",
+        "put_episode_monitor",
+        ("monitored",),
+        parent="series",
+        parent_key="seriesId",
+        per_parent=True,
+    ),
+    ("lidarr", "album"): EditTarget(
+        "get_album",
+        "albumIds",
+        "put_album_monitor",
+        ("monitored",),
+        parent="artist",
+        parent_key="artistId",
+    ),
+    ("chaptarr", "book"): EditTarget(
+        "get_book",
+        "bookIds",
+        "put_book_monitor",
+        ("monitored",),
+        parent="author",
+        parent_key="authorId",
+    ),
+}
+
+PRIMARY_ENTITY = {
+    "radarr": "movie",
+    "sonarr": "series",
+    "lidarr": "artist",
+    "chaptarr": "author",
+}
+
+
+@dataclass
+class ItemFilter:
+    """
+    Local filter over library items; unset criteria match everything.
+
+    For episodes, albums and books the criteria apply to the parent series,
+    artist or author, and ``seasons`` narrows episodes further.
+    """
+
+    tags: Sequence[str | int] = field(default_factory=list)
+    quality_profile: str | int | None = None
+    root_folder: str | None = None
+    year_from: int | None = None
+    year_to: int | None = None
+    monitored: bool | None = None
+    ids: list[int] = field(default_factory=list)
+    seasons: list[int] = field(default_factory=list)
+
+
+def _by_label(client: Any, method: str, key: str) -> dict[str, int]:
+    return {
+        str(item[key]).strip().lower(): item["id"]
+        for item in records(getattr(client, method)())
+        if isinstance(item, dict) and item.get(key) is not None and "id" in item
+    }
+
+
+def resolve_tags(
+    client: Any, tags: Sequence[str | int], create: bool = False
+) -> tuple[list[int], list[str]]:
+    """
+    Map tag labels (or ids) to ids.
+
+    Returns:
+        Tuple: The resolved ids and the labels that do not exist yet. When
+        ``create`` is set, missing labels are created instead and the second
+        list is empty.
+    """
+    ids: list[int] = []
+    missing: list[str] = []
+    known: dict[str, int] | None = None
+    for tag in tags:
+        if isinstance(tag, int) or str(tag).isdigit():
+            ids.append(int(tag))
+            continue
+        if known is None:
+            known = _by_label(client, "get_tag", "label")
+        label = str(tag).strip()
+        if label.lower() not in known:
+            if not create:
+                missing.append(label)
+                continue
+            known[label.lower()] = client.post_tag(data={"label": label})["id"]
+        ids.append(known[label.lower()])
+    return ids, missing
+
+
+def resolve_profile(client: Any, profile: str | int) -> int:
+    """Map a quality profile name (or id) to its id."""
+    if isinstance(profile, int) or str(profile).isdigit():
+        return int(profile)
+    profiles = _by_label(client, "get_qualityprofile", "name")
+    try:
+        return profiles[str(profile).strip().lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown quality profile '{profile}'; "
+            f"expected one of {', '.join(sorted(profiles))}"
+        ) from None
+
+
+def _in_root(item: dict[str, Any], root: str) -> bool:
+    root = root.rstrip("/\\") + "/"
+    path = item.get("rootFolderPath") or item.get("path") or ""
+    return (path.rstrip("/\\") + "/").startswith(root)
+
+
+def matches(item: dict[str, Any], criteria: ItemFilter, tag_ids: set[int]) -> bool:
+    """Return whether a library item satisfies ``criteria`` (tags already resolved)."""
+    if criteria.ids and item.get("id") not in criteria.ids:
+        return False
+    if tag_ids and not tag_ids.intersection(item.get("tags") or []):
+        return False
+    if (
+        criteria.quality_profile is not None
+        and item.get("qualityProfileId") != criteria.quality_profile
+    ):
+        return False
+    if criteria.root_folder and not _in_root(item, criteria.root_folder):
+        return False
+    if (
+        criteria.monitored is not None
+        and bool(item.get("monitored")) != criteria.monitored
+    ):
+        return False
+    if criteria.year_from is not None or criteria.year_to is not None:
+        year = item.get("year")
+        if not year:
+            return False
+        if criteria.year_from is not None and year < criteria.year_from:
+            return False
+        if criteria.year_to is not None and year > criteria.year_to:
+            return False
+    return True
+
+
+def _needs_change(item: dict[str, Any], payload: dict[str, Any]) -> bool:
+    for key, value in payload.items():
+        if key in ("applyTags", "moveFiles"):
+            continue
+        if key == "tags":
+            current = set(item.get("tags") or [])
+            mode = payload.get("applyTags", "replace")
+            if mode == "add" and not set(value) <= current:
+                return True
+            if mode == "remove" and current & set(value):
+                return True
+            if mode == "replace" and current != set(value):
+                return True
+            continue
+        if key == "rootFolderPath":
+            if not _in_root(item, value):
+                return True
+            continue
+        if item.get(key) != value:
+            return True
+    return False
+
+
+def _select(
+    client: Any,
+    target: EditTarget,
+    service: str,
+    criteria: ItemFilter,
+    concurrency: int,
+) -> list[dict[str, Any]]:
+    """List the library (or its children) once and keep the matching items."""
+    tag_ids: set[int] = set()
+    if criteria.tags:
+        ids, _ = resolve_tags(client, criteria.tags)
+        if not ids:
+            # Every requested tag is unknown, so nothing can carry it.
+            return []
+        tag_ids = set(ids)
+    if target.parent is None:
+        items = records(getattr(client, target.list_method)())
+        return [
+            i for i in items if isinstance(i, dict) and matches(i, criteria, tag_ids)
+        ]
+
+    parent_target = EDIT_TARGETS[(service, target.parent)]
+    parents = {
+        p["id"]: p
+        for p in records(getattr(client, parent_target.list_method)())
+        if isinstance(p, dict) and "id" in p and matches(p, criteria, tag_ids)
+    }
+    parent_key = str(target.parent_key)
+    if target.per_parent:
+        listing = getattr(client, target.list_method)
+        children = [
+            child
+            for _, result, error in bounded_map(
+                lambda pid: listing(**{parent_key: pid}),
+                list(parents),
+                concurrency,
+            )
+            if error is None
+            for child in records(result)
+        ]
+    else:
+        children = records(getattr(client, target.list_method)())
+    return [
+        child
+        for child in children
+        if isinstance(child, dict)
+        and child.get(parent_key) in parents
+        and (not criteria.seasons or child.get("seasonNumber") in criteria.seasons)
+    ]
+
+
+def bulk_edit(
+    service: str,
+    client: Any,
+    criteria: ItemFilter,
+    changes: dict[str, Any],
+    entity: str | None = None,
+    chunk_size: int = 500,
+    dry_run: bool = False,
+    concurrency: int = 8,
+) -> dict[str, Any]:
+    """
+    Apply ``changes`` to every item matching ``criteria`` in chunked editor calls.
+
+    Args:
+        service (str): ``radarr``, ``sonarr``, ``lidarr`` or ``chaptarr``.
+        client (Any): The service's API client.
+        criteria (ItemFilter): Which items to edit.
+        changes (Dict[str, Any]): Editor fields to set: ``monitored``,
+            ``qualityProfileId`` (id or profile name), ``rootFolderPath`` with
+            ``moveFiles``, ``tags`` (labels or ids) with ``applyTags``
+            (``add``/``remove``/``replace``), plus service-specific fields such as
+            ``minimumAvailability`` or ``metadataProfileId``. Episodes, albums
+            and books accept ``monitored`` only.
+        entity (Optional[str]): Item kind; defaults to the service's primary
+            kind (movie, series, artist, author). Also ``episode``, ``album``
+            or ``book``.
+        chunk_size (int): Ids per editor request.
+        dry_run (bool): Report what would change without writing.
+        concurrency (int): Parallel child listings for episode edits.
+
+    Returns:
+        Dict: ``matched`` and ``changed`` counts, ``unchanged`` items skipped,
+        ``requests`` issued, per-chunk ``errors`` and a ``sample`` of titles.
+    """
+    entity = entity or PRIMARY_ENTITY.get(service)
+    target = EDIT_TARGETS.get((service, entity or ""))
+    if target is None:
+        supported = ", ".join(f"{s}/{e}" for s, e in EDIT_TARGETS)
+        raise ValueError(f"Bulk edit supports {supported}, not {service}/{entity}")
+    unsupported = sorted(set(changes) - set(target.fields))
+    if unsupported:
+        raise ValueError(
+            f"{service}/{entity} cannot change {', '.join(unsupported)}; "
+            f"supported: {', '.join(target.fields)}"
+        )
+    if not any(k not in ("moveFiles", "applyTags") for k in changes):
+        raise ValueError("No changes requested")
+
+    payload = dict(changes)
+    if isinstance(criteria.quality_profile, str):
+        criteria = replace(
+            criteria, quality_profile=resolve_profile(client, criteria.quality_profile)
+        )
+    if "qualityProfileId" in payload:
+        payload["qualityProfileId"] = resolve_profile(
+            client, payload["qualityProfileId"]
+        )
+    new_tags: list[str] = []
+    if "tags" in payload:
+        mode = payload.setdefault("applyTags", "add")
+        if mode not in ("add", "remove", "replace"):
+            raise ValueError(f"applyTags must be add, remove or replace, not '{mode}'")
+        payload["tags"], new_tags = resolve_tags(
+            client, payload["tags"], create=mode != "remove" and not dry_run
+        )
+        if new_tags and mode != "remove":
+            # Dry run: stand-in id so items still count as needing the tag.
+            payload["tags"] = payload["tags"] + [-1]
+
+    matched = _select(client, target, service, criteria, concurrency)
+    pending = [item for item in matched if _needs_change(item, payload)]
+    result: dict[str, Any] = {
+        "service": service,
+        "entity": entity,
+        "matched": len(matched),
+        "changed": len(pending),
+        "unchanged": len(matched) - len(pending),
+        "dry_run": dry_run,
+        "tags_to_create": new_tags if payload.get("applyTags") != "remove" else [],
+        "sample": [
+            item.get("title") or item.get("artistName") or item.get("authorName")
+            for item in pending[:10]
+        ],
+        "requests": 0,
+        "errors": [],
+    }
+    if dry_run or not pending:
+        return result
+
+    editor = getattr(client, target.editor_method)
+    ids = [item["id"] for item in pending]
+    size = max(1, chunk_size)
+    for start in range(0, len(ids), size):
+        chunk = ids[start : start + size]
+        result["requests"] += 1
+        try:
+            editor(data={**payload, target.ids_field: chunk})
+        except Exception as e:
+            result["errors"].append({"ids": chunk, "error": str(e)})
+    result["changed"] -= sum(len(err["ids"]) for err in result["errors"])
+    return result
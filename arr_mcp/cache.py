@@ -0,0 +1,846 @@
+"""
+Response caching for the API clients.
+
+The *arr metadata lookup endpoints proxy to slow upstream providers (TMDb,
+TheTVDB, MusicBrainz, Goodreads), so repeating a lookup during a bulk add or
+an agent retry costs seconds. A :class:`ResponseCache` attached to a client
+serves those GETs from the cache store, keyed by instance, endpoint and
+normalized parameters.
+
+Release searches (Prowlarr ``/api/v1/search``, Radarr/Sonarr interactive
+``/release``) are the opposite case: results go stale within minutes, but
+agents repeat them while refining a decision and every repeat hits every
+indexer. A :class:`SearchCache` keeps them briefly and counts hits and
+misses per indexer. Only the clients of :data:`SEARCH_SERVICES` get one,
+since other services use ``/api/v1/search`` for metadata. Inside :func:`bypass_cache` every cache is skipped for
+reads and refreshed on write.
+
+The store is pluggable (``ARR_CACHE_BACKEND``): a bounded in-process LRU
+(:class:`MemoryCache`), a SQLite file with entry-count and size-based
+eviction that survives restarts (:class:`DiskCache`), or a Redis-protocol
+server that replicas share (:class:`RedisCache`). Each kind of data uses a
+:class:`Namespace` of the one store with its own TTL and counters; values
+are stored as compact JSON, compressed when large (:func:`encode`).
+
+CONCEPT:ARR-005 — Response Cache
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import socket
+import sqlite3
+import ssl
+import threading
+import time
+import urllib.parse
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from arr_mcp import tracing
+from arr_mcp.paging import records
+
+try:
+    from prometheus_client import Counter
+except ImportError:  # pragma: no cover - exercised only without prometheus_client
+    Counter = None
+
+LOOKUP_ENDPOINTS = frozenset(
+    {
+        "/api/v3/movie/lookup",
+        "/api/v3/movie/lookup/tmdb",
+        "/api/v3/movie/lookup/imdb",
+        "/api/v3/series/lookup",
+        "/api/v1/artist/lookup",
+        "/api/v1/album/lookup",
+        "/api/v1/author/lookup",
+        "/api/v1/book/lookup",
+    }
+)
+
+SEARCH_ENDPOINTS = frozenset({"/api/v1/search", "/api/v3/release"})
+
+# Services whose SEARCH_ENDPOINTS are release searches. Seerr, Lidarr and
+# Chaptarr answer metadata searches on ``/api/v1/search``.
+SEARCH_SERVICES = frozenset({"prowlarr", "radarr", "sonarr"})
+
+BACKENDS = ("memory", "disk", "redis")
+
+# JSON values shorter than this are stored uncompressed.
+COMPRESS_MIN_BYTES = 256
+
+CACHE_REQUESTS = (
+    Counter(
+        "arr_mcp_cache_requests_total",
+        "Response cache lookups and stores by namespace and result.",
+        ("namespace", "result"),
+    )
+    if Counter is not None
+    else None
+)
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "arr_cache_bypass", default=False
+)
+
+
+@contextlib.contextmanager
+def bypass_cache(enabled: bool = True) -> Iterator[None]:
+    """Force fresh responses for requests made in this context; results are still stored."""
+    token = _bypass.set(bool(enabled))
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def normalize_term(value: Any) -> Any:
+    """Collapse case, whitespace and list order so equivalent queries share a key."""
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, (list, tuple)):
+        return sorted((normalize_term(v) for v in value), key=str)
+    return value
+
+
+def cache_key(base_url: str, endpoint: str, params: dict[str, Any] | None) -> str:
+    """Build the cache key for a GET against ``endpoint`` on one instance."""
+    normalized = {k: normalize_term(v) for k, v in (params or {}).items()}
+    query = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return f"{base_url.rstrip('/')}{endpoint}?{query}"
+
+
+def encode(value: Any) -> bytes:
+    """
+    Serialize ``value`` as compact JSON, zlib-compressed when that pays off.
+
+    Compressed blobs start with the zlib header byte ``x``, which JSON text
+    never does, so :func:`decode` tells the two apart without a marker and
+    still decodes values written by earlier versions (always compressed).
+    """
+    raw = json.dumps(value, separators=(",", ":")).encode()
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            return packed
+    return raw
+
+
+def decode(blob: bytes) -> Any:
+    """Inverse of :func:`encode`."""
+    if blob[:1] == b"x":
+        blob = zlib.decompress(blob)
+    return json.loads(blob)
+
+
+def _glob_escape(text: str) -> str:
+    return "".join("\\" + c if c in "*?[]\\" else c for c in text)
+
+
+class DiskCache:
+    """
+    SQLite-backed key/value store with per-entry expiry and LRU eviction.
+
+    Values are stored with :func:`encode`. The database runs in WAL mode so
+    several processes (workers, or containers sharing a volume) can use one
+    file. Once more than ``max_entries`` rows or ``max_bytes`` of values are
+    stored, the least recently read ones are evicted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 86400.0,
+        max_entries: int = 10000,
+        max_bytes: int = 268435456,
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str): Path of the SQLite file; parent directories are created.
+            ttl (float): Default seconds an entry stays fresh.
+            max_entries (int): Number of entries kept before LRU eviction.
+            max_bytes (int): Total size of stored values kept before LRU eviction.
+        """
+        path = os.path.expanduser(path)
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "expires REAL NOT NULL, accessed REAL NOT NULL, "
+            "size INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "size" not in columns:
+            self._conn.execute(
+                "ALTER TABLE entries ADD COLUMN size INTEGER NOT NULL DEFAULT 0"
+            )
+            self._conn.execute("UPDATE entries SET size = length(value)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+        )
+
+    def get(self, key: str) -> Any | None:
+        """Return the fresh value stored under ``key``, or ``None``."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+        return decode(row[0])
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds (default: the cache TTL)."""
+        blob = encode(value)
+        now = time.time()
+        expires = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires, accessed, size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, blob, expires, now, len(blob)),
+            )
+            self.sets += 1
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM entries WHERE expires < ?", (now,))
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed"
+        ):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count, total = count - 1, total - size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self, prefix: str = "") -> None:
+        """Remove every entry, or those whose key starts with ``prefix``."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM entries WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss/eviction counters, stored entries and their size."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            "backend": "disk",
+            "path": self.path,
+            "entries": count,
+            "bytes": total,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "evictions": self.evictions,
+        }
+
+
+class MemoryCache:
+    """
+    In-process key/value store with per-entry expiry and LRU eviction.
+
+    Same interface as :class:`DiskCache`, for results too short-lived to be
+    worth persisting. Values are stored encoded, like on disk, so every
+    ``get`` returns a fresh copy that callers may mutate.
+    """
+
+    def __init__(self, ttl: float = 120.0, max_entries: int = 1000):
+        """
+        Args:
+            ttl (float): Default seconds an entry stays fresh.
+            max_entries (int): Number of entries kept before LRU eviction.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        """Return the fresh value stored under ``key``, or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return decode(entry[1])
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds (default: the cache TTL)."""
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        blob = encode(value)
+        with self._lock:
+            self._entries[key] = (expires, blob)
+            self._entries.move_to_end(key)
+            self.sets += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, prefix: str = "") -> None:
+        """Remove every entry, or those whose key starts with ``prefix``."""
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss/eviction counters and the number of stored entries."""
+        with self._lock:
+            count = len(self._entries)
+        return {
+            "backend": "memory",
+            "entries": count,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "evictions": self.evictions,
+        }
+
+
+class RedisError(Exception):
+    """An error reply from a Redis-protocol server."""
+
+
+class RedisCache:
+    """
+    Key/value store on a Redis-protocol server (Redis, Valkey, KeyDB, ...).
+
+    Lets replicas of the MCP container share one cache. Speaks RESP directly
+    over a socket, one connection per thread, so no client library is
+    needed; only ``GET``, ``SET ... PX``, ``DEL`` and ``SCAN`` are used.
+    Values are stored with :func:`encode` under ``prefix`` and expire on the
+    server, which also does the eviction (set ``maxmemory-policy`` to an
+    ``allkeys-lru`` variant). When the server cannot be reached, commands fail
+    at once for ``cooldown`` seconds instead of each waiting on a connect
+    timeout, so an outage reads as a cache miss rather than a slow request.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        ttl: float = 86400.0,
+        prefix: str = "arr-mcp:",
+        timeout: float = 5.0,
+        connect_timeout: float = 0.5,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            url (str): ``redis://[user:password@]host[:port][/db]``, or
+                ``rediss://`` for TLS.
+            ttl (float): Default seconds an entry stays fresh.
+            prefix (str): Prepended to every key.
+            timeout (float): Socket timeout in seconds once connected.
+            connect_timeout (float): Seconds to wait for a connection.
+            cooldown (float): Seconds commands fail fast after the server
+                could not be reached.
+            clock (Callable): Monotonic time source.
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("redis", "rediss"):
+            raise ValueError(
+                f"Unsupported cache URL '{url}'; use redis:// or rediss://"
+            )
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.username = urllib.parse.unquote(parts.username or "") or None
+        self.password = urllib.parse.unquote(parts.password or "") or None
+        self.db = int(parts.path.strip("/") or 0)
+        self.tls = parts.scheme == "rediss"
+        self.url = f"{parts.scheme}://{self.host}:{self.port}/{self.db}"
+        self.ttl = ttl
+        self.prefix = prefix
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.cooldown = cooldown
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.failures = 0
+        self._clock = clock
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connect(self) -> Any:
+        sock = socket.create_connection((self.host, self.port), self.connect_timeout)
+        sock.settimeout(self.timeout)
+        if self.tls:
+            context = ssl.create_default_context()
+            sock = context.wrap_socket(sock, server_hostname=self.host)
+        conn = (sock, sock.makefile("rb"))
+        try:
+            if self.password:
+                auth = (
+                    [self.username, self.password] if self.username else [self.password]
+                )
+                self._roundtrip(conn, "AUTH", *auth)
+            if self.db:
+                self._roundtrip(conn, "SELECT", self.db)
+        except BaseException:
+            sock.close()
+            raise
+        return conn
+
+    @staticmethod
+    def _roundtrip(conn: Any, *args: Any) -> Any:
+        sock, reader = conn
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        sock.sendall(b"".join(out))
+        return RedisCache._reply(reader)
+
+    @staticmethod
+    def _reply(reader: Any) -> Any:
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by the cache server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise RedisError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            size = int(body)
+            return None if size < 0 else reader.read(size + 2)[:-2]
+        if kind == b"*":
+            size = int(body)
+            return (
+                None if size < 0 else [RedisCache._reply(reader) for _ in range(size)]
+            )
+        raise ConnectionError(f"Unexpected reply from the cache server: {line!r}")
+
+    def _close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            conn[0].close()
+
+    def _command(self, *args: Any) -> Any:
+        """
+        Send one command on this thread's connection.
+
+        A connection that dropped since its last use is reopened once. When
+        the server cannot be reached, every command fails immediately for
+        ``cooldown`` seconds.
+
+        Raises:
+            ConnectionError: The server is unreachable or cooling down.
+            RedisError: The server replied with an error.
+        """
+        if self._clock() < self._down_until:
+            raise ConnectionError(f"Cache server {self.url} is unavailable")
+        conn = getattr(self._local, "conn", None)
+        try:
+            if conn is not None:
+                try:
+                    return self._roundtrip(conn, *args)
+                except (OSError, ConnectionError):
+                    self._close()
+            conn = self._local.conn = self._connect()
+            return self._roundtrip(conn, *args)
+        except (OSError, ConnectionError):
+            self._close()
+            with self._lock:
+                self.failures += 1
+                self._down_until = self._clock() + self.cooldown
+            raise
+
+    def get(self, key: str) -> Any | None:
+        """Return the fresh value stored under ``key``, or ``None``."""
+        blob = self._command("GET", self.prefix + key)
+        with self._lock:
+            if blob is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if blob is None else decode(blob)
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds (default: the cache TTL)."""
+        ms = int((self.ttl if ttl is None else ttl) * 1000)
+        if ms <= 0:
+            self.delete(key)
+            return
+        self._command("SET", self.prefix + key, encode(value), "PX", ms)
+        with self._lock:
+            self.sets += 1
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+        self._command("DEL", self.prefix + key)
+
+    def clear(self, prefix: str = "") -> None:
+        """Remove every entry under this cache's prefix, or under ``prefix`` within it."""
+        pattern = _glob_escape(self.prefix + prefix) + "*"
+        cursor = "0"
+        while True:
+            cursor, keys = self._command("SCAN", cursor, "MATCH", pattern, "COUNT", 500)
+            if keys:
+                self._command("DEL", *keys)
+            cursor = cursor.decode() if isinstance(cursor, bytes) else str(cursor)
+            if cursor == "0":
+                return
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters of this process and the server address."""
+        with self._lock:
+            return {
+                "backend": "redis",
+                "url": self.url,
+                "prefix": self.prefix,
+                "hits": self.hits,
+                "misses": self.misses,
+                "sets": self.sets,
+                "failures": self.failures,
+                "available": self._clock() >= self._down_until,
+            }
+
+
+class Namespace:
+    """
+    One namespace of a shared store, with its own TTL and counters.
+
+    Lookups, release searches and Seerr details share one backend but keep
+    different lifetimes; each gets a ``Namespace`` that prefixes its keys
+    with ``"<name>:"``, applies its TTL and counts its own hits and misses
+    (also exported as ``arr_mcp_cache_requests_total`` when
+    ``prometheus_client`` is installed).
+    """
+
+    def __init__(self, store: Any, name: str, ttl: float | None = None):
+        """
+        Args:
+            store (Any): :class:`MemoryCache`, :class:`DiskCache` or :class:`RedisCache`.
+            name (str): Namespace name, used as the key prefix and metric label.
+            ttl (Optional[float]): Entry lifetime; ``None`` uses the store default.
+        """
+        self.store = store
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _count(self, result: str) -> None:
+        with self._lock:
+            setattr(self, result, getattr(self, result) + 1)
+        if CACHE_REQUESTS is not None:
+            CACHE_REQUESTS.labels(namespace=self.name, result=result).inc()
+
+    def get(self, key: str) -> Any | None:
+        """Return the fresh value stored under ``key`` in this namespace, or ``None``.
+
+        A store failure (server down, locked database) counts as an error and
+        reads as a miss.
+        """
+        with tracing.span("cache get", {"arr.cache.namespace": self.name}) as span:
+            try:
+                value = self.store.get(f"{self.name}:{key}")
+            except Exception:
+                self._count("errors")
+                span.set_attribute("arr.cache.result", "error")
+                return None
+            self._count("misses" if value is None else "hits")
+            span.set_attribute("arr.cache.result", "miss" if value is None else "hit")
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store ``value`` for ``ttl`` seconds (default: the namespace TTL).
+
+        Store failures, including unserializable values, are counted and dropped.
+        """
+        with tracing.span("cache set", {"arr.cache.namespace": self.name}) as span:
+            try:
+                self.store.set(
+                    f"{self.name}:{key}", value, self.ttl if ttl is None else ttl
+                )
+            except Exception:
+                self._count("errors")
+                span.set_attribute("arr.cache.result", "error")
+                return
+        self._count("sets")
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` from this namespace if present."""
+        self.store.delete(f"{self.name}:{key}")
+
+    def clear(self) -> None:
+        """Remove every entry of this namespace."""
+        self.store.clear(f"{self.name}:")
+
+    def stats(self) -> dict[str, Any]:
+        """Return this namespace's TTL and hit/miss/set/error counters."""
+        with self._lock:
+            return {
+                "ttl": self.store.ttl if self.ttl is None else self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "sets": self.sets,
+                "errors": self.errors,
+            }
+
+
+def open_store(
+    backend: str,
+    path: str,
+    url: str,
+    ttl: float = 86400.0,
+    max_entries: int = 10000,
+    max_bytes: int = 268435456,
+) -> MemoryCache | DiskCache | RedisCache:
+    """
+    Open the cache store selected by ``backend``.
+
+    Args:
+        backend (str): ``memory``, ``disk`` or ``redis``.
+        path (str): SQLite file of the ``disk`` backend.
+        url (str): Server URL of the ``redis`` backend.
+        ttl (float): Default entry lifetime.
+        max_entries (int): Entries kept by the ``memory`` and ``disk`` backends.
+        max_bytes (int): Value bytes kept by the ``disk`` backend.
+    """
+    backend = backend.strip().lower()
+    if backend == "memory":
+        return MemoryCache(ttl=ttl, max_entries=max_entries)
+    if backend == "disk":
+        return DiskCache(path, ttl=ttl, max_entries=max_entries, max_bytes=max_bytes)
+    if backend == "redis":
+        return RedisCache(url, ttl=ttl)
+    raise ValueError(
+        f"Unknown cache backend '{backend}'; expected one of {', '.join(BACKENDS)}"
+    )
+
+
+class ResponseCache:
+    """
+    Decides which client GETs are cacheable and routes them to a store.
+
+    Only endpoints listed in ``endpoints`` are cached; every other request
+    passes straight through. Store failures (an unserializable response, a
+    locked database) never fail the request itself.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        endpoints: frozenset[str] = LOOKUP_ENDPOINTS,
+        ttl: float | None = None,
+    ):
+        """
+        Args:
+            store (Any): Backing store exposing ``get(key)`` and ``set(key, value, ttl)``.
+            endpoints (frozenset[str]): Endpoint paths whose GET responses are cached.
+            ttl (Optional[float]): Entry lifetime; ``None`` uses the store default.
+        """
+        self.store = store
+        self.endpoints = endpoints
+        self.ttl = ttl
+
+    def get(
+        self, base_url: str, endpoint: str, params: dict[str, Any] | None
+    ) -> Any | None:
+        """Return the cached response for a GET, or ``None`` on a miss."""
+        if endpoint not in self.endpoints or _bypass.get():
+            return None
+        try:
+            return self.store.get(cache_key(base_url, endpoint, params))
+        except Exception:
+            return None
+
+    def set(
+        self,
+        base_url: str,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        value: Any,
+    ) -> None:
+        """Store a GET response when its endpoint is cacheable."""
+        if endpoint not in self.endpoints:
+            return
+        try:
+            self.store.set(cache_key(base_url, endpoint, params), value, self.ttl)
+        except Exception:
+            pass
+
+
+class SearchCache(ResponseCache):
+    """
+    Short-lived cache for release searches with per-indexer accounting.
+
+    Each hit or miss is attributed to the indexers in the response (the
+    ``indexer`` field of each release), or to the requested ``indexerIds`` when
+    the response is empty, so the stats show which indexers' quota is saved.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        endpoints: frozenset[str] = SEARCH_ENDPOINTS,
+        ttl: float | None = None,
+    ):
+        super().__init__(store, endpoints, ttl)
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.indexers: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _indexers(params: dict[str, Any] | None, value: Any) -> set[str]:
+        names = {
+            str(release.get("indexer") or release.get("indexerId"))
+            for release in records(value)
+            if isinstance(release, dict)
+            and (release.get("indexer") or release.get("indexerId") is not None)
+        }
+        if not names:
+            ids = (params or {}).get("indexerIds") or []
+            names = {f"#{i}" for i in ids}
+        return names
+
+    def _count(self, names: set[str], field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+            for name in names:
+                counts = self.indexers.setdefault(name, {"hits": 0, "misses": 0})
+                counts[field] += 1
+
+    def get(
+        self, base_url: str, endpoint: str, params: dict[str, Any] | None
+    ) -> Any | None:
+        """Return a fresh cached search result, counting the hit per indexer."""
+        if endpoint not in self.endpoints:
+            return None
+        if _bypass.get():
+            with self._lock:
+                self.bypassed += 1
+            return None
+        value = super().get(base_url, endpoint, params)
+        if value is not None:
+            self._count(self._indexers(params, value), "hits")
+        return value
+
+    def set(
+        self,
+        base_url: str,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        value: Any,
+    ) -> None:
+        """Store a fresh search result, counting the miss that fetched it per indexer."""
+        if endpoint not in self.endpoints:
+            return
+        if not _bypass.get():
+            self._count(self._indexers(params, value), "misses")
+        super().set(base_url, endpoint, params, value)
+
+    def stats(self) -> dict[str, Any]:
+        """Return overall and per-indexer hit/miss counts."""
+        with self._lock:
+            indexers = {name: dict(c) for name, c in sorted(self.indexers.items())}
+            totals = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+            }
+        ttl = getattr(self.store, "ttl", None) if self.ttl is None else self.ttl
+        return {**totals, "ttl": ttl, "indexers": indexers}
+
+
+class CacheChain:
+    """
+    Routes client requests to the first cache that handles the endpoint.
+
+    Lets one ``client.cache`` combine the on-disk lookup cache with the
+    in-memory search cache while each keeps its own store and lifetime.
+    """
+
+    def __init__(self, *caches: ResponseCache):
+        self.caches = caches
+
+    def get(
+        self, base_url: str, endpoint: str, params: dict[str, Any] | None
+    ) -> Any | None:
+        """Return the cached response from whichever cache owns ``endpoint``."""
+        for cache in self.caches:
+            if endpoint in cache.endpoints:
+                return cache.get(base_url, endpoint, params)
+        return None
+
+    def set(
+        self,
+        base_url: str,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        value: Any,
+    ) -> None:
+        """Store a response in whichever cache owns ``endpoint``."""
+        for cache in self.caches:
+            if endpoint in cache.endpoints:
+                cache.set(base_url, endpoint, params, value)
+                return
@@ -0,0 +1,152 @@
+"""
+Aggregated waiting on *arr background commands.
+
+``post_command`` (RescanSeries, RefreshMovie, MissingEpisodeSearch, ...) only
+queues work and returns a command id. Polling ``get_command_id`` for each id
+on every tick costs commands × ticks requests; :func:`wait_for_commands`
+instead reads the whole ``get_command`` listing once per tick, resolves every
+tracked id from it, and backs off while nothing changes. A failed request is
+retried on the next tick and only reported as an error once it keeps failing;
+it never makes a command look finished.
+
+CONCEPT:ARR-009 — Command Waiter
+"""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+from arr_mcp.paging import records
+
+FINISHED_STATUSES = frozenset(
+    {"completed", "failed", "aborted", "cancelled", "orphaned"}
+)
+
+_FIELDS = ("name", "status", "result", "message", "started", "ended", "duration")
+
+
+def _summary(command: dict[str, Any]) -> dict[str, Any]:
+    return {key: command[key] for key in _FIELDS if command.get(key) is not None}
+
+
+def _is_missing(error: Exception) -> bool:
+    """Whether a failed ``get_command_id`` means the server does not know the id."""
+    return "API error: 404" in str(error)
+
+
+def wait_for_commands(
+    client: Any,
+    command_ids: int | list[int],
+    timeout: float = 300.0,
+    interval: float = 1.0,
+    max_interval: float = 15.0,
+    backoff: float = 1.5,
+    retries: int = 3,
+    on_progress: Callable[[int, int, dict[int, dict]], None] | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> dict[str, Any]:
+    """
+    Poll until every command has finished or ``timeout`` seconds have passed.
+
+    Each tick issues one ``get_command`` listing. Only ids missing from the
+    listing (already pruned by the server) are fetched with ``get_command_id``,
+    once; ids the server answers with 404 are reported as ``not_found``. Any
+    other failure, of the listing or of ``get_command_id``, is retried on the
+    next tick; after ``retries`` more failures in a row the affected ids get
+    status ``error`` and the message is listed in ``errors``. The wait between
+    ticks grows by ``backoff`` while no command changes status, up to
+    ``max_interval``, and drops back to ``interval`` on any change.
+
+    Args:
+        client (Any): Sonarr, Radarr, Lidarr, Chaptarr or Prowlarr API client.
+        command_ids (List[int]): Ids returned by ``post_command``.
+        timeout (float): Deadline in seconds.
+        interval (float): Initial seconds between ticks.
+        max_interval (float): Upper bound for the backed-off interval.
+        backoff (float): Interval multiplier applied after an idle tick.
+        retries (int): Further attempts after a failed request before giving up.
+        on_progress (Optional[Callable]): Called as ``on_progress(finished,
+            total, commands)`` after every tick.
+        sleep (Callable): Sleep function, replaceable in tests.
+
+    Returns:
+        Dict: ``done`` (all finished, none in error), per-id ``commands``
+        summaries, the ids still ``pending``, request ``errors``, ``polls``
+        issued and ``elapsed_s``.
+    """
+    if isinstance(command_ids, int):
+        command_ids = [command_ids]
+    ids = list(dict.fromkeys(int(i) for i in command_ids))
+    commands: dict[int, dict[str, Any]] = {i: {"status": "unknown"} for i in ids}
+    finished: set[int] = set()
+    # Consecutive failed requests per command id; ``None`` counts the listing.
+    failures: dict[int | None, int] = {}
+    errors: list[dict[str, Any]] = []
+    began = time.monotonic()
+    deadline = began + timeout
+    wait = interval
+    polls = 0
+
+    while True:
+        polls += 1
+        changed = False
+        try:
+            listing = {
+                c.get("id"): c
+                for c in records(client.get_command())
+                if isinstance(c, dict)
+            }
+            failures.pop(None, None)
+        except Exception as e:
+            listing = None
+            failures[None] = failures.get(None, 0) + 1
+            if failures[None] > retries:
+                errors.append({"error": f"get_command: {e}"})
+                for command_id in ids:
+                    if command_id not in finished:
+                        commands[command_id] = {"status": "error"}
+                        finished.add(command_id)
+
+        for command_id in ids:
+            if listing is None or command_id in finished:
+                continue
+            command = listing.get(command_id)
+            if command is None:
+                polls += 1
+                try:
+                    command = client.get_command_id(id=command_id)
+                    failures.pop(command_id, None)
+                except Exception as e:
+                    command = None
+                    if not _is_missing(e):
+                        failures[command_id] = failures.get(command_id, 0) + 1
+                        if failures[command_id] <= retries:
+                            continue
+                        errors.append({"id": command_id, "error": str(e)})
+                        command = {"status": "error"}
+                if not isinstance(command, dict) or "status" not in command:
+                    command = {"status": "not_found"}
+            summary = _summary(command)
+            status = str(summary.get("status", "")).lower()
+            if summary != commands[command_id]:
+                commands[command_id] = summary
+                changed = True
+            if status in FINISHED_STATUSES or status in ("not_found", "error"):
+                finished.add(command_id)
+
+        if on_progress is not None:
+            on_progress(len(finished), len(ids), commands)
+        now = time.monotonic()
+        if len(finished) == len(ids) or now >= deadline:
+            break
+        wait = interval if changed else min(wait * backoff, max_interval)
+        sleep(min(wait, deadline - now))
+
+    return {
+        "done": len(finished) == len(ids) and not errors,
+        "commands": commands,
+        "pending": [i for i in ids if i not in finished],
+        "errors": errors,
+        "polls": polls,
+        "elapsed_s": round(time.monotonic() - began, 3),
+    }
@@ -0,0 +1,58 @@
+"""
+Bounded fan-out for the blocking API clients.
+
+The clients are synchronous ``requests`` sessions, so library-level tools
+fan independent calls out over a small thread pool instead of issuing them
+one after another. Workers run in a copy of the caller's context, so context
+variables such as the cache bypass flag and the current trace span carry
+over; with tracing on, each fan-out is a span and every task records how
+long it waited for a thread.
+
+CONCEPT:ARR-006 — Bounded Fan-Out
+"""
+
+import contextvars
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from arr_mcp import tracing
+
+T = TypeVar("T")
+
+
+def bounded_map(
+    fn: Callable[[T], Any], items: Iterable[T], limit: int = 8
+) -> list[tuple[T, Any, Exception | None]]:
+    """
+    Call ``fn`` on every item with at most ``limit`` calls in flight.
+
+    Args:
+        fn (Callable): Function applied to each item.
+        items (Iterable): Inputs; consumed eagerly.
+        limit (int): Maximum concurrent calls.
+
+    Returns:
+        List[Tuple]: ``(item, result, error)`` in input order; ``error`` is the
+        exception ``fn`` raised for that item (``result`` is then ``None``).
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def run(item: T) -> tuple[T, Any, Exception | None]:
+        try:
+            return item, fn(item), None
+        except Exception as e:
+            return item, None, e
+
+    if limit <= 1 or len(items) == 1:
+        return [run(item) for item in items]
+    workers = min(limit, len(items))
+    attributes = {"arr.fan_out.items": len(items), "arr.fan_out.workers": workers}
+    with tracing.span("fan out", attributes), ThreadPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, tracing.queued(run), i)
+            for i in items
+        ]
+        return [future.result() for future in futures]
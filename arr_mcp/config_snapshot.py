@@ -0,0 +1,627 @@
+"""
+Content-addressed snapshots of every configuration resource, and restore.
+
+``get_system_backup`` lists the services' own zip backups, which are opaque
+and tied to one install. :func:`snapshot` instead fetches every
+configuration resource of every targeted instance concurrently. That covers
+each ``get_config_*`` section, tags, quality definitions and profiles,
+custom formats, indexers, download clients, import lists, notifications,
+metadata, root folders and remote path mappings. Each resource is written as
+normalized JSON (sorted keys, records ordered by id, volatile fields such as
+free space and the plaintext host API key and password dropped) into a blob
+named after its SHA-256. A snapshot is a small manifest mapping
+``service/instance`` and resource to blob hashes. A resource that did not
+change since any earlier snapshot, of any instance, is not written again.
+
+:func:`restore` fetches the current resources, hashes them the same way and
+touches only the resources whose hash differs from the snapshot. Within one,
+records are matched by label, name or path, and by id when they have none
+or were renamed. Records that changed are PUT back, missing ones are
+created, and extra ones are deleted only with ``prune``, after every other
+write. A recreated tag or custom format gets a new id, which is written into
+the records that refer to it, so restoring again finds nothing to do.
+Changes a service has no endpoint for are reported as errors. Dropped fields
+keep their current values. The services mask other passwords and API keys
+as ``********``. A PUT with the mask keeps the stored secret, but a
+recreated record needs its secrets entered again.
+
+CONCEPT:ARR-027 — Config Snapshot
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from arr_mcp.concurrency import bounded_map
+from arr_mcp.config_sync import DELETE_OPS, Change, diff_paths
+from arr_mcp.paging import records
+
+# Services with configuration resources to snapshot.
+SERVICES = ("sonarr", "radarr", "lidarr", "chaptarr", "prowlarr")
+
+# List resources in restore order: what is referred to before what refers to it.
+LIST_RESOURCES = (
+    "tag",
+    "qualitydefinition",
+    "customformat",
+    "qualityprofile",
+    "languageprofile",
+    "metadataprofile",
+    "appprofile",
+    "delayprofile",
+    "releaseprofile",
+    "autotagging",
+    "rootfolder",
+    "remotepathmapping",
+    "indexerproxy",
+    "indexer",
+    "downloadclient",
+    "applications",
+    "importlist",
+    "importlistexclusion",
+    "notification",
+    "metadata",
+)
+
+# Fields left out of snapshots: they change without anyone editing the
+# configuration, or are secrets the services return unmasked.
+DROPPED_FIELDS = {
+    "rootfolder": ("accessible", "freeSpace", "totalSpace", "unmappedFolders"),
+    "config_host": ("apiKey", "password", "passwordConfirmation"),
+}
+
+# Resources whose ids other records hold: tags in ``tags`` lists, custom
+# formats in quality profile ``formatItems``.
+REFERENCED = ("tag", "customformat")
+
+# Fields that identify a record even after it was deleted and created again.
+_NATURAL_KEYS = ("label", "name", "path")
+
+_CONFIG_METHOD = re.compile(r"get_(config_[a-z]+)")
+_SNAPSHOT_ID = re.compile(r"[\w.-]+")
+
+
+def _takes_no_arguments(method: Any) -> bool:
+    try:
+        parameters = inspect.signature(method).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return all(p.default is not p.empty for p in parameters)
+
+
+def resources_of(client: Any) -> list[str]:
+    """
+    The configuration resources a client can read, in restore order.
+
+    Args:
+        client (Any): A service ``Api`` client.
+
+    Returns:
+        List[str]: Resource names such as ``config_naming`` or ``customformat``;
+        ``get_<name>`` reads each one.
+    """
+    configs = sorted(
+        match.group(1)
+        for name in dir(type(client))
+        if (match := _CONFIG_METHOD.fullmatch(name))
+        and _takes_no_arguments(getattr(client, name))
+    )
+    lists = [
+        name
+        for name in LIST_RESOURCES
+        if hasattr(type(client), f"get_{name}")
+        and _takes_no_arguments(getattr(client, f"get_{name}"))
+    ]
+    return configs + lists
+
+
+def normalize(resource: str, response: Any) -> Any:
+    """
+    A resource as it is stored: records ordered by id, :data:`DROPPED_FIELDS` left out.
+
+    Args:
+        resource (str): Resource name, e.g. ``rootfolder``.
+        response (Any): The client response.
+
+    Returns:
+        Any: A dict for ``config_*`` sections, otherwise a list of records.
+    """
+    dropped = DROPPED_FIELDS.get(resource, ())
+    if resource.startswith("config_"):
+        return {k: v for k, v in (response or {}).items() if k not in dropped}
+    items = [
+        {k: v for k, v in item.items() if k not in dropped}
+        for item in records(response)
+        if isinstance(item, dict)
+    ]
+    return sorted(items, key=lambda item: (item.get("id") is None, item.get("id", 0)))
+
+
+def encode(value: Any) -> bytes:
+    """Canonical JSON bytes of a normalized resource; equal content, equal bytes."""
+    text = json.dumps(value, sort_keys=True, indent=2, ensure_ascii=False)
+    return (text + "\n").encode("utf-8")
+
+
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class SnapshotStore:
+    """Blobs under ``<root>/blobs/ab/<sha256>.json``, manifests under ``<root>/snapshots``."""
+
+    def __init__(self, root: str):
+        self.root = os.path.expanduser(root)
+
+    def blob_path(self, key: str) -> str:
+        return os.path.join(self.root, "blobs", key[:2], f"{key}.json")
+
+    def manifest_path(self, snapshot_id: str) -> str:
+        if not _SNAPSHOT_ID.fullmatch(snapshot_id):
+            raise ValueError(
+                f"Snapshot name '{snapshot_id}' may only hold letters, digits, '.', '_' and '-'"
+            )
+        return os.path.join(self.root, "snapshots", f"{snapshot_id}.json")
+
+    def put(self, data: bytes) -> tuple[str, bool]:
+        """Store a blob unless it is already there; returns its hash and whether it was written."""
+        key = digest(data)
+        path = self.blob_path(key)
+        if os.path.exists(path):
+            return key, False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{os.getpid()}.part"
+        with open(partial, "wb") as fh:
+            fh.write(data)
+        os.replace(partial, path)
+        return key, True
+
+    def get(self, key: str) -> Any:
+        with open(self.blob_path(key), encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def save_manifest(self, manifest: dict[str, Any]) -> str:
+        path = self.manifest_path(manifest["id"])
+        if os.path.exists(path):
+            raise ValueError(f"Snapshot '{manifest['id']}' already exists")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.part", "wb") as fh:
+            fh.write(encode(manifest))
+        os.replace(f"{path}.part", path)
+        return path
+
+    def load_manifest(self, snapshot_id: str) -> dict[str, Any]:
+        path = self.manifest_path(snapshot_id)
+        if not os.path.exists(path):
+            raise ValueError(f"No snapshot '{snapshot_id}' under {self.root}")
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def manifests(self) -> list[dict[str, Any]]:
+        directory = os.path.join(self.root, "snapshots")
+        names = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+        return [
+            self.load_manifest(name[: -len(".json")])
+            for name in names
+            if name.endswith(".json")
+        ]
+
+
+def _fetch(
+    clients: dict[tuple[str, str], Any],
+    resources: list[str] | None,
+    concurrency: int,
+) -> tuple[dict[tuple[str, str, str], Any], list[dict[str, Any]]]:
+    """Read every resource of every client concurrently; responses come back as-is."""
+    jobs = [
+        (service, instance, resource)
+        for (service, instance), client in clients.items()
+        for resource in resources_of(client)
+        if resources is None or resource in resources
+    ]
+    outcomes = bounded_map(
+        lambda job: getattr(clients[job[:2]], f"get_{job[2]}")(), jobs, concurrency
+    )
+    fetched, errors = {}, []
+    for (service, instance, resource), result, error in outcomes:
+        if error is None:
+            fetched[(service, instance, resource)] = result
+        else:
+            errors.append(
+                {
+                    "service": service,
+                    "instance": instance,
+                    "resource": resource,
+                    "error": str(error),
+                }
+            )
+    return fetched, errors
+
+
+def snapshot(
+    root: str,
+    clients: dict[tuple[str, str], Any],
+    name: str | None = None,
+    resources: list[str] | None = None,
+    concurrency: int = 8,
+) -> dict[str, Any]:
+    """
+    Snapshot the configuration of every instance in ``clients``.
+
+    Args:
+        root (str): Snapshot store directory.
+        clients (Dict[Tuple[str, str], Any]): API client per ``(service, instance)``.
+        name (Optional[str]): Snapshot id; a UTC timestamp by default.
+        resources (Optional[List[str]]): Only these resources (default: all).
+        concurrency (int): Requests in flight at once.
+
+    Returns:
+        Dict: Snapshot ``id`` and manifest ``path``, how many ``resources``
+        were captured, blobs ``written`` and ``reused``, ``bytes_written``
+        and per-resource fetch ``errors``.
+    """
+    store = SnapshotStore(root)
+    created = datetime.now(timezone.utc)
+    snapshot_id = name or created.strftime("%Y%m%dT%H%M%S%fZ")
+    if os.path.exists(store.manifest_path(snapshot_id)):
+        raise ValueError(f"Snapshot '{snapshot_id}' already exists")
+    fetched, errors = _fetch(clients, resources, concurrency)
+    manifest: dict[str, Any] = {
+        "id": snapshot_id,
+        "created": created.isoformat(),
+        "instances": {},
+    }
+    written = reused = size = 0
+    for (service, instance, resource), response in sorted(fetched.items()):
+        data = encode(normalize(resource, response))
+        key, new = store.put(data)
+        written, reused = written + new, reused + (not new)
+        size += len(data) if new else 0
+        entries = manifest["instances"].setdefault(f"{service}/{instance}", {})
+        entries[resource] = key
+    path = store.save_manifest(manifest)
+    return {
+        "id": snapshot_id,
+        "path": path,
+        "resources": len(fetched),
+        "written": written,
+        "reused": reused,
+        "bytes_written": size,
+        "errors": errors,
+    }
+
+
+def list_snapshots(root: str) -> list[dict[str, Any]]:
+    """Snapshots in the store, oldest first, with the instances each covers."""
+    return [
+        {
+            "id": manifest["id"],
+            "created": manifest["created"],
+            "instances": {
+                target: len(entries)
+                for target, entries in manifest["instances"].items()
+            },
+        }
+        for manifest in sorted(
+            SnapshotStore(root).manifests(), key=lambda m: m["created"]
+        )
+    ]
+
+
+def _record_name(item: dict[str, Any]) -> str:
+    for key in ("name", "label", "path", "title"):
+        if item.get(key):
+            return str(item[key])
+    return f"#{item.get('id')}"
+
+
+def _natural_key(item: dict[str, Any]) -> tuple[str, str] | None:
+    for key in _NATURAL_KEYS:
+        if item.get(key) not in (None, ""):
+            return key, str(item[key]).strip().lower()
+    return None
+
+
+@dataclass(frozen=True)
+class Recreated:
+    """Id of a tag or custom format that the same restore creates again."""
+
+    resource: str
+    id: int
+
+    def __str__(self) -> str:
+        return f"<recreated {self.resource} {self.id}>"
+
+
+class InstanceRestore:
+    """One instance being restored: where snapshot ids of referenced records went."""
+
+    def __init__(self, service: str, instance: str, client: Any, prune: bool):
+        self.service = service
+        self.instance = instance
+        self.client = client
+        self.prune = prune
+        # Snapshot id -> current id, or a Recreated until the record exists.
+        self.ids: dict[str, dict[Any, Any]] = {r: {} for r in REFERENCED}
+        self.recreates: dict[int, Recreated] = {}
+        self.new_ids: dict[Recreated, int] = {}
+
+
+def _match(
+    saved: list[dict[str, Any]], current: list[dict[str, Any]]
+) -> tuple[list[tuple[dict[str, Any], dict[str, Any] | None]], list[dict[str, Any]]]:
+    """
+    Pair snapshot records with current ones.
+
+    By label, name or path first, so a record deleted and created again is
+    found under its new id; by id for records without one, or renamed since
+    the snapshot.
+
+    Returns:
+        Tuple: ``(saved, current or None)`` pairs, and the current records
+        left unpaired.
+    """
+    by_key: dict[tuple[str, str], dict[str, Any]] = {}
+    for item in current:
+        key = _natural_key(item)
+        if key is not None:
+            by_key.setdefault(key, item)
+    by_id = {item.get("id"): item for item in current}
+    saved_keys = {_natural_key(item) for item in saved} - {None}
+    pairs, taken = [], set()
+    for item in saved:
+        key = _natural_key(item)
+        match = by_key.get(key) if key is not None else None
+        if match is None:
+            candidate = by_id.get(item.get("id"))
+            if candidate is not None and _natural_key(candidate) not in saved_keys:
+                match = candidate
+        if match is not None and id(match) in taken:
+            match = None
+        if match is not None:
+            taken.add(id(match))
+        pairs.append((item, match))
+    return pairs, [item for item in current if id(item) not in taken]
+
+
+def _remap(item: dict[str, Any], state: InstanceRestore) -> dict[str, Any]:
+    """A snapshot record with its tag and custom format ids translated to current ones."""
+    item = dict(item)
+    tags, formats = state.ids["tag"], state.ids["customformat"]
+    if isinstance(item.get("tags"), list):
+        item["tags"] = [tags.get(t, t) for t in item["tags"]]
+    if isinstance(item.get("formatItems"), list):
+        item["formatItems"] = [
+            {**f, "format": formats.get(f.get("format"), f.get("format"))}
+            if isinstance(f, dict)
+            else f
+            for f in item["formatItems"]
+        ]
+    return item
+
+
+def _plan(
+    state: InstanceRestore, resource: str, saved: Any, response: Any
+) -> tuple[list[Change], list[dict[str, Any]]]:
+    """Changes taking one differing resource back to its snapshot, and those the service cannot make."""
+    change = functools.partial(Change, state.service, state.instance, resource)
+    current = normalize(resource, response)
+    if resource.startswith("config_"):
+        paths = diff_paths(current, saved)
+        if not paths:
+            return [], []
+        return [
+            change(
+                "update",
+                resource,
+                id=saved.get("id"),
+                fields=paths,
+                payload={**response, **saved},
+            )
+        ], []
+    raw = {item.get("id"): item for item in records(response)}
+    pairs, extra = _match(saved, current)
+    updates, creates = [], []
+    for item, match in pairs:
+        wanted = _remap(item, state)
+        if match is None:
+            creates.append(wanted)
+            continue
+        if resource in state.ids:
+            state.ids[resource][item.get("id")] = match.get("id")
+        wanted["id"] = match.get("id")
+        if wanted != match:
+            updates.append(
+                change(
+                    "update",
+                    _record_name(wanted),
+                    id=match.get("id"),
+                    fields=diff_paths(match, wanted),
+                    payload={**raw[match.get("id")], **wanted},
+                )
+            )
+    if resource == "qualitydefinition":
+        # Quality definitions are fixed; the update endpoint takes them all at once.
+        if not updates:
+            return [], []
+        return [
+            change(
+                "bulk_update",
+                ", ".join(u.name for u in updates),
+                payload=[u.payload for u in updates],
+                ids=[u.id for u in updates if u.id is not None],
+            )
+        ], []
+    changes = list(updates)
+    for wanted in creates:
+        saved_id = wanted.pop("id", None)
+        create = change("create", _record_name(wanted), payload=wanted)
+        if resource in state.ids and saved_id is not None:
+            recreated = Recreated(resource, saved_id)
+            state.ids[resource][saved_id] = recreated
+            state.recreates[id(create)] = recreated
+        changes.append(create)
+    if state.prune:
+        changes += [
+            change("delete", _record_name(item), id=item.get("id")) for item in extra
+        ]
+    methods = {
+        "create": f"post_{resource}",
+        "update": f"put_{resource}_id",
+        "delete": f"delete_{resource}_id",
+    }
+    errors = [
+        {
+            **c.describe(),
+            "error": f"{state.service} has no {methods[c.op]}; restore it by hand",
+        }
+        for c in changes
+        if not hasattr(state.client, methods[c.op])
+    ]
+    return [c for c in changes if hasattr(state.client, methods[c.op])], errors
+
+
+def _materialize(value: Any, state: InstanceRestore) -> Any:
+    """Replace :class:`Recreated` ids with the ids the services gave the new records."""
+    if isinstance(value, Recreated):
+        if value not in state.new_ids:
+            raise ValueError(f"{value} was not created, so it cannot be referenced")
+        return state.new_ids[value]
+    if isinstance(value, dict):
+        return {k: _materialize(v, state) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_materialize(v, state) for v in value]
+    return value
+
+
+def _apply(change: Change, state: InstanceRestore) -> Any:
+    resource, client = change.section, state.client
+    payload = _materialize(change.payload, state)
+    if change.op == "bulk_update":
+        return client.put_qualitydefinition_update(data=payload)
+    if change.op == "create":
+        created = getattr(client, f"post_{resource}")(data=payload)
+        recreated = state.recreates.get(id(change))
+        if recreated is not None and isinstance(created, dict):
+            if isinstance(created.get("id"), int):
+                state.new_ids[recreated] = created["id"]
+        return created
+    if change.op == "delete":
+        return getattr(client, f"delete_{resource}_id")(id=change.id)
+    return getattr(client, f"put_{resource}_id")(id=change.id, data=payload)
+
+
+def restore(
+    root: str,
+    snapshot_id: str,
+    clients: dict[tuple[str, str], Any],
+    resources: list[str] | None = None,
+    dry_run: bool = True,
+    prune: bool = False,
+    concurrency: int = 8,
+) -> dict[str, Any]:
+    """
+    Take every instance in ``clients`` back to a snapshot, touching only what differs.
+
+    Args:
+        root (str): Snapshot store directory.
+        snapshot_id (str): Snapshot to restore.
+        clients (Dict[Tuple[str, str], Any]): API client per ``(service, instance)``;
+            instances missing from the snapshot are skipped.
+        resources (Optional[List[str]]): Only these resources (default: all).
+        dry_run (bool): Return the plan without writing.
+        prune (bool): Delete records created since the snapshot.
+        concurrency (int): Requests in flight at once.
+
+    Returns:
+        Dict: ``differing`` resources, the ``changes`` planned (and applied
+        unless ``dry_run``), ``unchanged`` resource count, ``requests``
+        (``reads``, and ``writes`` made) and ``errors``, including changes
+        the service has no endpoint for.
+    """
+    store = SnapshotStore(root)
+    manifest = store.load_manifest(snapshot_id)
+    targets = {
+        key: client
+        for key, client in clients.items()
+        if "/".join(key) in manifest["instances"]
+    }
+    saved = {
+        resource
+        for (service, instance) in targets
+        for resource in manifest["instances"][f"{service}/{instance}"]
+    }
+    wanted = {r for r in saved if resources is None or r in resources}
+    if any(r in LIST_RESOURCES and r not in REFERENCED for r in wanted):
+        # Read to map the ids that the requested records refer to.
+        wanted |= saved & set(REFERENCED)
+    fetched, errors = _fetch(targets, sorted(wanted), concurrency)
+    reads = len(fetched) + len(errors)
+
+    differing, changes = [], []
+    unchanged = 0
+    owner: dict[int, InstanceRestore] = {}
+    for (service, instance), client in targets.items():
+        state = InstanceRestore(service, instance, client, prune)
+        saved_keys = manifest["instances"][f"{service}/{instance}"]
+        for resource in resources_of(client):
+            key = saved_keys.get(resource)
+            current = fetched.get((service, instance, resource))
+            if key is None or current is None:
+                continue
+            requested = resources is None or resource in resources
+            if digest(encode(normalize(resource, current))) == key:
+                unchanged += requested
+                continue
+            planned, failed = _plan(state, resource, store.get(key), current)
+            if not requested:
+                continue
+            if not planned and not failed:
+                # Only ids differ, from records recreated by an earlier restore.
+                unchanged += 1
+                continue
+            differing.append(f"{service}/{instance}/{resource}")
+            changes += planned
+            errors += failed
+            owner.update((id(c), state) for c in planned)
+
+    if not dry_run:
+        # Phases in restore order, deletes last in reverse order; instances and
+        # records within a phase run concurrently.
+        order = sorted(r for r in wanted if r.startswith("config_")) + list(
+            LIST_RESOURCES
+        )
+        phases = [
+            [c for c in changes if c.section == r and c.op not in DELETE_OPS]
+            for r in order
+        ] + [
+            [c for c in changes if c.section == r and c.op in DELETE_OPS]
+            for r in reversed(order)
+        ]
+        for phase in phases:
+            if not phase:
+                continue
+            outcomes = bounded_map(
+                lambda c: _apply(c, owner[id(c)]), phase, concurrency
+            )
+            errors += [
+                {**change.describe(), "error": str(error)}
+                for change, _, error in outcomes
+                if error is not None
+            ]
+
+    return {
+        "snapshot": snapshot_id,
+        "dry_run": dry_run,
+        "differing": differing,
+        "unchanged": unchanged,
+        "changes": [change.describe() for change in changes],
+        "requests": {"reads": reads, "writes": 0 if dry_run else len(changes)},
+        "errors": errors,
+    }
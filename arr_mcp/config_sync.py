@@ -0,0 +1,636 @@
+"""
+Declarative desired-state sync of service configuration.
+
+Quality profiles, custom formats, release and delay profiles, tags, naming
+and notifications drift apart when several Sonarr/Radarr instances are
+edited by hand. :func:`sync` takes the desired state, a document with a
+section per service, and fetches the current state of every instance
+concurrently. It lays the desired values over the current resources and
+writes only the resources that come out different:
+
+- a POST for a new resource;
+- a PUT of the merged resource for a changed one;
+- a DELETE for a pruned one;
+- one ``put_customformat_bulk`` or ``delete_customformat_bulk`` call where
+  several custom formats change the same way.
+
+With ``dry_run`` it stops at the plan.
+
+Desired values are partial: keys left out keep their current value, and
+lists of named objects (custom format specifications) are matched by name.
+Resources are identified by name, tags by label and delay profiles by their
+tag set. Tags may be given by label, and are created when missing. Custom
+format scores in quality profiles may be given by format name; formats left
+out keep their score. New quality profiles and notifications start from the
+service's schema (a notification names its ``implementation``, e.g.
+``Discord``) and new release profiles from empty term lists, so the desired
+state only lists what differs. Deletes run after every create and update,
+dependents first, so nothing in use is deleted. The document is YAML
+(``pip install arr-mcp[sync]``) or JSON.
+
+CONCEPT:ARR-026 — Config Sync
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+from arr_mcp.concurrency import bounded_map
+from arr_mcp.paging import records
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - exercised only without PyYAML
+    yaml = None
+
+
+@dataclass(frozen=True)
+class ResourceKind:
+    """One kind of configuration resource and the client methods that manage it.
+
+    The client lists it with ``get_<path>``, creates with ``post_<path>``,
+    updates with ``put_<path>_id`` and deletes with ``delete_<path>_id``.
+    With ``schema``, new resources start from ``get_<path>_schema``.
+    """
+
+    section: str
+    path: str
+    key: str = "name"
+    singleton: bool = False
+    uses_tags: bool = False
+    bulk: bool = False
+    schema: bool = False
+
+
+# In the order they are created and updated: tags and formats before what
+# refers to them. Deletes run afterwards in the reverse order.
+KINDS = (
+    ResourceKind("tags", "tag", key="label"),
+    ResourceKind("custom_formats", "customformat", bulk=True),
+    ResourceKind("quality_profiles", "qualityprofile", schema=True),
+    ResourceKind("release_profiles", "releaseprofile", uses_tags=True),
+    ResourceKind("delay_profiles", "delayprofile", key="tags", uses_tags=True),
+    ResourceKind("notifications", "notification", uses_tags=True, schema=True),
+    ResourceKind("naming", "config_naming", singleton=True),
+)
+KINDS_BY_SECTION = {kind.section: kind for kind in KINDS}
+OPTIONS = ("instances", "prune")
+
+# Sonarr and Radarr refuse to delete the default delay profile.
+DEFAULT_DELAY_PROFILE_ID = 1
+
+# Full payloads for new resources of kinds without a schema endpoint.
+CREATE_DEFAULTS: dict[str, dict[str, Any]] = {
+    "release_profiles": {
+        "enabled": True,
+        "required": [],
+        "ignored": [],
+        "indexerId": 0,
+        "tags": [],
+    },
+}
+
+DELETE_OPS = ("delete", "bulk_delete")
+
+
+def require_yaml() -> None:
+    """Raise a clear error when the optional PyYAML dependency is missing."""
+    if yaml is None:
+        raise RuntimeError(
+            "YAML desired state needs PyYAML; install it with "
+            "'pip install arr-mcp[sync]' or pass JSON"
+        )
+
+
+def load_desired(source: str) -> dict[str, Any]:
+    """
+    Parse a desired-state document.
+
+    Args:
+        source (str): YAML or JSON text, or the path of a file holding it.
+
+    Returns:
+        Dict: One section per service, e.g. ``{"sonarr": {...}}``.
+    """
+    path = os.path.expanduser(source.strip())
+    if "\n" not in path and os.path.isfile(path):
+        with open(path, encoding="utf-8") as fh:
+            source = fh.read()
+    try:
+        document = json.loads(source)
+    except ValueError:
+        require_yaml()
+        document = yaml.safe_load(source)
+    if not isinstance(document, dict) or not all(
+        isinstance(section, dict) for section in document.values()
+    ):
+        raise ValueError(
+            "Desired state must map each service to its settings, e.g. "
+            "'sonarr: {custom_formats: [...], quality_profiles: [...]}'"
+        )
+    for service, section in document.items():
+        unknown = sorted(set(section) - set(KINDS_BY_SECTION) - set(OPTIONS))
+        if unknown:
+            raise ValueError(
+                f"Unknown {service} section(s) {', '.join(unknown)}; expected "
+                f"{', '.join(list(KINDS_BY_SECTION) + list(OPTIONS))}"
+            )
+    return document
+
+
+@dataclass(frozen=True)
+class Pending:
+    """Id of a tag or custom format that is created earlier in the same sync."""
+
+    section: str
+    name: str
+
+    def __str__(self) -> str:
+        return f"<new {self.section[:-1].replace('_', ' ')} {self.name}>"
+
+
+def _is_named_list(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and bool(value)
+        and all(isinstance(v, dict) and "name" in v for v in value)
+    )
+
+
+def _overlay_fields(current: Any, desired: dict[str, Any]) -> list[dict[str, Any]]:
+    """Set values in a ``[{"name": ..., "value": ...}]`` field list from a mapping."""
+    merged = [dict(f) for f in current or [] if isinstance(f, dict)]
+    by_name = {f.get("name"): f for f in merged}
+    for name, value in desired.items():
+        if name in by_name:
+            by_name[name]["value"] = overlay(by_name[name].get("value"), value)
+        else:
+            merged.append({"name": name, "value": value})
+    return merged
+
+
+def overlay(current: Any, desired: Any) -> Any:
+    """
+    ``current`` with ``desired`` laid over it.
+
+    Keys missing from ``desired`` keep their current value. A list of named
+    objects is matched to the current one by name, and a ``fields`` mapping
+    sets the values of the current ``[{"name", "value"}]`` field list. Any
+    other value replaces the current one.
+    """
+    if isinstance(desired, dict):
+        merged = dict(current) if isinstance(current, dict) else {}
+        for key, value in desired.items():
+            if key == "fields" and isinstance(value, dict):
+                merged[key] = _overlay_fields(merged.get(key), value)
+            else:
+                merged[key] = overlay(merged.get(key), value)
+        return merged
+    if _is_named_list(desired):
+        current = current if isinstance(current, list) else []
+        by_name = {c.get("name"): c for c in current if isinstance(c, dict)}
+        return [overlay(by_name.get(d["name"]), d) for d in desired]
+    return desired
+
+
+def diff_paths(old: Any, new: Any, prefix: str = "") -> list[str]:
+    """Paths such as ``specifications[x265].negate`` where ``new`` differs from ``old``."""
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        return [
+            path
+            for key in new
+            for path in diff_paths(
+                old.get(key), new[key], f"{prefix}.{key}" if prefix else key
+            )
+        ]
+    if (
+        _is_named_list(old)
+        and _is_named_list(new)
+        and [o["name"] for o in old] == [n["name"] for n in new]
+    ):
+        return [
+            path
+            for o, n in zip(old, new, strict=True)
+            for path in diff_paths(o, n, f"{prefix}[{n['name']}]")
+        ]
+    return [prefix or "."]
+
+
+@dataclass
+class Change:
+    """One write the sync makes, or would make in a dry run."""
+
+    service: str
+    instance: str
+    section: str
+    op: str
+    name: str
+    id: int | None = None
+    fields: list[str] = field(default_factory=list)
+    payload: Any = None
+    ids: list[int] = field(default_factory=list)
+
+    def describe(self) -> dict[str, Any]:
+        doc = {
+            "service": self.service,
+            "instance": self.instance,
+            "resource": self.section,
+            "op": self.op,
+            "name": self.name,
+            "id": self.id,
+            "fields": self.fields or None,
+            "ids": self.ids or None,
+        }
+        return {k: v for k, v in doc.items() if v is not None}
+
+
+class InstanceState:
+    """Current configuration of one instance, fetched once, and its planned changes."""
+
+    def __init__(self, service: str, instance: str, client: Any, desired: dict):
+        self.service = service
+        self.instance = instance
+        self.client = client
+        self.desired = desired
+        self.current: dict[str, Any] = {}
+        self.ids: dict[str, dict[str, int]] = {"tags": {}, "custom_formats": {}}
+        self.changes: list[Change] = []
+        self.unchanged = 0
+        self.reads = 0
+
+    def needed(self) -> list[ResourceKind]:
+        """Kinds to fetch: those in the desired state and those they refer to."""
+        sections = {s for s in self.desired if s in KINDS_BY_SECTION}
+        if any(KINDS_BY_SECTION[s].uses_tags for s in sections):
+            sections.add("tags")
+        if "quality_profiles" in sections:
+            sections.add("custom_formats")
+        kinds = [kind for kind in KINDS if kind.section in sections]
+        missing = [
+            k.section for k in kinds if not hasattr(self.client, f"get_{k.path}")
+        ]
+        if missing:
+            raise ValueError(f"{self.service} has no {', '.join(missing)} to sync")
+        return kinds
+
+    def items(self, section: str) -> list[dict[str, Any]]:
+        return [i for i in records(self.current.get(section)) if isinstance(i, dict)]
+
+    def index(self) -> None:
+        """Map tag labels and custom format names to ids."""
+        for section, key in (("tags", "label"), ("custom_formats", "name")):
+            for item in self.items(section):
+                if isinstance(item.get("id"), int):
+                    self.ids[section][str(item.get(key, "")).lower()] = item["id"]
+
+    def ref(self, section: str, name: Any) -> Any:
+        """Id of a tag or custom format by name, or a :class:`Pending` one."""
+        if isinstance(name, int) or str(name).isdigit():
+            return int(name)
+        return self.ids[section].get(str(name).lower()) or Pending(section, str(name))
+
+    def prunes(self, kind: ResourceKind) -> bool:
+        prune = self.desired.get("prune", False)
+        if kind.section not in self.desired:
+            return False
+        return prune is True or (isinstance(prune, list) and kind.section in prune)
+
+
+def _identity(kind: ResourceKind, item: dict[str, Any]) -> Any:
+    value = item.get(kind.key)
+    if kind.key == "tags":
+        return tuple(sorted(str(t) for t in value or []))
+    return str(value or "").strip().lower()
+
+
+def _label(kind: ResourceKind, item: dict[str, Any], state: InstanceState) -> str:
+    if kind.key != "tags":
+        return str(item.get(kind.key, ""))
+    names = {v: k for k, v in state.ids["tags"].items()}
+    tags = [names.get(t, str(t)) for t in item.get("tags") or []]
+    return ",".join(tags) or "(default)"
+
+
+def _merge_format_items(
+    current: Any, desired: list[Any], state: InstanceState
+) -> list[dict[str, Any]]:
+    """Set scores by format name; formats left out keep their current score."""
+    merged = [dict(i) for i in current or [] if isinstance(i, dict)]
+    by_id = {i.get("format"): i for i in merged}
+    for entry in desired:
+        name = entry.get("name", entry.get("format"))
+        format_id = state.ref("custom_formats", name)
+        if format_id in by_id:
+            by_id[format_id]["score"] = entry.get("score", 0)
+        else:
+            merged.append(
+                {"format": format_id, "name": str(name), "score": entry.get("score", 0)}
+            )
+    return merged
+
+
+def _resolve(
+    kind: ResourceKind,
+    desired: dict[str, Any],
+    state: InstanceState,
+    existing: dict[str, Any] | None,
+) -> dict[str, Any]:
+    item = dict(desired)
+    if kind.uses_tags and "tags" in item:
+        item["tags"] = [state.ref("tags", t) for t in item["tags"] or []]
+    if kind.section == "quality_profiles" and isinstance(item.get("formatItems"), list):
+        current = (existing or {}).get("formatItems")
+        item["formatItems"] = _merge_format_items(current, item["formatItems"], state)
+    return item
+
+
+def _desired_items(kind: ResourceKind, state: InstanceState) -> list[dict[str, Any]]:
+    desired = state.desired.get(kind.section) or []
+    if kind.section != "tags":
+        return [dict(d) for d in desired if isinstance(d, dict)]
+    # Tags named anywhere in the document are created along with the listed ones.
+    labels = [d if isinstance(d, str) else d.get("label") for d in desired]
+    for section in ("release_profiles", "delay_profiles", "notifications"):
+        for item in state.desired.get(section) or []:
+            labels += [t for t in item.get("tags") or [] if isinstance(t, str)]
+    unique = {str(label).lower(): str(label) for label in labels if label}
+    return [{"label": label} for label in unique.values() if not label.isdigit()]
+
+
+def _template(kind: ResourceKind, schema: Any, desired: dict[str, Any]) -> Any:
+    """The schema entry a new resource starts from.
+
+    Quality profiles have one schema; notifications have one per
+    ``implementation``, which the desired resource must name.
+    """
+    if kind.section != "notifications":
+        return schema
+    templates = [t for t in records(schema) if isinstance(t, dict)]
+    wanted = str(desired.get("implementation", "")).lower()
+    for template in templates:
+        if str(template.get("implementation", "")).lower() == wanted:
+            return template
+    known = ", ".join(sorted(str(t.get("implementation")) for t in templates))
+    raise ValueError(
+        f"New notification '{desired.get('name', '')}' needs an implementation, "
+        f"one of: {known}"
+    )
+
+
+def plan_kind(kind: ResourceKind, state: InstanceState) -> None:
+    """Add the changes converging one kind of resource on one instance."""
+    if kind.section not in state.desired and kind.section != "tags":
+        return
+    if kind.singleton:
+        current = state.current.get(kind.section) or {}
+        merged = overlay(current, state.desired[kind.section] or {})
+        paths = diff_paths(current, merged)
+        if paths:
+            state.changes.append(
+                Change(
+                    state.service,
+                    state.instance,
+                    kind.section,
+                    "update",
+                    kind.section,
+                    current.get("id"),
+                    paths,
+                    merged,
+                )
+            )
+        else:
+            state.unchanged += 1
+        return
+
+    existing = {_identity(kind, item): item for item in state.items(kind.section)}
+    seen = set()
+    schema = None
+    for desired in _desired_items(kind, state):
+        # Tags resolve first: they identify delay profiles.
+        item = _resolve(kind, desired, state, None)
+        key = _identity(kind, item)
+        seen.add(key)
+        current = existing.get(key)
+        if current is not None:
+            item = _resolve(kind, desired, state, current)
+            merged = overlay(current, item)
+            paths = diff_paths(current, merged)
+            if not paths:
+                state.unchanged += 1
+                continue
+            change = Change(
+                state.service,
+                state.instance,
+                kind.section,
+                "update",
+                _label(kind, current, state),
+                current.get("id"),
+                paths,
+                merged,
+            )
+        else:
+            if kind.schema:
+                if schema is None:
+                    schema = getattr(state.client, f"get_{kind.path}_schema")()
+                    state.reads += 1
+                template = _template(kind, schema, desired)
+                item = _resolve(kind, desired, state, template)
+                item = overlay(template, item)
+                item.pop("id", None)
+            else:
+                item = overlay(CREATE_DEFAULTS.get(kind.section), item)
+            change = Change(
+                state.service,
+                state.instance,
+                kind.section,
+                "create",
+                _label(kind, item, state),
+                payload=item,
+            )
+        state.changes.append(change)
+
+    if state.prunes(kind):
+        for key, current in existing.items():
+            if key in seen:
+                continue
+            if kind.section == "delay_profiles" and (
+                current.get("id") == DEFAULT_DELAY_PROFILE_ID
+            ):
+                continue
+            state.changes.append(
+                Change(
+                    state.service,
+                    state.instance,
+                    kind.section,
+                    "delete",
+                    _label(kind, current, state),
+                    current.get("id"),
+                )
+            )
+
+
+def _bulk_custom_formats(state: InstanceState) -> None:
+    """Fold custom format changes that bulk endpoints can make into one request each."""
+    client = state.client
+    formats = [c for c in state.changes if c.section == "custom_formats"]
+    groups: dict[Any, list[Change]] = {}
+    for change in formats:
+        if change.op == "update" and change.fields == [
+            "includeCustomFormatWhenRenaming"
+        ]:
+            value = change.payload["includeCustomFormatWhenRenaming"]
+            groups.setdefault(("bulk_update", value), []).append(change)
+        elif change.op == "delete":
+            groups.setdefault(("bulk_delete", None), []).append(change)
+    for (op, value), changes in groups.items():
+        method = (
+            "put_customformat_bulk"
+            if op == "bulk_update"
+            else "delete_customformat_bulk"
+        )
+        if len(changes) < 2 or not hasattr(client, method):
+            continue
+        ids = [c.id for c in changes if c.id is not None]
+        payload: dict[str, Any] = {"ids": ids}
+        if op == "bulk_update":
+            payload["includeCustomFormatWhenRenaming"] = value
+        bulk = Change(
+            state.service,
+            state.instance,
+            "custom_formats",
+            op,
+            ", ".join(c.name for c in changes),
+            fields=changes[0].fields,
+            payload=payload,
+            ids=ids,
+        )
+        position = state.changes.index(changes[0])
+        state.changes = [c for c in state.changes if c not in changes]
+        state.changes.insert(position, bulk)
+
+
+def _materialize(value: Any, state: InstanceState) -> Any:
+    """Replace :class:`Pending` ids with the ids of the resources created meanwhile."""
+    if isinstance(value, Pending):
+        found = state.ids[value.section].get(value.name.lower())
+        if found is None:
+            raise ValueError(f"{value} was not created, so it cannot be referenced")
+        return found
+    if isinstance(value, dict):
+        return {k: _materialize(v, state) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_materialize(v, state) for v in value]
+    return value
+
+
+def _apply(change: Change, state: InstanceState) -> Any:
+    kind = KINDS_BY_SECTION[change.section]
+    client = state.client
+    payload = _materialize(change.payload, state)
+    if change.op == "create":
+        created = getattr(client, f"post_{kind.path}")(data=payload)
+        if change.section in state.ids and isinstance(created, dict):
+            if isinstance(created.get("id"), int):
+                state.ids[change.section][change.name.lower()] = created["id"]
+        return created
+    if change.op == "update":
+        return getattr(client, f"put_{kind.path}_id")(id=change.id, data=payload)
+    if change.op == "delete":
+        return getattr(client, f"delete_{kind.path}_id")(id=change.id)
+    if change.op == "bulk_update":
+        return client.put_customformat_bulk(data=payload)
+    return client.delete_customformat_bulk(data=payload)
+
+
+def sync(
+    desired: dict[str, Any],
+    clients: dict[tuple[str, str], Any],
+    dry_run: bool = True,
+    concurrency: int = 8,
+) -> dict[str, Any]:
+    """
+    Converge every instance in ``clients`` to ``desired`` with the fewest writes.
+
+    Args:
+        desired (Dict): Parsed desired state (see :func:`load_desired`).
+        clients (Dict[Tuple[str, str], Any]): API client per ``(service, instance)``.
+        dry_run (bool): Return the plan without writing.
+        concurrency (int): Reads and writes in flight at once.
+
+    Returns:
+        Dict: ``changes`` planned (and applied unless ``dry_run``), a
+        ``summary`` of creates, updates, deletes and unchanged resources,
+        ``requests`` it takes (``reads`` and ``writes``) and per-change ``errors``.
+    """
+    states = [
+        InstanceState(service, instance, client, desired.get(service) or {})
+        for (service, instance), client in clients.items()
+    ]
+    errors: list[dict[str, Any]] = []
+    jobs = [(state, kind) for state in states for kind in state.needed()]
+    fetched = bounded_map(
+        lambda job: getattr(job[0].client, f"get_{job[1].path}")(), jobs, concurrency
+    )
+    failed: set[int] = set()
+    for (state, kind), result, error in fetched:
+        state.reads += 1
+        if error is not None:
+            failed.add(id(state))
+            errors.append(
+                {
+                    "service": state.service,
+                    "instance": state.instance,
+                    "resource": kind.section,
+                    "error": str(error),
+                }
+            )
+        else:
+            state.current[kind.section] = result
+    fetched_states = states
+    states = [state for state in states if id(state) not in failed]
+
+    for state in states:
+        state.index()
+        for kind in state.needed():
+            plan_kind(kind, state)
+        _bulk_custom_formats(state)
+
+    changes = [change for state in states for change in state.changes]
+    reads = sum(state.reads for state in fetched_states)
+    if not dry_run:
+        owner = {id(c): state for state in states for c in state.changes}
+        # Deletes wait until every resource that referred to them is updated.
+        phases = [
+            [c for c in changes if c.section == k.section and c.op not in DELETE_OPS]
+            for k in KINDS
+        ] + [
+            [c for c in changes if c.section == k.section and c.op in DELETE_OPS]
+            for k in reversed(KINDS)
+        ]
+        for phase in phases:
+            outcomes = bounded_map(
+                lambda c: _apply(c, owner[id(c)]), phase, concurrency
+            )
+            for change, _, error in outcomes:
+                if error is not None:
+                    errors.append({**change.describe(), "error": str(error)})
+
+    summary = {"create": 0, "update": 0, "delete": 0}
+    for change in changes:
+        op = change.op.removeprefix("bulk_")
+        summary[op] += len(change.ids) or 1
+    summary["unchanged"] = sum(state.unchanged for state in states)
+    return {
+        "dry_run": dry_run,
+        "instances": [f"{s.service}/{s.instance}" for s in states],
+        "changes": [change.describe() for change in changes],
+        "summary": summary,
+        "requests": {
+            "reads": reads,
+            "writes": len(changes),
+        },
+        "errors": errors,
+    }
@@ -0,0 +1,427 @@
+"""
+Streaming export of libraries, history and requests to files.
+
+Reporting off a full library or history through the MCP tools means holding
+a ``{"result": [...]}`` response in memory and serializing it again into the
+tool reply. :func:`export` instead walks the records (page by page where the
+endpoint pages), selects and flattens the requested fields, and writes them
+in batches straight to NDJSON, CSV or Parquet (one row group per batch),
+optionally gzip or zstd compressed. Only the path and row count come back.
+
+CSV and Parquet need their columns up front. Without a field list they are
+taken from a sample of the first rows, and the column types are taken from
+all of its values. Keys first seen after the sample and values that do not
+fit their Parquet column are counted and reported, never dropped silently.
+
+Parquet needs ``pyarrow`` and zstd text output needs ``zstandard``; both are
+optional (``pip install arr-mcp[export]``).
+
+CONCEPT:ARR-018 — Streaming Export
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timezone
+from itertools import chain, islice, takewhile
+from typing import Any
+
+from arr_mcp.paging import iter_pages, records
+from arr_mcp.seerr_triage import iter_requests
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = pq = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard
+    zstandard = None  # type: ignore[assignment]
+
+FORMATS = ("ndjson", "csv", "parquet")
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+_EXTENSIONS = {"ndjson": ".ndjson", "csv": ".csv", "parquet": ".parquet"}
+_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# Library listing method per service; the whole list comes back in one call.
+LIBRARY_METHODS = {
+    "sonarr": "get_series",
+    "radarr": "get_movie",
+    "lidarr": "get_artist",
+    "chaptarr": "get_author",
+}
+
+HISTORY_SERVICES = ("sonarr", "radarr", "lidarr", "chaptarr", "prowlarr")
+
+DATASETS: dict[str, tuple[str, ...]] = {
+    "library": tuple(LIBRARY_METHODS),
+    "history": HISTORY_SERVICES,
+    "requests": ("seerr",),
+}
+
+
+def require_pyarrow() -> None:
+    """Raise a clear error when the optional pyarrow dependency is missing."""
+    if pa is None:
+        raise RuntimeError(
+            "Parquet export needs pyarrow; install it with 'pip install arr-mcp[export]'"
+        )
+
+
+def require_zstandard() -> None:
+    """Raise a clear error when the optional zstandard dependency is missing."""
+    if zstandard is None:
+        raise RuntimeError(
+            "zstd compression needs zstandard; install it with "
+            "'pip install arr-mcp[export]'"
+        )
+
+
+def iter_records(
+    client: Any,
+    service: str,
+    dataset: str,
+    since: str | None = None,
+    page_size: int = 1000,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield the raw records of one dataset from one service.
+
+    Args:
+        client (Any): API client for ``service``.
+        service (str): One of the services listed for ``dataset`` in :data:`DATASETS`.
+        dataset (str): ``library``, ``history`` or ``requests``.
+        since (Optional[str]): For ``history``, only events on or after this
+            ISO date; the newest-first pages stop being read once past it.
+        page_size (int): Records per page for paged endpoints.
+
+    Returns:
+        Iterator[Dict]: Records in the order the service returns them.
+    """
+    if service not in DATASETS.get(dataset, ()):
+        raise ValueError(
+            f"Cannot export '{dataset}' from '{service}'; expected one of "
+            + ", ".join(f"{d} ({'/'.join(s)})" for d, s in DATASETS.items())
+        )
+    if dataset == "library":
+        rows: Iterable[Any] = records(getattr(client, LIBRARY_METHODS[service])())
+    elif dataset == "requests":
+        rows = iter_requests(client, filter="all", take=page_size, max_pages=10**6)
+    else:
+        rows = iter_pages(
+            client.get_history,
+            page_size=page_size,
+            max_pages=10**6,
+            sortKey="date",
+            sortDirection="descending",
+        )
+        if since:
+            cutoff = _timestamp(since)
+            rows = takewhile(
+                lambda r: (
+                    not isinstance(r, dict)
+                    or _timestamp(r.get("date"), cutoff) >= cutoff
+                ),
+                rows,
+            )
+    return (r for r in rows if isinstance(r, dict))
+
+
+def _timestamp(value: Any, default: float = 0.0) -> float:
+    """Epoch seconds of an ISO date; naive dates are UTC."""
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return default
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _lookup(record: dict[str, Any], path: str) -> Any:
+    value: Any = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _flatten(record: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    flat: dict[str, Any] = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def select(
+    record: dict[str, Any], fields: list[str] | None, flat: bool
+) -> dict[str, Any]:
+    """
+    Project one record onto ``fields`` (dotted paths into nested objects).
+
+    Without ``fields`` the whole record is kept. With ``flat`` nested objects
+    become dotted columns and lists become JSON strings, as CSV and Parquet
+    columns need scalar values.
+    """
+    if fields:
+        row = {f: _lookup(record, f) for f in fields}
+    elif flat:
+        row = _flatten(record)
+    else:
+        return record
+    if flat:
+        for key, value in row.items():
+            if isinstance(value, (dict, list)):
+                row[key] = json.dumps(value, separators=(",", ":"), default=str)
+    return row
+
+
+def _open_binary(path: str, compression: str) -> Any:
+    if compression == "gzip":
+        return gzip.open(path, "wb")
+    if compression == "zstd":
+        require_zstandard()
+        return zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+    return open(path, "wb")
+
+
+class _TextWriter:
+    def __init__(self, path: str, compression: str):
+        self._raw = _open_binary(path, compression)
+        self._text = io.TextIOWrapper(self._raw, encoding="utf-8", newline="")
+
+    def close(self) -> None:
+        self._text.close()
+
+
+class _NdjsonWriter(_TextWriter):
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        self._text.writelines(
+            json.dumps(row, separators=(",", ":"), default=str) + "\n" for row in rows
+        )
+
+
+def _count_dropped(
+    rows: list[dict[str, Any]], columns: list[str], dropped: Counter
+) -> None:
+    known = set(columns)
+    for row in rows:
+        dropped.update(k for k in row if k not in known)
+
+
+class _CsvWriter(_TextWriter):
+    def __init__(self, path: str, compression: str, columns: list[str]):
+        super().__init__(path, compression)
+        self._columns = columns
+        self._csv = csv.DictWriter(
+            self._text, fieldnames=columns, extrasaction="ignore"
+        )
+        self._csv.writeheader()
+        self.dropped: Counter = Counter()
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        _count_dropped(rows, self._columns, self.dropped)
+        self._csv.writerows(rows)
+
+
+def _kind(values: Iterable[Any]) -> str:
+    """Narrowest column kind holding every non-null value: bool, int, float or string."""
+    kinds = {
+        "bool"
+        if isinstance(v, bool)
+        else "int"
+        if isinstance(v, int)
+        else "float"
+        if isinstance(v, float)
+        else "string"
+        for v in values
+        if v is not None
+    }
+    if kinds <= {"int", "float"} and kinds:
+        return "float" if "float" in kinds else "int"
+    if len(kinds) == 1:
+        return kinds.pop()
+    return "string"
+
+
+def _fits(kind: str, value: Any) -> bool:
+    if kind == "bool":
+        return isinstance(value, bool)
+    if kind == "int":
+        return (
+            isinstance(value, int)
+            and not isinstance(value, bool)
+            and -(2**63) <= value < 2**63
+        )
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _ParquetWriter:
+    def __init__(
+        self,
+        path: str,
+        compression: str,
+        columns: list[str],
+        sample: list[dict[str, Any]],
+    ):
+        require_pyarrow()
+        self._columns = columns
+        # Types come from every sampled value; all-null columns are strings.
+        self._kinds = {name: _kind(row.get(name) for row in sample) for name in columns}
+        arrow = {
+            "bool": pa.bool_(),
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "string": pa.string(),
+        }
+        schema = pa.schema(
+            [pa.field(name, arrow[self._kinds[name]]) for name in columns]
+        )
+        self._writer = pq.ParquetWriter(path, schema, compression=compression)
+        self.dropped: Counter = Counter()
+        self.mismatched: Counter = Counter()
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        _count_dropped(rows, self._columns, self.dropped)
+        table = []
+        for row in rows:
+            out = {}
+            for name, kind in self._kinds.items():
+                value = row.get(name)
+                if value is None:
+                    pass
+                elif kind == "string":
+                    if not isinstance(value, str):
+                        value = str(value)
+                elif not _fits(kind, value):
+                    # A later batch changed the type: null it rather than fail.
+                    self.mismatched[name] += 1
+                    value = None
+                out[name] = value
+            table.append(out)
+        self._writer.write_table(
+            pa.Table.from_pylist(table, schema=self._writer.schema)
+        )
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def default_path(
+    directory: str, service: str, dataset: str, fmt: str, compression: str
+) -> str:
+    """Timestamped file name for an export under ``directory``."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    suffix = "" if fmt == "parquet" else _SUFFIXES[compression]
+    name = f"{service}-{dataset}-{stamp}{_EXTENSIONS[fmt]}{suffix}"
+    return os.path.join(os.path.expanduser(directory), name)
+
+
+def export(
+    rows: Iterable[dict[str, Any]],
+    path: str,
+    fmt: str = "ndjson",
+    fields: list[str] | None = None,
+    compression: str = "none",
+    batch_size: int = 5000,
+    schema_sample: int = 10000,
+    on_progress: Callable[[int, int, str | None], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Stream records to a file in bounded batches.
+
+    The file is written under a ``.part`` name and moved into place once
+    complete, so a failed export never leaves a truncated file at ``path``.
+
+    Args:
+        rows (Iterable[Dict]): Records, e.g. from :func:`iter_records`.
+        path (str): Output file.
+        fmt (str): ``ndjson``, ``csv`` or ``parquet``.
+        fields (Optional[List[str]]): Dotted field paths to keep, in column
+            order; all fields (flattened for CSV/Parquet) when omitted.
+        compression (str): ``none``, ``gzip`` or ``zstd``; for Parquet this is
+            the column codec, otherwise the whole file is compressed.
+        batch_size (int): Records buffered per write (a Parquet row group).
+        schema_sample (int): Without ``fields``, CSV and Parquet columns and
+            types come from this many leading records (at least one batch).
+        on_progress (Optional[Callable]): Called as ``on_progress(rows,
+            rows, message)`` after each batch.
+
+    Returns:
+        Dict: ``path``, ``format``, ``compression``, ``rows``, ``batches``,
+        ``bytes`` written, ``seconds`` taken, and for CSV and Parquet the
+        ``dropped_fields`` seen after the sample and the Parquet values
+        written as null because their type did not fit (``mismatched_values``),
+        each as a count per field.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(
+            f"Unknown format '{fmt}'; expected one of {', '.join(FORMATS)}"
+        )
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Unknown compression '{compression}'; "
+            f"expected one of {', '.join(COMPRESSIONS)}"
+        )
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    path = os.path.expanduser(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    partial = f"{path}.part"
+    flat = fmt != "ndjson"
+    began = time.monotonic()
+    writer: Any = None
+    count = batches = 0
+    try:
+        source: Iterator[dict[str, Any]] = (select(r, fields, flat) for r in rows)
+        sample: list[dict[str, Any]] = []
+        if fmt == "ndjson":
+            writer = _NdjsonWriter(partial, compression)
+        else:
+            sample = list(islice(source, max(batch_size, schema_sample)))
+            columns = fields or list(dict.fromkeys(k for r in sample for k in r))
+            if fmt == "parquet":
+                writer = _ParquetWriter(partial, compression, columns, sample)
+            else:
+                writer = _CsvWriter(partial, compression, columns)
+            source = chain(sample, source)
+        while batch := list(islice(source, batch_size)):
+            writer.write(batch)
+            count += len(batch)
+            batches += 1
+            if on_progress is not None:
+                on_progress(count, count, f"{count} rows written")
+        writer.close()
+    except BaseException:
+        try:
+            if writer is not None:
+                writer.close()
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        raise
+    os.replace(partial, path)
+    return {
+        "path": path,
+        "format": fmt,
+        "compression": compression,
+        "rows": count,
+        "batches": batches,
+        "bytes": os.path.getsize(path),
+        "seconds": round(time.monotonic() - began, 3),
+        "dropped_fields": dict(getattr(writer, "dropped", {})),
+        "mismatched_values": dict(getattr(writer, "mismatched", {})),
+    }
@@ -0,0 +1,360 @@
+"""
+Append-only local archive of *arr and Prowlarr history.
+
+The services prune their ``history`` tables and page them slowly, so
+questions such as "grabs per indexer over 90 days" or "failed downloads by
+release group" mean walking every ``get_history`` page, and older events may
+already be gone. :class:`HistoryArchive` keeps every event it has seen in an
+indexed SQLite table, fed incrementally from ``get_history_since`` with a
+per-service cursor. Queries and group-bys then run locally.
+
+CONCEPT:ARR-019 — History Archive
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from arr_mcp.concurrency import bounded_map
+from arr_mcp.paging import records
+
+# Per service, the history field naming the library entity an event is about.
+ENTITY_FIELDS = {
+    "sonarr": "seriesId",
+    "radarr": "movieId",
+    "lidarr": "artistId",
+    "chaptarr": "authorId",
+    "prowlarr": "indexerId",
+}
+
+# Grouping key to the SQL expression it groups on.
+GROUP_KEYS = {
+    "service": "service",
+    "event_type": "event_type",
+    "indexer": "indexer",
+    "release_group": "release_group",
+    "quality": "quality",
+    "entity_id": "entity_id",
+    "download_client": "download_client",
+    "day": "substr(date, 1, 10)",
+    "month": "substr(date, 1, 7)",
+}
+
+_COLUMNS = (
+    "service",
+    "id",
+    "date",
+    "event_type",
+    "entity_id",
+    "indexer",
+    "download_id",
+    "download_client",
+    "release_group",
+    "quality",
+    "source_title",
+    "data",
+)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS events (service TEXT NOT NULL, id INTEGER NOT NULL, "
+    "date TEXT NOT NULL, event_type TEXT, entity_id INTEGER, indexer TEXT, "
+    "download_id TEXT, download_client TEXT, release_group TEXT, quality TEXT, "
+    "source_title TEXT, data TEXT, PRIMARY KEY (service, id))",
+    "CREATE INDEX IF NOT EXISTS events_date ON events (date)",
+    "CREATE INDEX IF NOT EXISTS events_type ON events (event_type, date)",
+    "CREATE INDEX IF NOT EXISTS events_entity ON events (service, entity_id)",
+    "CREATE INDEX IF NOT EXISTS events_indexer ON events (indexer, date)",
+    "CREATE INDEX IF NOT EXISTS events_download ON events (download_id)",
+    "CREATE TABLE IF NOT EXISTS cursors (service TEXT PRIMARY KEY, "
+    "last_date TEXT, synced_at REAL NOT NULL)",
+)
+
+
+def _iso(moment: datetime) -> str:
+    return moment.isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def event_row(
+    service: str, event: dict[str, Any], indexers: dict[Any, Any] | None = None
+) -> tuple[Any, ...] | None:
+    """Flatten one history record into an ``events`` row (``None`` if unusable)."""
+    if event.get("id") is None or not event.get("date"):
+        return None
+    data = event.get("data")
+    if not isinstance(data, dict):
+        data = {}
+    quality = (event.get("quality") or {}).get("quality") or {}
+    indexer = data.get("indexer")
+    if not indexer and indexers:
+        indexer = indexers.get(event.get("indexerId"))
+    return (
+        service,
+        event["id"],
+        str(event["date"]),
+        str(event.get("eventType") or "").lower() or None,
+        event.get(ENTITY_FIELDS[service]),
+        indexer or None,
+        event.get("downloadId"),
+        data.get("downloadClientName") or data.get("downloadClient"),
+        data.get("releaseGroup"),
+        quality.get("name"),
+        event.get("sourceTitle") or data.get("query") or data.get("title"),
+        json.dumps(event, separators=(",", ":"), default=str),
+    )
+
+
+class HistoryArchive:
+    """Indexed, append-only SQLite store of history events from every service."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): SQLite file; created with its parent directory if missing.
+        """
+        path = os.path.expanduser(path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    def append(self, rows: list[tuple[Any, ...]]) -> int:
+        """Insert events not archived yet; returns how many were new."""
+        if not rows:
+            return 0
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR IGNORE INTO events ({', '.join(_COLUMNS)}) "
+                    f"VALUES ({placeholders})",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def cursor(self, service: str) -> tuple[str | None, float | None]:
+        """``(last event date, last sync time)`` for a service."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_date, synced_at FROM cursors WHERE service = ?",
+                (service,),
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def set_cursor(self, service: str, last_date: str | None, synced_at: float) -> None:
+        """Record how far a service has been archived."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cursors (service, last_date, synced_at) "
+                "VALUES (?, ?, ?)",
+                (service, last_date, synced_at),
+            )
+
+    def sync_service(
+        self,
+        service: str,
+        client: Any,
+        backfill_days: int = 90,
+        clock: Callable[[], float] = time.time,
+    ) -> dict[str, Any]:
+        """
+        Archive a service's events newer than its cursor.
+
+        The first sync reads ``backfill_days`` of history. Later syncs ask
+        ``get_history_since`` for events from the newest archived date on;
+        events already archived at that instant are skipped by id.
+
+        Returns:
+            Dict: ``fetched`` and ``new`` event counts and the new ``cursor``.
+        """
+        last, _ = self.cursor(service)
+        since = last or _iso(
+            datetime.fromtimestamp(clock(), timezone.utc)
+            - timedelta(days=backfill_days)
+        )
+        events = [
+            e
+            for e in records(client.get_history_since(date=since))
+            if isinstance(e, dict)
+        ]
+        indexers = None
+        if service == "prowlarr" and events:
+            indexers = {
+                i.get("id"): i.get("name")
+                for i in records(client.get_indexer())
+                if isinstance(i, dict)
+            }
+        rows = [r for r in (event_row(service, e, indexers) for e in events) if r]
+        new = self.append(rows)
+        newest = max([r[2] for r in rows] + ([last] if last else []), default=since)
+        self.set_cursor(service, newest, clock())
+        return {"fetched": len(events), "new": new, "cursor": newest}
+
+    def sync(
+        self,
+        clients: dict[str, Any],
+        backfill_days: int = 90,
+        min_interval: float = 0.0,
+        concurrency: int = 5,
+        clock: Callable[[], float] = time.time,
+    ) -> dict[str, Any]:
+        """
+        Incrementally archive every service in ``clients`` concurrently.
+
+        Services synced less than ``min_interval`` seconds ago are skipped.
+
+        Returns:
+            Dict: Per-service sync results and per-service ``errors``.
+        """
+        due = []
+        for service in clients:
+            if service not in ENTITY_FIELDS:
+                continue
+            _, synced_at = self.cursor(service)
+            if synced_at is None or clock() - synced_at >= min_interval:
+                due.append(service)
+
+        def run(service: str) -> dict[str, Any]:
+            return self.sync_service(service, clients[service], backfill_days, clock)
+
+        report: dict[str, Any] = {"services": {}, "errors": {}}
+        for service, result, error in bounded_map(run, due, concurrency):
+            if error is None:
+                report["services"][service] = result
+            else:
+                report["errors"][service] = str(error)
+        return report
+
+    def query(
+        self,
+        services: list[str] | None = None,
+        event_types: list[str] | None = None,
+        entity_id: int | None = None,
+        indexer: str | None = None,
+        download_id: str | None = None,
+        release_group: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        group_by: list[str] | None = None,
+        limit: int = 100,
+    ) -> dict[str, Any]:
+        """
+        Filter archived events, optionally counting them per group.
+
+        Args:
+            services (Optional[List[str]]): Only these services.
+            event_types (Optional[List[str]]): Event types, e.g. ``grabbed``,
+                ``downloadfailed``, ``downloadfolderimported`` (case-insensitive).
+            entity_id (Optional[int]): Series/movie/artist/author/indexer id.
+            indexer (Optional[str]): Indexer name (case-insensitive).
+            download_id (Optional[str]): Download client id of a release.
+            release_group (Optional[str]): Release group (case-insensitive).
+            since (Optional[str]): ISO date or datetime lower bound (inclusive).
+            until (Optional[str]): ISO date or datetime upper bound (exclusive).
+            group_by (Optional[List[str]]): Any of :data:`GROUP_KEYS`; counts per
+                group instead of listing events.
+            limit (int): Maximum events or groups returned.
+
+        Returns:
+            Dict: ``total`` matching events, then ``groups`` (keys and
+            ``count``, largest first) or ``events`` (newest first), and
+            ``query_ms``.
+        """
+        clauses, params = [], []
+
+        def where(clause: str, values: list[Any]) -> None:
+            clauses.append(clause)
+            params.extend(values)
+
+        if services:
+            where(
+                f"service IN ({', '.join('?' for _ in services)})",
+                [s.lower() for s in services],
+            )
+        if event_types:
+            where(
+                f"event_type IN ({', '.join('?' for _ in event_types)})",
+                [t.lower() for t in event_types],
+            )
+        if entity_id is not None:
+            where("entity_id = ?", [entity_id])
+        if indexer:
+            where("indexer = ? COLLATE NOCASE", [indexer])
+        if download_id:
+            where("download_id = ?", [download_id])
+        if release_group:
+            where("release_group = ? COLLATE NOCASE", [release_group])
+        if since:
+            where("date >= ?", [since])
+        if until:
+            where("date < ?", [until])
+        condition = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        began = time.perf_counter()
+        result: dict[str, Any] = {}
+        with self._lock:
+            result["total"] = self._conn.execute(
+                f"SELECT COUNT(*) FROM events{condition}", params
+            ).fetchone()[0]
+            if group_by:
+                unknown = [k for k in group_by if k not in GROUP_KEYS]
+                if unknown:
+                    raise ValueError(
+                        f"Unknown group key {', '.join(unknown)}; "
+                        f"expected any of {', '.join(GROUP_KEYS)}"
+                    )
+                keys = ", ".join(GROUP_KEYS[k] for k in group_by)
+                rows = self._conn.execute(
+                    f"SELECT {keys}, COUNT(*) AS n FROM events{condition} "
+                    f"GROUP BY {keys} ORDER BY n DESC LIMIT ?",
+                    params + [limit],
+                ).fetchall()
+                result["groups"] = [
+                    dict(zip(group_by + ["count"], row, strict=True)) for row in rows
+                ]
+            else:
+                columns = [c for c in _COLUMNS if c != "data"]
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(columns)} FROM events{condition} "
+                    "ORDER BY date DESC LIMIT ?",
+                    params + [limit],
+                ).fetchall()
+                result["events"] = [
+                    dict(zip(columns, row, strict=True)) for row in rows
+                ]
+        result["query_ms"] = round((time.perf_counter() - began) * 1000, 3)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Archived event counts, date range and cursor per service."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT e.service, COUNT(*), MIN(e.date), MAX(e.date), c.synced_at "
+                "FROM events e LEFT JOIN cursors c ON c.service = e.service "
+                "GROUP BY e.service"
+            ).fetchall()
+        return {
+            service: {
+                "events": count,
+                "oldest": oldest,
+                "newest": newest,
+                "synced_at": synced_at,
+            }
+            for service, count, oldest, newest, synced_at in rows
+        }
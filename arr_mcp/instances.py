@@ -0,0 +1,85 @@
+"""
+Fan-out of read actions across several instances of one service.
+
+Shops often run more than one Sonarr (1080p, 4K, anime) or Radarr. Named
+instances are configured as ``<SVC>__<NAME>__BASE_URL`` next to the default
+``<SVC>_BASE_URL`` (see :func:`arr_mcp.auth.list_instances`). The action
+tools address one of them with ``instance``, or all of them with
+``instance="all"``: :func:`fan_out` then runs the read action on every
+instance concurrently and :func:`merge` combines the answers, tagging each
+record with the instance it came from.
+
+CONCEPT:ARR-022 — Instance Fan-Out
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from arr_mcp.concurrency import bounded_map
+from arr_mcp.paging import records
+
+# Actions safe to repeat on every instance: they only read. ``search_*`` is not
+# one of them; Bazarr's subtitle searches POST and start downloads.
+READ_PREFIXES = ("get_", "list_", "lookup", "help", "actions")
+
+_LIST_KEYS = ("result", "records", "data", "results")
+
+
+def is_read_action(action: str) -> bool:
+    """Whether ``action`` only reads, so it may run on every instance at once."""
+    return action.strip().lower().startswith(READ_PREFIXES)
+
+
+def _is_listing(result: Any) -> bool:
+    if isinstance(result, list):
+        return True
+    return isinstance(result, dict) and any(
+        isinstance(result.get(k), list) for k in _LIST_KEYS
+    )
+
+
+def fan_out(
+    instances: list[str], call: Callable[[str], Any], concurrency: int = 4
+) -> dict[str, Any]:
+    """
+    Run ``call(instance)`` on every instance concurrently and merge the results.
+
+    Args:
+        instances (List[str]): Instance names, e.g. ``["default", "4k"]``.
+        call (Callable[[str], Any]): Performs the action against one instance.
+        concurrency (int): Instances queried in parallel.
+
+    Returns:
+        Dict: See :func:`merge`.
+    """
+    return merge(bounded_map(call, instances, concurrency))
+
+
+def merge(outcomes: list[tuple[str, Any, Exception | None]]) -> dict[str, Any]:
+    """
+    Combine per-instance ``(instance, result, error)`` outcomes.
+
+    Listings are concatenated under ``result`` with an ``instance`` field added
+    to each record; any other answer is kept whole under its instance.
+
+    Returns:
+        Dict: The merged ``result`` list and, per instance, its record
+        ``count``, its non-list ``result`` or its ``error``.
+    """
+    merged: list[Any] = []
+    per_instance: dict[str, Any] = {}
+    for instance, result, error in outcomes:
+        if error is not None:
+            per_instance[instance] = {"error": str(error)}
+        elif _is_listing(result):
+            items = records(result)
+            merged.extend(
+                {**item, "instance": instance}
+                if isinstance(item, dict)
+                else {"instance": instance, "value": item}
+                for item in items
+            )
+            per_instance[instance] = {"count": len(items)}
+        else:
+            per_instance[instance] = {"result": result}
+    return {"result": merged, "instances": per_instance}
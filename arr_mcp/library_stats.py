@@ -0,0 +1,397 @@
+"""
+Columnar analytics over the media files of every *arr library.
+
+Questions such as "space used by 4K remuxes per root folder" or "files below
+cutoff and over 20 GB" need every file record from ``get_moviefile``,
+``get_episodefile``, ``get_trackfile`` and ``get_bookfile``. :func:`load_files`
+fetches them concurrently once and packs them into a :class:`FileTable`: NumPy
+columns for sizes, resolutions and dates, and dictionary-encoded integer codes
+for quality, codec, root folder and language. Filters, group-bys, percentiles
+and top-N queries then run as vectorized array operations.
+
+NumPy is an optional dependency (``pip install arr-mcp[analytics]``).
+
+CONCEPT:ARR-017 — Columnar Library Stats
+"""
+
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from arr_mcp.concurrency import bounded_map
+from arr_mcp.paging import records
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
+
+_GB = 1024**3
+
+CATEGORICAL = ("service", "quality", "source", "codec", "root_folder", "language")
+GROUP_KEYS = CATEGORICAL + ("resolution", "added_year", "cutoff_not_met")
+
+
+@dataclass(frozen=True)
+class FileSource:
+    """How one service lists its parents and their media files."""
+
+    parent_method: str
+    file_method: str
+    parent_param: str
+    title_field: str
+    chunk: int | None = None
+
+
+FILE_SOURCES: dict[str, FileSource] = {
+    "radarr": FileSource("get_movie", "get_moviefile", "movieId", "title", chunk=200),
+    "sonarr": FileSource("get_series", "get_episodefile", "seriesId", "title"),
+    "lidarr": FileSource("get_artist", "get_trackfile", "artistId", "artistName"),
+    "chaptarr": FileSource("get_author", "get_bookfile", "authorId", "authorName"),
+}
+
+
+def require_numpy() -> None:
+    """Raise a clear error when the optional NumPy dependency is missing."""
+    if np is None:
+        raise RuntimeError(
+            "library_stats needs NumPy; install it with 'pip install arr-mcp[analytics]'"
+        )
+
+
+def _epoch(value: Any) -> float:
+    if not value:
+        return float("nan")
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return float("nan")
+
+
+def _file_row(
+    service: str, record: dict[str, Any], parent: dict[str, Any], title_field: str
+) -> dict[str, Any]:
+    quality = (record.get("quality") or {}).get("quality") or {}
+    media = record.get("mediaInfo") or {}
+    languages = record.get("languages") or []
+    language = (
+        languages[0].get("name")
+        if languages and isinstance(languages[0], dict)
+        else media.get("audioLanguages")
+    )
+    root = parent.get("rootFolderPath") or os.path.dirname(
+        str(parent.get("path") or "").rstrip("/")
+    )
+    return {
+        "service": service,
+        "size": record.get("size") or 0,
+        "quality": quality.get("name") or "Unknown",
+        "source": quality.get("source") or "unknown",
+        "resolution": quality.get("resolution") or 0,
+        "codec": media.get("videoCodec")
+        or media.get("audioCodec")
+        or media.get("audioFormat")
+        or "unknown",
+        "root_folder": root or "unknown",
+        "language": language or "unknown",
+        "added": _epoch(record.get("dateAdded")),
+        "cutoff_not_met": bool(record.get("qualityCutoffNotMet")),
+        "title": parent.get(title_field) or parent.get("title"),
+        "path": record.get("path") or record.get("relativePath"),
+    }
+
+
+def fetch_file_rows(
+    service: str, client: Any, concurrency: int = 8
+) -> tuple[list[dict[str, Any]], dict[str, str]]:
+    """
+    List one service's parents, then all their files, as flat rows.
+
+    Returns:
+        Tuple: The rows, and the error of each file listing that failed,
+        keyed like ``radarr get_moviefile movieId=1..200``.
+    """
+    source = FILE_SOURCES[service]
+    parents = {
+        p["id"]: p
+        for p in records(getattr(client, source.parent_method)())
+        if isinstance(p, dict) and "id" in p
+    }
+    list_files = getattr(client, source.file_method)
+    ids = list(parents)
+    if source.chunk:
+        jobs: list[Any] = [
+            ids[i : i + source.chunk] for i in range(0, len(ids), source.chunk)
+        ]
+    else:
+        jobs = ids
+    rows = []
+    errors: dict[str, str] = {}
+    for job, result, error in bounded_map(
+        lambda j: list_files(**{source.parent_param: j}), jobs, concurrency
+    ):
+        if error is not None:
+            parents_of = f"{job[0]}..{job[-1]}" if isinstance(job, list) else job
+            key = f"{service} {source.file_method} {source.parent_param}={parents_of}"
+            errors[key] = str(error)
+            continue
+        for record in records(result):
+            if not isinstance(record, dict):
+                continue
+            owner = record.get(source.parent_param, job)
+            parent = parents.get(owner) or {}
+            rows.append(_file_row(service, record, parent, source.title_field))
+    return rows, errors
+
+
+class Column:
+    """Dictionary-encoded string column: integer ``codes`` into ``labels``."""
+
+    def __init__(self, values: list[Any]):
+        index: dict[str, int] = {}
+        codes = [index.setdefault(str(v), len(index)) for v in values]
+        self.labels = list(index)
+        self.codes = np.asarray(codes, dtype=np.int32)
+
+    def matches(self, wanted: list[str], exact: bool = False) -> Any:
+        """Boolean row mask for labels equal to (or containing) any of ``wanted``."""
+        needles = [w.lower() for w in wanted]
+        hits = np.array(
+            [
+                any(
+                    (label.lower() == n) if exact else (n in label.lower())
+                    for n in needles
+                )
+                for label in self.labels
+            ],
+            dtype=bool,
+        )
+        return hits[self.codes] if len(hits) else np.zeros(len(self.codes), bool)
+
+
+class FileTable:
+    """NumPy-backed table of media files with vectorized summary queries."""
+
+    def __init__(self, rows: list[dict[str, Any]]):
+        require_numpy()
+        self.size = np.fromiter((r["size"] for r in rows), np.int64, len(rows))
+        self.resolution = np.fromiter(
+            (r["resolution"] for r in rows), np.int32, len(rows)
+        )
+        self.added = np.fromiter((r["added"] for r in rows), np.float64, len(rows))
+        self.cutoff_not_met = np.fromiter(
+            (r["cutoff_not_met"] for r in rows), bool, len(rows)
+        )
+        self.columns = {name: Column([r[name] for r in rows]) for name in CATEGORICAL}
+        self.title = np.array([r["title"] for r in rows], dtype=object)
+        self.path = np.array([r["path"] for r in rows], dtype=object)
+        self.errors: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.size)
+
+    def mask(
+        self,
+        services: list[str] | None = None,
+        quality: list[str] | None = None,
+        codec: list[str] | None = None,
+        root_folder: list[str] | None = None,
+        language: list[str] | None = None,
+        min_resolution: int | None = None,
+        max_resolution: int | None = None,
+        min_size_gb: float | None = None,
+        max_size_gb: float | None = None,
+        cutoff_not_met: bool | None = None,
+        added_after: str | None = None,
+        added_before: str | None = None,
+    ) -> Any:
+        """Boolean row mask for the given criteria; text criteria match substrings."""
+        keep = np.ones(len(self), dtype=bool)
+        if services:
+            keep &= self.columns["service"].matches(services, exact=True)
+        for name, wanted in (
+            ("quality", quality),
+            ("codec", codec),
+            ("root_folder", root_folder),
+            ("language", language),
+        ):
+            if wanted:
+                keep &= self.columns[name].matches(wanted)
+        if min_resolution is not None:
+            keep &= self.resolution >= min_resolution
+        if max_resolution is not None:
+            keep &= self.resolution <= max_resolution
+        if min_size_gb is not None:
+            keep &= self.size >= min_size_gb * _GB
+        if max_size_gb is not None:
+            keep &= self.size <= max_size_gb * _GB
+        if cutoff_not_met is not None:
+            keep &= self.cutoff_not_met == cutoff_not_met
+        if added_after:
+            keep &= self.added >= _epoch(added_after)
+        if added_before:
+            keep &= self.added < _epoch(added_before)
+        return keep
+
+    def _codes(self, key: str, keep: Any) -> tuple[Any, list[Any]]:
+        if key in self.columns:
+            column = self.columns[key]
+            return column.codes[keep], column.labels
+        if key == "resolution":
+            values = self.resolution[keep]
+        elif key == "added_year":
+            added = self.added[keep]
+            years = np.full(len(added), -1, dtype=np.int64)
+            known = ~np.isnan(added)
+            years[known] = (
+                added[known].astype("datetime64[s]").astype("datetime64[Y]").astype(int)
+                + 1970
+            )
+            values = years
+        elif key == "cutoff_not_met":
+            values = self.cutoff_not_met[keep]
+        else:
+            raise ValueError(
+                f"Cannot group by '{key}'; expected any of {', '.join(GROUP_KEYS)}"
+            )
+        labels, codes = np.unique(values, return_inverse=True)
+        return codes.astype(np.int64), [v.item() for v in labels]
+
+    def group_by(self, keys: list[str], keep: Any, limit: int = 50) -> list[dict]:
+        """Count, total and mean size per distinct combination of ``keys``."""
+        combined = np.zeros(int(keep.sum()), dtype=np.int64)
+        label_sets = []
+        for key in keys:
+            codes, labels = self._codes(key, keep)
+            combined = combined * max(len(labels), 1) + codes
+            label_sets.append(labels)
+        groups, inverse = np.unique(combined, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(groups))
+        sizes = np.bincount(inverse, weights=self.size[keep], minlength=len(groups))
+        total = sizes.sum() or 1.0
+        order = np.argsort(-sizes)[:limit]
+        result = []
+        for g in order:
+            code, parts = int(groups[g]), []
+            for labels in reversed(label_sets):
+                code, part = divmod(code, max(len(labels), 1))
+                parts.append(labels[part] if labels else None)
+            row = dict(zip(keys, reversed(parts), strict=True))
+            row.update(
+                files=int(counts[g]),
+                size_gb=round(sizes[g] / _GB, 2),
+                mean_gb=round(sizes[g] / counts[g] / _GB, 3),
+                share=round(sizes[g] / total, 4),
+            )
+            result.append(row)
+        return result
+
+    def percentiles(self, keep: Any, qs: list[float]) -> dict[str, float]:
+        """Size percentiles (in GB) of the selected rows."""
+        sizes = self.size[keep]
+        if not len(sizes):
+            return {}
+        values = np.percentile(sizes, qs)
+        return {f"p{q:g}": round(v / _GB, 3) for q, v in zip(qs, values, strict=True)}
+
+    def top(self, keep: Any, n: int = 10) -> list[dict[str, Any]]:
+        """The ``n`` largest selected files."""
+        rows = np.flatnonzero(keep)
+        if not len(rows) or n <= 0:
+            return []
+        sizes = self.size[rows]
+        if len(rows) > n:
+            part = np.argpartition(-sizes, n - 1)[:n]
+            rows, sizes = rows[part], sizes[part]
+        rows = rows[np.argsort(-sizes)]
+        return [
+            {
+                "title": self.title[i],
+                "path": self.path[i],
+                "size_gb": round(int(self.size[i]) / _GB, 2),
+                "quality": self.columns["quality"].labels[
+                    self.columns["quality"].codes[i]
+                ],
+                "service": self.columns["service"].labels[
+                    self.columns["service"].codes[i]
+                ],
+            }
+            for i in rows
+        ]
+
+    def summarize(
+        self,
+        group_by: list[str] | None = None,
+        percentiles: list[float] | None = None,
+        top: int = 0,
+        limit: int = 50,
+        **criteria: Any,
+    ) -> dict[str, Any]:
+        """
+        Answer one analytics question over the table.
+
+        Args:
+            group_by (Optional[List[str]]): Keys from :data:`GROUP_KEYS`.
+            percentiles (Optional[List[float]]): Size percentiles to report.
+            top (int): Number of largest matching files to list.
+            limit (int): Most groups returned, largest first.
+            **criteria: Row filters accepted by :meth:`mask`.
+
+        Returns:
+            Dict: Matching ``files`` and ``size_gb``, plus ``groups``,
+            ``percentiles`` and ``top`` when requested.
+        """
+        keep = self.mask(**criteria)
+        result: dict[str, Any] = {
+            "files": int(keep.sum()),
+            "size_gb": round(int(self.size[keep].sum()) / _GB, 2),
+            "of_files": len(self),
+        }
+        if group_by:
+            result["groups"] = self.group_by(group_by, keep, limit)
+        if percentiles:
+            result["percentiles"] = self.percentiles(keep, percentiles)
+        if top:
+            result["top"] = self.top(keep, top)
+        return result
+
+
+def load_files(
+    clients: dict[str, Any],
+    concurrency: int = 8,
+    on_service: Callable[[str, int], None] | None = None,
+) -> FileTable:
+    """
+    Fetch every file record from the configured services into a :class:`FileTable`.
+
+    Args:
+        clients (Dict[str, Any]): Service name to API client.
+        concurrency (int): Per-parent file listings in flight per service.
+        on_service (Optional[Callable]): Called as ``on_service(service, rows)``
+            after each service is loaded.
+
+    Returns:
+        FileTable: The rows that loaded; ``errors`` holds each service or file
+        listing that failed, whose files are missing from every total.
+    """
+    require_numpy()
+    rows: list[dict[str, Any]] = []
+    errors: dict[str, str] = {}
+    services = [s for s in FILE_SOURCES if s in clients]
+    for service, result, error in bounded_map(
+        lambda s: fetch_file_rows(s, clients[s], concurrency),
+        services,
+        len(services) or 1,
+    ):
+        if error is None:
+            rows.extend(result[0])
+            errors.update(result[1])
+        else:
+            errors[service] = str(error)
+        if on_service is not None:
+            on_service(service, 0 if error is not None else len(result[0]))
+    table = FileTable(rows)
+    table.errors = errors
+    return table
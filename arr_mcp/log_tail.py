@@ -0,0 +1,409 @@
+"""
+Incremental tailing of *arr and Prowlarr logs.
+
+``get_log`` pages the log table newest first and ``get_log_file_filename``
+returns a whole log file as text, so following a problem means downloading
+the same entries or megabytes again on every look. The tail functions here
+resume from a cursor instead: the last log entry id for the log table, or a
+byte offset for log files, which are read with HTTP ``Range`` requests in
+bounded chunks when the service honours them. Level, logger and regex
+filters run while entries stream in and output stops at an entry or byte
+cap, leaving the cursor just after the last entry returned.
+
+CONCEPT:ARR-020 — Log Tail
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote
+
+from arr_mcp.paging import records
+
+# API prefix of the log endpoints per service.
+LOG_SERVICES = {
+    "sonarr": "/api/v3",
+    "radarr": "/api/v3",
+    "lidarr": "/api/v1",
+    "prowlarr": "/api/v1",
+    "chaptarr": "/api/v1",
+}
+
+LEVELS = ("trace", "debug", "info", "warn", "error", "fatal")
+
+# ``2024-05-01 10:00:00.1|Info|RssSyncService|Message``
+_LINE = re.compile(r"^(\d{4}-\d\d-\d\d[ T][\d:.]+)\|(\w+)\|([^|]*)\|(.*)$")
+_CONTENT_RANGE = re.compile(r"bytes (?:(\d+)-\d+|\*)/(\d+|\*)")
+_ENTRY_OVERHEAD = 64
+
+
+def _rank(level: Any) -> int:
+    name = str(level or "").lower()
+    name = {"warning": "warn", "critical": "fatal"}.get(name, name)
+    return LEVELS.index(name) if name in LEVELS else -1
+
+
+@dataclass
+class LogFilter:
+    """Client-side filter applied to each entry as it is read."""
+
+    level: str | None = None
+    logger: str | None = None
+    pattern: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.level and _rank(self.level) < 0:
+            raise ValueError(
+                f"Unknown level '{self.level}'; expected one of {', '.join(LEVELS)}"
+            )
+        self._regex = re.compile(self.pattern, re.IGNORECASE) if self.pattern else None
+
+    def matches(self, entry: dict[str, Any]) -> bool:
+        """Whether ``entry`` is at or above ``level``, from ``logger`` and matches ``pattern``."""
+        if self.level and _rank(entry.get("level")) < _rank(self.level):
+            return False
+        if (
+            self.logger
+            and self.logger.lower() not in str(entry.get("logger") or "").lower()
+        ):
+            return False
+        if self._regex is not None:
+            text = f"{entry.get('message') or ''}\n{entry.get('exception') or ''}"
+            if not self._regex.search(text):
+                return False
+        return True
+
+
+def _size(entry: dict[str, Any]) -> int:
+    return (
+        len(entry.get("message") or "")
+        + len(entry.get("exception") or "")
+        + _ENTRY_OVERHEAD
+    )
+
+
+class CursorStore:
+    """SQLite record of how far each service's log has been tailed."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): SQLite file; created with its parent directory if missing.
+        """
+        path = os.path.expanduser(path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cursors (service TEXT NOT NULL, "
+            "source TEXT NOT NULL, position INTEGER NOT NULL, at REAL NOT NULL, "
+            "PRIMARY KEY (service, source))"
+        )
+
+    def get(self, service: str, source: str) -> int | None:
+        """Saved position of ``source`` (``entries`` or ``file:<name>``), if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT position FROM cursors WHERE service = ? AND source = ?",
+                (service, source),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, service: str, source: str, position: int) -> None:
+        """Save the position reached in ``source``."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cursors (service, source, position, at) "
+                "VALUES (?, ?, ?, ?)",
+                (service, source, position, time.time()),
+            )
+
+    def clear(self, service: str | None = None) -> None:
+        """Forget the cursors of one service, or of all."""
+        with self._lock:
+            if service:
+                self._conn.execute("DELETE FROM cursors WHERE service = ?", (service,))
+            else:
+                self._conn.execute("DELETE FROM cursors")
+
+
+def tail_entries(
+    client: Any,
+    cursor: int | None,
+    log_filter: LogFilter | None = None,
+    limit: int = 200,
+    max_bytes: int = 65536,
+    initial: int = 50,
+    page_size: int = 200,
+    max_scan: int = 5000,
+) -> dict[str, Any]:
+    """
+    Return log table entries newer than entry id ``cursor``, oldest first.
+
+    Pages of ``get_log`` (newest first) are read only until the cursor is
+    reached. Without a cursor the newest ``initial`` entries are considered.
+
+    Args:
+        client (Any): Sonarr/Radarr/Lidarr/Prowlarr/Chaptarr API client.
+        cursor (Optional[int]): Id of the last entry already seen.
+        log_filter (Optional[LogFilter]): Entries that do not match are skipped
+            (the cursor still moves past them).
+        limit (int): Maximum entries returned.
+        max_bytes (int): Approximate cap on the returned text.
+        initial (int): Entries looked at when there is no cursor yet.
+        page_size (int): Entries per ``get_log`` page.
+        max_scan (int): Stop paging back after this many newer entries; older
+            ones are then reported as a ``gap``.
+
+    Returns:
+        Dict: ``entries``, the new ``cursor``, ``scanned`` entry count,
+        ``truncated`` when a cap stopped output early and ``gap`` when entries
+        between the old cursor and the oldest one scanned were skipped.
+    """
+    wanted = initial if cursor is None else max_scan
+    newer: list[dict[str, Any]] = []
+    reached = cursor is None
+    for page in range(1, wanted // page_size + 2):
+        batch = records(
+            client.get_log(
+                page=page, pageSize=page_size, sortKey="id", sortDirection="descending"
+            )
+        )
+        for entry in batch:
+            if not isinstance(entry, dict) or entry.get("id") is None:
+                continue
+            if cursor is not None and entry["id"] <= cursor:
+                reached = True
+                break
+            newer.append(entry)
+        if reached and cursor is not None or len(batch) < page_size:
+            reached = True
+            break
+        if len(newer) >= wanted:
+            break
+    newer = newer[:wanted]
+    newer.reverse()
+
+    log_filter = log_filter or LogFilter()
+    entries: list[dict[str, Any]] = []
+    used = 0
+    position = cursor
+    truncated = False
+    for entry in newer:
+        if log_filter.matches(entry):
+            if len(entries) >= limit or used + _size(entry) > max_bytes and entries:
+                truncated = True
+                break
+            entries.append(
+                {
+                    "id": entry["id"],
+                    "time": entry.get("time"),
+                    "level": entry.get("level"),
+                    "logger": entry.get("logger"),
+                    "message": entry.get("message"),
+                    "exception": entry.get("exception"),
+                }
+            )
+            used += _size(entry)
+        position = entry["id"]
+    if position is None and newer:
+        position = newer[-1]["id"]
+    return {
+        "entries": entries,
+        "cursor": position,
+        "scanned": len(newer),
+        "truncated": truncated,
+        "gap": not reached,
+    }
+
+
+def read_range(
+    client: Any, service: str, filename: str, start: int, length: int
+) -> dict[str, Any]:
+    """
+    Read part of a log file, with a ``Range`` request where supported.
+
+    A negative ``start`` reads the last ``-start`` bytes. Servers that ignore
+    the range answer with the whole file, which is then sliced locally.
+
+    Returns:
+        Dict: The ``data`` bytes (to the end of the file when the server sent
+        it whole), the ``start`` offset they begin at, the file ``size``
+        (``None`` if unknown) and whether the server ``ranged``.
+    """
+    wanted = f"bytes={start}" if start < 0 else f"bytes={start}-{start + length - 1}"
+    response = client.request_raw(
+        "GET",
+        f"{LOG_SERVICES[service]}/log/file/{quote(filename)}",
+        headers={"Range": wanted},
+    )
+    if response.status_code == 416:
+        match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+        size = int(match.group(2)) if match and match.group(2) != "*" else None
+        return {"data": b"", "start": start, "size": size, "ranged": True}
+    if response.status_code >= 400:
+        raise Exception(f"API error: {response.status_code} - {response.text}")
+    body = response.content
+    if response.status_code == 206:
+        match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+        first = int(match.group(1)) if match and match.group(1) else max(start, 0)
+        size = int(match.group(2)) if match and match.group(2) != "*" else None
+        return {"data": body, "start": first, "size": size, "ranged": True}
+    size = len(body)
+    first = max(size + start, 0) if start < 0 else min(start, size)
+    return {"data": body[first:], "start": first, "size": size, "ranged": False}
+
+
+def current_log_file(client: Any) -> str:
+    """Name of the most recently written log file."""
+    files = [f for f in records(client.get_log_file()) if isinstance(f, dict)]
+    if not files:
+        raise ValueError("The service lists no log files")
+    latest = max(files, key=lambda f: str(f.get("lastWriteTime") or ""))
+    return str(latest.get("filename"))
+
+
+def _lines(data: bytes, start: int) -> Iterator[tuple[str, int, int]]:
+    """Complete lines of ``data`` with their start and end byte offsets."""
+    offset = 0
+    while True:
+        newline = data.find(b"\n", offset)
+        if newline < 0:
+            return
+        line = data[offset:newline].rstrip(b"\r").decode("utf-8", "replace")
+        yield line, start + offset, start + newline + 1
+        offset = newline + 1
+
+
+def tail_file(
+    client: Any,
+    service: str,
+    filename: str,
+    cursor: int | None,
+    log_filter: LogFilter | None = None,
+    limit: int = 200,
+    max_bytes: int = 65536,
+    initial_bytes: int = 65536,
+    chunk_size: int = 262144,
+    max_download: int = 4194304,
+) -> dict[str, Any]:
+    """
+    Return log file entries after byte offset ``cursor``, oldest first.
+
+    Without a cursor only the last ``initial_bytes`` of the file are read. A
+    file smaller than the cursor was rotated and is read from the start.
+    Continuation lines (stack traces) are folded into the entry above them.
+
+    Args:
+        client (Any): Sonarr/Radarr/Lidarr/Prowlarr/Chaptarr API client.
+        service (str): Key of :data:`LOG_SERVICES` for the client.
+        filename (str): Log file name, e.g. from :func:`current_log_file`.
+        cursor (Optional[int]): Byte offset already consumed.
+        log_filter (Optional[LogFilter]): Entries that do not match are skipped.
+        limit (int): Maximum entries returned.
+        max_bytes (int): Approximate cap on the returned text.
+        initial_bytes (int): Tail size read when there is no cursor yet.
+        chunk_size (int): Bytes per range request.
+        max_download (int): Bytes downloaded per call before stopping early.
+
+    Returns:
+        Dict: ``entries``, the new ``cursor`` offset, file ``size``,
+        ``downloaded`` bytes, whether the server ``ranged``, ``rotated`` and
+        ``truncated``.
+    """
+    log_filter = log_filter or LogFilter()
+    rotated = False
+    if cursor is None:
+        part = read_range(client, service, filename, -initial_bytes, initial_bytes)
+        skip_partial = part["start"] > 0
+    else:
+        part = read_range(client, service, filename, cursor, chunk_size)
+        if part["size"] is not None and part["size"] < cursor:
+            rotated = True
+            part = read_range(client, service, filename, 0, chunk_size)
+        skip_partial = False
+
+    entries: list[dict[str, Any]] = []
+    used = 0
+    downloaded = 0
+    truncated = False
+    pending: dict[str, Any] | None = None
+    position = part["start"]
+
+    def flush(entry: dict[str, Any]) -> bool:
+        """Emit a finished entry; False when a cap stops the tail before it."""
+        nonlocal used, position
+        if log_filter.matches(entry):
+            if len(entries) >= limit or used + _size(entry) > max_bytes and entries:
+                return False
+            used += _size(entry)
+            entries.append({k: v for k, v in entry.items() if k != "end"})
+        position = entry["end"]
+        return True
+
+    while True:
+        data = part["data"]
+        downloaded += len(data)
+        consumed = part["start"]
+        for line, _, end in _lines(data, part["start"]):
+            consumed = end
+            if skip_partial:
+                skip_partial = False
+                position = end
+                continue
+            match = _LINE.match(line)
+            if match is None and pending is not None:
+                pending["message"] += "\n" + line
+                pending["end"] = end
+                continue
+            if pending is not None and not flush(pending):
+                truncated = True
+                pending = None
+                break
+            if match is None:
+                pending = {"time": None, "level": None, "logger": None}
+                pending.update(message=line, end=end)
+            else:
+                when, level, logger, message = match.groups()
+                pending = {
+                    "time": when,
+                    "level": level.lower(),
+                    "logger": logger,
+                    "message": message,
+                    "end": end,
+                }
+        if truncated:
+            break
+        size = part["size"]
+        at_end = (
+            not part["ranged"]
+            or not data
+            or (size is not None and part["start"] + len(data) >= size)
+        )
+        if at_end or downloaded >= max_download:
+            truncated = not at_end
+            break
+        # A line longer than a chunk: read further from the same offset.
+        length = chunk_size if consumed > part["start"] else len(data) + chunk_size
+        part = read_range(client, service, filename, consumed, length)
+    if pending is not None and not truncated and not flush(pending):
+        truncated = True
+    return {
+        "entries": entries,
+        "cursor": position,
+        "size": part["size"],
+        "downloaded": downloaded,
+        "ranged": part["ranged"],
+        "rotated": rotated,
+        "truncated": truncated,
+    }
@@ -2,25 +2,66 @@
 
 Mirrors the gitlab-api / servicenow-api layout: each service exposes a
 ``register_<svc>_tools(mcp)`` that registers one condensed action-routed tool.
+Cross-service library tools follow the same ``register_<domain>_tools`` shape.
 ``mcp_server.get_mcp_instance`` discovers these via ``register_tool_surface``.
 
 CONCEPT:ECO-4.82 — gitlab-style organized per-service tool surface.
 """
 
+from arr_mcp.mcp.mcp_actions import register_actions_tools
+from arr_mcp.mcp.mcp_audit import register_audit_tools
+from arr_mcp.mcp.mcp_backlog import register_backlog_tools
 from arr_mcp.mcp.mcp_bazarr import register_bazarr_tools
+from arr_mcp.mcp.mcp_bulkadd import register_bulkadd_tools
+from arr_mcp.mcp.mcp_bulkedit import register_bulkedit_tools
+from arr_mcp.mcp.mcp_cache import register_cache_tools
 from arr_mcp.mcp.mcp_chaptarr import register_chaptarr_tools
+from arr_mcp.mcp.mcp_commands import register_commands_tools
+from arr_mcp.mcp.mcp_export import register_export_tools
+from arr_mcp.mcp.mcp_history import register_history_tools
 from arr_mcp.mcp.mcp_lidarr import register_lidarr_tools
+from arr_mcp.mcp.mcp_logs import register_logs_tools
+from arr_mcp.mcp.mcp_owned import register_owned_tools
 from arr_mcp.mcp.mcp_prowlarr import register_prowlarr_tools
+from arr_mcp.mcp.mcp_queue import register_queue_tools
 from arr_mcp.mcp.mcp_radarr import register_radarr_tools
+from arr_mcp.mcp.mcp_requests import register_requests_tools
+from arr_mcp.mcp.mcp_results import register_results_tools
+from arr_mcp.mcp.mcp_search import register_search_tools
 from arr_mcp.mcp.mcp_seerr import register_seerr_tools
+from arr_mcp.mcp.mcp_snapshot import register_snapshot_tools
 from arr_mcp.mcp.mcp_sonarr import register_sonarr_tools
+from arr_mcp.mcp.mcp_stats import register_stats_tools
+from arr_mcp.mcp.mcp_subtitles import register_subtitles_tools
+from arr_mcp.mcp.mcp_sync import register_sync_tools
+from arr_mcp.mcp.mcp_triage import register_triage_tools
 
 __all__ = [
+    "register_actions_tools",
+    "register_audit_tools",
+    "register_backlog_tools",
     "register_bazarr_tools",
+    "register_bulkadd_tools",
+    "register_bulkedit_tools",
+    "register_cache_tools",
     "register_chaptarr_tools",
+    "register_commands_tools",
+    "register_export_tools",
+    "register_history_tools",
     "register_lidarr_tools",
+    "register_logs_tools",
+    "register_owned_tools",
     "register_prowlarr_tools",
+    "register_queue_tools",
     "register_radarr_tools",
+    "register_requests_tools",
+    "register_results_tools",
+    "register_search_tools",
     "register_seerr_tools",
+    "register_snapshot_tools",
     "register_sonarr_tools",
+    "register_stats_tools",
+    "register_subtitles_tools",
+    "register_sync_tools",
+    "register_triage_tools",
 ]
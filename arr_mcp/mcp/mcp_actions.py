@@ -0,0 +1,27 @@
+"""Ranked action search MCP tool.
+
+CONCEPT:ARR-023 — Action Search
+"""
+
+from typing import Any
+
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp import action_index
+
+
+def register_actions_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"actions"})
+    async def find_action(
+        service: str = Field(
+            description="Service whose actions to search: sonarr, radarr, lidarr, prowlarr, bazarr, seerr or chaptarr.",
+        ),
+        query: str = Field(
+            description="What the action should do, e.g. 'delete episode file' or 'list quality profiles', or an approximate action name.",
+        ),
+        top_k: int = Field(default=5, description="Number of matches to return."),
+    ) -> Any:
+        """Search a service's actions by name, description, endpoint and parameters, returning the best matches with their signatures."""
+        return await run_blocking(action_index.find_action, service, query, top_k)
@@ -0,0 +1,40 @@
+"""Cross-service consistency audit MCP tool.
+
+CONCEPT:ARR-016 — Consistency Auditor
+"""
+
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp.audit import audit
+from arr_mcp.auth import get_clients
+
+
+def register_audit_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"audit"})
+    async def audit_stack(
+        checks: str = Field(
+            default="all",
+            description="Comma-separated checks: bazarr (library items missing from Bazarr), indexers (Prowlarr indexers absent or disabled in synced apps), tags (labels used on one service but missing on another), root_folders (inaccessible or low on space), or 'all'.",
+        ),
+        min_free_gb: float | None = Field(
+            default=None,
+            description="Flag root folders with less free space than this; defaults to AUDIT_MIN_FREE_GB.",
+        ),
+    ) -> Any:
+        """Find drift across Sonarr, Radarr, Lidarr, Chaptarr, Bazarr and Prowlarr in one report, fetching each listing once and comparing locally."""
+        return await run_blocking(
+            audit,
+            get_clients(),
+            checks=None
+            if checks == "all"
+            else [c.strip().lower() for c in checks.split(",") if c.strip()],
+            min_free_gb=min_free_gb
+            if min_free_gb is not None
+            else setting("AUDIT_MIN_FREE_GB", 10.0),
+            concurrency=setting("AUDIT_CONCURRENCY", 8),
+        )
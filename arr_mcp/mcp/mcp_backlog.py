@@ -0,0 +1,83 @@
+"""Budgeted background backlog search MCP tool.
+
+CONCEPT:ARR-012 — Backlog Search Scheduler
+"""
+
+import threading
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.core.paths import data_dir
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp import workers
+from arr_mcp.auth import get_clients
+from arr_mcp.search_scheduler import SEARCH_COMMANDS, SearchScheduler
+
+_scheduler: SearchScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+BACKLOG_ACTIONS = ("status", "start", "stop", "reset")
+
+
+def get_scheduler() -> SearchScheduler:
+    """Get the process-wide backlog search scheduler, creating it on first use."""
+    global _scheduler
+    workers.require_single_worker("backlog_search")
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SearchScheduler(
+                setting(
+                    "BACKLOG_SEARCH_PATH",
+                    str(data_dir() / "arr-mcp" / "backlog.sqlite3"),
+                ),
+                get_clients(list(SEARCH_COMMANDS)),
+                budget_per_hour=setting("BACKLOG_SEARCH_BUDGET", 60),
+                batch_size=setting("BACKLOG_SEARCH_BATCH", 10),
+                interval=setting("BACKLOG_SEARCH_INTERVAL", 60.0),
+                cycle_interval=setting("BACKLOG_SEARCH_CYCLE", 86400.0),
+            )
+    return _scheduler
+
+
+def _split(value: str) -> list[str] | None:
+    if value == "all":
+        return None
+    return [v.strip().lower() for v in value.split(",") if v.strip()]
+
+
+def register_backlog_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"backlog"})
+    async def backlog_search(
+        action: str = Field(
+            default="status",
+            description="'status' to report progress, 'start' to begin or resume, 'stop' to pause, 'reset' to rewind to the top of the list.",
+        ),
+        services: str = Field(
+            default="all",
+            description="Comma-separated services (sonarr, radarr, lidarr, chaptarr) or 'all'.",
+        ),
+        kinds: str = Field(
+            default="all",
+            description="Comma-separated wanted lists to work through: 'missing', 'cutoff' or 'all'.",
+        ),
+    ) -> Any:
+        """Search the wanted/missing and cutoff-unmet backlogs in the background within an hourly indexer budget, resuming from saved checkpoints."""
+        if action not in BACKLOG_ACTIONS:
+            raise ValueError(
+                f"Unknown action '{action}'; expected one of {', '.join(BACKLOG_ACTIONS)}"
+            )
+        scheduler = get_scheduler()
+        wanted, lists = _split(services), _split(kinds)
+        if action == "start":
+            await run_blocking(scheduler.start, wanted, lists)
+        elif action == "stop":
+            await run_blocking(scheduler.stop, wanted, lists)
+        elif action == "reset":
+            await run_blocking(scheduler.reset, wanted, lists)
+        # Jobs left running by a previous server process resume on first use.
+        if await run_blocking(scheduler.has_running_jobs):
+            scheduler.ensure_running()
+        return await run_blocking(scheduler.status)
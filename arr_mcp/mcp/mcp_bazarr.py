@@ -4,29 +4,30 @@
 """
 
 import json
-from typing import Any
+from typing import Annotated, Any
 
-from agent_utilities.mcp_utilities import dispatch, run_blocking
+from agent_utilities.mcp_utilities import run_blocking
 from fastmcp import FastMCP
 from pydantic import Field
 
 from arr_mcp.auth import get_bazarr_client
+from arr_mcp.mcp.routing import INSTANCE_DESCRIPTION, run_action
 
 
 def register_bazarr_tools(mcp: FastMCP) -> None:
     @mcp.tool(tags={"bazarr"})
     async def bazarr_action(
         action: str = Field(
-            description="The action/method name to execute on Bazarr (e.g. get_series, get_movies, get_system_status). Use action='list_actions' to discover every valid action."
+            description="The action/method name to execute on Bazarr (e.g. get_series, get_movies, get_system_status). Use find_action to search the actions by what they do, or action='list_actions' for every name."
         ),
         params_json: str = Field(
             default="{}",
             description="JSON string of parameters to pass to the action.",
         ),
+        instance: Annotated[str | None, Field(description=INSTANCE_DESCRIPTION)] = None,
     ) -> Any:
         """Execute any Bazarr API action."""
-        client = get_bazarr_client()
         kwargs = {k: v for k, v in json.loads(params_json).items() if v is not None}
         return await run_blocking(
-            dispatch, client, action, kwargs, service="arr-bazarr"
+            run_action, get_bazarr_client, "bazarr", action, kwargs, instance
         )
@@ -0,0 +1,61 @@
+"""Bulk add MCP tool.
+
+CONCEPT:ARR-007 — Bulk Add Pipeline
+"""
+
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp import bulk_add as bulk_add_engine
+from arr_mcp.auth import CLIENT_FACTORIES
+
+
+def register_bulkadd_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"bulkadd"})
+    async def bulk_add(
+        service: str = Field(
+            description="Service to add to: radarr, sonarr, lidarr or chaptarr."
+        ),
+        terms: list[str] = Field(
+            description="Titles or ids to add, e.g. ['Heat 1995', 'tmdb:603', 'tt0133093', 'tvdb:81189', 'lidarr:<mbid>']."
+        ),
+        quality_profile_id: int = Field(
+            description="Quality profile id applied to every added entry."
+        ),
+        root_folder_path: str = Field(
+            description="Root folder path applied to every added entry."
+        ),
+        metadata_profile_id: int | None = Field(
+            default=None,
+            description="Lidarr/Chaptarr metadata profile id; defaults to the first configured profile.",
+        ),
+        monitored: bool = Field(default=True, description="Monitor added entries."),
+        search: bool = Field(
+            default=False, description="Search for each entry once it is added."
+        ),
+    ) -> Any:
+        """Add many titles at once: concurrent lookups, owned and duplicate titles skipped, bulk import where supported."""
+        service = service.strip().lower()
+        if service not in bulk_add_engine.ADD_TARGETS:
+            raise ValueError(
+                f"Bulk add supports {', '.join(bulk_add_engine.ADD_TARGETS)}, "
+                f"not '{service}'"
+            )
+        client = CLIENT_FACTORIES[service]()
+        return await run_blocking(
+            bulk_add_engine.bulk_add,
+            service,
+            client,
+            terms,
+            quality_profile_id,
+            root_folder_path,
+            metadata_profile_id=metadata_profile_id,
+            monitored=monitored,
+            search=search,
+            concurrency=setting("BULK_ADD_CONCURRENCY", 8),
+            chunk_size=setting("BULK_ADD_CHUNK_SIZE", 100),
+        )
@@ -0,0 +1,120 @@
+"""Filtered bulk editor MCP tool.
+
+CONCEPT:ARR-011 — Bulk Editor
+"""
+
+import json
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp import bulk_edit as bulk_edit_engine
+from arr_mcp.auth import CLIENT_FACTORIES
+
+
+def register_bulkedit_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"bulkedit"})
+    async def bulk_edit(
+        service: str = Field(description="radarr, sonarr, lidarr or chaptarr."),
+        entity: str | None = Field(
+            default=None,
+            description="Item kind: movie, series, artist or author (the default for the service), or episode, album or book for monitor-only edits.",
+        ),
+        tags: list[str] | None = Field(
+            default=None, description="Match items carrying any of these tag labels."
+        ),
+        quality_profile: str | None = Field(
+            default=None,
+            description="Match items using this quality profile (name or id).",
+        ),
+        root_folder: str | None = Field(
+            default=None, description="Match items under this root folder path."
+        ),
+        year_from: int | None = Field(
+            default=None, description="Match items released in or after this year."
+        ),
+        year_to: int | None = Field(
+            default=None, description="Match items released in or before this year."
+        ),
+        monitored: bool | None = Field(
+            default=None,
+            description="Match only monitored (true) or unmonitored (false) items.",
+        ),
+        ids: list[int] | None = Field(
+            default=None, description="Match only these item ids."
+        ),
+        seasons: list[int] | None = Field(
+            default=None, description="Episodes only: restrict to these season numbers."
+        ),
+        set_monitored: bool | None = Field(
+            default=None,
+            description="Monitor (true) or unmonitor (false) the matched items.",
+        ),
+        set_quality_profile: str | None = Field(
+            default=None, description="New quality profile (name or id)."
+        ),
+        set_root_folder: str | None = Field(
+            default=None, description="New root folder path."
+        ),
+        move_files: bool = Field(
+            default=False,
+            description="Move existing files when changing the root folder.",
+        ),
+        tag_labels: list[str] | None = Field(
+            default=None,
+            description="Tags to apply; labels that do not exist are created.",
+        ),
+        tag_mode: str = Field(
+            default="add", description="How tag_labels apply: add, remove or replace."
+        ),
+        extra_json: str = Field(
+            default="{}",
+            description='Other editor fields as JSON, e.g. {"minimumAvailability": "released"} or {"metadataProfileId": 2}.',
+        ),
+        dry_run: bool = Field(
+            default=False,
+            description="Report how many items match and would change without writing.",
+        ),
+    ) -> Any:
+        """Bulk monitor/unmonitor, retag, move or re-profile library items selected by a local filter, in a few chunked editor requests."""
+        service = service.strip().lower()
+        if service not in bulk_edit_engine.PRIMARY_ENTITY:
+            raise ValueError(
+                f"Bulk edit supports {', '.join(bulk_edit_engine.PRIMARY_ENTITY)}, "
+                f"not '{service}'"
+            )
+        criteria = bulk_edit_engine.ItemFilter(
+            tags=tags or [],
+            quality_profile=quality_profile,
+            root_folder=root_folder,
+            year_from=year_from,
+            year_to=year_to,
+            monitored=monitored,
+            ids=ids or [],
+            seasons=seasons or [],
+        )
+        changes: dict[str, Any] = json.loads(extra_json or "{}")
+        if set_monitored is not None:
+            changes["monitored"] = set_monitored
+        if set_quality_profile is not None:
+            changes["qualityProfileId"] = set_quality_profile
+        if set_root_folder is not None:
+            changes["rootFolderPath"] = set_root_folder
+            changes["moveFiles"] = move_files
+        if tag_labels:
+            changes["tags"] = tag_labels
+            changes["applyTags"] = tag_mode
+        client = CLIENT_FACTORIES[service]()
+        return await run_blocking(
+            bulk_edit_engine.bulk_edit,
+            service,
+            client,
+            criteria,
+            changes,
+            entity=entity,
+            chunk_size=setting("BULK_EDIT_CHUNK_SIZE", 500),
+            dry_run=dry_run,
+        )
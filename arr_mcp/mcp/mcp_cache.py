@@ -0,0 +1,43 @@
+"""Response cache statistics MCP tool.
+
+CONCEPT:ARR-005 — Response Cache
+"""
+
+from typing import Any
+
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp import auth
+
+
+def cache_report(clear: str | None = None) -> dict[str, Any]:
+    """Cache store and per-namespace stats, after clearing ``clear`` if given.
+
+    The ``search`` namespace also carries the release search cache's
+    bypasses and its hits and misses per indexer.
+    """
+    auth.get_response_cache()
+    if clear:
+        auth.clear_cache(clear)
+    report = auth.cache_stats()
+    search_cache = auth.get_search_cache()
+    if search_cache is not None:
+        search = search_cache.stats()
+        report["namespaces"].setdefault("search", {}).update(
+            bypassed=search["bypassed"], indexers=search["indexers"]
+        )
+    return report
+
+
+def register_cache_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"cache"})
+    async def cache_stats(
+        clear: str | None = Field(
+            default=None,
+            description="Namespace to empty first: lookup (metadata lookups), search (release searches) or seerr (Seerr details).",
+        ),
+    ) -> Any:
+        """Show the response cache backend, its size and evictions, hits, misses and TTL per namespace, and release search hits per indexer."""
+        return await run_blocking(cache_report, clear)
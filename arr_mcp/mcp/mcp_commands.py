@@ -0,0 +1,66 @@
+"""Command completion waiter MCP tool.
+
+CONCEPT:ARR-009 — Command Waiter
+"""
+
+import logging
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import Context, FastMCP
+from pydantic import Field
+
+from arr_mcp import commands
+from arr_mcp.auth import CLIENT_FACTORIES
+from arr_mcp.mcp.progress import threadsafe_reporter
+
+logger = logging.getLogger(__name__)
+
+COMMAND_SERVICES = ("sonarr", "radarr", "lidarr", "chaptarr", "prowlarr")
+
+
+def register_commands_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"commands"})
+    async def wait_for_commands(
+        service: str = Field(
+            description="Service the commands were posted to: sonarr, radarr, lidarr, chaptarr or prowlarr."
+        ),
+        command_ids: list[int] = Field(
+            description="Command ids returned by post_command."
+        ),
+        timeout: float | None = Field(
+            default=None,
+            description="Seconds to wait before returning with commands still pending; defaults to COMMAND_WAIT_TIMEOUT.",
+        ),
+        ctx: Context | None = None,
+    ) -> Any:
+        """Wait for queued commands (RescanSeries, RefreshMovie, MissingEpisodeSearch, ...) to finish, polling one command listing per tick."""
+        service = service.strip().lower()
+        if service not in COMMAND_SERVICES:
+            raise ValueError(
+                f"Commands are tracked for {', '.join(COMMAND_SERVICES)}, "
+                f"not '{service}'"
+            )
+        client = CLIENT_FACTORIES[service]()
+        report = threadsafe_reporter(ctx, logger)
+
+        def on_progress(finished: int, total: int, state: dict) -> None:
+            if report is None:
+                return
+            running = [
+                f"{c.get('name', cid)} {c.get('status')}"
+                for cid, c in state.items()
+                if str(c.get("status", "")).lower() not in commands.FINISHED_STATUSES
+            ]
+            report(finished, total, "; ".join(running) or "all commands finished")
+
+        return await run_blocking(
+            commands.wait_for_commands,
+            client,
+            command_ids,
+            timeout=timeout or setting("COMMAND_WAIT_TIMEOUT", 300.0),
+            interval=setting("COMMAND_POLL_INTERVAL", 1.0),
+            max_interval=setting("COMMAND_POLL_MAX_INTERVAL", 15.0),
+            on_progress=on_progress if report is not None else None,
+        )
@@ -0,0 +1,163 @@
+"""Streaming export MCP tool and ``arr-mcp export`` command.
+
+CONCEPT:ARR-018 — Streaming Export
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from collections.abc import Callable
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.core.paths import data_dir
+from agent_utilities.mcp_utilities import load_config, run_blocking
+from fastmcp import Context, FastMCP
+from pydantic import Field
+
+from arr_mcp import export
+from arr_mcp.auth import CLIENT_FACTORIES
+from arr_mcp.mcp.progress import threadsafe_reporter
+
+logger = logging.getLogger(__name__)
+
+
+def export_dir() -> str:
+    """Directory exports are written to unless a full path is given."""
+    return os.path.expanduser(
+        setting("EXPORT_DIR", str(data_dir() / "arr-mcp" / "exports"))
+    )
+
+
+def _fields(value: str | None) -> list[str] | None:
+    return [f.strip() for f in (value or "").split(",") if f.strip()] or None
+
+
+def export_dataset(
+    service: str,
+    dataset: str,
+    path: str | None = None,
+    fmt: str = "ndjson",
+    fields: list[str] | None = None,
+    compression: str = "none",
+    since: str | None = None,
+    on_progress: Callable[[int, int, str | None], None] | None = None,
+) -> dict[str, Any]:
+    """Export one dataset of one configured service to ``path`` (or a default)."""
+    service, dataset = service.strip().lower(), dataset.strip().lower()
+    if service not in CLIENT_FACTORIES:
+        raise ValueError(
+            f"Unknown service '{service}'; expected one of {', '.join(CLIENT_FACTORIES)}"
+        )
+    rows = export.iter_records(
+        CLIENT_FACTORIES[service](),
+        service,
+        dataset,
+        since=since,
+        page_size=setting("EXPORT_PAGE_SIZE", 1000),
+    )
+    return export.export(
+        rows,
+        path or export.default_path(export_dir(), service, dataset, fmt, compression),
+        fmt=fmt,
+        fields=fields,
+        compression=compression,
+        batch_size=setting("EXPORT_BATCH_SIZE", 5000),
+        schema_sample=setting("EXPORT_SCHEMA_SAMPLE", 10000),
+        on_progress=on_progress,
+    )
+
+
+def export_cli(argv: list[str] | None = None) -> int:
+    """Entry point of ``arr-mcp export SERVICE DATASET [options]``."""
+    parser = argparse.ArgumentParser(
+        prog="arr-mcp export",
+        description="Stream a library, history or request list to a file.",
+    )
+    services = sorted({s for names in export.DATASETS.values() for s in names})
+    parser.add_argument("service", choices=services)
+    parser.add_argument("dataset", choices=sorted(export.DATASETS))
+    parser.add_argument("-o", "--output", help="output file (default: timestamped)")
+    parser.add_argument("-f", "--format", choices=export.FORMATS, default="ndjson")
+    parser.add_argument(
+        "-c", "--compression", choices=export.COMPRESSIONS, default="none"
+    )
+    parser.add_argument(
+        "--fields", help="comma-separated dotted fields, e.g. id,title,quality.name"
+    )
+    parser.add_argument("--since", help="only history after this ISO date")
+    args = parser.parse_args(argv)
+
+    load_config()
+
+    def report(rows: int, _total: int, _message: str | None) -> None:
+        print(f"\r{rows} rows", end="", file=sys.stderr, flush=True)
+
+    try:
+        result = export_dataset(
+            args.service,
+            args.dataset,
+            path=args.output,
+            fmt=args.format,
+            fields=_fields(args.fields),
+            compression=args.compression,
+            since=args.since,
+            on_progress=report if sys.stderr.isatty() else None,
+        )
+    except Exception as e:
+        print(f"export failed: {e}", file=sys.stderr)
+        return 1
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+    print(json.dumps(result))
+    return 0
+
+
+def register_export_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"export"})
+    async def export_records(
+        service: str = Field(
+            description="Service to export from: sonarr, radarr, lidarr, chaptarr (library/history), prowlarr (history) or seerr (requests).",
+        ),
+        dataset: str = Field(
+            default="library",
+            description="What to export: library, history or requests.",
+        ),
+        filename: str | None = Field(
+            default=None,
+            description="File name inside the export directory; timestamped by default.",
+        ),
+        format: str = Field(
+            default="ndjson", description="Output format: ndjson, csv or parquet."
+        ),
+        fields: str | None = Field(
+            default=None,
+            description="Comma-separated dotted fields to keep, e.g. 'id,title,year,statistics.sizeOnDisk'. All fields by default.",
+        ),
+        compression: str = Field(
+            default="none",
+            description="none, gzip or zstd (for parquet: the column codec).",
+        ),
+        since: str | None = Field(
+            default=None,
+            description="For history: only events after this ISO date, e.g. 2024-01-01.",
+        ),
+        ctx: Context | None = None,
+    ) -> Any:
+        """Stream a library, history or request list to an NDJSON, CSV or Parquet file and return the file path and row count."""
+        path = None
+        if filename:
+            path = os.path.join(export_dir(), os.path.basename(filename))
+        return await run_blocking(
+            export_dataset,
+            service,
+            dataset,
+            path=path,
+            fmt=format.strip().lower(),
+            fields=_fields(fields),
+            compression=compression.strip().lower(),
+            since=since,
+            on_progress=threadsafe_reporter(ctx, logger),
+        )
@@ -0,0 +1,108 @@
+"""History archive MCP tool.
+
+CONCEPT:ARR-019 — History Archive
+"""
+
+import threading
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.core.paths import data_dir
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp.auth import get_clients
+from arr_mcp.history_archive import ENTITY_FIELDS, HistoryArchive
+
+_archive: HistoryArchive | None = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> HistoryArchive:
+    """Get the process-wide history archive, creating it on first use."""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = HistoryArchive(
+                setting(
+                    "HISTORY_ARCHIVE_PATH",
+                    str(data_dir() / "arr-mcp" / "history.sqlite3"),
+                )
+            )
+    return _archive
+
+
+def _split(value: str | None) -> list[str] | None:
+    if not value:
+        return None
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def _query(sync: bool, **filters: Any) -> dict[str, Any]:
+    archive = get_archive()
+    report = None
+    if sync:
+        report = archive.sync(
+            get_clients(list(ENTITY_FIELDS)),
+            backfill_days=setting("HISTORY_ARCHIVE_BACKFILL_DAYS", 90),
+            min_interval=setting("HISTORY_ARCHIVE_SYNC_INTERVAL", 300.0),
+        )
+    result = archive.query(**filters)
+    if report is not None:
+        result["sync"] = report
+    result["archive"] = archive.stats()
+    return result
+
+
+def register_history_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"history"})
+    async def history_query(
+        services: str | None = Field(
+            default=None,
+            description="Comma-separated services (sonarr, radarr, lidarr, chaptarr, prowlarr); all by default.",
+        ),
+        event_types: str | None = Field(
+            default=None,
+            description="Comma-separated event types, e.g. 'grabbed', 'downloadFailed', 'downloadFolderImported', 'releaseGrabbed'.",
+        ),
+        entity_id: int | None = Field(
+            default=None,
+            description="Series, movie, artist, author (or, for Prowlarr, indexer) id.",
+        ),
+        indexer: str | None = Field(default=None, description="Indexer name."),
+        download_id: str | None = Field(
+            default=None, description="Download client id of a release."
+        ),
+        release_group: str | None = Field(default=None, description="Release group."),
+        since: str | None = Field(
+            default=None, description="Only events on or after this ISO date."
+        ),
+        until: str | None = Field(
+            default=None, description="Only events before this ISO date."
+        ),
+        group_by: str | None = Field(
+            default=None,
+            description="Comma-separated keys to count by instead of listing events: service, event_type, indexer, release_group, quality, entity_id, download_client, day, month.",
+        ),
+        limit: int = Field(default=100, description="Maximum events or groups."),
+        sync: bool = Field(
+            default=True,
+            description="Pull new events from the services first (at most every HISTORY_ARCHIVE_SYNC_INTERVAL seconds).",
+        ),
+    ) -> Any:
+        """Query the local append-only archive of *arr and Prowlarr history, e.g. grabs per indexer over 90 days or failed downloads by release group."""
+        return await run_blocking(
+            _query,
+            sync,
+            services=_split(services),
+            event_types=_split(event_types),
+            entity_id=entity_id,
+            indexer=indexer,
+            download_id=download_id,
+            release_group=release_group,
+            since=since,
+            until=until,
+            group_by=_split(group_by),
+            limit=limit,
+        )
@@ -0,0 +1,131 @@
+"""Incremental log tailing MCP tool.
+
+CONCEPT:ARR-020 — Log Tail
+"""
+
+import threading
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.core.paths import data_dir
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp import log_tail
+from arr_mcp.auth import CLIENT_FACTORIES
+
+_cursors: log_tail.CursorStore | None = None
+_cursors_lock = threading.Lock()
+
+
+def get_cursor_store() -> log_tail.CursorStore:
+    """Get the process-wide log cursor store, creating it on first use."""
+    global _cursors
+    with _cursors_lock:
+        if _cursors is None:
+            _cursors = log_tail.CursorStore(
+                setting(
+                    "LOG_TAIL_CURSORS_PATH",
+                    str(data_dir() / "arr-mcp" / "log_cursors.sqlite3"),
+                )
+            )
+    return _cursors
+
+
+def tail(
+    service: str,
+    source: str = "entries",
+    filename: str | None = None,
+    log_filter: log_tail.LogFilter | None = None,
+    limit: int = 200,
+    cursor: int | None = None,
+    reset: bool = False,
+) -> dict[str, Any]:
+    """Tail one service's log table or log file from its saved (or given) cursor."""
+    service = service.strip().lower()
+    if service not in log_tail.LOG_SERVICES:
+        raise ValueError(
+            f"Cannot tail logs of '{service}'; expected one of "
+            f"{', '.join(log_tail.LOG_SERVICES)}"
+        )
+    if source not in ("entries", "file"):
+        raise ValueError(f"source must be entries or file, not '{source}'")
+    store = get_cursor_store()
+    client = CLIENT_FACTORIES[service]()
+    max_bytes = setting("LOG_TAIL_MAX_BYTES", 65536)
+    if source == "file":
+        filename = filename or log_tail.current_log_file(client)
+        key = f"file:{filename}"
+    else:
+        key = "entries"
+    start = cursor
+    if start is None and not reset:
+        start = store.get(service, key)
+    if source == "file":
+        result = log_tail.tail_file(
+            client,
+            service,
+            filename or "",
+            start,
+            log_filter,
+            limit=limit,
+            max_bytes=max_bytes,
+            chunk_size=setting("LOG_TAIL_CHUNK_BYTES", 262144),
+        )
+        result["filename"] = filename
+    else:
+        result = log_tail.tail_entries(
+            client, start, log_filter, limit=limit, max_bytes=max_bytes
+        )
+    if result["cursor"] is not None:
+        store.set(service, key, result["cursor"])
+    return {"service": service, "source": source, **result}
+
+
+def register_logs_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"logs"})
+    async def tail_logs(
+        service: str = Field(
+            description="Service whose log to tail: sonarr, radarr, lidarr, prowlarr or chaptarr.",
+        ),
+        source: str = Field(
+            default="entries",
+            description="'entries' for the log table (get_log) or 'file' for a log file read with range requests.",
+        ),
+        filename: str | None = Field(
+            default=None,
+            description="Log file to tail when source is 'file'; the most recently written file by default.",
+        ),
+        level: str | None = Field(
+            default=None,
+            description="Minimum level: trace, debug, info, warn, error or fatal.",
+        ),
+        logger: str | None = Field(
+            default=None, description="Only entries whose logger contains this text."
+        ),
+        pattern: str | None = Field(
+            default=None,
+            description="Only entries whose message or exception matches this regular expression.",
+        ),
+        limit: int = Field(default=200, description="Maximum entries returned."),
+        cursor: int | None = Field(
+            default=None,
+            description="Resume from this cursor (entry id or byte offset) instead of the saved one.",
+        ),
+        reset: bool = Field(
+            default=False,
+            description="Ignore the saved cursor and start again from the most recent entries.",
+        ),
+    ) -> Any:
+        """Return only the log entries written since the last call for a service, filtered by level, logger and regex, with output capped."""
+        return await run_blocking(
+            tail,
+            service,
+            source=source.strip().lower(),
+            filename=filename,
+            log_filter=log_tail.LogFilter(level=level, logger=logger, pattern=pattern),
+            limit=limit,
+            cursor=cursor,
+            reset=reset,
+        )
@@ -0,0 +1,51 @@
+"""Owned-media fuzzy finder MCP tool.
+
+CONCEPT:ARR-004 — Owned Media Index
+"""
+
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp import owned_index
+from arr_mcp.auth import get_clients
+
+
+def register_owned_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"owned"})
+    async def find_owned(
+        query: str = Field(
+            description="Title fragment (optionally with a year, e.g. 'dune 2021') or an external id such as 'tmdb:438631', 'goodreads:13651', 'tt1160419' or a MusicBrainz id."
+        ),
+        services: str = Field(
+            default="all",
+            description="Comma-separated services to search (radarr, sonarr, lidarr, chaptarr) or 'all'.",
+        ),
+        limit: int = Field(default=10, description="Maximum matches to return."),
+        fallback_lookup: bool = Field(
+            default=True,
+            description="Query the upstream metadata lookup only when nothing owned matches.",
+        ),
+        refresh: bool = Field(
+            default=False,
+            description="Rebuild the index from the libraries before searching.",
+        ),
+    ) -> Any:
+        """Find media already in the library by fuzzy title, alternate title, year or external id."""
+        clients = {
+            name: client
+            for name, client in get_clients(services).items()
+            if name in owned_index.INDEX_SOURCES
+        }
+        return await run_blocking(
+            owned_index.find_owned,
+            clients,
+            query,
+            limit=limit,
+            fallback_lookup=fallback_lookup,
+            max_age=setting("OWNED_INDEX_TTL", 900.0),
+            refresh=refresh,
+        )
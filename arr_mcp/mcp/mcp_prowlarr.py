@@ -4,29 +4,30 @@
 """
 
 import json
-from typing import Any
+from typing import Annotated, Any
 
-from agent_utilities.mcp_utilities import dispatch, run_blocking
+from agent_utilities.mcp_utilities import run_blocking
 from fastmcp import FastMCP
 from pydantic import Field
 
 from arr_mcp.auth import get_prowlarr_client
+from arr_mcp.mcp.routing import INSTANCE_DESCRIPTION, run_action
 
 
 def register_prowlarr_tools(mcp: FastMCP) -> None:
     @mcp.tool(tags={"prowlarr"})
     async def prowlarr_action(
         action: str = Field(
-            description="The action/method name to execute on Prowlarr. Use action='list_actions' to discover every valid action."
+            description="The action/method name to execute on Prowlarr. Use find_action to search the actions by what they do, or action='list_actions' for every name."
         ),
         params_json: str = Field(
             default="{}",
-            description="JSON string of parameters to pass to the action.",
+            description='JSON string of parameters to pass to the action. Add "bypass_cache": true to skip cached search/release results.',
         ),
+        instance: Annotated[str | None, Field(description=INSTANCE_DESCRIPTION)] = None,
     ) -> Any:
         """Execute any Prowlarr API action."""
-        client = get_prowlarr_client()
         kwargs = {k: v for k, v in json.loads(params_json).items() if v is not None}
         return await run_blocking(
-            dispatch, client, action, kwargs, service="arr-prowlarr"
+            run_action, get_prowlarr_client, "prowlarr", action, kwargs, instance
         )
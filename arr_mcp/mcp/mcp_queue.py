@@ -0,0 +1,62 @@
+"""Unified download queue overview MCP tool.
+
+CONCEPT:ARR-010 — Queue Snapshot
+"""
+
+import threading
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp import workers
+from arr_mcp.auth import get_clients
+from arr_mcp.queue_snapshot import QUEUE_SOURCES, QueueSnapshotter
+
+_snapshotter: QueueSnapshotter | None = None
+_snapshotter_lock = threading.Lock()
+
+
+def get_snapshotter() -> QueueSnapshotter:
+    """Get the process-wide queue snapshotter, creating it on first use."""
+    global _snapshotter
+    workers.require_single_worker("queue_overview")
+    with _snapshotter_lock:
+        if _snapshotter is None:
+            _snapshotter = QueueSnapshotter(
+                get_clients(list(QUEUE_SOURCES)),
+                interval=setting("QUEUE_SNAPSHOT_INTERVAL", 15.0),
+                idle_timeout=setting("QUEUE_SNAPSHOT_IDLE_TIMEOUT", 600.0),
+            )
+    return _snapshotter
+
+
+def register_queue_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"queue"})
+    async def queue_overview(
+        services: str = Field(
+            default="all",
+            description="Comma-separated services to include (sonarr, radarr, lidarr, chaptarr) or 'all'.",
+        ),
+        since_version: int | None = Field(
+            default=None,
+            description="Version returned by a previous call; only entries changed since then (plus removed keys) are returned.",
+        ),
+        refresh: bool = Field(
+            default=False,
+            description="Refresh every queue now instead of serving the background snapshot.",
+        ),
+    ) -> Any:
+        """Download queues of every service in one normalized snapshot (title, progress, size, ETA, status, trackedDownloadState), served from memory with optional deltas."""
+        snapshotter = get_snapshotter()
+        wanted = (
+            None
+            if services == "all"
+            else [s.strip().lower() for s in services.split(",") if s.strip()]
+        )
+        if refresh:
+            await run_blocking(snapshotter.refresh)
+        snapshotter.ensure_running()
+        return await run_blocking(snapshotter.overview, since_version, wanted)
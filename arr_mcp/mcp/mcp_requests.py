@@ -0,0 +1,42 @@
+"""Seerr request fulfillment MCP tool.
+
+CONCEPT:ARR-015 — Request Fulfillment Join
+"""
+
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp.auth import get_clients
+from arr_mcp.request_join import join_requests
+
+
+def register_requests_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"requests"})
+    async def request_fulfillment(
+        stages: str = Field(
+            default="stuck",
+            description="Comma-separated stages to list: stuck (failed, not_in_arr, unmonitored, grabbed_not_imported), pending_approval, declined, wanted, downloading, partially_available, available, unknown, or 'all'.",
+        ),
+        history_days: int = Field(
+            default=30, description="Days of Radarr/Sonarr grab history to consider."
+        ),
+    ) -> Any:
+        """Where each Seerr request stands in Radarr/Sonarr (not added, wanted, grabbed, downloading, available), from a few bulk fetches joined on tmdbId/tvdbId."""
+        clients = get_clients(["seerr", "radarr", "sonarr"])
+        if "seerr" not in clients:
+            raise RuntimeError("SEERR_BASE_URL not set")
+        return await run_blocking(
+            join_requests,
+            clients["seerr"],
+            clients.get("radarr"),
+            clients.get("sonarr"),
+            history_days=history_days,
+            stages=None
+            if stages == "all"
+            else [s.strip().lower() for s in stages.split(",") if s.strip()],
+            concurrency=setting("REQUEST_JOIN_CONCURRENCY", 4),
+        )
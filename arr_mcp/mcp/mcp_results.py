@@ -0,0 +1,75 @@
+"""Oversized result spilling and the ``fetch_more`` MCP tool.
+
+CONCEPT:ARR-021 — Result Spill
+"""
+
+import threading
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp import result_spill, workers
+
+_store: result_spill.ResultStore | result_spill.SharedResultStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_result_store() -> result_spill.ResultStore | result_spill.SharedResultStore:
+    """Get the store of spilled results, creating it on first use.
+
+    In memory for a single server process; shared through SQLite under
+    ``WORKER_STATE_PATH`` when ``MCP_WORKERS`` processes serve, so a cursor
+    can be followed from whichever worker gets the next request.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            limits = {
+                "ttl": setting("RESULT_SPILL_TTL", 900.0),
+                "max_results": setting("RESULT_SPILL_MAX_RESULTS", 64),
+                "max_bytes": setting("RESULT_SPILL_MAX_BYTES", 268435456),
+            }
+            if workers.is_multi_worker():
+                _store = result_spill.SharedResultStore(
+                    workers.state_path("results.sqlite3"), **limits
+                )
+            else:
+                _store = result_spill.ResultStore(**limits)
+    return _store
+
+
+def spill_large(result: Any) -> Any:
+    """Spill ``result`` when it is above ``RESULT_SPILL_THRESHOLD`` bytes.
+
+    Passed as the ``result_coercer`` of the action-routed tools, so the size
+    check runs on the worker thread along with the API call.
+    """
+    return result_spill.spill(
+        result,
+        get_result_store(),
+        threshold=setting("RESULT_SPILL_THRESHOLD", 262144),
+        chunk_bytes=setting("RESULT_SPILL_CHUNK_BYTES", 131072),
+    )
+
+
+def register_results_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"results"})
+    async def fetch_more(
+        cursor: str = Field(
+            description="The cursor returned with a truncated result, e.g. by radarr_action get_movie.",
+        ),
+        max_bytes: int | None = Field(
+            default=None,
+            description="Approximate size of the returned chunk; RESULT_SPILL_CHUNK_BYTES by default.",
+        ),
+    ) -> Any:
+        """Return the next chunk of a large result that was cut short, without querying the service again."""
+        return await run_blocking(
+            result_spill.fetch_more,
+            get_result_store(),
+            cursor,
+            max_bytes or setting("RESULT_SPILL_CHUNK_BYTES", 131072),
+        )
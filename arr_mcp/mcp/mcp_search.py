@@ -0,0 +1,74 @@
+"""Streaming Prowlarr fan-out search MCP tool.
+
+CONCEPT:ARR-008 — Fan-Out Release Search
+"""
+
+import logging
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import Context, FastMCP
+from pydantic import Field
+
+from arr_mcp import cache, release_search
+from arr_mcp.auth import get_prowlarr_client
+from arr_mcp.mcp.progress import threadsafe_reporter
+
+logger = logging.getLogger(__name__)
+
+
+def register_search_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"search"})
+    async def search_releases(
+        query: str = Field(description="Release search term."),
+        indexer_ids: list[int] | None = Field(
+            default=None,
+            description="Prowlarr indexer ids to query; all enabled indexers when omitted.",
+        ),
+        type: str = Field(
+            default="search",
+            description="Prowlarr search type: search, movie, tvsearch, music or book.",
+        ),
+        categories: list[int] | None = Field(
+            default=None, description="Newznab category ids to restrict to."
+        ),
+        limit: int = Field(default=50, description="Ranked releases to return."),
+        timeout: float | None = Field(
+            default=None,
+            description="Seconds an indexer may take before it is dropped; defaults to RELEASE_SEARCH_TIMEOUT.",
+        ),
+        bypass_cache: bool = Field(
+            default=False,
+            description="Query every indexer again instead of reusing results cached within SEARCH_CACHE_TTL.",
+        ),
+        ctx: Context | None = None,
+    ) -> Any:
+        """Search Prowlarr indexers concurrently, streaming progress per indexer, and return deduplicated releases ranked by seeders, age and size."""
+        client = get_prowlarr_client()
+        report = threadsafe_reporter(ctx, logger)
+
+        def on_result(result, done, total, merger) -> None:
+            if report is None:
+                return
+            status = result.error or f"{len(result.releases)} releases"
+            report(
+                done,
+                total,
+                f"{result.name}: {status} in {result.elapsed}s; "
+                f"{len(merger)} unique so far",
+            )
+
+        with cache.bypass_cache(bypass_cache):
+            return await run_blocking(
+                release_search.fanout_search,
+                client,
+                query,
+                indexer_ids=indexer_ids,
+                type=type,
+                categories=categories,
+                limit=limit,
+                timeout=timeout or setting("RELEASE_SEARCH_TIMEOUT", 15.0),
+                concurrency=setting("RELEASE_SEARCH_CONCURRENCY", 8),
+                on_result=on_result if report is not None else None,
+            )
@@ -0,0 +1,109 @@
+"""Configuration snapshot and restore MCP tools.
+
+CONCEPT:ARR-027 — Config Snapshot
+"""
+
+import os
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.core.paths import data_dir
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp import config_snapshot
+from arr_mcp.auth import CLIENT_FACTORIES, list_instances
+
+
+def snapshot_dir() -> str:
+    """Directory holding snapshot manifests and blobs."""
+    return os.path.expanduser(
+        setting("SNAPSHOT_DIR", str(data_dir() / "arr-mcp" / "snapshots"))
+    )
+
+
+def snapshot_clients(
+    services: list[str] | None = None, instances: list[str] | None = None
+) -> dict[tuple[str, str], Any]:
+    """A client per configured instance of ``services`` (default: all), optionally only ``instances``."""
+    clients = {}
+    for service in services or config_snapshot.SERVICES:
+        service = service.strip().lower()
+        if service not in config_snapshot.SERVICES:
+            raise ValueError(
+                f"Snapshots cover {', '.join(config_snapshot.SERVICES)}, not '{service}'"
+            )
+        for instance in list_instances(service):
+            if not instances or instance in instances:
+                clients[(service, instance)] = CLIENT_FACTORIES[service](instance)
+    if not clients:
+        raise ValueError("No configured instance matches")
+    return clients
+
+
+def register_snapshot_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"snapshot"})
+    async def snapshot_config(
+        services: list[str] | None = Field(
+            default=None,
+            description="Services to snapshot: sonarr, radarr, lidarr, chaptarr, prowlarr (default: every configured one).",
+        ),
+        instances: list[str] | None = Field(
+            default=None, description="Only these instance names (default: all)."
+        ),
+        resources: list[str] | None = Field(
+            default=None,
+            description="Only these resources, e.g. config_naming, customformat, indexer (default: all).",
+        ),
+        name: str | None = Field(
+            default=None, description="Snapshot name; a UTC timestamp by default."
+        ),
+    ) -> Any:
+        """Snapshot every configuration resource of the configured instances as content-addressed JSON; unchanged resources are not rewritten."""
+        return await run_blocking(
+            config_snapshot.snapshot,
+            snapshot_dir(),
+            snapshot_clients(services, instances),
+            name=name,
+            resources=resources,
+            concurrency=setting("SNAPSHOT_CONCURRENCY", 8),
+        )
+
+    @mcp.tool(tags={"snapshot"})
+    async def list_config_snapshots() -> Any:
+        """List configuration snapshots with the instances and resource counts each holds."""
+        return await run_blocking(config_snapshot.list_snapshots, snapshot_dir())
+
+    @mcp.tool(tags={"snapshot"})
+    async def restore_config(
+        snapshot: str = Field(description="Snapshot name from list_config_snapshots."),
+        services: list[str] | None = Field(
+            default=None,
+            description="Only these services (default: all in the snapshot).",
+        ),
+        instances: list[str] | None = Field(
+            default=None, description="Only these instance names (default: all)."
+        ),
+        resources: list[str] | None = Field(
+            default=None, description="Only these resources (default: all)."
+        ),
+        prune: bool = Field(
+            default=False, description="Also delete records created since the snapshot."
+        ),
+        dry_run: bool = Field(
+            default=True,
+            description="Only list the differing resources and planned writes; set false to apply them.",
+        ),
+    ) -> Any:
+        """Restore a configuration snapshot, writing only the resources that differ from it."""
+        return await run_blocking(
+            config_snapshot.restore,
+            snapshot_dir(),
+            snapshot,
+            snapshot_clients(services, instances),
+            resources=resources,
+            dry_run=dry_run,
+            prune=prune,
+            concurrency=setting("SNAPSHOT_CONCURRENCY", 8),
+        )
@@ -0,0 +1,140 @@
+"""Columnar library analytics MCP tool.
+
+CONCEPT:ARR-017 — Columnar Library Stats
+"""
+
+import logging
+import threading
+import time
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import Context, FastMCP
+from pydantic import Field
+
+# Aliased: the tool function below is also called library_stats.
+from arr_mcp import library_stats as stats
+from arr_mcp.auth import get_clients
+from arr_mcp.mcp.progress import threadsafe_reporter
+
+logger = logging.getLogger(__name__)
+
+_table: Any = None
+_loaded_at = 0.0
+_table_lock = threading.Lock()
+
+
+def get_file_table(refresh: bool = False, report: Any = None) -> Any:
+    """Get the loaded file table, (re)loading it when stale or on ``refresh``."""
+    global _table, _loaded_at
+    with _table_lock:
+        ttl = setting("LIBRARY_STATS_TTL", 600.0)
+        if refresh or _table is None or time.monotonic() - _loaded_at > ttl:
+            clients = get_clients(list(stats.FILE_SOURCES))
+            loaded = [0]
+
+            def on_service(service: str, rows: int) -> None:
+                loaded[0] += 1
+                if report is not None:
+                    report(loaded[0], len(clients), f"{service}: {rows} files")
+
+            _table = stats.load_files(
+                clients,
+                concurrency=setting("LIBRARY_STATS_CONCURRENCY", 8),
+                on_service=on_service,
+            )
+            _loaded_at = time.monotonic()
+    return _table
+
+
+def _split(value: str | None) -> list[str] | None:
+    if not value:
+        return None
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def register_stats_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"stats"})
+    async def library_stats(
+        group_by: str | None = Field(
+            default=None,
+            description="Comma-separated keys to group by: service, quality, source, codec, root_folder, language, resolution, added_year (year the file was imported), cutoff_not_met.",
+        ),
+        services: str | None = Field(
+            default=None,
+            description="Comma-separated services to include (radarr, sonarr, lidarr, chaptarr).",
+        ),
+        quality: str | None = Field(
+            default=None,
+            description="Comma-separated quality name fragments, e.g. 'Remux-2160p' or 'WEBDL'.",
+        ),
+        codec: str | None = Field(
+            default=None,
+            description="Comma-separated codec fragments, e.g. 'x265,HEVC'.",
+        ),
+        root_folder: str | None = Field(
+            default=None, description="Comma-separated root folder path fragments."
+        ),
+        language: str | None = Field(
+            default=None, description="Comma-separated language name fragments."
+        ),
+        min_resolution: int | None = Field(
+            default=None, description="Minimum vertical resolution, e.g. 2160."
+        ),
+        max_resolution: int | None = Field(
+            default=None, description="Maximum vertical resolution."
+        ),
+        min_size_gb: float | None = Field(
+            default=None, description="Only files at least this large (GB)."
+        ),
+        max_size_gb: float | None = Field(
+            default=None, description="Only files at most this large (GB)."
+        ),
+        cutoff_not_met: bool | None = Field(
+            default=None,
+            description="Only files below (true) or meeting (false) their quality cutoff.",
+        ),
+        added_after: str | None = Field(
+            default=None, description="Only files added on or after this ISO date."
+        ),
+        added_before: str | None = Field(
+            default=None, description="Only files added before this ISO date."
+        ),
+        percentiles: list[float] | None = Field(
+            default=None, description="Size percentiles to report, e.g. [50, 90, 99]."
+        ),
+        top: int = Field(default=0, description="List this many of the largest files."),
+        refresh: bool = Field(
+            default=False,
+            description="Reload file records now instead of using the table loaded within LIBRARY_STATS_TTL.",
+        ),
+        ctx: Context | None = None,
+    ) -> Any:
+        """Space, counts and size distribution of media files across the libraries, filtered and grouped by quality, codec, resolution, root folder, language or date."""
+        stats.require_numpy()
+        report = threadsafe_reporter(ctx, logger)
+        table = await run_blocking(get_file_table, refresh, report)
+        result = await run_blocking(
+            table.summarize,
+            group_by=_split(group_by),
+            percentiles=percentiles,
+            top=top,
+            services=_split(services),
+            quality=_split(quality),
+            codec=_split(codec),
+            root_folder=_split(root_folder),
+            language=_split(language),
+            min_resolution=min_resolution,
+            max_resolution=max_resolution,
+            min_size_gb=min_size_gb,
+            max_size_gb=max_size_gb,
+            cutoff_not_met=cutoff_not_met,
+            added_after=added_after,
+            added_before=added_before,
+        )
+        if table.errors:
+            # Totals leave out the services and file listings that failed.
+            result["incomplete"] = True
+            result["errors"] = table.errors
+        return result
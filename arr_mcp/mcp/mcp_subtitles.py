@@ -0,0 +1,95 @@
+"""Bazarr wanted-subtitle batch search MCP tool.
+
+CONCEPT:ARR-013 — Subtitle Batch Processor
+"""
+
+import logging
+import threading
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.core.paths import data_dir
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import Context, FastMCP
+from pydantic import Field
+
+from arr_mcp import workers
+from arr_mcp.auth import get_bazarr_client
+from arr_mcp.mcp.progress import threadsafe_reporter
+from arr_mcp.subtitle_batch import AttemptLog, ProviderThrottle, process_wanted
+
+logger = logging.getLogger(__name__)
+
+_attempts: AttemptLog | None = None
+_throttle: ProviderThrottle | None = None
+_lock = threading.Lock()
+
+
+def _parse_limits(value: str) -> dict[str, float]:
+    limits = {}
+    for pair in value.split(","):
+        name, _, rate = pair.partition("=")
+        if name.strip() and rate.strip():
+            limits[name.strip()] = float(rate)
+    return limits
+
+
+def get_subtitle_state() -> tuple[AttemptLog, ProviderThrottle]:
+    """Get the process-wide attempt log and provider throttle, creating them on first use."""
+    global _attempts, _throttle
+    workers.require_single_worker("search_wanted_subtitles")
+    with _lock:
+        if _attempts is None:
+            _attempts = AttemptLog(
+                setting(
+                    "SUBTITLE_ATTEMPTS_PATH",
+                    str(data_dir() / "arr-mcp" / "subtitles.sqlite3"),
+                )
+            )
+        if _throttle is None:
+            # Shared so back-to-back calls keep honoring the provider rates.
+            _throttle = ProviderThrottle(
+                per_minute=setting("SUBTITLE_PROVIDER_RATE", 30.0),
+                limits=_parse_limits(setting("SUBTITLE_PROVIDER_LIMITS", "")),
+            )
+    return _attempts, _throttle
+
+
+def register_subtitles_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"subtitles"})
+    async def search_wanted_subtitles(
+        kinds: str = Field(
+            default="all",
+            description="Which Bazarr wanted lists to work through: 'episodes', 'movies' or 'all'.",
+        ),
+        limit: int | None = Field(
+            default=None,
+            description="Stop after this many searches; the rest are picked up by the next call.",
+        ),
+        retry_after_hours: float | None = Field(
+            default=None,
+            description="Skip items searched within this many hours; defaults to SUBTITLE_RETRY_AFTER seconds.",
+        ),
+        ctx: Context | None = None,
+    ) -> Any:
+        """Search subtitles for every episode and movie on Bazarr's wanted lists concurrently, throttled per provider and skipping items tried recently."""
+        client = get_bazarr_client()
+        attempts, throttle = get_subtitle_state()
+        retry_after = (
+            retry_after_hours * 3600
+            if retry_after_hours is not None
+            else setting("SUBTITLE_RETRY_AFTER", 86400.0)
+        )
+        return await run_blocking(
+            process_wanted,
+            client,
+            attempts,
+            kinds=None
+            if kinds == "all"
+            else [k.strip().lower() for k in kinds.split(",") if k.strip()],
+            throttle=throttle,
+            concurrency=setting("SUBTITLE_SEARCH_CONCURRENCY", 4),
+            retry_after=retry_after,
+            limit=limit,
+            on_progress=threadsafe_reporter(ctx, logger),
+        )
@@ -0,0 +1,52 @@
+"""Declarative config sync MCP tool.
+
+CONCEPT:ARR-026 — Config Sync
+"""
+
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import FastMCP
+from pydantic import Field
+
+from arr_mcp import config_sync
+from arr_mcp.auth import CLIENT_FACTORIES, list_instances
+
+
+def sync_clients(desired: dict[str, Any]) -> dict[tuple[str, str], Any]:
+    """A client per instance the desired state targets: those listed, or all configured."""
+    clients = {}
+    for service, section in desired.items():
+        if service not in CLIENT_FACTORIES:
+            raise ValueError(
+                f"Unknown service '{service}'; expected one of {', '.join(CLIENT_FACTORIES)}"
+            )
+        instances = section.get("instances") or list_instances(service)
+        if not instances:
+            raise ValueError(f"No {service} instance is configured")
+        for instance in instances:
+            clients[(service, instance)] = CLIENT_FACTORIES[service](instance)
+    return clients
+
+
+def register_sync_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"sync"})
+    async def sync_config(
+        desired: str = Field(
+            description="Desired state as YAML or JSON text, or the path of a file holding it: a section per service (sonarr, radarr) with tags, custom_formats, quality_profiles, release_profiles, delay_profiles, notifications and naming, plus optional instances and prune.",
+        ),
+        dry_run: bool = Field(
+            default=True,
+            description="Only return the planned creates, updates and deletes; set false to apply them.",
+        ),
+    ) -> Any:
+        """Converge profiles, custom formats, tags, naming and notifications across instances to a desired state, writing only what differs."""
+        document = config_sync.load_desired(desired)
+        return await run_blocking(
+            config_sync.sync,
+            document,
+            sync_clients(document),
+            dry_run=dry_run,
+            concurrency=setting("CONFIG_SYNC_CONCURRENCY", 8),
+        )
@@ -0,0 +1,65 @@
+"""Seerr request triage MCP tool.
+
+CONCEPT:ARR-014 — Request Triage
+"""
+
+import json
+import logging
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import Context, FastMCP
+from pydantic import Field
+
+from arr_mcp import seerr_triage
+from arr_mcp.auth import cache_namespace, get_seerr_client
+from arr_mcp.cache import Namespace
+from arr_mcp.mcp.progress import threadsafe_reporter
+
+logger = logging.getLogger(__name__)
+
+
+def get_details_cache() -> Namespace:
+    """Get the cache of Seerr movie/TV details: the ``seerr`` cache namespace."""
+    return cache_namespace("seerr", setting("SEERR_DETAILS_CACHE_TTL", 900.0))
+
+
+def register_triage_tools(mcp: FastMCP) -> None:
+    @mcp.tool(tags={"triage"})
+    async def triage_requests(
+        rules_json: str = Field(
+            default="[]",
+            description='Ordered JSON list of rules; the first match decides. Each rule has "action" (approve/decline) and optional "requester" (name, email or id, or a list), "media_type" (movie/tv), "is4k" (bool), "available" (bool: already available in Seerr) and "reason". Example: [{"action": "decline", "available": true}, {"action": "approve", "requester": ["alice", "bob"], "is4k": false}].',
+        ),
+        default_action: str = Field(
+            default="skip",
+            description="What to do with requests no rule matches: skip (leave pending), approve or decline.",
+        ),
+        dry_run: bool = Field(
+            default=True,
+            description="Only report the decisions; set false to approve and decline.",
+        ),
+        limit: int | None = Field(
+            default=None,
+            description="Triage at most this many of the oldest pending requests.",
+        ),
+        ctx: Context | None = None,
+    ) -> Any:
+        """Triage every pending Seerr request against local rules (requester, media type, 4K, already available) and approve or decline them concurrently."""
+        raw = json.loads(rules_json or "[]")
+        if isinstance(raw, dict):
+            raw = [raw]
+        rules = [seerr_triage.TriageRule.from_dict(rule) for rule in raw]
+        client = get_seerr_client()
+        return await run_blocking(
+            seerr_triage.triage,
+            client,
+            rules,
+            default_action=default_action.strip().lower(),
+            dry_run=dry_run,
+            concurrency=setting("SEERR_TRIAGE_CONCURRENCY", 8),
+            details_store=get_details_cache(),
+            limit=limit,
+            on_progress=threadsafe_reporter(ctx, logger),
+        )
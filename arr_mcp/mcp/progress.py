@@ -0,0 +1,37 @@
+"""Progress reporting from blocking worker threads to the MCP client.
+
+Library tools run their engines through ``run_blocking``, so engine callbacks
+fire on a worker thread. :func:`threadsafe_reporter` turns them into MCP
+progress and log notifications scheduled back on the tool's event loop.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from agent_utilities.mcp_utilities import ctx_log, ctx_progress
+
+
+def threadsafe_reporter(
+    ctx: Any, logger: logging.Logger
+) -> Callable[[int, int, str | None], None] | None:
+    """
+    Build a ``report(done, total, message)`` callable usable from any thread.
+
+    Must be called from the tool coroutine. Returns ``None`` when there is no
+    MCP context, so engines can skip building progress messages altogether.
+    """
+    if ctx is None:
+        return None
+    loop = asyncio.get_running_loop()
+
+    async def notify(done: int, total: int, message: str | None) -> None:
+        await ctx_progress(ctx, done, total)
+        if message:
+            ctx_log(ctx, logger, "info", message)
+
+    def report(done: int, total: int, message: str | None = None) -> None:
+        asyncio.run_coroutine_threadsafe(notify(done, total, message), loop)
+
+    return report
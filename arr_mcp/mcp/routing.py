@@ -0,0 +1,84 @@
+"""Instance routing shared by the action-routed service tools.
+
+Every ``<svc>_action`` tool resolves its client through the service's auth
+factory and dispatches the action on it. :func:`run_action` adds the
+``instance`` selector on top: a named instance gets its own client, and
+``all`` fans a read action out over every configured instance.
+
+CONCEPT:ARR-022 — Instance Fan-Out
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.mcp_utilities import (
+    DISCOVERY_ACTIONS,
+    canonicalize,
+    dispatch,
+    public_actions,
+)
+
+from arr_mcp import action_index, instances
+from arr_mcp.auth import list_instances
+from arr_mcp.cache import bypass_cache
+from arr_mcp.mcp.mcp_results import spill_large
+
+ALL_INSTANCES = "all"
+
+INSTANCE_DESCRIPTION = (
+    "Named instance to use, e.g. '4k' for <SERVICE>__4K__BASE_URL; the default "
+    "instance when omitted. 'all' runs a read (get_/list_/lookup) action on every "
+    "configured instance concurrently and merges the results, tagging each record "
+    "with its instance."
+)
+
+
+def run_action(
+    get_client: Callable[..., Any],
+    service: str,
+    action: str,
+    kwargs: dict[str, Any],
+    instance: str | None = None,
+) -> Any:
+    """Dispatch ``action`` on one instance of ``service``, or on all of them.
+
+    An unknown action fails with the closest matches from the service's
+    action index rather than a bare name list. A ``bypass_cache`` entry in
+    ``kwargs`` is not passed on; it skips cached results for this call.
+    """
+    kwargs = dict(kwargs)
+    with bypass_cache(kwargs.pop("bypass_cache", False)):
+        return _run_action(get_client, service, action, kwargs, instance)
+
+
+def _run_action(
+    get_client: Callable[..., Any],
+    service: str,
+    action: str,
+    kwargs: dict[str, Any],
+    instance: str | None,
+) -> Any:
+    tag = f"arr-{service}"
+    if instance and instance.strip().lower() == ALL_INSTANCES:
+        if not instances.is_read_action(action):
+            raise ValueError(
+                f"instance='all' only runs read actions "
+                f"({', '.join(instances.READ_PREFIXES)}...), not '{action}'; "
+                "pick one instance for changes"
+            )
+        names = list_instances(service)
+        if not names:
+            raise RuntimeError(f"No {service} instances configured")
+        merged = instances.fan_out(
+            names,
+            lambda name: dispatch(get_client(name), action, kwargs, service=tag),
+            concurrency=setting("INSTANCE_FANOUT_CONCURRENCY", 4),
+        )
+        return spill_large(merged)
+    client = get_client(instance) if instance else get_client()
+    if action not in DISCOVERY_ACTIONS and not canonicalize(
+        action, public_actions(client)
+    ):
+        raise action_index.unknown_action_error(service, action)
+    return dispatch(client, action, kwargs, service=tag, result_coercer=spill_large)
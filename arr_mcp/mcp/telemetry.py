@@ -0,0 +1,95 @@
+"""Tool-call spans for the MCP server.
+
+CONCEPT:ARR-025 — Request Tracing
+"""
+
+import json
+from typing import Any
+
+import anyio.to_thread
+from fastmcp.server.dependencies import fastmcp_request_ctx
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from opentelemetry import propagate, trace
+from opentelemetry.trace import Link
+
+from arr_mcp import tracing
+from arr_mcp.action_index import SERVICES
+
+_TRACE_KEYS = ("traceparent", "tracestate")
+
+
+def tool_attributes(name: str, arguments: dict[str, Any] | None) -> dict[str, Any]:
+    """
+    Span attributes of one tool call: service, action and parameter keys.
+
+    Only argument names are recorded, never their values, which can hold
+    titles, paths or credentials.
+    """
+    arguments = arguments or {}
+    prefix = name.split("_", 1)[0]
+    service = prefix if prefix in SERVICES else arguments.get("service")
+    params = arguments.get("params_json")
+    try:
+        params = json.loads(params) if isinstance(params, str) else params
+    except ValueError:
+        params = None
+    text = lambda value: value if isinstance(value, str) else None  # noqa: E731
+    return {
+        "gen_ai.tool.name": name,
+        "arr.service": text(service),
+        "arr.action": text(arguments.get("action")),
+        "arr.instance": text(arguments.get("instance")),
+        "arr.argument_keys": sorted(k for k, v in arguments.items() if v is not None),
+        "arr.param_keys": sorted(params) if isinstance(params, dict) else None,
+    }
+
+
+def trace_carrier() -> dict[str, str]:
+    """W3C trace headers sent by the agent, from the MCP ``_meta`` or the HTTP request."""
+    request_context = fastmcp_request_ctx.get()
+    if request_context is None:
+        return {}
+    meta = request_context.meta or {}
+    carrier = {key: str(meta[key]) for key in _TRACE_KEYS if meta.get(key)}
+    if not carrier and request_context.request is not None:
+        headers = request_context.request.headers
+        carrier = {key: headers[key] for key in _TRACE_KEYS if headers.get(key)}
+    return carrier
+
+
+def parent_context(carrier: dict[str, str]) -> tuple[Any, list[Any]]:
+    """
+    The parent of the tool span and the links to put on it.
+
+    The server's own request span is the parent when it already continues
+    the agent's trace. When the agent only sent HTTP headers, that span
+    started a trace of its own; the tool span then joins the agent's trace
+    and links to it.
+    """
+    if not carrier:
+        return None, []
+    remote = propagate.extract(carrier)
+    remote_span = trace.get_current_span(remote).get_span_context()
+    local_span = trace.get_current_span().get_span_context()
+    if not remote_span.is_valid or remote_span.trace_id == local_span.trace_id:
+        return None, []
+    return remote, [Link(local_span)] if local_span.is_valid else []
+
+
+class TracingMiddleware(Middleware):
+    """Runs every tool call inside a span named ``<service>.<action>`` or the tool name."""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: Any) -> Any:
+        if not tracing.is_active():
+            return await call_next(context)
+        message = context.message
+        attributes = tool_attributes(message.name, message.arguments)
+        limiter = anyio.to_thread.current_default_thread_limiter().statistics()
+        attributes["arr.threads.busy"] = limiter.borrowed_tokens
+        attributes["arr.threads.waiting"] = limiter.tasks_waiting
+        name = message.name
+        if attributes["arr.service"] and attributes["arr.action"]:
+            name = f"{attributes['arr.service']}.{attributes['arr.action']}"
+        parent, links = parent_context(trace_carrier())
+        with tracing.span(name, attributes, context=parent, links=links):
+            return await call_next(context)
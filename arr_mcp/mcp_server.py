@@ -24,7 +24,6 @@
 Action Execution Pipeline
 """
 
-import difflib
 import importlib
 import json
 import logging
@@ -33,6 +32,7 @@
 from typing import Any
 
 from agent_utilities.base_utilities import to_boolean
+from agent_utilities.core.config import setting
 from agent_utilities.mcp_utilities import (
     create_mcp_server,
     load_config,
@@ -43,6 +43,7 @@
 from starlette.responses import JSONResponse
 
 import arr_mcp.mcp as _arr_tools
+from arr_mcp import action_index, rate_limit, tracing, workers
 from arr_mcp.api.api_client_bazarr import Api as BazarrApi
 from arr_mcp.api.api_client_chaptarr import Api as ChaptarrApi
 from arr_mcp.api.api_client_lidarr import Api as LidarrApi
@@ -59,6 +60,7 @@
     get_seerr_client,
     get_sonarr_client,
 )
+from arr_mcp.mcp.telemetry import TracingMiddleware
 
 __version__ = "1.0.1"
 
@@ -138,13 +140,7 @@ def execute_arr_action(
                 method = candidate
                 break
     if method is None:
-        suggestions = difflib.get_close_matches(action, available_actions, n=3)
-        hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
-        raise ValueError(
-            f"Unknown action '{action}' on {api_class.__name__}.{hint} "
-            f"Call with action='list_actions' to see all "
-            f"{len(available_actions)} available actions."
-        )
+        raise action_index.unknown_action_error(service_name, action)
 
     res = method(**kwargs)
     if hasattr(res, "dict") and callable(res.dict):
@@ -230,12 +226,23 @@ async def health_check(request: Request) -> JSONResponse:
         ],
     )
 
+    middlewares = rate_limit.apply_rate_limit_settings(
+        middlewares,
+        rate=setting("MCP_RATE_LIMIT_RPS", 10.0),
+        burst=setting("MCP_RATE_LIMIT_BURST", 20),
+    )
+    tracing.configure_tracing()
+    middlewares.append(TracingMiddleware())
     for mw in middlewares:
         mcp.add_middleware(mw)
     return mcp, args, middlewares, registered_tags
 
 
 def mcp_server() -> None:
+    if sys.argv[1:2] == ["export"]:
+        from arr_mcp.mcp.mcp_export import export_cli
+
+        sys.exit(export_cli(sys.argv[2:]))
     mcp, args, middlewares, registered_tags = get_mcp_instance()
     print(f"{'arr-mcp'} MCP v{__version__}", file=sys.stderr)
     print("\nStarting MCP Server", file=sys.stderr)
@@ -245,9 +252,14 @@ def mcp_server() -> None:
 
     if args.transport == "stdio":
         mcp.run(transport="stdio")
+    elif args.transport == "streamable-http" and workers.is_multi_worker():
+        print(f"  Workers: {workers.worker_count()} (stateless)", file=sys.stderr)
+        sys.exit(workers.supervise(workers.worker_count(), args.host, args.port))
     elif args.transport == "streamable-http":
         mcp.run(transport="streamable-http", host=args.host, port=args.port)
     elif args.transport == "sse":
+        if workers.is_multi_worker():
+            logger.warning("MCP_WORKERS is ignored for sse; it needs one process")
         mcp.run(transport="sse", host=args.host, port=args.port)
     else:
         logger.error("Invalid transport", extra={"transport": args.transport})
@@ -0,0 +1,411 @@
+"""
+Owned-media title index.
+
+Builds an in-process trigram index over everything the *arr services already
+own — titles, sort titles, alternate titles, years and external ids — so an
+agent can resolve "the one with the dragons" locally instead of round-tripping
+through the upstream metadata providers behind ``get_*_lookup``.
+
+CONCEPT:ARR-004 — Owned Media Index
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from arr_mcp.paging import records
+
+_YEAR = re.compile(r"\b(19\d{2}|20\d{2})\b")
+_IMDB = re.compile(r"^tt\d{5,}$")
+_UUID = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+_PREFIXED_ID = re.compile(
+    r"^(tmdb|tvdb|imdb|mb|musicbrainz|gr|goodreads)\s*[:=]\s*(\S+)$"
+)
+
+
+def normalize(text: str) -> str:
+    """Fold accents, case and punctuation so titles compare on their letters."""
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    folded = folded.lower().replace("&", " and ")
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", folded).split())
+
+
+def trigrams(text: str) -> set[str]:
+    """Return the word-padded trigrams of an already normalized string."""
+    grams: set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TitleIndex:
+    """
+    Trigram index over media documents.
+
+    Each document is indexed under every title variant it carries; a query
+    scores a document by the best Dice similarity across its variants, with a
+    boost when the query names the document's year. Candidates are drawn from
+    the query's selective trigrams only, so ubiquitous grams such as ``"  t"``
+    do not turn every search into a scan. External ids resolve through an
+    exact-match map, skipping the trigram pass entirely.
+    """
+
+    def __init__(self) -> None:
+        self.docs: list[dict[str, Any]] = []
+        self._keys: list[tuple[int, str, frozenset[str]]] = []
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        self._ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(
+        self,
+        doc: dict[str, Any],
+        titles: Iterable[str | None],
+        ids: dict[str, Any] | None = None,
+    ) -> None:
+        """Index ``doc`` under each of ``titles`` and each external id in ``ids``."""
+        doc_idx = len(self.docs)
+        self.docs.append(doc)
+        seen: set[str] = set()
+        for title in titles:
+            if not title:
+                continue
+            key = normalize(str(title))
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            grams = frozenset(trigrams(key))
+            key_idx = len(self._keys)
+            self._keys.append((doc_idx, key, grams))
+            for gram in grams:
+                self._postings[gram].append(key_idx)
+        for kind, value in (ids or {}).items():
+            if value in (None, "", 0):
+                continue
+            self._ids[f"{kind}:{str(value).lower()}"] = doc_idx
+
+    def lookup_id(self, query: str) -> dict[str, Any] | None:
+        """Resolve an external id query (``tmdb:603``, ``goodreads:3``, ``tt0133093``, a MusicBrainz uuid)."""
+        text = query.strip().lower()
+        prefixed = _PREFIXED_ID.match(text)
+        if prefixed:
+            kind, value = prefixed.groups()
+            kind = {"mb": "musicbrainz", "gr": "goodreads"}.get(kind, kind)
+            candidates = [f"{kind}:{value}"]
+        elif _IMDB.match(text):
+            candidates = [f"imdb:{text}"]
+        elif _UUID.match(text):
+            candidates = [f"musicbrainz:{text}"]
+        else:
+            return None
+        for candidate in candidates:
+            if candidate in self._ids:
+                return self.docs[self._ids[candidate]]
+        return None
+
+    def search(
+        self, query: str, limit: int = 10, min_score: float = 0.3
+    ) -> list[dict[str, Any]]:
+        """Return up to ``limit`` documents ranked by similarity to ``query``."""
+        by_id = self.lookup_id(query)
+        if by_id is not None:
+            return [{"score": 1.0, **by_id}]
+
+        year_match = _YEAR.search(query)
+        year = int(year_match.group(1)) if year_match else None
+        text = normalize(_YEAR.sub(" ", query) if year else query)
+        if not text:
+            text = normalize(query)
+            year = None
+        grams = trigrams(text)
+        if not grams:
+            return []
+
+        postings = [self._postings[g] for g in grams if g in self._postings]
+        selective = max(64, len(self._keys) // 20)
+        rare = [p for p in postings if len(p) <= selective] or postings
+        candidates = set().union(*rare) if rare else set()
+
+        best: dict[int, float] = {}
+        for key_idx in candidates:
+            doc_idx, key, key_grams = self._keys[key_idx]
+            score = 2.0 * len(grams & key_grams) / (len(grams) + len(key_grams))
+            if key == text:
+                score = 1.0
+            elif f" {text} " in f" {key} ":
+                score = max(score, 0.6 + 0.4 * len(text) / len(key))
+            if score > best.get(doc_idx, 0.0):
+                best[doc_idx] = score
+
+        ranked: list[tuple[float, int]] = []
+        for doc_idx, score in best.items():
+            if year is not None:
+                doc_year = self.docs[doc_idx].get("year")
+                if doc_year == year:
+                    score = min(1.0, score + 0.15)
+                elif doc_year:
+                    score *= 0.85
+            if score >= min_score:
+                ranked.append((score, doc_idx))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [
+            {"score": round(score, 3), **self.docs[doc_idx]}
+            for score, doc_idx in ranked[:limit]
+        ]
+
+
+def _year(value: Any) -> int | None:
+    """Pull a year out of an int year or an ISO date string."""
+    if isinstance(value, int):
+        return value or None
+    if isinstance(value, str) and len(value) >= 4 and value[:4].isdigit():
+        return int(value[:4])
+    return None
+
+
+def _alt_titles(item: dict[str, Any]) -> list[str]:
+    return [a.get("title") for a in item.get("alternateTitles") or [] if a]
+
+
+def _radarr_entries(client: Any) -> Iterator[tuple[dict, list, dict]]:
+    extra: dict[tuple[str, Any], list[str]] = defaultdict(list)
+    for alt in records(client.get_alttitle()):
+        title = alt.get("title") if isinstance(alt, dict) else None
+        if not title:
+            continue
+        if alt.get("movieMetadataId") is not None:
+            extra["meta", alt["movieMetadataId"]].append(title)
+        elif alt.get("movieId") is not None:
+            extra["movie", alt["movieId"]].append(title)
+    for movie in records(client.get_movie()):
+        if not isinstance(movie, dict):
+            continue
+        doc = {
+            "service": "radarr",
+            "type": "movie",
+            "id": movie.get("id"),
+            "title": movie.get("title"),
+            "year": _year(movie.get("year")),
+            "tmdbId": movie.get("tmdbId"),
+            "imdbId": movie.get("imdbId"),
+            "hasFile": movie.get("hasFile"),
+            "monitored": movie.get("monitored"),
+        }
+        titles = [
+            movie.get("title"),
+            movie.get("originalTitle"),
+            movie.get("sortTitle"),
+            *_alt_titles(movie),
+            *extra.get(("meta", movie.get("movieMetadataId")), []),
+            *extra.get(("movie", movie.get("id")), []),
+        ]
+        ids = {"tmdb": movie.get("tmdbId"), "imdb": movie.get("imdbId")}
+        yield doc, titles, ids
+
+
+def _sonarr_entries(client: Any) -> Iterator[tuple[dict, list, dict]]:
+    for series in records(client.get_series()):
+        if not isinstance(series, dict):
+            continue
+        doc = {
+            "service": "sonarr",
+            "type": "series",
+            "id": series.get("id"),
+            "title": series.get("title"),
+            "year": _year(series.get("year")),
+            "tvdbId": series.get("tvdbId"),
+            "tmdbId": series.get("tmdbId"),
+            "imdbId": series.get("imdbId"),
+            "monitored": series.get("monitored"),
+        }
+        titles = [series.get("title"), series.get("sortTitle"), *_alt_titles(series)]
+        ids = {
+            "tvdb": series.get("tvdbId"),
+            "tmdb": series.get("tmdbId"),
+            "imdb": series.get("imdbId"),
+        }
+        yield doc, titles, ids
+
+
+def _lidarr_entries(client: Any) -> Iterator[tuple[dict, list, dict]]:
+    for artist in records(client.get_artist()):
+        if not isinstance(artist, dict):
+            continue
+        doc = {
+            "service": "lidarr",
+            "type": "artist",
+            "id": artist.get("id"),
+            "title": artist.get("artistName"),
+            "musicbrainzId": artist.get("foreignArtistId"),
+            "monitored": artist.get("monitored"),
+        }
+        titles = [artist.get("artistName"), artist.get("sortName")]
+        yield doc, titles, {"musicbrainz": artist.get("foreignArtistId")}
+    for album in records(client.get_album()):
+        if not isinstance(album, dict):
+            continue
+        doc = {
+            "service": "lidarr",
+            "type": "album",
+            "id": album.get("id"),
+            "artistId": album.get("artistId"),
+            "title": album.get("title"),
+            "year": _year(album.get("releaseDate")),
+            "musicbrainzId": album.get("foreignAlbumId"),
+            "monitored": album.get("monitored"),
+        }
+        yield doc, [album.get("title")], {"musicbrainz": album.get("foreignAlbumId")}
+
+
+def _chaptarr_entries(client: Any) -> Iterator[tuple[dict, list, dict]]:
+    for author in records(client.get_author()):
+        if not isinstance(author, dict):
+            continue
+        doc = {
+            "service": "chaptarr",
+            "type": "author",
+            "id": author.get("id"),
+            "title": author.get("authorName"),
+            "foreignAuthorId": author.get("foreignAuthorId"),
+            "monitored": author.get("monitored"),
+        }
+        titles = [author.get("authorName"), author.get("sortName")]
+        yield doc, titles, {"goodreads": author.get("foreignAuthorId")}
+    for book in records(client.get_book()):
+        if not isinstance(book, dict):
+            continue
+        doc = {
+            "service": "chaptarr",
+            "type": "book",
+            "id": book.get("id"),
+            "authorId": book.get("authorId"),
+            "title": book.get("title"),
+            "year": _year(book.get("releaseDate")),
+            "foreignBookId": book.get("foreignBookId"),
+            "monitored": book.get("monitored"),
+        }
+        yield doc, [book.get("title")], {"goodreads": book.get("foreignBookId")}
+
+
+INDEX_SOURCES: dict[str, Callable[[Any], Iterator[tuple[dict, list, dict]]]] = {
+    "radarr": _radarr_entries,
+    "sonarr": _sonarr_entries,
+    "lidarr": _lidarr_entries,
+    "chaptarr": _chaptarr_entries,
+}
+
+LOOKUP_METHODS: dict[str, str] = {
+    "radarr": "get_movie_lookup",
+    "sonarr": "get_series_lookup",
+    "lidarr": "get_artist_lookup",
+    "chaptarr": "get_author_lookup",
+}
+
+
+def build_index(service: str, client: Any) -> TitleIndex:
+    """Fetch ``service``'s library through ``client`` and index it."""
+    index = TitleIndex()
+    for doc, titles, ids in INDEX_SOURCES[service](client):
+        index.add(doc, titles, ids)
+    return index
+
+
+_indexes: dict[str, tuple[float, TitleIndex]] = {}
+_lock = threading.Lock()
+
+
+def get_index(
+    service: str, client: Any, max_age: float = 900.0, refresh: bool = False
+) -> TitleIndex:
+    """Return the cached index for ``client``'s instance, rebuilding it when stale."""
+    key = f"{service}@{getattr(client, 'base_url', '')}"
+    with _lock:
+        cached = _indexes.get(key)
+    if cached and not refresh and time.monotonic() - cached[0] < max_age:
+        return cached[1]
+    index = build_index(service, client)
+    with _lock:
+        _indexes[key] = (time.monotonic(), index)
+    return index
+
+
+def invalidate(service: str | None = None) -> None:
+    """Drop cached indexes for ``service`` (or all of them)."""
+    with _lock:
+        for key in list(_indexes):
+            if service is None or key.split("@", 1)[0] == service:
+                del _indexes[key]
+
+
+def find_owned(
+    clients: dict[str, Any],
+    query: str,
+    limit: int = 10,
+    fallback_lookup: bool = True,
+    max_age: float = 900.0,
+    refresh: bool = False,
+) -> dict[str, Any]:
+    """
+    Rank owned media across ``clients`` against ``query``.
+
+    Falls back to each service's metadata lookup endpoint only when nothing in
+    the local index clears the match threshold.
+
+    Args:
+        clients (Dict[str, Any]): Service name to API client, e.g. ``{"radarr": ...}``.
+        query (str): Free-text title, optionally with a year, or an external id.
+        limit (int): Maximum number of matches to return.
+        fallback_lookup (bool): Query the upstream lookup endpoints on a miss.
+        max_age (float): Seconds before a cached index is rebuilt.
+        refresh (bool): Force a rebuild of every index before searching.
+
+    Returns:
+        Dict: ``matches`` ranked by score, the ``source`` that produced them
+        and the local search time in milliseconds.
+    """
+    errors: dict[str, str] = {}
+    indexes: dict[str, TitleIndex] = {}
+    for service, client in clients.items():
+        if service not in INDEX_SOURCES:
+            continue
+        try:
+            indexes[service] = get_index(service, client, max_age, refresh)
+        except Exception as e:
+            errors[service] = str(e)
+
+    started = time.perf_counter()
+    matches: list[dict[str, Any]] = []
+    for index in indexes.values():
+        matches.extend(index.search(query, limit=limit))
+    matches.sort(key=lambda m: -m["score"])
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    result: dict[str, Any] = {
+        "query": query,
+        "source": "index",
+        "matches": matches[:limit],
+        "indexed": {service: len(index) for service, index in indexes.items()},
+        "search_ms": elapsed_ms,
+    }
+    if not matches and fallback_lookup:
+        result["source"] = "lookup"
+        for service in indexes:
+            try:
+                found = getattr(clients[service], LOOKUP_METHODS[service])(term=query)
+            except Exception as e:
+                errors[service] = str(e)
+                continue
+            for item in records(found)[:limit]:
+                if isinstance(item, dict):
+                    result["matches"].append({"service": service, **item})
+    if errors:
+        result["errors"] = errors
+    return result
@@ -0,0 +1,48 @@
+"""
+Response unwrapping and paging helpers shared by the library-level tools.
+
+The API clients wrap list responses as ``{"result": [...]}`` while the paged
+*arr endpoints answer with ``{"records": [...], "totalRecords": n}``. These
+helpers hide both shapes from the code that only wants the records.
+
+CONCEPT:ARR-001 — Core API Client
+"""
+
+from collections.abc import Callable, Iterator
+from typing import Any
+
+
+def records(response: Any) -> list[Any]:
+    """Return the list of records carried by a client response.
+
+    Accepts the ``{"result": [...]}`` list wrapper, the paged
+    ``{"records": [...]}`` envelope, Bazarr's ``{"data": [...]}``, Seerr's
+    ``{"results": [...]}`` and a bare list. Anything else yields an empty list.
+    """
+    if isinstance(response, list):
+        return response
+    if isinstance(response, dict):
+        for key in ("result", "records", "data", "results"):
+            value = response.get(key)
+            if isinstance(value, list):
+                return value
+    return []
+
+
+def iter_pages(
+    fetch: Callable[..., Any], page_size: int = 250, max_pages: int = 100, **params
+) -> Iterator[Any]:
+    """Yield every record from a paged ``records``/``totalRecords`` endpoint.
+
+    ``fetch`` is called with ``page``, ``pageSize`` and ``params`` until a short
+    or empty page, ``totalRecords`` is reached, or ``max_pages`` were read.
+    """
+    seen = 0
+    for page in range(1, max_pages + 1):
+        response = fetch(page=page, pageSize=page_size, **params)
+        batch = records(response)
+        yield from batch
+        seen += len(batch)
+        total = response.get("totalRecords") if isinstance(response, dict) else None
+        if len(batch) < page_size or (isinstance(total, int) and seen >= total):
+            return
@@ -0,0 +1,280 @@
+"""
+In-memory snapshot of the download queues across the *arr services.
+
+Watching downloads otherwise means paging ``get_queue`` on Sonarr, Radarr,
+Lidarr and Chaptarr for every poll. :class:`QueueSnapshotter` refreshes all
+queues concurrently on a background thread, normalizes their entries into one
+shape, and stamps every change with a monotonically increasing version so
+callers can ask for only what changed since the version they last saw.
+
+CONCEPT:ARR-010 — Queue Snapshot
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from arr_mcp.concurrency import bounded_map
+from arr_mcp.paging import iter_pages
+
+logger = logging.getLogger(__name__)
+
+# get_queue flags that embed the parent media in each record.
+QUEUE_SOURCES: dict[str, dict[str, bool]] = {
+    "sonarr": {"includeSeries": True, "includeEpisode": True},
+    "radarr": {"includeMovie": True},
+    "lidarr": {"includeArtist": True, "includeAlbum": True},
+    "chaptarr": {"includeAuthor": True, "includeBook": True},
+}
+
+_PASSTHROUGH = (
+    "status",
+    "trackedDownloadStatus",
+    "trackedDownloadState",
+    "timeleft",
+    "estimatedCompletionTime",
+    "protocol",
+    "downloadClient",
+    "indexer",
+    "errorMessage",
+)
+
+
+def _media_title(record: dict[str, Any]) -> str | None:
+    series = record.get("series")
+    if isinstance(series, dict):
+        episode = record.get("episode")
+        if isinstance(episode, dict) and episode.get("seasonNumber") is not None:
+            return (
+                f"{series.get('title')} S{episode['seasonNumber']:02d}"
+                f"E{episode.get('episodeNumber', 0):02d}"
+            )
+        return series.get("title")
+    for parent, child in (("artist", "album"), ("author", "book")):
+        owner, item = record.get(parent), record.get(child)
+        if isinstance(owner, dict) or isinstance(item, dict):
+            names = [
+                (owner or {}).get("artistName") or (owner or {}).get("authorName"),
+                (item or {}).get("title"),
+            ]
+            return " - ".join(n for n in names if n) or None
+    movie = record.get("movie")
+    if isinstance(movie, dict):
+        year = movie.get("year")
+        return f"{movie.get('title')} ({year})" if year else movie.get("title")
+    return None
+
+
+def normalize_entry(service: str, record: dict[str, Any]) -> dict[str, Any]:
+    """Project one ``get_queue`` record onto the common queue entry shape."""
+    size = record.get("size") or 0
+    left = record.get("sizeleft") or 0
+    entry: dict[str, Any] = {
+        "key": f"{service}:{record.get('id')}",
+        "service": service,
+        "id": record.get("id"),
+        "title": record.get("title"),
+        "media": _media_title(record),
+        "size": size,
+        "sizeleft": left,
+        "progress": round(100.0 * (size - left) / size, 1) if size else 0.0,
+    }
+    for field in _PASSTHROUGH:
+        if record.get(field) is not None:
+            entry[field] = record[field]
+    return entry
+
+
+def _without_version(entry: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in entry.items() if k != "version"}
+
+
+def _iso(ts: float | None) -> str | None:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="seconds")
+
+
+class QueueSnapshotter:
+    """
+    Keeps a versioned, normalized copy of every service's download queue.
+
+    Each refresh that changes anything bumps :attr:`version`; changed entries
+    carry the version they changed in and removed ones leave a tombstone, so
+    :meth:`overview` can answer ``since_version`` with just the delta. Only the
+    newest ``max_tombstones`` removals are kept; older ``since_version`` values
+    get a full snapshot instead. The background thread stops by itself after
+    ``idle_timeout`` seconds without an :meth:`overview` call.
+    """
+
+    def __init__(
+        self,
+        clients: dict[str, Any],
+        interval: float = 15.0,
+        idle_timeout: float = 600.0,
+        max_tombstones: int = 1000,
+        page_size: int = 250,
+    ):
+        """
+        Args:
+            clients (Dict[str, Any]): Service name to API client, for services
+                listed in :data:`QUEUE_SOURCES`.
+            interval (float): Seconds between background refreshes.
+            idle_timeout (float): Seconds without readers before the thread stops.
+            max_tombstones (int): Removed entries remembered for deltas.
+            page_size (int): ``pageSize`` used when paging each queue.
+        """
+        self.clients = {s: c for s, c in clients.items() if s in QUEUE_SOURCES}
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.max_tombstones = max_tombstones
+        self.page_size = page_size
+        self.version = 0
+        self.refreshed_at: float | None = None
+        self.services: dict[str, dict[str, Any]] = {}
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._removed: dict[str, int] = {}
+        self._floor = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._last_read = time.monotonic()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def _fetch(self, service: str) -> list[dict[str, Any]]:
+        client = self.clients[service]
+        return [
+            normalize_entry(service, record)
+            for record in iter_pages(
+                client.get_queue,
+                page_size=self.page_size,
+                **QUEUE_SOURCES[service],
+            )
+            if isinstance(record, dict)
+        ]
+
+    def refresh(self) -> int:
+        """Fetch every queue now and fold the changes in; returns the new version."""
+        with self._refresh_lock:
+            began = time.monotonic()
+            fetched = bounded_map(self._fetch, list(self.clients), len(self.clients))
+            elapsed = round(time.monotonic() - began, 3)
+            with self._lock:
+                self._apply(fetched, elapsed)
+                return self.version
+
+    def _apply(self, fetched: list, elapsed: float) -> None:
+        next_version = self.version + 1
+        changed = False
+        for service, entries, error in fetched:
+            if error is not None:
+                # Keep the last good entries rather than reporting a drained queue.
+                self.services[service] = {
+                    **self.services.get(service, {}),
+                    "error": str(error),
+                }
+                continue
+            self.services[service] = {"count": len(entries), "elapsed_s": elapsed}
+            current = {e["key"]: e for e in entries}
+            for key, entry in current.items():
+                previous = self._entries.get(key)
+                if previous is None or _without_version(previous) != entry:
+                    self._entries[key] = {**entry, "version": next_version}
+                    self._removed.pop(key, None)
+                    changed = True
+            for key in [
+                k
+                for k, e in self._entries.items()
+                if e["service"] == service and k not in current
+            ]:
+                del self._entries[key]
+                self._removed[key] = next_version
+                changed = True
+        if changed:
+            self.version = next_version
+        while len(self._removed) > self.max_tombstones:
+            key = next(iter(self._removed))
+            self._floor = max(self._floor, self._removed.pop(key))
+        self.refreshed_at = time.time()
+
+    def overview(
+        self, since_version: int | None = None, services: list[str] | None = None
+    ) -> dict[str, Any]:
+        """
+        Return the queue snapshot, or only the changes after ``since_version``.
+
+        Args:
+            since_version (Optional[int]): Version from a previous call. Entries
+                changed after it are returned in ``entries`` and keys removed
+                after it in ``removed``. ``None``, a version older than the
+                retained history, or one from another server run yields the
+                full snapshot (``full: true``).
+            services (Optional[List[str]]): Restrict to these services.
+
+        Returns:
+            Dict: ``version``, ``full``, ``refreshed_at``, ``age_s``, per-service
+            ``services`` status, ``entries`` and ``removed`` keys.
+        """
+        self._last_read = time.monotonic()
+        if self.refreshed_at is None:
+            self.refresh()
+        wanted = set(services or self.clients)
+        with self._lock:
+            # Anything older than the oldest tombstone (or unknown) gets it all.
+            since = -1 if since_version is None else since_version
+            full = since < self._floor or since > self.version
+            entries = [
+                dict(e)
+                for e in self._entries.values()
+                if e["service"] in wanted and (full or e["version"] > since)
+            ]
+            removed = (
+                []
+                if full
+                else [
+                    k
+                    for k, v in self._removed.items()
+                    if v > since and k.split(":", 1)[0] in wanted
+                ]
+            )
+            refreshed_at = self.refreshed_at or time.time()
+            result = {
+                "version": self.version,
+                "full": full,
+                "refreshed_at": _iso(refreshed_at),
+                "age_s": round(time.time() - refreshed_at, 1),
+                "services": {
+                    s: dict(v) for s, v in self.services.items() if s in wanted
+                },
+                "entries": sorted(
+                    entries, key=lambda e: (e["service"], -e["progress"], e["key"])
+                ),
+                "removed": removed,
+            }
+        return result
+
+    def ensure_running(self) -> None:
+        """Start the background refresh thread unless it is already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._last_read = time.monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="arr-queue-snapshotter", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread after its current refresh."""
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if time.monotonic() - self._last_read > self.idle_timeout:
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Queue snapshot refresh failed: {e}")
@@ -0,0 +1,176 @@
+"""
+Rate-limit buckets shared by every worker process.
+
+The server's ``RateLimitingMiddleware`` keeps its token buckets in process
+memory, so with ``MCP_WORKERS`` processes the effective limit would be N
+times the configured one. :class:`SharedTokenBuckets` stores the buckets in
+a SQLite file in WAL mode and refills and consumes each one inside a single
+write transaction, so every worker draws from the same bucket.
+:func:`share_rate_limits` swaps them into the middleware, and
+:func:`apply_rate_limit_settings` sets its rate from ``MCP_RATE_LIMIT_RPS``.
+
+CONCEPT:ARR-024 — Worker Pool
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+class SharedTokenBuckets:
+    """Token buckets in a SQLite file, refilled on access."""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path (str): Path of the SQLite file; parent directories are created.
+            clock (Callable): Wall-clock time source, shared across processes.
+        """
+        path = os.path.expanduser(path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def consume(
+        self, key: str, capacity: float, rate: float, tokens: float = 1.0
+    ) -> bool:
+        """
+        Take ``tokens`` from bucket ``key`` if it holds enough.
+
+        Args:
+            key (str): Bucket name, e.g. ``"global"`` or a client id.
+            capacity (float): Most tokens the bucket holds; a new bucket starts full.
+            rate (float): Tokens added per second.
+            tokens (float): Tokens the request costs.
+
+        Returns:
+            bool: Whether the tokens were taken.
+        """
+        now = self._clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+                ).fetchone()
+                level = capacity
+                if row is not None:
+                    level = min(capacity, row[0] + max(now - row[1], 0.0) * rate)
+                allowed = level >= tokens
+                if allowed:
+                    level -= tokens
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated) "
+                    "VALUES (?, ?, ?)",
+                    (key, level, now),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return allowed
+
+
+class SharedBucket:
+    """One named bucket, with the async ``consume()`` the middleware calls."""
+
+    def __init__(
+        self, buckets: SharedTokenBuckets, key: str, capacity: float, rate: float
+    ):
+        self.buckets = buckets
+        self.key = key
+        self.capacity = capacity
+        self.rate = rate
+
+    async def consume(self, tokens: int = 1) -> bool:
+        return await asyncio.to_thread(
+            self.buckets.consume, self.key, self.capacity, self.rate, tokens
+        )
+
+
+def _is_token_bucket_limiter(middleware: Any) -> bool:
+    return (
+        hasattr(middleware, "limiters")
+        and hasattr(middleware, "burst_capacity")
+        and hasattr(middleware, "max_requests_per_second")
+    )
+
+
+def apply_rate_limit_settings(
+    middlewares: list[Any], rate: float, burst: int
+) -> list[Any]:
+    """
+    Set the sustained rate and burst of the token-bucket rate limiters.
+
+    Args:
+        middlewares (List[Any]): The server's middleware instances.
+        rate (float): Requests per second; ``0`` drops the rate limiter.
+        burst (int): Requests allowed in a burst.
+
+    Returns:
+        List[Any]: The middlewares to install.
+    """
+    kept = []
+    for middleware in middlewares:
+        if _is_token_bucket_limiter(middleware):
+            if rate <= 0:
+                continue
+            middleware.max_requests_per_second = rate
+            middleware.burst_capacity = max(int(burst), 1)
+        kept.append(middleware)
+    return kept
+
+
+class _KeyedDefault(dict):
+    """A dict that fills a missing key with ``factory(key)``."""
+
+    def __init__(self, factory: Callable[[str], Any]):
+        super().__init__()
+        self.factory = factory
+
+    def __missing__(self, key: str) -> Any:
+        value = self[key] = self.factory(key)
+        return value
+
+
+def share_rate_limits(middlewares: list[Any], buckets: SharedTokenBuckets) -> int:
+    """
+    Point every token-bucket rate-limiting middleware at ``buckets``.
+
+    Args:
+        middlewares (List[Any]): The server's middleware instances.
+        buckets (SharedTokenBuckets): Buckets shared by all workers.
+
+    Returns:
+        int: Number of middlewares switched over.
+    """
+    shared = 0
+    for middleware in middlewares:
+        if not _is_token_bucket_limiter(middleware):
+            continue
+        capacity = middleware.burst_capacity
+        rate = middleware.max_requests_per_second
+
+        def bucket(key: str, capacity: float = capacity, rate: float = rate) -> Any:
+            return SharedBucket(buckets, f"rate:{key}", capacity, rate)
+
+        middleware.limiters = _KeyedDefault(bucket)
+        if getattr(middleware, "global_limit", False):
+            middleware.global_limiter = bucket("global")
+        shared += 1
+    return shared
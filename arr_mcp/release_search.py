@@ -0,0 +1,265 @@
+"""
+Streaming fan-out release search across Prowlarr indexers.
+
+``Api.search`` issues one ``/api/v1/search`` call and Prowlarr answers only
+after its slowest indexer does. :func:`iter_indexer_results` instead issues one
+search per enabled indexer (``indexerIds=[id]``), at most ``concurrency`` at
+a time, and yields each indexer's releases as soon as they arrive. An
+indexer that exceeds the per-indexer timeout is abandoned and its slot goes
+to the next indexer. :class:`ReleaseMerger` deduplicates the
+stream by info hash or GUID and ranks the merged releases.
+
+CONCEPT:ARR-008 — Fan-Out Release Search
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from arr_mcp import tracing
+from arr_mcp.paging import records
+
+
+@dataclass
+class IndexerResult:
+    """One indexer's answer (or failure) within a fan-out search."""
+
+    indexer_id: int
+    name: str
+    releases: list[dict[str, Any]] = field(default_factory=list)
+    elapsed: float = 0.0
+    error: str | None = None
+
+
+def enabled_indexers(client: Any, indexer_ids: list[int] | None = None) -> list[dict]:
+    """Return the enabled indexers, optionally restricted to ``indexer_ids``."""
+    wanted = set(indexer_ids or [])
+    return [
+        indexer
+        for indexer in records(client.get_indexer())
+        if isinstance(indexer, dict)
+        and indexer.get("enable", True)
+        and indexer.get("id") is not None
+        and (not wanted or indexer["id"] in wanted)
+    ]
+
+
+def iter_indexer_results(
+    client: Any,
+    query: str,
+    indexers: list[dict],
+    type: str = "search",
+    categories: list[int] | None = None,
+    limit: int | None = None,
+    timeout: float = 15.0,
+    concurrency: int = 8,
+) -> Iterator[IndexerResult]:
+    """
+    Search each indexer separately and yield results in completion order.
+
+    Args:
+        client (Any): Prowlarr API client.
+        query (str): Search term.
+        indexers (List[Dict]): Indexers to query, as returned by ``get_indexer``.
+        type (str): Prowlarr search type (``search``, ``movie``, ``tvsearch``...).
+        categories (Optional[List[int]]): Newznab category filter.
+        limit (Optional[int]): Per-indexer result cap.
+        timeout (float): Seconds an indexer may run before it is dropped.
+        concurrency (int): Indexers queried at once.
+
+    Yields:
+        IndexerResult: One per indexer. Indexers that time out are yielded with
+        ``error="timeout"``, free their slot for the next indexer, and their
+        late answers are discarded.
+    """
+    if not indexers:
+        return
+
+    def run(indexer: dict) -> None:
+        try:
+            releases = records(
+                client.get_search(
+                    query=query,
+                    type=type,
+                    indexerIds=[indexer["id"]],
+                    categories=categories,
+                    limit=limit,
+                )
+            )
+        except Exception as e:
+            answers.put((indexer, None, e))
+        else:
+            answers.put((indexer, releases, None))
+
+    # One daemon thread per indexer rather than a fixed pool: a thread stuck
+    # past the timeout cannot be stopped, so its slot is given to a fresh
+    # thread and whatever it answers later is dropped.
+    answers: queue.Queue[tuple[dict, list | None, Exception | None]] = queue.Queue()
+    pending = list(indexers)
+    running: dict[int, tuple[dict, float]] = {}
+    slots = max(1, concurrency)
+    while pending or running:
+        while pending and len(running) < slots:
+            indexer = pending.pop(0)
+            running[indexer["id"]] = (indexer, time.monotonic())
+            task = contextvars.copy_context().run
+            threading.Thread(
+                target=task,
+                args=(tracing.queued(run), indexer),
+                name=f"release-search-{indexer['id']}",
+                daemon=True,
+            ).start()
+        deadline = min(began for _, began in running.values()) + timeout
+        try:
+            indexer, releases, error = answers.get(
+                timeout=max(0.0, deadline - time.monotonic())
+            )
+        except queue.Empty:
+            pass
+        else:
+            if indexer["id"] in running:
+                _, began = running.pop(indexer["id"])
+                yield IndexerResult(
+                    indexer["id"],
+                    indexer.get("name", ""),
+                    releases or [],
+                    elapsed=round(time.monotonic() - began, 3),
+                    error=None if error is None else str(error),
+                )
+        now = time.monotonic()
+        for indexer_id, (indexer, began) in list(running.items()):
+            if now - began >= timeout:
+                del running[indexer_id]
+                yield IndexerResult(
+                    indexer_id,
+                    indexer.get("name", ""),
+                    elapsed=round(now - began, 3),
+                    error="timeout",
+                )
+
+
+def release_key(release: dict[str, Any]) -> str:
+    """Identity used to merge the same release reported by several indexers."""
+    info_hash = release.get("infoHash")
+    if info_hash:
+        return f"btih:{str(info_hash).lower()}"
+    guid = release.get("guid") or release.get("downloadUrl")
+    if guid:
+        return f"guid:{guid}"
+    return (
+        f"title:{release.get('indexerId')}:{release.get('title')}:{release.get('size')}"
+    )
+
+
+def rank_key(release: dict[str, Any]) -> tuple:
+    """Sort key: most seeders (grabs for usenet), then newest, then largest."""
+    popularity = release.get("seeders")
+    if popularity is None:
+        popularity = release.get("grabs") or 0
+    age = release.get("ageMinutes")
+    if age is None:
+        age = (release.get("age") or 0) * 1440
+    return (-popularity, age, -(release.get("size") or 0))
+
+
+class ReleaseMerger:
+    """Accumulates releases from many indexers, keeping one entry per release."""
+
+    def __init__(self):
+        self._releases: dict[str, dict[str, Any]] = {}
+
+    def add(self, result: IndexerResult) -> int:
+        """Merge one indexer's releases and return how many were new."""
+        new = 0
+        for release in result.releases:
+            if not isinstance(release, dict):
+                continue
+            key = release_key(release)
+            existing = self._releases.get(key)
+            if existing is None:
+                self._releases[key] = {**release, "indexers": [result.name]}
+                new += 1
+                continue
+            if result.name not in existing["indexers"]:
+                existing["indexers"].append(result.name)
+            if (release.get("seeders") or 0) > (existing.get("seeders") or 0):
+                existing["seeders"] = release["seeders"]
+        return new
+
+    def __len__(self) -> int:
+        return len(self._releases)
+
+    def ranked(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Return merged releases best first, at most ``limit`` of them."""
+        ordered = sorted(self._releases.values(), key=rank_key)
+        return ordered if limit is None else ordered[:limit]
+
+
+def fanout_search(
+    client: Any,
+    query: str,
+    indexer_ids: list[int] | None = None,
+    type: str = "search",
+    categories: list[int] | None = None,
+    limit: int = 50,
+    timeout: float = 15.0,
+    concurrency: int = 8,
+    on_result: Callable[[IndexerResult, int, int, ReleaseMerger], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Search every enabled indexer concurrently and return merged, ranked releases.
+
+    Args:
+        client (Any): Prowlarr API client.
+        query (str): Search term.
+        indexer_ids (Optional[List[int]]): Restrict to these indexers.
+        type (str): Prowlarr search type.
+        categories (Optional[List[int]]): Newznab category filter.
+        limit (int): Number of ranked releases returned.
+        timeout (float): Per-indexer timeout in seconds.
+        concurrency (int): Indexers queried at once.
+        on_result (Optional[Callable]): Called as ``on_result(result, done,
+            total, merger)`` after each indexer answers, for progress streaming.
+
+    Returns:
+        Dict: ``releases`` (ranked, deduplicated), ``total`` unique releases and
+        a per-indexer ``indexers`` report with counts, latency and errors.
+    """
+    indexers = enabled_indexers(client, indexer_ids)
+    merger = ReleaseMerger()
+    report = []
+    first_result_s = None
+    began = time.monotonic()
+    for done, result in enumerate(
+        iter_indexer_results(
+            client, query, indexers, type, categories, None, timeout, concurrency
+        ),
+        start=1,
+    ):
+        new = merger.add(result)
+        if first_result_s is None and result.releases:
+            first_result_s = round(time.monotonic() - began, 3)
+        entry = {
+            "id": result.indexer_id,
+            "name": result.name,
+            "releases": len(result.releases),
+            "new": new,
+            "elapsed": result.elapsed,
+        }
+        if result.error:
+            entry["error"] = result.error
+        report.append(entry)
+        if on_result is not None:
+            on_result(result, done, len(indexers), merger)
+    return {
+        "query": query,
+        "total": len(merger),
+        "first_result_s": first_result_s,
+        "elapsed_s": round(time.monotonic() - began, 3),
+        "indexers": report,
+        "releases": merger.ranked(limit),
+    }
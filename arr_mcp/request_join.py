@@ -0,0 +1,231 @@
+"""
+Fulfillment status of Seerr requests joined against Radarr and Sonarr.
+
+Working out why a request never arrived means checking Seerr, then the movie
+or series in Radarr/Sonarr, then their queue and history: N+1 lookups per
+request. :func:`join_requests` instead pulls every request, the full Radarr
+movie and Sonarr series lists, both queues and recent grab history in a
+handful of concurrent bulk fetches, indexes the *arr side by tmdbId/tvdbId,
+and classifies each request into a fulfillment stage with dictionary probes.
+
+CONCEPT:ARR-015 — Request Fulfillment Join
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from arr_mcp.concurrency import bounded_map
+from arr_mcp.paging import iter_pages, records
+from arr_mcp.seerr_triage import iter_requests
+
+# Seerr request status codes.
+_REQUEST_STATUS = {1: "pending_approval", 3: "declined", 4: "failed"}
+
+STAGES = (
+    "pending_approval",
+    "declined",
+    "failed",
+    "not_in_arr",
+    "unmonitored",
+    "wanted",
+    "grabbed_not_imported",
+    "downloading",
+    "partially_available",
+    "available",
+    "unknown",
+)
+
+# Stages that need someone to act; everything else is waiting or done.
+STUCK_STAGES = frozenset(
+    {"failed", "not_in_arr", "unmonitored", "grabbed_not_imported"}
+)
+
+# Per service: library list method, join id field, queue/history item key.
+ARR_SIDES: dict[str, tuple[str, str, str]] = {
+    "radarr": ("get_movie", "tmdbId", "movieId"),
+    "sonarr": ("get_series", "tvdbId", "seriesId"),
+}
+
+
+def _fetch_side(service: str, client: Any, since: str) -> dict[str, Any]:
+    list_method, _, item_key = ARR_SIDES[service]
+    library = [
+        r for r in records(getattr(client, list_method)()) if isinstance(r, dict)
+    ]
+    queued = {
+        r.get(item_key)
+        for r in iter_pages(client.get_queue)
+        if isinstance(r, dict) and r.get(item_key) is not None
+    }
+    grabbed = {
+        r.get(item_key)
+        for r in records(client.get_history_since(date=since, eventType="grabbed"))
+        if isinstance(r, dict) and r.get(item_key) is not None
+    }
+    return {"library": library, "queued": queued, "grabbed": grabbed}
+
+
+def _episode_counts(item: dict[str, Any], seasons: list[int]) -> tuple[int, int]:
+    """Files and episodes for the requested seasons (all seasons when none)."""
+    if seasons:
+        have = total = 0
+        for season in item.get("seasons") or []:
+            if season.get("seasonNumber") in seasons:
+                stats = season.get("statistics") or {}
+                have += stats.get("episodeFileCount") or 0
+                total += stats.get("episodeCount") or 0
+        if total:
+            return have, total
+    stats = item.get("statistics") or {}
+    return stats.get("episodeFileCount") or 0, stats.get("episodeCount") or 0
+
+
+def classify(
+    request: dict[str, Any],
+    item: dict[str, Any] | None,
+    queued: set[Any],
+    grabbed: set[Any],
+) -> str:
+    """Return the fulfillment stage of one request given its joined *arr item."""
+    status = request.get("status")
+    if status in _REQUEST_STATUS:
+        return _REQUEST_STATUS[status]
+    if item is None:
+        return "not_in_arr"
+    if "hasFile" in item:
+        have, total = int(bool(item["hasFile"])), 1
+    else:
+        seasons = [
+            s["seasonNumber"]
+            for s in request.get("seasons") or []
+            if isinstance(s, dict) and s.get("seasonNumber") is not None
+        ]
+        have, total = _episode_counts(item, seasons)
+    if total and have >= total:
+        return "available"
+    if item.get("id") in queued:
+        return "downloading"
+    if have:
+        return "partially_available"
+    if item.get("id") in grabbed:
+        return "grabbed_not_imported"
+    if not item.get("monitored", True):
+        return "unmonitored"
+    return "wanted"
+
+
+def join_requests(
+    seerr: Any,
+    radarr: Any | None = None,
+    sonarr: Any | None = None,
+    history_days: int = 30,
+    stages: list[str] | None = None,
+    concurrency: int = 4,
+) -> dict[str, Any]:
+    """
+    Classify every Seerr request by how far it got through Radarr/Sonarr.
+
+    Movie requests join Radarr movies on ``tmdbId``; TV requests join Sonarr
+    series on ``tvdbId``. A request whose service is not configured is
+    ``unknown``.
+
+    Args:
+        seerr (Any): Seerr API client.
+        radarr (Optional[Any]): Radarr API client.
+        sonarr (Optional[Any]): Sonarr API client.
+        history_days (int): How far back grab history is read.
+        stages (Optional[List[str]]): Only list requests in these stages
+            (``stuck`` selects :data:`STUCK_STAGES`); counts cover every request.
+        concurrency (int): Bulk fetches in flight.
+
+    Returns:
+        Dict: Per-stage ``counts``, the ``stuck`` total, matching ``requests``
+        (id, type, title, requester, stage, arr id), ``fetch_s`` spent in bulk
+        fetches and ``join_ms`` of local work.
+    """
+    wanted = set(stages or STAGES)
+    if "stuck" in wanted:
+        wanted = (wanted - {"stuck"}) | STUCK_STAGES
+    unknown = wanted - set(STAGES)
+    if unknown:
+        raise ValueError(
+            f"Unknown stage {', '.join(sorted(unknown))}; "
+            f"expected stuck or any of {', '.join(STAGES)}"
+        )
+    since = (
+        (datetime.now(timezone.utc) - timedelta(days=history_days))
+        .isoformat(timespec="seconds")
+        .replace("+00:00", "Z")
+    )
+    sides = {s: c for s, c in (("radarr", radarr), ("sonarr", sonarr)) if c is not None}
+    jobs = [("seerr", seerr)] + list(sides.items())
+
+    def fetch(job: tuple[str, Any]) -> Any:
+        service, client = job
+        if service == "seerr":
+            return list(iter_requests(client, filter="all"))
+        return _fetch_side(service, client, since)
+
+    began = time.monotonic()
+    fetched = {}
+    errors = {}
+    for (service, _), value, error in bounded_map(fetch, jobs, concurrency):
+        if error is not None:
+            if service == "seerr":
+                raise error
+            errors[service] = str(error)
+        else:
+            fetched[service] = value
+    fetch_s = round(time.monotonic() - began, 3)
+
+    began = time.perf_counter()
+    index = {}
+    for service, data in fetched.items():
+        if service == "seerr":
+            continue
+        key = ARR_SIDES[service][1]
+        index[service] = {
+            item[key]: item for item in data["library"] if item.get(key) is not None
+        }
+    counts = {stage: 0 for stage in STAGES}
+    rows = []
+    for request in fetched["seerr"]:
+        media = request.get("media") or {}
+        media_type = request.get("type") or media.get("mediaType")
+        service = {"movie": "radarr", "tv": "sonarr"}.get(str(media_type), "")
+        item = None
+        if service not in index:
+            stage = _REQUEST_STATUS.get(request.get("status"), "unknown")
+        else:
+            item = index[service].get(media.get(ARR_SIDES[service][1]))
+            side = fetched[service]
+            stage = classify(request, item, side["queued"], side["grabbed"])
+        counts[stage] += 1
+        if stage not in wanted:
+            continue
+        user = request.get("requestedBy") or {}
+        rows.append(
+            {
+                "id": request.get("id"),
+                "type": media_type,
+                "title": (item or {}).get("title"),
+                "tmdbId": media.get("tmdbId"),
+                "tvdbId": media.get("tvdbId"),
+                "requester": user.get("displayName") or user.get("email"),
+                "is4k": bool(request.get("is4k")),
+                "created": request.get("createdAt"),
+                "stage": stage,
+                "arr_id": (item or {}).get("id"),
+            }
+        )
+    join_ms = round((time.perf_counter() - began) * 1000, 3)
+    return {
+        "total": len(fetched["seerr"]),
+        "counts": {stage: n for stage, n in counts.items() if n},
+        "stuck": sum(counts[stage] for stage in STUCK_STAGES),
+        "requests": rows,
+        "errors": errors,
+        "fetch_s": fetch_s,
+        "join_ms": join_ms,
+    }
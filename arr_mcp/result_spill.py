@@ -0,0 +1,371 @@
+"""
+Server-side cursors for oversized tool results.
+
+``radarr_action get_movie`` or ``sonarr_action get_episode`` on a large
+library returns thousands of records in one MCP response, which is slow to
+serialize and can exceed what the client accepts. :func:`spill` measures a
+result and, above a threshold, keeps the full record list in a bounded,
+TTL-evicted :class:`ResultStore` and returns only the first chunk with a
+cursor. :func:`fetch_more` pages through the stored records without asking
+the service again. When the server runs several worker processes,
+:class:`SharedResultStore` keeps the spilled results in SQLite so a cursor
+can be followed from any worker.
+
+CONCEPT:ARR-021 — Result Spill
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+# Envelope keys that carry the record list, as in :func:`arr_mcp.paging.records`.
+_LIST_KEYS = ("result", "records", "data", "results")
+
+
+def _encoded_size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+@dataclass
+class StoredResult:
+    """A spilled record list, the envelope it came in and each record's size."""
+
+    envelope: dict[str, Any]
+    key: str
+    items: list[Any]
+    sizes: list[int]
+    expires: float = 0.0
+
+    @property
+    def size(self) -> int:
+        return sum(self.sizes)
+
+
+class ResultStore:
+    """
+    In-process store of spilled results with expiry and LRU eviction.
+
+    Bounded both by result count and by the total encoded size of the stored
+    records, so a burst of huge results cannot grow memory without limit.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 900.0,
+        max_results: int = 64,
+        max_bytes: int = 268435456,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            ttl (float): Seconds a spilled result stays available.
+            max_results (int): Results kept before the least recently used goes.
+            max_bytes (int): Total encoded record size kept before eviction.
+            clock (Callable): Monotonic time source.
+        """
+        self.ttl = ttl
+        self.max_results = max_results
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._results: OrderedDict[str, StoredResult] = OrderedDict()
+        self._bytes = 0
+        self.evicted = 0
+
+    def _drop(self, result_id: str) -> None:
+        stored = self._results.pop(result_id)
+        self._bytes -= stored.size
+
+    def _expire(self, now: float) -> None:
+        for result_id in [r for r, s in self._results.items() if s.expires < now]:
+            self._drop(result_id)
+
+    def put(self, stored: StoredResult) -> str:
+        """Store a spilled result for ``ttl`` seconds and return its id."""
+        result_id = uuid.uuid4().hex[:16]
+        stored.expires = self._clock() + self.ttl
+        with self._lock:
+            self._expire(self._clock())
+            self._results[result_id] = stored
+            self._bytes += stored.size
+            while len(self._results) > 1 and (
+                len(self._results) > self.max_results or self._bytes > self.max_bytes
+            ):
+                self._drop(next(iter(self._results)))
+                self.evicted += 1
+        return result_id
+
+    def get(self, result_id: str) -> StoredResult | None:
+        """Return a stored result that has not expired, or ``None``."""
+        with self._lock:
+            self._expire(self._clock())
+            stored = self._results.get(result_id)
+            if stored is not None:
+                self._results.move_to_end(result_id)
+            return stored
+
+    def stats(self) -> dict[str, Any]:
+        """Stored result count, total encoded size and evictions."""
+        with self._lock:
+            return {
+                "results": len(self._results),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evicted": self.evicted,
+            }
+
+
+class SharedResultStore:
+    """
+    :class:`ResultStore` kept in a SQLite file that several processes share.
+
+    Same expiry and LRU eviction by count and total size, with wall-clock
+    expiry so every process agrees on it. The database runs in WAL mode and
+    each ``put`` evicts inside one write transaction. Stored results never
+    change, so each process keeps its ``decoded`` most recently read results
+    and paging through one only checks that it is still stored.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 900.0,
+        max_results: int = 64,
+        max_bytes: int = 268435456,
+        decoded: int = 4,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path (str): Path of the SQLite file; parent directories are created.
+            ttl (float): Seconds a spilled result stays available.
+            max_results (int): Results kept before the least recently used goes.
+            max_bytes (int): Total encoded record size kept before eviction.
+            decoded (int): Decompressed results kept in this process.
+            clock (Callable): Wall-clock time source.
+        """
+        path = os.path.expanduser(path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_results = max_results
+        self.max_bytes = max_bytes
+        self.decoded = decoded
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._decoded: OrderedDict[str, StoredResult] = OrderedDict()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS spilled ("
+            "id TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS spill_stats (name TEXT PRIMARY KEY, value INTEGER)"
+        )
+
+    def put(self, stored: StoredResult) -> str:
+        """Store a spilled result for ``ttl`` seconds and return its id."""
+        result_id = uuid.uuid4().hex[:16]
+        now = self._clock()
+        stored.expires = now + self.ttl
+        blob = zlib.compress(
+            json.dumps(
+                [stored.envelope, stored.key, stored.items, stored.sizes],
+                separators=(",", ":"),
+                default=str,
+            ).encode()
+        )
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM spilled WHERE expires < ?", (now,))
+                self._conn.execute(
+                    "INSERT INTO spilled (id, value, size, expires, accessed) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (result_id, blob, stored.size, stored.expires, now),
+                )
+                self._evict(result_id)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result_id
+
+    def _evict(self, keep: str) -> None:
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM spilled"
+        ).fetchone()
+        evicted = 0
+        oldest = self._conn.execute(
+            "SELECT id, size FROM spilled WHERE id != ? ORDER BY accessed", (keep,)
+        ).fetchall()
+        for result_id, size in oldest:
+            if count <= self.max_results and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM spilled WHERE id = ?", (result_id,))
+            count, total, evicted = count - 1, total - size, evicted + 1
+        if evicted:
+            self._conn.execute(
+                "INSERT INTO spill_stats (name, value) VALUES ('evicted', ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (evicted,),
+            )
+
+    def get(self, result_id: str) -> StoredResult | None:
+        """Return a stored result that has not expired, or ``None``."""
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires FROM spilled WHERE id = ? AND expires >= ?",
+                (result_id, now),
+            ).fetchone()
+            if row is None:
+                self._decoded.pop(result_id, None)
+                return None
+            self._conn.execute(
+                "UPDATE spilled SET accessed = ? WHERE id = ?", (now, result_id)
+            )
+            stored = self._decoded.get(result_id)
+            if stored is not None:
+                self._decoded.move_to_end(result_id)
+                return stored
+            row = self._conn.execute(
+                "SELECT value, expires FROM spilled WHERE id = ?", (result_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        envelope, key, items, sizes = json.loads(zlib.decompress(row[0]))
+        stored = StoredResult(envelope, key, items, sizes, row[1])
+        with self._lock:
+            self._decoded[result_id] = stored
+            while len(self._decoded) > self.decoded:
+                self._decoded.popitem(last=False)
+        return stored
+
+    @property
+    def evicted(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM spill_stats WHERE name = 'evicted'"
+            ).fetchone()
+        return row[0] if row else 0
+
+    def stats(self) -> dict[str, Any]:
+        """Stored result count, total encoded size and evictions."""
+        evicted = self.evicted
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM spilled WHERE expires >= ?",
+                (self._clock(),),
+            ).fetchone()
+        return {
+            "results": count,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "evicted": evicted,
+            "path": self.path,
+        }
+
+
+def _chunk_end(sizes: list[int], start: int, chunk_bytes: int) -> int:
+    """Index after the last record of a chunk starting at ``start`` (at least one)."""
+    end, used = start, 0
+    while end < len(sizes) and (end == start or used + sizes[end] <= chunk_bytes):
+        used += sizes[end]
+        end += 1
+    return end
+
+
+def _page(stored: StoredResult, result_id: str, start: int, end: int) -> dict[str, Any]:
+    total = len(stored.items)
+    return {
+        **stored.envelope,
+        stored.key: stored.items[start:end],
+        "cursor": f"{result_id}:{end}" if end < total else None,
+        "offset": start,
+        "returned": end - start,
+        "total": total,
+    }
+
+
+def spill(
+    result: Any,
+    store: ResultStore | SharedResultStore,
+    threshold: int,
+    chunk_bytes: int,
+) -> Any:
+    """
+    Return ``result`` unchanged, or its first chunk plus a cursor when it is large.
+
+    The record list is the ``result``/``records``/``data``/``results`` list of
+    the response; a large response without one is spilled as chunks of its
+    JSON text under ``text``. Other envelope fields (``totalRecords``, ...)
+    are repeated with every chunk.
+
+    Args:
+        result (Any): Tool result about to be returned.
+        store (ResultStore | SharedResultStore): Where the full record list is kept.
+        threshold (int): Encoded size above which the result is spilled; ``0``
+            disables spilling.
+        chunk_bytes (int): Target encoded size of each returned chunk.
+
+    Returns:
+        Any: ``result`` itself, or a dict with the first chunk under the same
+        key plus ``cursor``, ``offset``, ``returned`` and ``total``.
+    """
+    if threshold <= 0 or not isinstance(result, (dict, list)):
+        return result
+    envelope = result if isinstance(result, dict) else {"result": result}
+    key = next((k for k in _LIST_KEYS if isinstance(envelope.get(k), list)), None)
+    if key is not None:
+        items = envelope[key]
+        sizes = [_encoded_size(item) + 1 for item in items]
+        if sum(sizes) <= threshold:
+            return result
+        rest = {k: v for k, v in envelope.items() if k != key}
+    else:
+        text = json.dumps(result, separators=(",", ":"), default=str)
+        if len(text) <= threshold:
+            return result
+        key, rest = "text", {"format": "json"}
+        items = [text[i : i + chunk_bytes] for i in range(0, len(text), chunk_bytes)]
+        sizes = [len(piece) for piece in items]
+    stored = StoredResult(rest, key, items, sizes)
+    result_id = store.put(stored)
+    return _page(stored, result_id, 0, _chunk_end(sizes, 0, chunk_bytes))
+
+
+def fetch_more(
+    store: ResultStore | SharedResultStore, cursor: str, chunk_bytes: int
+) -> dict[str, Any]:
+    """
+    Return the chunk of a spilled result that starts at ``cursor``.
+
+    Raises:
+        ValueError: The cursor is malformed, or its result expired or was evicted.
+    """
+    result_id, _, offset = str(cursor).partition(":")
+    if not offset.isdigit():
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    stored = store.get(result_id)
+    if stored is None:
+        raise ValueError(
+            f"Result for cursor '{cursor}' has expired; run the original action again"
+        )
+    start = min(int(offset), len(stored.items))
+    end = _chunk_end(stored.sizes, start, chunk_bytes)
+    return _page(stored, result_id, start, end)
@@ -0,0 +1,425 @@
+"""
+Rate-limited background searching of the wanted/missing and cutoff lists.
+
+Clearing a backlog by hand means paging ``get_wanted_missing`` or
+``get_wanted_cutoff`` and firing searches ad hoc, which can exhaust indexer API
+limits or flood the command queue. :class:`SearchScheduler` works through each
+wanted list a batch at a time and turns every batch into one search command
+(``EpisodeSearch``, ``MoviesSearch``, ``AlbumSearch``, ``BookSearch``). Each
+item searched costs one query on every indexer, so batches are sized to stay
+within an hourly per-indexer budget, and no new command is posted while the
+previous one is still queued. Each list is walked in a fixed sort order and
+the checkpoint is the sort value and id of the last item searched, not a page
+offset: searched items that get grabbed leave the list and move the rest
+forward, so the walk looks up where that key now sits and resumes right after
+it. Checkpoints, the spend ledger and job status live in SQLite, so a
+restarted server picks up where it stopped.
+
+CONCEPT:ARR-012 — Backlog Search Scheduler
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from arr_mcp.paging import records
+
+logger = logging.getLogger(__name__)
+
+# Search command name and id field per service.
+SEARCH_COMMANDS: dict[str, tuple[str, str]] = {
+    "sonarr": ("EpisodeSearch", "episodeIds"),
+    "radarr": ("MoviesSearch", "movieIds"),
+    "lidarr": ("AlbumSearch", "albumIds"),
+    "chaptarr": ("BookSearch", "bookIds"),
+}
+
+WANTED_METHODS = {"missing": "get_wanted_missing", "cutoff": "get_wanted_cutoff"}
+
+# Ascending sort key per service and the record field holding its value. The
+# servers break ties in row (id) order, which the checkpoint relies on.
+SORT_KEYS: dict[str, tuple[str, str]] = {
+    "sonarr": ("episodes.airDateUtc", "airDateUtc"),
+    "radarr": ("movieMetadata.sortTitle", "sortTitle"),
+    "lidarr": ("albums.releaseDate", "releaseDate"),
+    "chaptarr": ("books.releaseDate", "releaseDate"),
+}
+
+_ACTIVE_STATUSES = {"queued", "started"}
+_HOUR = 3600.0
+
+
+def _sort_value(item: dict[str, Any], field: str) -> tuple[str, int]:
+    """Position of a wanted item in its list: sort field, then id."""
+    return (str(item.get(field) or ""), int(item["id"]))
+
+
+class SearchScheduler:
+    """
+    Persistent, budgeted walker over the wanted lists of several services.
+
+    A job is one ``service:kind`` pair (``sonarr:missing``, ``radarr:cutoff``,
+    ...). Each :meth:`tick` advances every running job by at most one batch.
+    When a job reaches the end of its list it rests for ``cycle_interval``
+    seconds and then starts again from the top.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        clients: dict[str, Any],
+        budget_per_hour: int = 60,
+        batch_size: int = 10,
+        interval: float = 60.0,
+        cycle_interval: float = 86400.0,
+        clock: Any = time.time,
+    ):
+        """
+        Args:
+            path (str): SQLite file holding checkpoints and the spend ledger.
+            clients (Dict[str, Any]): Service name to API client.
+            budget_per_hour (int): Searches each indexer may receive per rolling
+                hour, shared by all jobs.
+            batch_size (int): Most items per search command.
+            interval (float): Seconds between background ticks.
+            cycle_interval (float): Seconds a finished job waits before rescanning.
+            clock (Callable): Time source, replaceable in tests.
+        """
+        path = os.path.expanduser(path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.clients = {s: c for s, c in clients.items() if s in SEARCH_COMMANDS}
+        self.budget_per_hour = budget_per_hour
+        self.batch_size = batch_size
+        self.interval = interval
+        self.cycle_interval = cycle_interval
+        self.clock = clock
+        self._lock = threading.RLock()
+        # Jobs a tick is advancing right now, so a concurrent tick skips them.
+        self._claimed: set[str] = set()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "name TEXT PRIMARY KEY, service TEXT NOT NULL, kind TEXT NOT NULL, "
+            "status TEXT NOT NULL DEFAULT 'stopped', offset INTEGER NOT NULL DEFAULT 0, "
+            "total INTEGER, searched INTEGER NOT NULL DEFAULT 0, "
+            "commands INTEGER NOT NULL DEFAULT 0, cycles INTEGER NOT NULL DEFAULT 0, "
+            "last_command_id INTEGER, next_run REAL NOT NULL DEFAULT 0, "
+            "last_error TEXT, updated REAL, last_key TEXT, last_id INTEGER)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column in ("last_key TEXT", "last_id INTEGER"):
+            if column.split()[0] not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS spend (at REAL NOT NULL, items INTEGER NOT NULL)"
+        )
+
+    # -- job control -----------------------------------------------------
+
+    def start(self, services: list[str] | None = None, kinds: list[str] | None = None):
+        """Mark jobs as running (creating them on first use) and start the thread."""
+        now = self.clock()
+        with self._lock:
+            for service in services or list(self.clients):
+                if service not in self.clients:
+                    raise ValueError(f"{service} is not configured for backlog search")
+                for kind in kinds or list(WANTED_METHODS):
+                    if kind not in WANTED_METHODS:
+                        raise ValueError(f"Unknown wanted list '{kind}'")
+                    self._conn.execute(
+                        "INSERT INTO jobs (name, service, kind, status, updated) "
+                        "VALUES (?, ?, ?, 'running', ?) ON CONFLICT(name) DO UPDATE "
+                        "SET status = 'running', last_error = NULL, updated = ?",
+                        (f"{service}:{kind}", service, kind, now, now),
+                    )
+        self.ensure_running()
+
+    def stop(self, services: list[str] | None = None, kinds: list[str] | None = None):
+        """Pause matching jobs; their checkpoints are kept."""
+        with self._lock:
+            for name in self._names(services, kinds):
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'stopped', updated = ? WHERE name = ?",
+                    (self.clock(), name),
+                )
+
+    def reset(self, services: list[str] | None = None, kinds: list[str] | None = None):
+        """Rewind matching jobs to the start of their wanted list."""
+        with self._lock:
+            for name in self._names(services, kinds):
+                self._conn.execute(
+                    "UPDATE jobs SET offset = 0, last_key = NULL, last_id = NULL, "
+                    "next_run = 0, updated = ? WHERE name = ?",
+                    (self.clock(), name),
+                )
+
+    def _names(self, services: list[str] | None, kinds: list[str] | None) -> list[str]:
+        rows = self._conn.execute("SELECT name, service, kind FROM jobs").fetchall()
+        return [
+            name
+            for name, service, kind in rows
+            if (not services or service in services) and (not kinds or kind in kinds)
+        ]
+
+    # -- budget ------------------------------------------------------------
+
+    def remaining_budget(self) -> int:
+        """Searches each indexer can still take in the current rolling hour."""
+        now = self.clock()
+        with self._lock:
+            self._conn.execute("DELETE FROM spend WHERE at < ?", (now - _HOUR,))
+            (spent,) = self._conn.execute(
+                "SELECT COALESCE(SUM(items), 0) FROM spend WHERE at >= ?",
+                (now - _HOUR,),
+            ).fetchone()
+        return max(0, self.budget_per_hour - spent)
+
+    # -- work --------------------------------------------------------------
+
+    def _busy(self, client: Any, command: str) -> bool:
+        return any(
+            isinstance(c, dict)
+            and c.get("name") == command
+            and str(c.get("status", "")).lower() in _ACTIVE_STATUSES
+            for c in records(client.get_command())
+        )
+
+    def _reserve(self, now: float) -> tuple[int, int]:
+        """Book up to one batch of the hourly budget; returns (items, ledger row)."""
+        with self._lock:
+            allowed = min(self.batch_size, self.remaining_budget())
+            if allowed <= 0:
+                return 0, 0
+            cursor = self._conn.execute(
+                "INSERT INTO spend (at, items) VALUES (?, ?)", (now, allowed)
+            )
+            return allowed, int(cursor.lastrowid or 0)
+
+    def _next_items(
+        self, client: Any, job: dict[str, Any], allowed: int
+    ) -> tuple[list[tuple[int, dict[str, Any]]], int | None]:
+        """
+        The next ``allowed`` wanted items after the job's checkpoint.
+
+        Returns:
+            Tuple: ``(position, item)`` pairs in list order and ``totalRecords``.
+        """
+        sort_key, field = SORT_KEYS[job["service"]]
+        size = self.batch_size
+        method = getattr(client, WANTED_METHODS[job["kind"]])
+        pages: dict[int, dict[str, Any]] = {}
+
+        def fetch(page: int) -> list[dict[str, Any]]:
+            if page not in pages:
+                response = method(
+                    page=page,
+                    pageSize=size,
+                    sortKey=sort_key,
+                    sortDirection="ascending",
+                    monitored=True,
+                )
+                pages[page] = response if isinstance(response, dict) else {}
+            return [
+                r for r in records(pages[page]) if isinstance(r, dict) and "id" in r
+            ]
+
+        checkpoint = (
+            None
+            if job["last_id"] is None
+            else (job["last_key"] or "", int(job["last_id"]))
+        )
+
+        def starts_after(page: int) -> bool:
+            # Whether the page is empty or begins past the checkpoint.
+            items = fetch(page)
+            return (
+                not items
+                or checkpoint is None
+                or _sort_value(items[0], field) > checkpoint
+            )
+
+        # The last page that begins at or before the checkpoint; 0 if none does.
+        if checkpoint is None:
+            page = 0
+        else:
+            page = job["offset"] // size + 1
+            if not starts_after(page):
+                while not starts_after(page + 1):
+                    page += 1
+            else:
+                # Items left the list since: gallop back, then bisect.
+                high, step = page, 1
+                page = max(1, page - step)
+                while page > 1 and starts_after(page):
+                    high, step = page, step * 2
+                    page = max(1, page - step)
+                if starts_after(page):
+                    page = 0
+                else:
+                    low = page
+                    while high - low > 1:
+                        middle = (low + high) // 2
+                        if starts_after(middle):
+                            high = middle
+                        else:
+                            low = middle
+                    page = low
+
+        found: list[tuple[int, dict[str, Any]]] = []
+        for number in (page, page + 1) if page else (1,):
+            for index, item in enumerate(fetch(number)):
+                if checkpoint is None or _sort_value(item, field) > checkpoint:
+                    found.append(((number - 1) * size + index, item))
+        total = next(
+            (p.get("totalRecords") for p in pages.values() if "totalRecords" in p),
+            None,
+        )
+        return found[:allowed], total
+
+    def _advance(self, job: dict[str, Any]) -> None:
+        service, name = job["service"], job["name"]
+        client = self.clients[service]
+        command, ids_field = SEARCH_COMMANDS[service]
+        now = self.clock()
+        if self._busy(client, command):
+            return
+        allowed, ledger_row = self._reserve(now)
+        if allowed <= 0:
+            return
+        searched = 0
+        try:
+            items, total = self._next_items(client, job, allowed)
+            if not items:
+                # End of the list: rest, then rescan from the top.
+                with self._lock:
+                    self._conn.execute(
+                        "UPDATE jobs SET offset = 0, last_key = NULL, last_id = NULL, "
+                        "total = ?, cycles = cycles + 1, next_run = ?, updated = ? "
+                        "WHERE name = ?",
+                        (total, now + self.cycle_interval, now, name),
+                    )
+                return
+
+            posted = client.post_command(
+                data={"name": command, ids_field: [item["id"] for _, item in items]}
+            )
+            searched = len(items)
+            position, last = items[-1]
+            last_key, last_id = _sort_value(last, SORT_KEYS[service][1])
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE jobs SET offset = ?, last_key = ?, last_id = ?, total = ?, "
+                    "searched = searched + ?, commands = commands + 1, "
+                    "last_command_id = ?, updated = ? WHERE name = ?",
+                    (
+                        position + 1,
+                        last_key,
+                        last_id,
+                        total,
+                        searched,
+                        posted.get("id") if isinstance(posted, dict) else None,
+                        now,
+                        name,
+                    ),
+                )
+        finally:
+            # Give back whatever part of the booked budget went unused.
+            with self._lock:
+                if searched:
+                    self._conn.execute(
+                        "UPDATE spend SET items = ? WHERE rowid = ?",
+                        (searched, ledger_row),
+                    )
+                else:
+                    self._conn.execute(
+                        "DELETE FROM spend WHERE rowid = ?", (ledger_row,)
+                    )
+
+    def _claim(self) -> list[dict[str, Any]]:
+        """Running jobs due now that no other tick is advancing; marks them claimed."""
+        now = self.clock()
+        with self._lock:
+            jobs = [
+                job
+                for job in self._jobs("WHERE status = 'running'")
+                if job["service"] in self.clients
+                and job["name"] not in self._claimed
+                and job["next_run"] <= now
+            ]
+            self._claimed.update(job["name"] for job in jobs)
+        return jobs
+
+    def tick(self) -> None:
+        """
+        Advance every running job by at most one search batch.
+
+        Jobs and their share of the budget are claimed under the lock; the
+        requests to the services run after it is released.
+        """
+        for job in self._claim():
+            try:
+                self._advance(job)
+            except Exception as e:
+                logger.warning(f"Backlog search {job['name']} failed: {e}")
+                with self._lock:
+                    self._conn.execute(
+                        "UPDATE jobs SET last_error = ?, updated = ? WHERE name = ?",
+                        (str(e), self.clock(), job["name"]),
+                    )
+            finally:
+                with self._lock:
+                    self._claimed.discard(job["name"])
+
+    def _jobs(self, where: str = "") -> list[dict[str, Any]]:
+        cursor = self._conn.execute(f"SELECT * FROM jobs {where} ORDER BY name")
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row, strict=True)) for row in cursor.fetchall()]
+
+    def status(self) -> dict[str, Any]:
+        """Return every job's checkpoint and counters plus the remaining budget."""
+        with self._lock:
+            jobs = self._jobs()
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "budget_per_hour": self.budget_per_hour,
+            "budget_remaining": self.remaining_budget(),
+            "batch_size": self.batch_size,
+            "jobs": jobs,
+        }
+
+    # -- background thread -------------------------------------------------
+
+    def has_running_jobs(self) -> bool:
+        """Whether any job is marked running (e.g. before a restart)."""
+        with self._lock:
+            return bool(self._jobs("WHERE status = 'running'"))
+
+    def ensure_running(self) -> None:
+        """Start the background thread unless it is already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="arr-backlog-search", daemon=True
+        )
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        """Stop the background thread after its current tick."""
+        self._stop.set()
+
+    def _run(self) -> None:
+        while True:
+            self.tick()
+            if not self.has_running_jobs() or self._stop.wait(self.interval):
+                return
@@ -0,0 +1,289 @@
+"""
+Rule-based triage of pending Seerr requests.
+
+``get_request`` pages with ``take``/``skip`` and each decision is its own
+``post_request_id_approve`` or ``post_request_id_decline`` call, so clearing a
+morning's worth of requests by hand is hundreds of round trips.
+:func:`triage` reads every pending request once, looks up each distinct title
+at most once (through an optional shared store) when a rule needs to know
+whether it is already available, decides locally with the first matching
+:class:`TriageRule`, and applies the decisions concurrently.
+
+CONCEPT:ARR-014 — Request Triage
+"""
+
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from arr_mcp.concurrency import bounded_map
+from arr_mcp.paging import records
+
+# Seerr request and media status codes.
+REQUEST_PENDING = 1
+MEDIA_AVAILABLE = 5
+
+TRIAGE_ACTIONS = ("approve", "decline", "skip")
+
+_REQUESTER_FIELDS = ("displayName", "username", "plexUsername", "jellyfinUsername")
+
+
+@dataclass
+class TriageRule:
+    """
+    One triage rule; unset criteria match every request.
+
+    ``available`` compares against the media's current (4K or regular) status
+    in Seerr, so a rule with it set costs one cached detail lookup per title.
+    """
+
+    action: str
+    requesters: list[str | int] = field(default_factory=list)
+    media_type: str | None = None
+    is4k: bool | None = None
+    available: bool | None = None
+    reason: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TriageRule":
+        """Build a rule from its JSON form (``requester`` may be a single value)."""
+        requesters = data.get("requesters", data.get("requester")) or []
+        if not isinstance(requesters, list):
+            requesters = [requesters]
+        rule = cls(
+            action=str(data.get("action", "")).lower(),
+            requesters=requesters,
+            media_type=data.get("media_type"),
+            is4k=data.get("is4k"),
+            available=data.get("available"),
+            reason=data.get("reason"),
+        )
+        if rule.action not in ("approve", "decline"):
+            raise ValueError(
+                f"Rule action must be approve or decline, not '{rule.action}'"
+            )
+        if rule.media_type not in (None, "movie", "tv"):
+            raise ValueError(
+                f"Rule media_type must be movie or tv, not '{rule.media_type}'"
+            )
+        return rule
+
+
+def iter_requests(
+    client: Any, filter: str = "pending", take: int = 100, max_pages: int = 100
+) -> Iterator[dict[str, Any]]:
+    """Yield every request matching ``filter``, paging with ``take``/``skip``."""
+    for page in range(max_pages):
+        response = client.get_request(take=take, skip=page * take, filter=filter)
+        batch = [r for r in records(response) if isinstance(r, dict)]
+        yield from batch
+        info = response.get("pageInfo") if isinstance(response, dict) else None
+        total = info.get("results") if isinstance(info, dict) else None
+        if len(batch) < take or (isinstance(total, int) and (page + 1) * take >= total):
+            return
+
+
+def _media_key(request: dict[str, Any]) -> tuple[str, int] | None:
+    media = request.get("media") or {}
+    media_type = request.get("type") or media.get("mediaType")
+    tmdb_id = media.get("tmdbId")
+    if media_type not in ("movie", "tv") or tmdb_id is None:
+        return None
+    return media_type, tmdb_id
+
+
+def _requester(request: dict[str, Any]) -> dict[str, Any]:
+    user = request.get("requestedBy")
+    return user if isinstance(user, dict) else {}
+
+
+def _requester_name(request: dict[str, Any]) -> str | None:
+    user = _requester(request)
+    for key in _REQUESTER_FIELDS + ("email",):
+        if user.get(key):
+            return str(user[key])
+    return None
+
+
+def _by_requester(request: dict[str, Any], wanted: list[str | int]) -> bool:
+    user = _requester(request)
+    names = {
+        str(user[key]).strip().lower()
+        for key in _REQUESTER_FIELDS + ("email",)
+        if user.get(key)
+    }
+    for who in wanted:
+        if isinstance(who, int) or str(who).isdigit():
+            if user.get("id") == int(who):
+                return True
+        elif str(who).strip().lower() in names:
+            return True
+    return False
+
+
+def is_available(request: dict[str, Any], details: dict[str, Any] | None) -> bool:
+    """Whether the requested title (in the requested quality tier) is already available."""
+    info = (details or {}).get("mediaInfo") or request.get("media") or {}
+    status = info.get("status4k" if request.get("is4k") else "status")
+    return status == MEDIA_AVAILABLE
+
+
+def rule_matches(
+    rule: TriageRule, request: dict[str, Any], details: dict[str, Any] | None
+) -> bool:
+    """Return whether ``request`` satisfies every criterion ``rule`` sets."""
+    key = _media_key(request)
+    if rule.media_type is not None and (key is None or key[0] != rule.media_type):
+        return False
+    if rule.is4k is not None and bool(request.get("is4k")) != rule.is4k:
+        return False
+    if rule.requesters and not _by_requester(request, rule.requesters):
+        return False
+    if rule.available is not None and is_available(request, details) != rule.available:
+        return False
+    return True
+
+
+def _detail_key(client: Any, key: tuple[str, int]) -> str:
+    return f"{getattr(client, 'base_url', '')}/api/v1/{key[0]}/{key[1]}"
+
+
+def _fetch_details(
+    client: Any, keys: list[tuple[str, int]], store: Any, concurrency: int
+) -> tuple[dict[tuple[str, int], dict[str, Any]], int]:
+    """Detail responses per media key, and how many had to be fetched."""
+    details: dict[tuple[str, int], dict[str, Any]] = {}
+    missing = []
+    for key in keys:
+        cached = store.get(_detail_key(client, key)) if store is not None else None
+        if cached is not None:
+            details[key] = cached
+        else:
+            missing.append(key)
+
+    def fetch(key: tuple[str, int]) -> Any:
+        method = client.get_movie_id if key[0] == "movie" else client.get_tv_id
+        return method(key[1])
+
+    for key, value, error in bounded_map(fetch, missing, concurrency):
+        if error is None and isinstance(value, dict):
+            details[key] = value
+            if store is not None:
+                store.set(_detail_key(client, key), value)
+    return details, len(missing)
+
+
+def triage(
+    client: Any,
+    rules: list[TriageRule],
+    default_action: str = "skip",
+    dry_run: bool = False,
+    concurrency: int = 8,
+    details_store: Any | None = None,
+    limit: int | None = None,
+    on_progress: Callable[[int, int, str | None], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Decide and apply approve/decline for every pending request.
+
+    Args:
+        client (Any): Seerr API client.
+        rules (List[TriageRule]): Evaluated in order; the first match decides.
+        default_action (str): ``approve``, ``decline`` or ``skip`` (leave
+            pending) for requests no rule matches.
+        dry_run (bool): Decide without approving or declining anything.
+        concurrency (int): Detail lookups and decisions in flight.
+        details_store (Optional[Any]): Store with ``get(key)``/``set(key, value)``
+            (e.g. :class:`arr_mcp.cache.MemoryCache`) reused across calls for
+            ``get_movie_id``/``get_tv_id`` results.
+        limit (Optional[int]): Triage at most this many of the oldest requests.
+        on_progress (Optional[Callable]): Called as ``on_progress(done, total,
+            message)`` as decisions are applied.
+
+    Returns:
+        Dict: ``pending`` count, per-action ``counts``, the ``decisions`` (id,
+        type, title, requester, is4k, action, rule), ``lookups`` issued and
+        ``errors``.
+    """
+    if default_action not in TRIAGE_ACTIONS:
+        raise ValueError(
+            f"default_action must be one of {', '.join(TRIAGE_ACTIONS)}, "
+            f"not '{default_action}'"
+        )
+    pending = [
+        r
+        for r in iter_requests(client)
+        if r.get("status", REQUEST_PENDING) == REQUEST_PENDING and "id" in r
+    ]
+    pending.sort(key=lambda r: (str(r.get("createdAt") or ""), r["id"]))
+    if limit is not None:
+        pending = pending[:limit]
+
+    details: dict[tuple[str, int], dict[str, Any]] = {}
+    lookups = 0
+    if any(rule.available is not None for rule in rules):
+        keys = list(dict.fromkeys(k for k in map(_media_key, pending) if k))
+        details, lookups = _fetch_details(client, keys, details_store, concurrency)
+
+    decisions = []
+    for request in pending:
+        key = _media_key(request)
+        info = details.get(key) if key else None
+        action, reason = default_action, "default"
+        for index, rule in enumerate(rules):
+            if rule_matches(rule, request, info):
+                action, reason = rule.action, rule.reason or f"rule {index + 1}"
+                break
+        decisions.append(
+            {
+                "id": request["id"],
+                "type": key[0] if key else request.get("type"),
+                "title": (info or {}).get("title") or (info or {}).get("name"),
+                "requester": _requester_name(request),
+                "is4k": bool(request.get("is4k")),
+                "action": action,
+                "rule": reason,
+            }
+        )
+
+    counts = {action: 0 for action in TRIAGE_ACTIONS}
+    for decision in decisions:
+        counts[decision["action"]] += 1
+    result: dict[str, Any] = {
+        "pending": len(pending),
+        "dry_run": dry_run,
+        "counts": counts,
+        "lookups": lookups,
+        "decisions": decisions,
+        "errors": [],
+    }
+    todo = [d for d in decisions if d["action"] != "skip"]
+    if dry_run or not todo:
+        return result
+
+    done = [0]
+    lock = threading.Lock()
+
+    def apply(decision: dict[str, Any]) -> Any:
+        method = (
+            client.post_request_id_approve
+            if decision["action"] == "approve"
+            else client.post_request_id_decline
+        )
+        try:
+            return method(decision["id"])
+        finally:
+            with lock:
+                done[0] += 1
+                finished = done[0]
+            if on_progress is not None:
+                on_progress(
+                    finished, len(todo), f"{decision['action']} #{decision['id']}"
+                )
+
+    for decision, _, error in bounded_map(apply, todo, concurrency):
+        if error is not None:
+            decision["error"] = str(error)
+            result["errors"].append({"id": decision["id"], "error": str(error)})
+    return result
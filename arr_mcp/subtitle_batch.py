@@ -0,0 +1,312 @@
+"""
+Batch searching of Bazarr's wanted (missing) subtitles.
+
+``get_wanted_series`` and ``get_wanted_movies`` page through every episode and
+movie missing a subtitle, and each needs its own ``search_series_subtitles`` or
+``search_movie_subtitles`` call. :func:`process_wanted` streams those pages and
+runs the searches on a bounded pool. Every search queries each enabled
+provider, so a :class:`ProviderThrottle` spaces searches to the tightest
+per-provider rate, and an :class:`AttemptLog` in SQLite skips items searched
+recently, across runs and restarts.
+
+CONCEPT:ARR-013 — Subtitle Batch Processor
+"""
+
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from arr_mcp import tracing
+from arr_mcp.paging import records
+
+
+@dataclass(frozen=True)
+class WantedSource:
+    """How one kind of wanted item is listed and searched."""
+
+    list_method: str
+    id_field: str
+    parent_field: str | None = None
+
+
+WANTED_SOURCES: dict[str, WantedSource] = {
+    "episodes": WantedSource("get_wanted_series", "sonarrEpisodeId", "sonarrSeriesId"),
+    "movies": WantedSource("get_wanted_movies", "radarrId"),
+}
+
+
+def iter_wanted(
+    client: Any, kind: str, page_size: int = 100, max_pages: int = 1000
+) -> Iterator[tuple[dict[str, Any], int | None]]:
+    """
+    Yield ``(item, total)`` for every wanted item of ``kind``, one page at a time.
+
+    ``total`` is Bazarr's ``total`` count from the page the item came from, or
+    ``None`` when the response does not carry one.
+    """
+    source = WANTED_SOURCES[kind]
+    fetch = getattr(client, source.list_method)
+    for page in range(1, max_pages + 1):
+        response = fetch(page=page, page_size=page_size)
+        batch = [r for r in records(response) if isinstance(r, dict)]
+        total = response.get("total") if isinstance(response, dict) else None
+        total = total if isinstance(total, int) else None
+        for item in batch:
+            yield item, total
+        if len(batch) < page_size or (total is not None and page * page_size >= total):
+            return
+
+
+def provider_names(response: Any) -> list[str]:
+    """Names of the providers in a ``get_enabled_providers`` response."""
+    names = []
+    for provider in records(response):
+        if isinstance(provider, str):
+            names.append(provider)
+        elif isinstance(provider, dict):
+            name = provider.get("name") or provider.get("provider")
+            if name:
+                names.append(str(name))
+    return sorted(set(names))
+
+
+class ProviderThrottle:
+    """
+    Spaces searches so no provider sees more than its per-minute rate.
+
+    A search queries every enabled provider, so :meth:`acquire` waits until
+    each of them has a free slot and then reserves one on all of them.
+    """
+
+    def __init__(
+        self,
+        per_minute: float = 30.0,
+        limits: dict[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            per_minute (float): Searches per minute for providers not in ``limits``;
+                zero or less disables throttling for them.
+            limits (Optional[Dict[str, float]]): Per-provider overrides.
+            clock (Callable): Monotonic time source, replaceable in tests.
+            sleep (Callable): Sleep function, replaceable in tests.
+        """
+        self.per_minute = per_minute
+        self.limits = {k.lower(): v for k, v in (limits or {}).items()}
+        self.clock = clock
+        self.sleep = sleep
+        self.waited = 0.0
+        self._next: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _gap(self, provider: str) -> float:
+        rate = self.limits.get(provider.lower(), self.per_minute)
+        return 60.0 / rate if rate > 0 else 0.0
+
+    def acquire(self, providers: list[str]) -> float:
+        """Block until every provider may be queried; returns the seconds waited."""
+        with self._lock:
+            now = self.clock()
+            start = max([now] + [self._next.get(p, now) for p in providers])
+            for provider in providers:
+                self._next[provider] = start + self._gap(provider)
+            delay = start - now
+            self.waited += delay
+        if delay > 0:
+            self.sleep(delay)
+        return delay
+
+
+class AttemptLog:
+    """SQLite record of when each wanted item was last searched."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): SQLite file; created with its parent directory if missing.
+        """
+        path = os.path.expanduser(path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS attempts (kind TEXT NOT NULL, "
+            "item_id INTEGER NOT NULL, at REAL NOT NULL, ok INTEGER NOT NULL, "
+            "error TEXT, PRIMARY KEY (kind, item_id))"
+        )
+
+    def recent(self, kind: str, since: float) -> set[int]:
+        """Ids of ``kind`` attempted at or after ``since``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item_id FROM attempts WHERE kind = ? AND at >= ?",
+                (kind, since),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def record(
+        self, kind: str, item_id: int, at: float, error: str | None = None
+    ) -> None:
+        """Remember an attempt; ``error`` is ``None`` for a successful search."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO attempts (kind, item_id, at, ok, error) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (kind, item_id, at, int(error is None), error),
+            )
+
+    def clear(self) -> None:
+        """Forget every attempt."""
+        with self._lock:
+            self._conn.execute("DELETE FROM attempts")
+
+
+def _label(kind: str, item: dict[str, Any]) -> str:
+    if kind == "episodes":
+        title = item.get("seriesTitle") or item.get("title") or ""
+        number = item.get("episode_number") or ""
+        return f"{title} {number}".strip()
+    return str(item.get("title") or item.get(WANTED_SOURCES[kind].id_field))
+
+
+def process_wanted(
+    client: Any,
+    attempts: AttemptLog,
+    kinds: list[str] | None = None,
+    throttle: ProviderThrottle | None = None,
+    concurrency: int = 4,
+    retry_after: float = 86400.0,
+    limit: int | None = None,
+    page_size: int = 100,
+    on_progress: Callable[[int, int, str | None], None] | None = None,
+    clock: Callable[[], float] = time.time,
+) -> dict[str, Any]:
+    """
+    Search subtitles for every wanted episode and movie not tried recently.
+
+    Wanted pages are read lazily while searches run, and at most
+    ``2 * concurrency`` searches are queued at any time.
+
+    Args:
+        client (Any): Bazarr API client.
+        attempts (AttemptLog): Persistent attempt history.
+        kinds (Optional[List[str]]): ``episodes`` and/or ``movies``; both by default.
+        throttle (Optional[ProviderThrottle]): Provider rate limiter; a default
+            one (30 searches per minute per provider) when omitted.
+        concurrency (int): Searches in flight.
+        retry_after (float): Seconds before an attempted item is searched again.
+        limit (Optional[int]): Stop after this many searches.
+        page_size (int): Items per wanted page.
+        on_progress (Optional[Callable]): Called as ``on_progress(done, total,
+            message)`` after every search; ``total`` counts wanted items seen
+            so far, including skipped ones.
+        clock (Callable): Wall-clock source for attempt timestamps.
+
+    Returns:
+        Dict: ``providers``, counts of ``wanted``, ``searched``, ``succeeded``,
+        ``failed`` and ``skipped_recent``, the first ``errors``, the total
+        ``throttle_wait_s`` and ``elapsed_s``.
+    """
+    kinds = kinds or list(WANTED_SOURCES)
+    unknown = [k for k in kinds if k not in WANTED_SOURCES]
+    if unknown:
+        raise ValueError(
+            f"Unknown wanted kind {', '.join(unknown)}; "
+            f"expected {', '.join(WANTED_SOURCES)}"
+        )
+    providers = provider_names(client.get_enabled_providers())
+    if not providers:
+        raise ValueError("Bazarr has no enabled subtitle providers")
+    throttle = throttle or ProviderThrottle()
+    began = time.monotonic()
+    result: dict[str, Any] = {
+        "providers": providers,
+        "wanted": 0,
+        "searched": 0,
+        "succeeded": 0,
+        "failed": 0,
+        "skipped_recent": 0,
+        "errors": [],
+    }
+    totals: dict[str, int] = {}
+    seen: dict[str, int] = {}
+
+    def search(kind: str, item: dict[str, Any]) -> None:
+        source = WANTED_SOURCES[kind]
+        throttle.acquire(providers)
+        if source.parent_field:
+            client.search_series_subtitles(
+                series_id=item.get(source.parent_field),
+                episode_id=item[source.id_field],
+            )
+        else:
+            client.search_movie_subtitles(movie_id=item[source.id_field])
+
+    def candidates() -> Iterator[tuple[str, dict[str, Any]]]:
+        for kind in kinds:
+            skip = attempts.recent(kind, clock() - retry_after)
+            id_field = WANTED_SOURCES[kind].id_field
+            for item, total in iter_wanted(client, kind, page_size):
+                seen[kind] = seen.get(kind, 0) + 1
+                if total is not None:
+                    totals[kind] = total
+                result["wanted"] += 1
+                if item.get(id_field) is None:
+                    continue
+                if item[id_field] in skip:
+                    result["skipped_recent"] += 1
+                    continue
+                yield kind, item
+
+    def settle(future, kind: str, item: dict[str, Any]) -> None:
+        item_id = item[WANTED_SOURCES[kind].id_field]
+        error = future.exception()
+        attempts.record(kind, item_id, clock(), None if error is None else str(error))
+        if error is None:
+            result["succeeded"] += 1
+        else:
+            result["failed"] += 1
+            if len(result["errors"]) < 20:
+                result["errors"].append(
+                    {"kind": kind, "id": item_id, "error": str(error)}
+                )
+        if on_progress is not None:
+            done = result["succeeded"] + result["failed"] + result["skipped_recent"]
+            total = sum(max(totals.get(k, 0), seen.get(k, 0)) for k in seen)
+            status = "ok" if error is None else "failed"
+            on_progress(done, total, f"{_label(kind, item)}: {status}")
+
+    pending: dict[Any, tuple[str, dict[str, Any]]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for kind, item in candidates():
+            if limit is not None and result["searched"] >= limit:
+                break
+            while len(pending) >= 2 * max(1, concurrency):
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    settle(future, *pending.pop(future))
+            result["searched"] += 1
+            future = pool.submit(
+                contextvars.copy_context().run, tracing.queued(search), kind, item
+            )
+            pending[future] = (kind, item)
+        for future in list(pending):
+            future.exception()
+            settle(future, *pending.pop(future))
+
+    result["throttle_wait_s"] = round(throttle.waited, 3)
+    result["elapsed_s"] = round(time.monotonic() - began, 3)
+    return result
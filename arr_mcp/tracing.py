@@ -0,0 +1,274 @@
+"""
+OpenTelemetry spans from the MCP tool call down to each *arr HTTP request.
+
+Tail latency of a tool call is spent somewhere between the agent and the
+*arr services: waiting for a worker thread, in a cache, in one slow page of
+a fan-out or in the HTTP call itself. With tracing on, every layer records a
+span in one trace:
+
+- the tool call, with service, action and parameter keys
+  (:class:`arr_mcp.mcp.telemetry.TracingMiddleware`), continuing the agent's
+  W3C trace context from the MCP request ``_meta`` or the HTTP headers;
+- each ``Api.request`` (:func:`traced_request`), with verb, path template,
+  status and response size;
+- each cache lookup and store (:class:`arr_mcp.cache.Namespace`);
+- each :func:`arr_mcp.concurrency.bounded_map` fan-out, with the time every
+  task waited for a pool thread (:func:`queued`).
+
+Only ``opentelemetry-api`` is needed to create spans, and without an SDK
+they cost next to nothing. Exporting them over OTLP needs the SDK and the
+OTLP exporter (``pip install arr-mcp[tracing]``); :func:`configure_tracing`
+installs them when ``ARR_OTEL_ENABLED`` is set and reads the standard
+``OTEL_EXPORTER_OTLP_*`` variables for the collector address.
+
+CONCEPT:ARR-025 — Request Tracing
+"""
+
+import contextlib
+import functools
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+from urllib.parse import urlsplit
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # pragma: no cover - exercised only without opentelemetry-api
+    trace = None  # type: ignore[assignment]
+
+try:
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+        OTLPSpanExporter,
+    )
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+except ImportError:  # pragma: no cover - exercised only without the OTel SDK
+    TracerProvider = None  # type: ignore[misc,assignment]
+
+TRACER_NAME = "arr_mcp"
+
+# Path segments that identify one record; replaced so paths group into templates.
+_ID_SEGMENT = re.compile(
+    r"\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{32,64}",
+    re.IGNORECASE,
+)
+
+_provider: Any = None
+_provider_lock = threading.Lock()
+
+
+class _NullSpan:
+    """Stands in for a span when ``opentelemetry-api`` is not installed."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        pass
+
+    def set_status(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+def require_tracing() -> None:
+    """Raise a clear error when the optional OTel SDK or exporter is missing."""
+    if trace is None or TracerProvider is None:
+        raise RuntimeError(
+            "Exporting traces needs opentelemetry-sdk and the OTLP exporter; "
+            "install them with 'pip install arr-mcp[tracing]'"
+        )
+
+
+def is_active() -> bool:
+    """Whether spans are recorded: a tracer provider other than the no-op one is set."""
+    if trace is None:
+        return False
+    if _provider is not None:
+        return True
+    return not isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider)
+
+
+def get_tracer() -> Any:
+    """The ``arr_mcp`` tracer from :func:`configure_tracing`'s provider or the global one."""
+    return trace.get_tracer(TRACER_NAME, tracer_provider=_provider)
+
+
+def build_tracer_provider(
+    service_name: str = "arr-mcp",
+    endpoint: str | None = None,
+    headers: dict[str, str] | None = None,
+) -> Any:
+    """
+    A tracer provider that batches spans to an OTLP/HTTP collector.
+
+    Args:
+        service_name (str): ``service.name`` resource attribute.
+        endpoint (Optional[str]): Traces URL, e.g. ``http://collector:4318/v1/traces``;
+            by default the exporter reads ``OTEL_EXPORTER_OTLP_TRACES_ENDPOINT``
+            or ``OTEL_EXPORTER_OTLP_ENDPOINT``.
+        headers (Optional[Dict[str, str]]): Extra export headers; by default
+            ``OTEL_EXPORTER_OTLP_HEADERS``.
+
+    Returns:
+        TracerProvider: The provider; call ``shutdown()`` to flush it.
+    """
+    require_tracing()
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    exporter = OTLPSpanExporter(endpoint=endpoint, headers=headers)
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    return provider
+
+
+def configure_tracing() -> bool:
+    """
+    Install the OTLP tracer provider when ``ARR_OTEL_ENABLED`` is set.
+
+    The provider also becomes the global one, so the server's own MCP spans
+    are exported next to ours. Safe to call more than once per process.
+
+    Returns:
+        bool: Whether spans are exported.
+    """
+    global _provider
+    from agent_utilities.core.config import setting
+
+    if not setting("ARR_OTEL_ENABLED", False):
+        return False
+    with _provider_lock:
+        if _provider is None:
+            _provider = build_tracer_provider(setting("OTEL_SERVICE_NAME", "arr-mcp"))
+            trace.set_tracer_provider(_provider)
+    return True
+
+
+@contextlib.contextmanager
+def span(
+    name: str,
+    attributes: dict[str, Any] | None = None,
+    kind: Any = None,
+    context: Any = None,
+    links: Any = None,
+) -> Iterator[Any]:
+    """
+    Run the block inside a span; a no-op when no tracer provider is set.
+
+    Exceptions escaping the block are recorded on the span and re-raised.
+
+    Args:
+        name (str): Span name.
+        attributes (Optional[Dict]): Attributes set at start; ``None`` values are skipped.
+        kind (Optional[SpanKind]): Defaults to ``INTERNAL``.
+        context (Optional[Context]): Parent context; defaults to the current one.
+        links (Optional[List[Link]]): Spans this one relates to outside its parent.
+
+    Yields:
+        Span: The span, or a stand-in that ignores attributes.
+    """
+    if not is_active():
+        yield NULL_SPAN
+        return
+    attributes = {k: v for k, v in (attributes or {}).items() if v is not None}
+    with get_tracer().start_as_current_span(
+        name,
+        context=context,
+        kind=SpanKind.INTERNAL if kind is None else kind,
+        attributes=attributes,
+        links=links,
+    ) as current:
+        yield current
+
+
+def path_template(endpoint: str) -> str:
+    """``/api/v3/series/12/episodes`` as ``/api/v3/series/{id}/episodes``."""
+    path = urlsplit(endpoint).path
+    return "/".join(
+        "{id}" if _ID_SEGMENT.fullmatch(part) else part for part in path.split("/")
+    )
+
+
+def _service_of(client: Any) -> str | None:
+    module = type(client).__module__
+    prefix = "arr_mcp.api.api_client_"
+    return module[len(prefix) :] if module.startswith(prefix) else None
+
+
+def traced_request(request: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorate an ``Api.request`` (or ``request_raw``) method to run inside a client span.
+
+    The span is named after the verb and path template and carries the
+    service and server address; :func:`record_response`, installed as the
+    session's response hook, adds status and size.
+    """
+
+    @functools.wraps(request)
+    def wrapper(
+        self: Any,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | list[Any] | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        if not is_active():
+            return request(self, method, endpoint, params, data, **kwargs)
+        template = path_template(endpoint)
+        server = urlsplit(self.base_url)
+        attributes = {
+            "http.request.method": method.upper(),
+            "url.template": template,
+            "server.address": server.hostname,
+            "server.port": server.port,
+            "arr.service": _service_of(self),
+        }
+        with span(f"{method.upper()} {template}", attributes, kind=SpanKind.CLIENT):
+            return request(self, method, endpoint, params, data, **kwargs)
+
+    return wrapper
+
+
+def record_response(response: Any, *args: Any, **kwargs: Any) -> Any:
+    """``requests`` response hook: put status and body size on the current span."""
+    if not is_active():
+        return response
+    current = trace.get_current_span()
+    if not current.is_recording():
+        return response
+    current.set_attribute("http.response.status_code", response.status_code)
+    size = response.headers.get("Content-Length")
+    if size is None and not kwargs.get("stream"):
+        size = len(response.content)
+    if size is not None:
+        current.set_attribute("http.response.body.size", int(size))
+    if response.status_code >= 400:
+        current.set_status(Status(StatusCode.ERROR))
+    return response
+
+
+def queued(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap ``fn`` for a thread pool so the wait for a free thread is a span.
+
+    Call at submit time; when a thread picks the task up, a ``queue wait``
+    span from submission to that moment is recorded under the current span.
+    """
+    if not is_active():
+        return fn
+    submitted = time.time_ns()
+
+    @functools.wraps(fn)
+    def run(*args: Any, **kwargs: Any) -> Any:
+        get_tracer().start_span("queue wait", start_time=submitted).end()
+        return fn(*args, **kwargs)
+
+    return run
@@ -0,0 +1,185 @@
+"""
+Multi-process serving for the streamable-http transport.
+
+One server process runs every tool call on a single core, and JSON
+decoding plus dispatch saturate it well before the *arr services do. With
+``MCP_WORKERS`` above 1, :func:`supervise` starts that many worker
+processes. Each worker builds its own server and binds its own listening
+socket on the same host and port with ``SO_REUSEPORT``, so the kernel
+spreads connections across them. The supervisor restarts workers that die
+and stops them all on SIGINT or SIGTERM.
+
+Workers serve stateless streamable-http, because a follow-up request can
+land on any worker. State that must be global lives in SQLite files in WAL
+mode under ``WORKER_STATE_PATH``:
+
+- the rate-limit buckets (:mod:`arr_mcp.rate_limit`);
+- spilled results (:class:`arr_mcp.result_spill.SharedResultStore`).
+
+The response cache lives in the store chosen by ``ARR_CACHE_BACKEND``
+(:func:`arr_mcp.auth.get_cache_store`), which the disk and redis backends
+already share between processes. The queue snapshot versions, the backlog
+search scheduler and the subtitle provider throttle are per process, so their
+tools refuse to run with several workers (:func:`require_single_worker`).
+
+CONCEPT:ARR-024 — Worker Pool
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.core.paths import data_dir
+
+logger = logging.getLogger(__name__)
+
+# A worker that exits sooner than this after starting counts as a failed start.
+MIN_UPTIME = 5.0
+MAX_FAILED_STARTS = 5
+
+
+def worker_count() -> int:
+    """Configured number of server processes (``MCP_WORKERS``, at least 1)."""
+    return max(int(setting("MCP_WORKERS", 1)), 1)
+
+
+def is_multi_worker() -> bool:
+    """Whether state must be shared between several server processes."""
+    return worker_count() > 1
+
+
+def require_single_worker(tool: str) -> None:
+    """
+    Refuse ``tool`` when several server processes serve.
+
+    For tools whose state lives in one process: their answers or their
+    background work would differ per worker.
+
+    Raises:
+        ValueError: ``MCP_WORKERS`` is above 1.
+    """
+    if is_multi_worker():
+        raise ValueError(
+            f"{tool} keeps its state in one server process and is unavailable "
+            f"with MCP_WORKERS={worker_count()}; run a single worker to use it"
+        )
+
+
+def state_path(name: str) -> str:
+    """Path of a shared state database under ``WORKER_STATE_PATH``."""
+    root = setting("WORKER_STATE_PATH", str(data_dir() / "arr-mcp" / "workers"))
+    return os.path.join(os.path.expanduser(root), name)
+
+
+def reuse_port_socket(host: str, port: int) -> socket.socket:
+    """
+    Bind a listening TCP socket that other processes may bind too.
+
+    Raises:
+        RuntimeError: The platform has no ``SO_REUSEPORT``.
+    """
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("MCP_WORKERS > 1 needs SO_REUSEPORT (Linux or BSD)")
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(index: int, host: str, port: int) -> None:
+    """
+    Serve stateless streamable-http from one worker process.
+
+    Builds the server from the same command line and settings as the
+    supervisor, moves its rate limits to the shared buckets and serves on a
+    ``SO_REUSEPORT`` socket.
+    """
+    import uvicorn
+
+    from arr_mcp.mcp_server import get_mcp_instance
+    from arr_mcp.rate_limit import SharedTokenBuckets, share_rate_limits
+
+    mcp, _args, middlewares, _tags = get_mcp_instance()
+    share_rate_limits(middlewares, SharedTokenBuckets(state_path("ratelimit.sqlite3")))
+    app = mcp.http_app(transport="streamable-http", stateless_http=True)
+    sock = reuse_port_socket(host, port)
+    config = uvicorn.Config(app, log_level="warning", lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def supervise(
+    workers: int,
+    host: str,
+    port: int,
+    target: Callable[..., Any] = run_worker,
+    poll: float = 0.5,
+    stop: threading.Event | None = None,
+) -> int:
+    """
+    Run ``workers`` server processes and keep them running until stopped.
+
+    Args:
+        workers (int): Number of processes.
+        host (str): Address every worker binds.
+        port (int): Port every worker binds.
+        target (Callable): Worker entry point, called as ``target(index, host, port)``.
+        poll (float): Seconds between liveness checks.
+        stop (Optional[threading.Event]): Set to stop; when omitted, SIGINT and
+            SIGTERM stop the workers.
+
+    Returns:
+        int: Process exit status: 0 after a requested stop, 1 when workers
+        keep failing right after starting.
+    """
+    context = multiprocessing.get_context("spawn")
+    if stop is None:
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+
+    def start(index: int) -> tuple[Any, float]:
+        process = context.Process(
+            target=target, args=(index, host, port), name=f"arr-mcp-worker-{index}"
+        )
+        process.start()
+        return process, time.monotonic()
+
+    processes = {index: start(index) for index in range(workers)}
+    failed_starts = 0
+    status = 0
+    logger.info(f"Started {workers} workers on {host}:{port}")
+    while not stop.wait(poll):
+        for index, (process, started) in list(processes.items()):
+            if process.is_alive():
+                continue
+            if time.monotonic() - started < MIN_UPTIME:
+                failed_starts += 1
+            else:
+                failed_starts = 0
+            logger.warning(f"Worker {index} exited with {process.exitcode}; restarting")
+            if failed_starts >= MAX_FAILED_STARTS:
+                logger.error("Workers keep exiting right after start; giving up")
+                stop.set()
+                status = 1
+                break
+            processes[index] = start(index)
+    for process, _ in processes.values():
+        if process.is_alive():
+            process.terminate()
+    for process, _ in processes.values():
+        process.join(timeout=10)
+        if process.is_alive():
+            process.kill()
+            process.join()
+    return status
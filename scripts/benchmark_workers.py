@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Throughput of the streamable-http server from 1 to N worker processes.
+
+Starts ``arr-mcp`` with ``MCP_WORKERS`` = 1..N on a free port and hammers it
+with concurrent ``tools/call`` requests to ``find_action``, which
+is CPU-bound and needs no *arr service. Rate limiting is switched off so the
+numbers show serving capacity, not the configured limit.
+
+usage: python scripts/benchmark_workers.py [--max-workers 4] [--clients 32]
+                                          [--seconds 10] [--warmup 15]
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+PAYLOAD = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "tools/call",
+    "params": {
+        "name": "find_action",
+        "arguments": {"service": "sonarr", "query": "delete episode file", "top_k": 5},
+    },
+}
+HEADERS = {"Accept": "application/json, text/event-stream"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, state: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "MCP_WORKERS": str(workers),
+        "WORKER_STATE_PATH": state,
+        "MCP_RATE_LIMIT_RPS": "0",
+    }
+    command = [sys.executable, "-m", "arr_mcp.mcp_server", "--transport"]
+    command += ["streamable-http", "--host", "127.0.0.1", "--port", str(port)]
+    return subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def open_session(url: str) -> dict:
+    """Run the MCP handshake; returns the headers for later requests.
+
+    A single worker keeps sessions; several workers are stateless and ignore
+    the session id, so the same client code measures both.
+    """
+    hello = {
+        "jsonrpc": "2.0",
+        "id": 0,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-03-26",
+            "capabilities": {},
+            "clientInfo": {"name": "benchmark", "version": "1"},
+        },
+    }
+    response = httpx.post(url, json=hello, headers=HEADERS)
+    response.raise_for_status()
+    headers = dict(HEADERS)
+    if response.headers.get("mcp-session-id"):
+        headers["mcp-session-id"] = response.headers["mcp-session-id"]
+    ready = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+    httpx.post(url, json=ready, headers=headers)
+    return headers
+
+
+def wait_ready(url: str, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            headers = open_session(url)
+            if httpx.post(url, json=PAYLOAD, headers=headers).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"server at {url} did not come up")
+
+
+def load(url: str, clients: int, seconds: float) -> dict:
+    done, failed, latencies = [0], [0], []
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def client() -> None:
+        headers = open_session(url)
+        # A fresh connection per request lets SO_REUSEPORT spread the load.
+        while time.monotonic() < stop:
+            started = time.perf_counter()
+            try:
+                ok = httpx.post(url, json=PAYLOAD, headers=headers).status_code == 200
+            except httpx.TransportError:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                if ok:
+                    done[0] += 1
+                    latencies.append(elapsed)
+                else:
+                    failed[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    p = lambda q: round(latencies[int(q * (len(latencies) - 1))] * 1000, 1)  # noqa: E731
+    return {
+        "requests": done[0],
+        "failed": failed[0],
+        "rps": round(done[0] / seconds, 1),
+        "p50_ms": p(0.5) if latencies else None,
+        "p95_ms": p(0.95) if latencies else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument(
+        "--warmup",
+        type=float,
+        default=15.0,
+        help="Seconds of discarded load while every worker finishes starting.",
+    )
+    args = parser.parse_args()
+
+    print(f"cpus={os.cpu_count()} clients={args.clients} seconds={args.seconds}")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        port = free_port()
+        with tempfile.TemporaryDirectory() as state:
+            server = start_server(workers, port, state)
+            try:
+                url = f"http://127.0.0.1:{port}/mcp"
+                wait_ready(url)
+                load(url, args.clients, args.warmup)
+                result = load(url, args.clients, args.seconds)
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+        baseline = baseline or result["rps"] or None
+        result["speedup"] = round(result["rps"] / baseline, 2) if baseline else None
+        print(json.dumps({"workers": workers, **result}))
+
+
+if __name__ == "__main__":
+    main()
@@ -102,11 +102,15 @@ def parse_spec(self):
                 if req_body_desc:
                     content = req_body_desc.get("content", {})
                     if "application/json" in content:
+                        schema = content["application/json"].get("schema", {})
                         params.append(
                             {
                                 "name": "data",
                                 "orig_name": "data",
-                                "type": "Dict",
+                                # Bulk endpoints such as movie/import take an array.
+                                "type": "list[dict]"
+                                if schema.get("type") == "array"
+                                else "Dict",
                                 "required": True,
                                 "in": "body",
                                 "default": "...",
@@ -128,57 +132,29 @@ def write_api_file(self):
         filename = f"{self.service_name}_api.py"
         filepath = os.path.join(self.output_dir, filename)
 
+        # Session, cache, tracing and command waiting live in the base classes.
+        has_commands = any(
+            re.fullmatch(r"/api/v\d+/command", m["path"]) for m in self.api_methods
+        )
+        base = "CommandApi" if has_commands else "BaseApi"
         content = [
             "#!/usr/bin/env python",
             "# coding: utf-8",
             "",
-            "import json",
-            "import requests",
             "from typing import Dict, List, Optional, Any",
-            "from urllib.parse import urljoin",
-            "import urllib3",
             "",
-            "class Api:",
+            f"from arr_mcp.api.base import {base}",
+            "",
+            f"class Api({base}):",
             "    def __init__(",
             "        self,",
             "        base_url: str,",
-            "        token: Optional[str] | None = None,",
+            "        token: Optional[str] = None,",
             "        verify: bool = False,",
+            "        cache: Any | None = None,",
             "    ):",
-            "        self.base_url = base_url",
+            "        super().__init__(base_url, token, verify=verify, cache=cache)",
             "        self.token = token",
-            "        self._session = requests.Session()",
-            "        self._session.verify = verify",
-            "",
-            "        if not verify:",
-            "            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)",
-            "",
-            "        if token:",
-            "            # Some arr apps accept key in header X-Api-Key",
-            "            self._session.headers.update({'X-Api-Key': token})",
-            "            # Also support query param in requests if needed, but header is cleaner",
-            "",
-            "    def request(",
-            "        self,",
-            "        method: str,",
-            "        endpoint: str,",
-            "        params: Dict | None = None,",
-            "        data: Dict | None = None,",
-            "    ) -> Any:",
-            "        url = urljoin(self.base_url, endpoint)",
-            "        response = self._session.request(method=method, url=url, params=params, json=data)",
-            "        if response.status_code >= 400:",
-            "            try:",
-            "                error_text = response.text",
-            "            except:",
-            "                error_text = 'Unknown error'",
-            "            raise Exception(f'API error: {response.status_code} - {error_text}')",
-            "        if response.status_code == 204:",
-            "            return {'status': 'success'}",
-            "        try:",
-            "            return response.json()",
-            "        except:",
-            "            return {'status': 'success', 'text': response.text}",
             "",
         ]
 
@@ -72,3 +72,30 @@ def mock_env():
     yield os.environ
     os.environ.clear()
     os.environ.update(original_env)
+
+
+@pytest.fixture(scope="session")
+def _state_home(tmp_path_factory):
+    return tmp_path_factory.mktemp("state")
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(_state_home, monkeypatch):
+    """Keep caches, archives and snapshots written by tests out of the real home.
+
+    The directory is shared by the session because the stores are opened once
+    per process and kept.
+    """
+    cache, data = _state_home / "cache", _state_home / "data"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache))
+    monkeypatch.setenv("XDG_DATA_HOME", str(data))
+    monkeypatch.setenv("AGENT_UTILITIES_CACHE_DIR", str(cache / "agent-utilities"))
+    monkeypatch.setenv("AGENT_UTILITIES_DATA_DIR", str(data / "agent-utilities"))
+    monkeypatch.setenv(
+        "ARR_CACHE_PATH",
+        str(cache / "agent-utilities" / "arr-mcp" / "responses.sqlite3"),
+    )
+    monkeypatch.setenv(
+        "SNAPSHOT_DIR", str(data / "agent-utilities" / "arr-mcp" / "snapshots")
+    )
+    yield _state_home
@@ -0,0 +1,74 @@
+"""Ranked action search: index contents, ranking and unknown-action hints."""
+
+import pytest
+
+from arr_mcp.action_index import (
+    ActionIndex,
+    find_action,
+    service_index,
+    tokenize,
+    unknown_action_error,
+)
+from arr_mcp.api.api_client_sonarr import Api as SonarrApi
+from arr_mcp.mcp.routing import run_action
+
+
+def test_tokenize_splits_names_paths_and_plurals():
+    assert tokenize("get_qualityProfiles") == ["get", "quality", "profile"]
+    assert tokenize("/api/v3/episodefile/{id}") == ["episodefile", "id"]
+    assert tokenize("Delete series") == ["delete", "sery"]
+
+
+def test_index_is_built_once_per_class():
+    index = service_index("sonarr")
+    assert service_index("Sonarr") is index
+    doc = index.by_name["delete_episodefile_id"]
+    assert (doc.method, doc.path) == ("DELETE", "/api/v3/episodefile/{id}")
+    assert doc.signature == "delete_episodefile_id(id: int) -> Any"
+    assert "request" not in index.by_name
+
+
+@pytest.mark.parametrize(
+    ("service", "query", "expected"),
+    [
+        ("sonarr", "delete episode file", "delete_episodefile"),
+        ("sonarr", "list quality profiles", "get_qualityprofile"),
+        ("sonarr", "system status", "get_system_status"),
+        ("seerr", "approve request", "post_request_id_approve"),
+        ("radarr", "movie files", "get_moviefile"),
+    ],
+)
+def test_search_ranks_the_intended_action_first(service, query, expected):
+    result = find_action(service, query, top_k=3)
+    assert result["indexed"] > 100 or service == "seerr"
+    top = result["matches"][0]
+    assert top["action"].startswith(expected)
+    assert top["signature"].startswith(top["action"] + "(")
+    assert [m["score"] for m in result["matches"]] == sorted(
+        (m["score"] for m in result["matches"]), reverse=True
+    )
+
+
+def test_find_action_validates_input():
+    with pytest.raises(ValueError, match="Unknown service"):
+        find_action("plex", "library")
+    with pytest.raises(ValueError, match="query is required"):
+        find_action("sonarr", "  ")
+    assert ActionIndex(SonarrApi).search("zzzz") == []
+
+
+def test_unknown_action_names_close_and_ranked_matches():
+    typo = str(unknown_action_error("radarr", "get_movei"))
+    assert "get_movie(" in typo and "list_actions" in typo and "find_action" in typo
+    words = str(unknown_action_error("sonarr", "remove_episode_files"))
+    assert "delete_episodefile" in words
+
+
+def test_run_action_rejects_unknown_actions_with_hints():
+    class FakeSonarr:
+        def get_series(self):
+            return {"result": []}
+
+    with pytest.raises(ValueError, match="Did you mean: get_series"):
+        run_action(FakeSonarr, "sonarr", "get_seriez", {})
+    assert run_action(FakeSonarr, "sonarr", "get_series", {}) == {"result": []}
@@ -0,0 +1,149 @@
+"""Cross-service consistency audit: planning, fetch-once and each check."""
+
+from arr_mcp.audit import audit, check_root_folders, plan
+
+GIB = 1024**3
+
+
+class Fake:
+    def __init__(self, base_url="", **listings):
+        self.base_url = base_url
+        self.listings = listings
+        self.calls = []
+
+    def __getattr__(self, name):
+        if name not in self.listings:
+            raise AttributeError(name)
+
+        def call(**kwargs):
+            self.calls.append(name)
+            value = self.listings[name]
+            if callable(value):
+                return value(**kwargs)
+            return {"result": value}
+
+        return call
+
+
+def _bazarr_movies(page=1, page_size=20):
+    data = [{"radarrId": 1}, {"radarrId": 9}]
+    return {"data": data[(page - 1) * page_size : page * page_size], "total": 2}
+
+
+def _stack():
+    radarr = Fake(
+        "http://radarr:7878",
+        get_movie=[{"id": 1, "title": "A"}, {"id": 2, "title": "B"}],
+        get_indexer=[
+            {
+                "name": "Nyaa (Prowlarr)",
+                "enableRss": False,
+                "enableAutomaticSearch": False,
+            },
+        ],
+        get_tag_detail=[{"id": 1, "label": "4k", "movieIds": [1]}],
+        get_rootfolder=[
+            {"path": "/movies", "accessible": True, "freeSpace": 2 * GIB},
+            {"path": "/gone", "accessible": False, "freeSpace": 500 * GIB},
+        ],
+        get_diskspace=[{"path": "/", "freeSpace": 2 * GIB, "totalSpace": 100 * GIB}],
+    )
+    sonarr = Fake(
+        "http://sonarr:8989",
+        get_indexer=[{"name": "Nyaa (Prowlarr)", "enableRss": True}],
+        get_tag_detail=[{"id": 3, "label": "anime", "seriesIds": []}],
+        get_rootfolder=[{"path": "/tv", "freeSpace": 900 * GIB}],
+        get_diskspace=[],
+    )
+    bazarr = Fake(get_movies=_bazarr_movies)
+    prowlarr = Fake(
+        get_applications=[
+            {
+                "name": "Radarr",
+                "implementation": "Radarr",
+                "syncLevel": "fullSync",
+                "fields": [{"name": "baseUrl", "value": "http://radarr:7878/"}],
+            },
+            {
+                "name": "Sonarr",
+                "implementation": "Sonarr",
+                "syncLevel": "fullSync",
+                "tags": [5],
+            },
+        ],
+        get_indexer=[
+            {"name": "Nyaa", "enable": True, "tags": [5]},
+            {"name": "1337x", "enable": True},
+            {"name": "Old", "enable": False},
+        ],
+        get_tag=[],
+    )
+    return {"radarr": radarr, "sonarr": sonarr, "bazarr": bazarr, "prowlarr": prowlarr}
+
+
+def test_plan_fetches_each_listing_once():
+    clients = _stack()
+    wanted = plan(clients, ["bazarr", "indexers", "tags", "root_folders"])
+    assert len(wanted) == len(set(wanted))
+    assert ("prowlarr", "get_applications") in wanted
+    result = audit(clients, checks=["indexers", "tags", "root_folders"])
+    assert result["fetches"] == len(plan(clients, ["indexers", "tags", "root_folders"]))
+    assert result["errors"] == {}
+    assert clients["radarr"].calls.count("get_indexer") == 1
+
+
+def test_audit_reports_drift_across_services():
+    clients = _stack()
+    clients["sonarr"].listings["get_series"] = []
+    clients["bazarr"].listings["get_series"] = lambda page=1, page_size=20: {
+        "data": [],
+        "total": 0,
+    }
+    result = audit(clients, min_free_gb=10)
+    checks = result["checks"]
+
+    assert checks["bazarr"]["radarr"]["missing_from_bazarr"] == [
+        {"id": 2, "title": "B"}
+    ]
+    assert checks["bazarr"]["radarr"]["unknown_in_bazarr"] == [9]
+
+    assert checks["indexers"]["radarr"]["missing"] == ["1337x"]
+    assert checks["indexers"]["radarr"]["disabled"] == ["Nyaa (Prowlarr)"]
+    # The Sonarr app is tagged, so only the tagged indexer is expected there.
+    assert checks["indexers"]["sonarr"] == {
+        "application": "Sonarr",
+        "expected": 1,
+        "missing": [],
+        "disabled": [],
+    }
+
+    assert checks["tags"] == {
+        "4k": {"used_in": ["radarr"], "missing_in": ["prowlarr", "sonarr"]}
+    }
+    assert {(p["path"], tuple(p["issues"])) for p in checks["root_folders"]} == {
+        ("/movies", ("low_space",)),
+        ("/gone", ("inaccessible",)),
+    }
+    assert result["issues"] == 1 + 2 + 1 + 2
+
+
+def test_root_folders_take_free_space_from_the_mount_on_a_path_boundary():
+    data = {
+        ("radarr", "get_rootfolder"): [
+            {"path": "/data2/movies", "accessible": True},
+            {"path": "/data/movies/", "accessible": True},
+        ],
+        ("radarr", "get_diskspace"): [
+            {"path": "/", "freeSpace": 500 * GIB, "totalSpace": 1000 * GIB},
+            {"path": "/data", "freeSpace": 1 * GIB, "totalSpace": 100 * GIB},
+        ],
+    }
+    assert check_root_folders(data) == [
+        {
+            "service": "radarr",
+            "path": "/data/movies/",
+            "free_gb": 1.0,
+            "total_gb": 100.0,
+            "issues": ["low_space"],
+        }
+    ]
@@ -0,0 +1,110 @@
+"""Bulk add pipeline: lookup fan-out, owned/batch dedupe and bulk import."""
+
+from unittest.mock import MagicMock
+
+from arr_mcp.bulk_add import bulk_add
+from arr_mcp.concurrency import bounded_map
+
+
+def test_bounded_map_keeps_order_and_captures_errors():
+    def fn(x):
+        if x == 3:
+            raise ValueError("boom")
+        return x * 2
+
+    out = bounded_map(fn, [1, 2, 3, 4], limit=3)
+    assert [(item, result) for item, result, _ in out] == [
+        (1, 2),
+        (2, 4),
+        (3, None),
+        (4, 8),
+    ]
+    assert isinstance(out[2][2], ValueError)
+
+
+def _radarr():
+    catalog = {
+        "heat": {"title": "Heat", "tmdbId": 949},
+        "the matrix": {"title": "The Matrix", "tmdbId": 603},
+        "alien": {"title": "Alien", "tmdbId": 348},
+    }
+    client = MagicMock()
+    client.get_movie.return_value = {"result": [{"id": 1, "tmdbId": 348}]}
+    client.get_movie_lookup.side_effect = lambda term: {
+        "result": [catalog[term.lower()]] if term.lower() in catalog else []
+    }
+    client.get_movie_lookup_tmdb.side_effect = lambda tmdbId: next(
+        m for m in catalog.values() if m["tmdbId"] == tmdbId
+    )
+    client.post_movie_import.side_effect = lambda data: {
+        "result": [{"id": 10 + i, "tmdbId": m["tmdbId"]} for i, m in enumerate(data)]
+    }
+    return client
+
+
+def test_radarr_bulk_add_dedupes_and_uses_import_endpoint():
+    client = _radarr()
+    out = bulk_add(
+        "radarr",
+        client,
+        ["Heat", "tmdb:603", "Alien", "heat", "Nope"],
+        quality_profile_id=4,
+        root_folder_path="/movies",
+    )
+
+    statuses = [r["status"] for r in out["results"]]
+    assert statuses == ["added", "added", "exists", "duplicate", "not_found"]
+    assert out["results"][0]["id"] == 10
+    client.get_movie.assert_called_once()
+    client.post_movie_import.assert_called_once()
+    sent = client.post_movie_import.call_args.kwargs["data"]
+    assert [m["tmdbId"] for m in sent] == [949, 603]
+    assert sent[0]["qualityProfileId"] == 4
+    assert sent[0]["rootFolderPath"] == "/movies"
+    client.post_movie.assert_not_called()
+
+
+def test_failed_import_chunk_falls_back_to_single_adds():
+    client = _radarr()
+    client.post_movie_import.side_effect = Exception("API error: 400")
+
+    def post_movie(data):
+        if data["tmdbId"] != 949:
+            raise Exception("API error: 400")
+        return {"id": 7}
+
+    client.post_movie.side_effect = post_movie
+    out = bulk_add(
+        "radarr", client, ["Heat", "The Matrix"], 1, "/movies", concurrency=1
+    )
+    assert [r["status"] for r in out["results"]] == ["added", "error"]
+    assert out["summary"] == {"added": 1, "error": 1}
+
+
+def test_lidarr_defaults_metadata_profile_and_posts_each_artist():
+    client = MagicMock()
+    client.get_artist.return_value = {"result": []}
+    client.get_metadataprofile.return_value = {"result": [{"id": 2}, {"id": 5}]}
+    client.get_artist_lookup.side_effect = lambda term: {
+        "result": [{"artistName": term, "foreignArtistId": term}]
+    }
+    client.post_artist.return_value = {"id": 3}
+    out = bulk_add("lidarr", client, ["mb:abc"], 1, "/music")
+
+    assert out["results"][0]["status"] == "added"
+    client.get_artist_lookup.assert_called_once_with(term="lidarr:abc")
+    assert client.post_artist.call_args.kwargs["data"]["metadataProfileId"] == 2
+
+
+def test_entries_missing_from_the_import_response_get_their_own_outcome():
+    client = _radarr()
+    # The service only imported The Matrix; Heat is posted alone and rejected.
+    client.post_movie_import.side_effect = lambda data: {
+        "result": [{"id": 20, "tmdbId": 603}]
+    }
+    client.post_movie.side_effect = Exception("API error: 400 - already exists")
+    out = bulk_add("radarr", client, ["Heat", "The Matrix"], 1, "/movies")
+    heat, matrix = out["results"]
+    assert matrix["status"] == "added" and matrix["id"] == 20
+    assert heat["status"] == "error" and "already exists" in heat["error"]
+    assert client.post_movie.call_args.kwargs["data"]["tmdbId"] == 949
@@ -0,0 +1,93 @@
+"""Bulk editor: local filtering, no-op skipping, chunking and monitor endpoints."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from arr_mcp.bulk_edit import ItemFilter, bulk_edit
+
+
+def _radarr(count=7):
+    client = MagicMock()
+    client.get_tag.return_value = {"result": [{"id": 3, "label": "kids"}]}
+    client.get_qualityprofile.return_value = {"result": [{"id": 4, "name": "HD-1080p"}]}
+    client.get_movie.return_value = {
+        "result": [
+            {
+                "id": i,
+                "title": f"Movie {i}",
+                "year": 1990 + i,
+                "tags": [3] if i % 2 else [],
+                "qualityProfileId": 4,
+                "monitored": i != 5,
+                "path": f"/movies/Movie {i}",
+            }
+            for i in range(1, count + 1)
+        ]
+    }
+    return client
+
+
+def test_filter_is_resolved_locally_and_edits_are_chunked():
+    client = _radarr()
+    out = bulk_edit(
+        "radarr",
+        client,
+        ItemFilter(tags=["Kids"], quality_profile="hd-1080p", year_from=1992),
+        {"monitored": False},
+        chunk_size=1,
+    )
+
+    # Odd ids carry the tag; year >= 1992 drops id 1; id 5 is already unmonitored.
+    assert (out["matched"], out["changed"], out["unchanged"]) == (3, 2, 1)
+    sent = [c.kwargs["data"] for c in client.put_movie_editor.call_args_list]
+    assert sent == [
+        {"monitored": False, "movieIds": [3]},
+        {"monitored": False, "movieIds": [7]},
+    ]
+    assert out["requests"] == 2
+
+
+def test_tag_add_creates_missing_labels_and_dry_run_writes_nothing():
+    client = _radarr(count=2)
+    client.post_tag.return_value = {"id": 9, "label": "4k"}
+
+    preview = bulk_edit("radarr", client, ItemFilter(), {"tags": ["4k"]}, dry_run=True)
+    assert preview["changed"] == 2
+    assert preview["tags_to_create"] == ["4k"]
+    client.post_tag.assert_not_called()
+    client.put_movie_editor.assert_not_called()
+
+    bulk_edit("radarr", client, ItemFilter(root_folder="/movies/"), {"tags": ["4k"]})
+    client.put_movie_editor.assert_called_once_with(
+        data={"tags": [9], "applyTags": "add", "movieIds": [1, 2]}
+    )
+
+
+def test_episode_monitor_uses_parent_filter_and_seasons():
+    client = MagicMock()
+    client.get_series.return_value = {
+        "result": [{"id": 1, "tags": []}, {"id": 2, "tags": [], "year": 1999}]
+    }
+    client.get_episode.side_effect = lambda seriesId: {
+        "result": [
+            {"id": seriesId * 10 + n, "seriesId": seriesId, "seasonNumber": n}
+            for n in (1, 2)
+        ]
+    }
+    out = bulk_edit(
+        "sonarr",
+        client,
+        ItemFilter(year_to=2000, seasons=[2]),
+        {"monitored": True},
+        entity="episode",
+    )
+    assert out["changed"] == 1
+    client.put_episode_monitor.assert_called_once_with(
+        data={"monitored": True, "episodeIds": [22]}
+    )
+
+
+def test_rejects_fields_the_endpoint_cannot_change():
+    with pytest.raises(ValueError, match="cannot change"):
+        bulk_edit("lidarr", MagicMock(), ItemFilter(), {"tags": [1]}, entity="album")
@@ -0,0 +1,372 @@
+"""Lookup and search caches and their hook in the client request path."""
+
+import base64
+import fnmatch
+import json
+import os
+import socketserver
+import sqlite3
+import threading
+import time
+import zlib
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from arr_mcp.cache import (
+    CacheChain,
+    DiskCache,
+    MemoryCache,
+    Namespace,
+    RedisCache,
+    RedisError,
+    ResponseCache,
+    SearchCache,
+    bypass_cache,
+    cache_key,
+    decode,
+    encode,
+    open_store,
+)
+
+
+def test_cache_key_normalizes_terms():
+    a = cache_key("http://radarr/", "/api/v3/movie/lookup", {"term": "The  Matrix"})
+    b = cache_key("http://radarr", "/api/v3/movie/lookup", {"term": "the matrix"})
+    assert a == b
+
+
+def test_disk_cache_survives_reopen_and_expires(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    DiskCache(path).set("k", {"result": [1, 2]})
+    reopened = DiskCache(path)
+    assert reopened.get("k") == {"result": [1, 2]}
+
+    reopened.set("stale", {"x": 1}, ttl=-1)
+    assert reopened.get("stale") is None
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_radarr_add_movie_reuses_cached_lookup(tmp_path):
+    from arr_mcp.api.api_client_radarr import Api as RadarrApi
+
+    with patch("requests.Session") as mock_sess:
+        session = mock_sess.return_value
+        lookup = MagicMock(status_code=200)
+        lookup.json.return_value = [{"title": "Heat", "tmdbId": 949}]
+        added = MagicMock(status_code=200)
+        added.json.return_value = {"id": 1}
+        session.request.side_effect = [lookup, added, added]
+
+        cache = ResponseCache(DiskCache(str(tmp_path / "cache.sqlite3")))
+        api = RadarrApi(base_url="http://radarr", token="x", cache=cache)
+        api.add_movie(term="Heat", root_folder_path="/m", quality_profile_id=1)
+        api.add_movie(term="heat ", root_folder_path="/m", quality_profile_id=1)
+
+    methods = [c.kwargs["method"] for c in session.request.call_args_list]
+    assert methods == ["GET", "POST", "POST"]
+
+
+def test_search_cache_counts_per_indexer_and_honours_bypass():
+    cache = SearchCache(MemoryCache(ttl=60))
+    params = {"query": "Dune ", "indexerIds": [2, 1]}
+    response = {"result": [{"title": "Dune", "indexer": "nyaa"}]}
+
+    assert cache.get("http://prowlarr", "/api/v1/search", params) is None
+    cache.set("http://prowlarr", "/api/v1/search", params, response)
+    reordered = {"query": "dune", "indexerIds": [1, 2]}
+    assert cache.get("http://prowlarr", "/api/v1/search", reordered) == response
+    with bypass_cache():
+        assert cache.get("http://prowlarr", "/api/v1/search", reordered) is None
+    assert cache.get("http://radarr", "/api/v3/movie", None) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["bypassed"]) == (1, 1, 1)
+    assert stats["indexers"] == {"nyaa": {"hits": 1, "misses": 1}}
+
+
+def test_memory_cache_expires_entries():
+    cache = MemoryCache(ttl=60, max_entries=1)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") is None
+    cache.set("c", 3, ttl=-1)
+    assert cache.get("c") is None
+
+
+def test_memory_cache_hands_out_copies():
+    cache = MemoryCache()
+    value = {"result": [{"title": "Heat"}]}
+    cache.set("k", value)
+    value["result"].append({"title": "changed after set"})
+    cache.get("k")["result"][0]["title"] = "changed after get"
+    assert cache.get("k") == {"result": [{"title": "Heat"}]}
+
+
+def test_repeated_release_search_hits_indexers_once(tmp_path):
+    from arr_mcp.api.api_client_radarr import Api as RadarrApi
+
+    with patch("requests.Session") as mock_sess:
+        session = mock_sess.return_value
+        releases = MagicMock(status_code=200)
+        releases.json.return_value = [{"guid": "x", "indexer": "nzbgeek"}]
+        session.request.return_value = releases
+
+        search = SearchCache(MemoryCache(ttl=60))
+        lookups = ResponseCache(DiskCache(str(tmp_path / "cache.sqlite3")))
+        api = RadarrApi(
+            base_url="http://radarr", token="x", cache=CacheChain(lookups, search)
+        )
+        api.get_release(movieId=7)
+        api.get_release(movieId=7)
+        api.get_release(movieId=8)
+        with bypass_cache():
+            api.get_release(movieId=7)
+
+    assert session.request.call_count == 3
+    assert search.stats()["indexers"]["nzbgeek"] == {"hits": 1, "misses": 2}
+
+
+class FakeRedis(socketserver.ThreadingTCPServer):
+    """Local stand-in speaking enough RESP for RedisCache: AUTH, SELECT, GET, SET PX, DEL, SCAN."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password=None):
+        super().__init__(("127.0.0.1", 0), _FakeRedisHandler)
+        self.password = password
+        self.data = {}
+        self.commands = []
+        self.url = f"redis://127.0.0.1:{self.server_address[1]}/2"
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+
+class _FakeRedisHandler(socketserver.StreamRequestHandler):
+    def _read(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def _bulk(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        server, authed = self.server, self.server.password is None
+        while (args := self._read()) is not None:
+            name = args[0].decode().upper()
+            server.commands.append(name)
+            now = time.monotonic()
+            if name == "AUTH":
+                authed = args[-1].decode() == server.password
+                reply = b"+OK\r\n" if authed else b"-WRONGPASS invalid password\r\n"
+            elif not authed:
+                reply = b"-NOAUTH Authentication required.\r\n"
+            elif name == "SELECT":
+                reply = b"+OK\r\n"
+            elif name == "GET":
+                value, expires = server.data.get(args[1], (None, 0))
+                reply = self._bulk(value if expires > now else None)
+            elif name == "SET":
+                server.data[args[1]] = (args[2], now + int(args[4]) / 1000)
+                reply = b"+OK\r\n"
+            elif name == "DEL":
+                removed = [server.data.pop(k, None) for k in args[1:]]
+                reply = b":%d\r\n" % sum(r is not None for r in removed)
+            elif name == "SCAN":
+                pattern = args[3].decode().replace("\\", "")
+                keys = [
+                    k for k in server.data if fnmatch.fnmatchcase(k.decode(), pattern)
+                ]
+                reply = b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(keys)
+                reply += b"".join(self._bulk(k) for k in keys)
+            else:
+                reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def redis_server():
+    server = FakeRedis(password="s3cret")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_encoding_is_compact_and_reads_legacy_entries():
+    small = {"id": 1, "title": "Heat"}
+    assert encode(small) == b'{"id":1,"title":"Heat"}'
+    large = {"result": [{"title": "Heat", "year": 1995}] * 200}
+    packed = encode(large)
+    assert packed[:1] == b"x" and len(packed) < len(json.dumps(large)) / 10
+    assert decode(packed) == large and decode(encode(small)) == small
+    assert decode(zlib.compress(b"[1,2]")) == [1, 2]
+
+
+def test_disk_cache_evicts_by_size_and_migrates_old_files(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    old = sqlite3.connect(path)
+    old.execute(
+        "CREATE TABLE entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+        "expires REAL NOT NULL, accessed REAL NOT NULL)"
+    )
+    old.execute(
+        "INSERT INTO entries VALUES ('old', ?, ?, 0)",
+        (zlib.compress(b'{"a":1}'), time.time() + 60),
+    )
+    old.commit()
+    old.close()
+
+    cache = DiskCache(path, max_bytes=1500)
+    assert cache.get("old") == {"a": 1}
+    blob = base64.b64encode(os.urandom(900)).decode()
+    for key in ("a", "b", "c"):
+        cache.set(key, blob)
+    stats = cache.stats()
+    assert stats["bytes"] <= 1500 and stats["evictions"] >= 2
+    assert cache.get("c") == blob and cache.get("old") is None
+
+
+def test_namespaces_share_a_store_with_their_own_ttl(tmp_path):
+    store = DiskCache(str(tmp_path / "cache.sqlite3"))
+    lookup, search = Namespace(store, "lookup", 3600), Namespace(store, "search", -1)
+    lookup.set("k", 1)
+    search.set("k", 2)
+    assert (lookup.get("k"), search.get("k")) == (1, None)
+    search.set("q", 3, ttl=60)
+    search.clear()
+    assert search.get("q") is None and lookup.get("k") == 1
+    assert lookup.stats() == {
+        "ttl": 3600,
+        "hits": 2,
+        "misses": 0,
+        "sets": 1,
+        "errors": 0,
+    }
+    lookup.set("bad", object())
+    assert lookup.stats()["errors"] == 1
+
+    memory = MemoryCache()
+    Namespace(memory, "a").set("x", 1)
+    Namespace(memory, "b").set("x", 2)
+    memory.clear("a:")
+    assert memory.stats()["entries"] == 1
+
+
+def test_redis_cache_against_local_server(redis_server):
+    url = redis_server.url.replace("redis://", "redis://:s3cret@")
+    cache = RedisCache(url, ttl=60, prefix="test:")
+    ns = Namespace(cache, "lookup")
+    ns.set("http://radarr/api/v3/movie/lookup?{}", {"result": [{"id": 1}] * 100})
+    assert ns.get("http://radarr/api/v3/movie/lookup?{}") == {
+        "result": [{"id": 1}] * 100
+    }
+    assert ns.get("missing") is None
+    assert redis_server.commands[:2] == ["AUTH", "SELECT"]
+    assert all(key.startswith(b"test:lookup:") for key in redis_server.data)
+
+    cache.set("short", 1, ttl=0.001)
+    time.sleep(0.01)
+    assert cache.get("short") is None
+    Namespace(cache, "search").set("q", 1)
+    ns.clear()
+    assert b"test:search:q" in redis_server.data
+    assert not any(key.startswith(b"test:lookup:") for key in redis_server.data)
+    assert cache.stats()["url"] == redis_server.url
+    assert (cache.stats()["hits"], ns.stats()["misses"]) == (1, 1)
+
+
+def test_redis_cache_reconnects_and_reports_errors(redis_server):
+    cache = RedisCache(redis_server.url)
+    with pytest.raises(RedisError, match="NOAUTH"):
+        cache.get("k")
+    ns = Namespace(cache, "lookup")
+    assert ns.get("k") is None and ns.stats()["errors"] == 1
+
+    authed = RedisCache(redis_server.url.replace("//", "//:s3cret@"))
+    authed.set("k", 1)
+    authed._local.conn[0].close()
+    assert authed.get("k") == 1
+
+
+def test_unreachable_redis_fails_fast_during_cooldown(redis_server):
+    now = [0.0]
+    url = redis_server.url.replace("//", "//:s3cret@")
+    cache = RedisCache(url, cooldown=30, clock=lambda: now[0])
+    redis_server.shutdown()
+    redis_server.server_close()
+    ns = Namespace(cache, "lookup")
+    assert ns.get("k") is None and cache.failures == 1
+    with patch("socket.create_connection") as connect:
+        assert ns.get("k") is None
+        ns.set("k", 1)
+        connect.assert_not_called()
+    assert ns.stats()["errors"] == 3 and cache.failures == 1
+    assert cache.stats()["available"] is False
+    now[0] = 31.0
+    assert ns.get("k") is None and cache.failures == 2
+
+
+def test_backend_is_a_configuration_option(monkeypatch, tmp_path, redis_server):
+    assert isinstance(open_store("memory", "", ""), MemoryCache)
+    assert isinstance(open_store("disk", str(tmp_path / "c.sqlite3"), ""), DiskCache)
+    assert isinstance(open_store("Redis", "", redis_server.url), RedisCache)
+    with pytest.raises(ValueError, match="Unknown cache backend"):
+        open_store("memcached", "", "")
+
+    from arr_mcp import auth
+    from arr_mcp.mcp.mcp_cache import cache_report
+
+    monkeypatch.setattr(auth, "_cache_store", None)
+    monkeypatch.setattr(auth, "_cache_store_opened", False)
+    monkeypatch.setattr(auth, "_response_cache", None)
+    monkeypatch.setattr(auth, "_namespaces", {})
+    monkeypatch.setenv("ARR_CACHE_BACKEND", "memory")
+    monkeypatch.setenv("SEARCH_CACHE_TTL", "30")
+    chain = auth.get_response_cache()
+    assert isinstance(auth.get_cache_store(), MemoryCache)
+    chain.set("http://prowlarr", "/api/v1/search", {"query": "x"}, {"result": []})
+    report = cache_report()
+    assert report["store"]["backend"] == "memory"
+    assert report["namespaces"]["search"]["ttl"] == 30.0
+    assert report["namespaces"]["search"]["sets"] == 1
+    assert report["namespaces"]["search"]["indexers"] == {}
+    assert cache_report(clear="search")["store"]["entries"] == 0
+    with pytest.raises(ValueError, match="Unknown cache namespace"):
+        cache_report(clear="nope")
+
+
+def test_only_release_search_services_get_the_search_cache(monkeypatch):
+    from arr_mcp import auth
+
+    monkeypatch.setattr(auth, "_cache_store", None)
+    monkeypatch.setattr(auth, "_cache_store_opened", False)
+    monkeypatch.setattr(auth, "_response_cache", None)
+    monkeypatch.setattr(auth, "_namespaces", {})
+    monkeypatch.setenv("ARR_CACHE_BACKEND", "memory")
+    for service in ("seerr", "lidarr", "chaptarr"):
+        chain = auth.get_response_cache(service)
+        chain.set("http://x", "/api/v1/search", {"term": "heat"}, {"result": [1]})
+        assert chain.get("http://x", "/api/v1/search", {"term": "heat"}) is None
+        assert not any(isinstance(c, SearchCache) for c in chain.caches)
+    assert auth.get_search_cache().stats()["misses"] == 0
+    prowlarr = auth.get_response_cache("prowlarr")
+    prowlarr.set("http://p", "/api/v1/search", {"query": "x"}, {"result": []})
+    assert prowlarr.get("http://p", "/api/v1/search", {"query": "x"}) == {"result": []}
@@ -0,0 +1,101 @@
+"""Command waiter: one listing per tick, backoff, pruned ids and deadlines."""
+
+from unittest.mock import MagicMock
+
+from arr_mcp.commands import wait_for_commands
+
+
+def _client(ticks):
+    """Client whose get_command listing advances one entry of ``ticks`` per call."""
+    client = MagicMock()
+    listings = iter(ticks)
+    client.get_command.side_effect = lambda: {"result": next(listings)}
+    client.get_command_id.side_effect = Exception("API error: 404")
+    return client
+
+
+def test_waits_on_one_listing_per_tick_with_backoff():
+    queued = {"id": 1, "name": "RescanSeries", "status": "queued"}
+    started = {**queued, "status": "started"}
+    done = {**queued, "status": "completed", "result": "successful"}
+    search = {"id": 2, "name": "MissingEpisodeSearch", "status": "started"}
+    client = _client(
+        [
+            [queued, search],
+            [queued, search],
+            [queued, search],
+            [started, search],
+            [done, {**search, "status": "failed"}],
+        ]
+    )
+    sleeps, progress = [], []
+    out = wait_for_commands(
+        client,
+        [1, 2, 1],
+        interval=1.0,
+        backoff=2.0,
+        sleep=sleeps.append,
+        on_progress=lambda finished, total, _: progress.append((finished, total)),
+    )
+
+    assert out["done"] is True
+    assert out["pending"] == []
+    assert out["commands"][1]["result"] == "successful"
+    assert out["commands"][2]["status"] == "failed"
+    assert client.get_command.call_count == 5
+    client.get_command_id.assert_not_called()
+    assert sleeps == [1.0, 2.0, 4.0, 1.0]
+    assert progress[-1] == (2, 2)
+
+
+def test_pruned_ids_fall_back_once_and_deadline_returns_pending():
+    client = _client([[{"id": 5, "status": "started"}]] * 10)
+    client.get_command_id.side_effect = lambda id: (
+        {"id": 9, "name": "RefreshMovie", "status": "completed"} if id == 9 else {}
+    )
+    out = wait_for_commands(client, [5, 9, 404], timeout=0, sleep=lambda s: None)
+
+    assert out["done"] is False
+    assert out["pending"] == [5]
+    assert out["commands"][9]["status"] == "completed"
+    assert out["commands"][404]["status"] == "not_found"
+    assert client.get_command.call_count == 1
+
+
+def test_transient_failures_are_retried_then_reported_as_errors():
+    client = _client([[]] * 10)
+    lookups = iter(
+        [
+            Exception("API error: 503 - Service Unavailable"),
+            {"id": 7, "status": "completed"},
+        ]
+    )
+
+    def get_command_id(id):
+        if id == 8:
+            raise Exception("API error: 500 - boom")
+        answer = next(lookups)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    client.get_command_id.side_effect = get_command_id
+    out = wait_for_commands(client, [7, 8], retries=2, sleep=lambda s: None)
+
+    assert out["done"] is False
+    assert out["commands"][7]["status"] == "completed"
+    assert out["commands"][8]["status"] == "error"
+    assert out["errors"] == [{"id": 8, "error": "API error: 500 - boom"}]
+    assert client.get_command.call_count == 3
+
+
+def test_a_failing_listing_is_retried_before_giving_up():
+    client = MagicMock()
+    client.get_command.side_effect = Exception("API error: 502 - Bad Gateway")
+    out = wait_for_commands(client, [1], retries=1, sleep=lambda s: None)
+
+    assert client.get_command.call_count == 2
+    assert out["done"] is False and out["pending"] == []
+    assert out["commands"][1] == {"status": "error"}
+    assert out["errors"] == [{"error": "get_command: API error: 502 - Bad Gateway"}]
+    client.get_command_id.assert_not_called()
@@ -0,0 +1,240 @@
+"""Config snapshots: normalized content-addressed blobs and restore of differing resources."""
+
+import copy
+import json
+
+import pytest
+
+from arr_mcp.config_snapshot import list_snapshots, normalize, restore, snapshot
+
+
+class FakeSonarr:
+    """A few Sonarr config endpoints over an in-memory store, recording writes."""
+
+    def __init__(self):
+        self.writes = []
+        self.reads = 0
+        self.store = {
+            "config_naming": {
+                "id": 1,
+                "renameEpisodes": True,
+                "standardEpisodeFormat": "S{season:00}",
+            },
+            "tag": [{"id": 2, "label": "kids"}, {"id": 1, "label": "anime"}],
+            "qualitydefinition": [
+                {"id": 1, "title": "SDTV", "minSize": 2, "maxSize": 100},
+                {"id": 2, "title": "HDTV-720p", "minSize": 3, "maxSize": 130},
+            ],
+            "rootfolder": [{"id": 1, "path": "/tv", "freeSpace": 1000}],
+            "indexer": [
+                {
+                    "id": 1,
+                    "name": "NZBgeek",
+                    "priority": 25,
+                    "fields": [{"name": "apiKey", "value": "********"}],
+                },
+            ],
+        }
+        self.next_id = 50
+
+    def _get(self, path):
+        self.reads += 1
+        value = copy.deepcopy(self.store[path])
+        return {"result": value} if isinstance(value, list) else value
+
+    def _put(self, path, id, data):
+        self.writes.append(("put", path, id))
+        self.store[path] = [data if r["id"] == id else r for r in self.store[path]]
+
+    def _post(self, path, data):
+        self.writes.append(
+            ("post", path, data.get("label") or data.get("name") or data.get("path"))
+        )
+        self.next_id += 1
+        created = {**data, "id": self.next_id}
+        self.store[path].append(created)
+        return created
+
+    def _delete(self, path, id):
+        self.writes.append(("delete", path, id))
+        self.store[path] = [r for r in self.store[path] if r["id"] != id]
+
+    def get_config_naming(self):
+        return self._get("config_naming")
+
+    def put_config_naming_id(self, id, data):
+        self.writes.append(("put", "config_naming", id))
+        self.store["config_naming"] = data
+
+    def get_config_naming_examples(self, renameEpisodes):
+        raise AssertionError("needs arguments, so it is not a resource")
+
+    def get_tag(self):
+        return self._get("tag")
+
+    def post_tag(self, data):
+        return self._post("tag", data)
+
+    def put_tag_id(self, id, data):
+        return self._put("tag", id, data)
+
+    def delete_tag_id(self, id):
+        return self._delete("tag", id)
+
+    def get_qualitydefinition(self):
+        return self._get("qualitydefinition")
+
+    def put_qualitydefinition_update(self, data):
+        self.writes.append(("put_bulk", "qualitydefinition", [d["id"] for d in data]))
+        for item in data:
+            self._put("qualitydefinition", item["id"], item)
+            self.writes.pop()
+
+    def get_rootfolder(self):
+        return self._get("rootfolder")
+
+    def post_rootfolder(self, data):
+        return self._post("rootfolder", data)
+
+    def delete_rootfolder_id(self, id):
+        return self._delete("rootfolder", id)
+
+    def get_indexer(self):
+        return self._get("indexer")
+
+    def post_indexer(self, data, forceSave=None):
+        return self._post("indexer", data)
+
+    def put_indexer_id(self, id, data, forceSave=None):
+        return self._put("indexer", id, data)
+
+    def delete_indexer_id(self, id):
+        return self._delete("indexer", id)
+
+
+def test_normalize_orders_records_and_drops_volatile_fields():
+    client = FakeSonarr()
+    assert [t["id"] for t in normalize("tag", client.get_tag())] == [1, 2]
+    assert normalize("rootfolder", client.get_rootfolder()) == [
+        {"id": 1, "path": "/tv"}
+    ]
+    host = {"id": 1, "port": 8989, "apiKey": "abc", "password": "secret"}
+    assert normalize("config_host", host) == {"id": 1, "port": 8989}
+
+
+def test_snapshot_writes_each_distinct_resource_once(tmp_path):
+    clients = {("sonarr", "a"): FakeSonarr(), ("sonarr", "b"): FakeSonarr()}
+    first = snapshot(str(tmp_path), clients, name="first")
+    assert first["resources"] == 10 and first["errors"] == []
+    # Both instances hold the same configuration: one blob per resource.
+    assert first["written"] == 5 and first["reused"] == 5
+
+    clients[("sonarr", "b")].store["rootfolder"][0]["freeSpace"] = 1
+    clients[("sonarr", "b")].store["tag"].append({"id": 3, "label": "4k"})
+    second = snapshot(str(tmp_path), clients, name="second")
+    assert second["written"] == 1 and second["reused"] == 9
+
+    manifest = json.loads((tmp_path / "snapshots" / "second.json").read_text())
+    key = manifest["instances"]["sonarr/b"]["tag"]
+    blob = tmp_path / "blobs" / key[:2] / f"{key}.json"
+    assert [t["label"] for t in json.loads(blob.read_text())] == ["anime", "kids", "4k"]
+    assert [s["id"] for s in list_snapshots(str(tmp_path))] == ["first", "second"]
+    assert list_snapshots(str(tmp_path))[0]["instances"] == {
+        "sonarr/a": 5,
+        "sonarr/b": 5,
+    }
+    with pytest.raises(ValueError, match="already exists"):
+        snapshot(str(tmp_path), clients, name="first")
+
+
+def test_restore_applies_only_differing_resources(tmp_path):
+    client = FakeSonarr()
+    clients = {("sonarr", "default"): client}
+    snapshot(str(tmp_path), clients, name="base")
+
+    client.store["config_naming"]["renameEpisodes"] = False
+    client.store["qualitydefinition"][1]["maxSize"] = 400
+    client.store["indexer"][0]["priority"] = 1
+    client.store["tag"] = [t for t in client.store["tag"] if t["label"] != "kids"]
+    client.store["tag"].append({"id": 9, "label": "new"})
+
+    plan = restore(str(tmp_path), "base", clients)
+    assert client.writes == [] and plan["requests"]["writes"] == 0
+    assert plan["differing"] == [
+        "sonarr/default/config_naming",
+        "sonarr/default/tag",
+        "sonarr/default/qualitydefinition",
+        "sonarr/default/indexer",
+    ]
+    assert plan["unchanged"] == 1
+    indexer = next(c for c in plan["changes"] if c["resource"] == "indexer")
+    assert indexer["op"] == "update" and indexer["fields"] == ["priority"]
+
+    client.reads = 0
+    out = restore(str(tmp_path), "base", clients, dry_run=False, prune=True)
+    assert out["errors"] == []
+    assert client.reads == 5
+    assert sorted(client.writes, key=str) == sorted(
+        [
+            ("put", "config_naming", 1),
+            ("post", "tag", "kids"),
+            ("delete", "tag", 9),
+            ("put_bulk", "qualitydefinition", [2]),
+            ("put", "indexer", 1),
+        ],
+        key=str,
+    )
+    assert out["requests"] == {"reads": 5, "writes": 5}
+    assert client.store["config_naming"]["renameEpisodes"] is True
+
+    again = restore(
+        str(tmp_path), "base", clients, resources=["indexer", "config_naming"]
+    )
+    assert again["differing"] == [] and again["unchanged"] == 2
+    # Tags are read too, to map the ids the indexers refer to.
+    assert again["requests"]["reads"] == 3
+
+
+def test_second_restore_matches_recreated_records_and_keeps_references(tmp_path):
+    client = FakeSonarr()
+    client.store["indexer"][0]["tags"] = [2]
+    clients = {("sonarr", "default"): client}
+    snapshot(str(tmp_path), clients, name="base")
+
+    client.store["tag"] = [t for t in client.store["tag"] if t["label"] != "kids"]
+    client.store["indexer"][0]["tags"] = []
+    out = restore(str(tmp_path), "base", clients, dry_run=False)
+    assert out["errors"] == [] and out["requests"]["writes"] == 2
+    kids = next(t["id"] for t in client.store["tag"] if t["label"] == "kids")
+    assert kids == 51
+    assert client.store["indexer"][0]["tags"] == [kids]
+
+    client.writes = []
+    again = restore(str(tmp_path), "base", clients, dry_run=False, prune=True)
+    assert again["changes"] == [] and again["errors"] == []
+    assert again["differing"] == [] and again["unchanged"] == 5
+    assert client.writes == [] and again["requests"]["writes"] == 0
+    assert [t["label"] for t in client.store["tag"]] == ["anime", "kids"]
+
+
+def test_changes_without_an_endpoint_are_reported(tmp_path):
+    client = FakeSonarr()
+    clients = {("sonarr", "default"): client}
+    snapshot(str(tmp_path), clients, name="base")
+    client.store["rootfolder"][0]["path"] = "/series"
+
+    out = restore(str(tmp_path), "base", clients, dry_run=False)
+    assert out["changes"] == [] and client.writes == []
+    assert out["differing"] == ["sonarr/default/rootfolder"]
+    assert out["errors"] == [
+        {
+            "service": "sonarr",
+            "instance": "default",
+            "resource": "rootfolder",
+            "op": "update",
+            "name": "/tv",
+            "id": 1,
+            "fields": ["path"],
+            "error": "sonarr has no put_rootfolder_id; restore it by hand",
+        }
+    ]
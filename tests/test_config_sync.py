@@ -0,0 +1,366 @@
+"""Config sync: partial overlays, name references, minimal writes, bulk and prune."""
+
+import json
+
+import pytest
+
+from arr_mcp.config_sync import diff_paths, load_desired, overlay, sync
+
+
+class FakeArr:
+    """In-memory Sonarr/Radarr config endpoints that count every request."""
+
+    def __init__(self):
+        self.calls = []
+        self.store = {
+            "tag": [{"id": 1, "label": "anime"}],
+            "customformat": [
+                {
+                    "id": 10,
+                    "name": "x265",
+                    "includeCustomFormatWhenRenaming": False,
+                    "specifications": [
+                        {
+                            "name": "x265",
+                            "implementation": "ReleaseTitleSpecification",
+                            "negate": False,
+                            "fields": [{"name": "value", "value": "x265"}],
+                        }
+                    ],
+                },
+                {"id": 11, "name": "HDR", "includeCustomFormatWhenRenaming": False},
+                {"id": 12, "name": "DV", "includeCustomFormatWhenRenaming": False},
+                {"id": 13, "name": "Old", "includeCustomFormatWhenRenaming": False},
+            ],
+            "qualityprofile": [
+                {
+                    "id": 4,
+                    "name": "HD",
+                    "cutoff": 7,
+                    "minFormatScore": 0,
+                    "formatItems": [
+                        {"format": 10, "name": "x265", "score": 0},
+                        {"format": 11, "name": "HDR", "score": 0},
+                    ],
+                }
+            ],
+            "delayprofile": [
+                {"id": 1, "tags": [], "usenetDelay": 0},
+                {"id": 2, "tags": [1], "usenetDelay": 60},
+            ],
+            "config_naming": {
+                "id": 1,
+                "renameEpisodes": False,
+                "colonReplacementFormat": 4,
+            },
+            "notification": [],
+            "releaseprofile": [],
+        }
+        self.next_id = 100
+
+    def __getattr__(self, name):
+        verb, _, path = name.partition("_")
+        if path.endswith("_bulk"):
+            return lambda data: self._bulk(verb, path[:-5], data)
+        if path.endswith("_id"):
+            path = path[:-3]
+        if path == "qualityprofile_schema":
+            return lambda: (
+                self._record("get", path)
+                or {
+                    "name": "",
+                    "cutoff": 1,
+                    "formatItems": [
+                        {"format": f["id"], "name": f["name"], "score": 0}
+                        for f in self.store["customformat"]
+                    ],
+                }
+            )
+        if path == "notification_schema":
+            return lambda: (
+                self._record("get", path)
+                or [
+                    {
+                        "id": 0,
+                        "name": "",
+                        "implementation": "Discord",
+                        "configContract": "DiscordSettings",
+                        "onGrab": False,
+                        "tags": [],
+                        "fields": [
+                            {"name": "webHookUrl", "value": None},
+                            {"name": "username", "value": None},
+                        ],
+                    },
+                    {"id": 0, "name": "", "implementation": "Email", "fields": []},
+                ]
+            )
+        if path not in self.store:
+            raise AttributeError(name)
+        return {
+            "get": lambda: self._get(path),
+            "post": lambda data: self._post(path, data),
+            "put": lambda id, data: self._put(path, id, data),
+            "delete": lambda id: self._delete(path, id),
+        }[verb]
+
+    def _record(self, verb, path, data=None):
+        self.calls.append((verb, path, data))
+
+    def _get(self, path):
+        self._record("get", path)
+        value = json.loads(json.dumps(self.store[path]))
+        return {"result": value} if isinstance(value, list) else value
+
+    def _post(self, path, data):
+        self._record("post", path, data)
+        self.next_id += 1
+        created = {**data, "id": self.next_id}
+        self.store[path].append(created)
+        return created
+
+    def _put(self, path, id, data):
+        self._record("put", path, data)
+        if isinstance(self.store[path], dict):
+            self.store[path] = data
+        else:
+            self.store[path] = [data if r["id"] == id else r for r in self.store[path]]
+        return data
+
+    def _delete(self, path, id):
+        self._record("delete", path, id)
+        self.store[path] = [r for r in self.store[path] if r["id"] != id]
+
+    def _bulk(self, verb, path, data):
+        self._record(f"{verb}_bulk", path, data)
+        for record in list(self.store[path]):
+            if record["id"] in data["ids"]:
+                if verb == "delete":
+                    self.store[path].remove(record)
+                else:
+                    record.update({k: v for k, v in data.items() if k != "ids"})
+
+    def writes(self):
+        return [c for c in self.calls if c[0] != "get"]
+
+
+DESIRED = """
+sonarr:
+  custom_formats:
+    - name: x265
+      includeCustomFormatWhenRenaming: true
+      specifications:
+        - name: x265
+          negate: true
+    - name: HDR
+      includeCustomFormatWhenRenaming: true
+    - name: DV
+      includeCustomFormatWhenRenaming: true
+    - name: 1080p Remux
+      specifications:
+        - name: Remux
+          implementation: ReleaseTitleSpecification
+          fields: {value: remux}
+  quality_profiles:
+    - name: HD
+      formatItems:
+        - {name: x265, score: -100}
+        - {name: 1080p Remux, score: 50}
+  delay_profiles:
+    - tags: [anime]
+      usenetDelay: 60
+    - tags: [4k]
+      usenetDelay: 120
+  naming:
+    renameEpisodes: true
+"""
+
+
+def _run(clients, dry_run=False, desired=DESIRED):
+    return sync(
+        load_desired(desired),
+        {("sonarr", name): client for name, client in clients.items()},
+        dry_run=dry_run,
+    )
+
+
+def test_overlay_keeps_unlisted_keys_and_matches_named_lists():
+    current = {
+        "name": "x",
+        "keep": 1,
+        "specifications": [
+            {"name": "a", "negate": False, "fields": [{"name": "value", "value": "1"}]},
+            {"name": "b", "negate": False},
+        ],
+    }
+    merged = overlay(
+        current, {"specifications": [{"name": "a", "fields": {"value": "2"}}]}
+    )
+    assert merged["keep"] == 1
+    assert merged["specifications"] == [
+        {"name": "a", "negate": False, "fields": [{"name": "value", "value": "2"}]}
+    ]
+    assert diff_paths(current, overlay(current, {"keep": 1})) == []
+    assert diff_paths(current["specifications"][0], merged["specifications"][0]) == [
+        "fields[value].value"
+    ]
+
+
+def test_dry_run_plans_without_writing():
+    client = FakeArr()
+    plan = _run({"default": client}, dry_run=True)
+    assert client.writes() == []
+    assert plan["summary"] == {"create": 3, "update": 5, "delete": 0, "unchanged": 2}
+    ops = {(c["resource"], c["op"], c["name"]) for c in plan["changes"]}
+    assert ("tags", "create", "4k") in ops
+    assert ("custom_formats", "update", "x265") in ops
+    assert ("custom_formats", "bulk_update", "HDR, DV") in ops
+    assert ("delay_profiles", "create", "<new tag 4k>") in ops
+    assert ("naming", "update", "naming") in ops
+
+
+def test_sync_converges_with_minimal_writes_and_resolves_new_ids():
+    clients = {"a": FakeArr(), "b": FakeArr()}
+    out = _run(clients)
+    assert out["errors"] == []
+    client = clients["a"]
+    writes = client.writes()
+    # Tags, then custom formats, then what refers to them.
+    assert [path for _, path, _ in writes] == [
+        "tag",
+        "customformat",
+        "customformat",
+        "customformat",
+        "qualityprofile",
+        "delayprofile",
+        "config_naming",
+    ]
+    formats = {verb: data for verb, path, data in writes if path == "customformat"}
+    assert set(formats) == {"post", "put", "put_bulk"}
+    assert formats["put_bulk"] == {
+        "ids": [11, 12],
+        "includeCustomFormatWhenRenaming": True,
+    }
+    # Only the negated specification changed; the rest of x265 is kept.
+    x265 = client.store["customformat"][0]
+    assert x265["specifications"][0]["negate"] is True
+    assert x265["specifications"][0]["fields"] == [{"name": "value", "value": "x265"}]
+
+    tag_id = next(t["id"] for t in client.store["tag"] if t["label"] == "4k")
+    remux_id = next(
+        f["id"] for f in client.store["customformat"] if f["name"] == "1080p Remux"
+    )
+    assert client.store["delayprofile"][-1]["tags"] == [tag_id]
+    scores = {
+        i["format"]: i["score"]
+        for i in client.store["qualityprofile"][0]["formatItems"]
+    }
+    assert scores == {10: -100, 11: 0, remux_id: 50}
+    assert client.store["config_naming"]["colonReplacementFormat"] == 4
+
+    assert out["requests"]["writes"] == 14
+    assert out["requests"]["reads"] == 10
+
+    again = _run(clients)
+    assert again["changes"] == [] and again["requests"]["writes"] == 0
+    assert all(c.writes() == writes for c in clients.values())
+
+
+def test_prune_deletes_unlisted_resources_but_not_the_default_delay_profile():
+    client = FakeArr()
+    desired = """
+sonarr:
+  prune: [custom_formats, delay_profiles]
+  custom_formats: [{name: x265}]
+  delay_profiles: [{tags: [anime], usenetDelay: 60}]
+"""
+    out = _run({"default": client}, desired=desired)
+    assert out["summary"]["delete"] == 3
+    assert client.writes() == [("delete_bulk", "customformat", {"ids": [11, 12, 13]})]
+    assert [d["id"] for d in client.store["delayprofile"]] == [1, 2]
+    assert [t["label"] for t in client.store["tag"]] == ["anime"]
+
+
+def test_prune_deletes_after_the_updates_that_drop_references():
+    client = FakeArr()
+    client.store["tag"].append({"id": 2, "label": "old"})
+    client.store["delayprofile"].append({"id": 3, "tags": [2], "usenetDelay": 5})
+    client.store["notification"] = [
+        {"id": 7, "name": "Discord", "implementation": "Discord", "tags": [2]}
+    ]
+    desired = """
+sonarr:
+  prune: [tags, delay_profiles]
+  tags: [anime]
+  delay_profiles: [{tags: [anime], usenetDelay: 60}]
+  notifications: [{name: Discord, tags: [anime]}]
+"""
+    out = _run({"default": client}, desired=desired)
+    assert out["errors"] == []
+    assert [(verb, path) for verb, path, _ in client.writes()] == [
+        ("put", "notification"),
+        ("delete", "delayprofile"),
+        ("delete", "tag"),
+    ]
+    assert [t["label"] for t in client.store["tag"]] == ["anime"]
+    assert client.store["notification"][0]["tags"] == [1]
+
+
+def test_new_notifications_and_release_profiles_get_full_payloads():
+    client = FakeArr()
+    desired = """
+sonarr:
+  notifications:
+    - name: Alerts
+      implementation: discord
+      onGrab: true
+      tags: [4k]
+      fields: {webHookUrl: "https://discord.example/hook"}
+  release_profiles:
+    - name: No x265
+      ignored: [x265]
+"""
+    out = _run({"default": client}, desired=desired)
+    assert out["errors"] == []
+    tag_id = client.store["tag"][-1]["id"]
+    notification = client.store["notification"][0]
+    assert notification["configContract"] == "DiscordSettings"
+    assert notification["onGrab"] is True and notification["tags"] == [tag_id]
+    assert notification["fields"] == [
+        {"name": "webHookUrl", "value": "https://discord.example/hook"},
+        {"name": "username", "value": None},
+    ]
+    assert notification["id"] != 0
+    profile = client.store["releaseprofile"][0]
+    assert profile["enabled"] is True and profile["required"] == []
+    assert profile["ignored"] == ["x265"] and profile["indexerId"] == 0
+
+    with pytest.raises(
+        ValueError, match="needs an implementation, one of: Discord, Email"
+    ):
+        _run(
+            {"default": FakeArr()},
+            dry_run=True,
+            desired="sonarr: {notifications: [{name: Bare}]}",
+        )
+
+
+def test_fetch_failures_skip_the_instance_and_are_reported():
+    class Broken(FakeArr):
+        def _get(self, path):
+            raise Exception("API error: 503 - Service Unavailable")
+
+    out = _run({"ok": FakeArr(), "broken": Broken()}, dry_run=True)
+    assert out["instances"] == ["sonarr/ok"]
+    assert {e["instance"] for e in out["errors"]} == {"broken"}
+    assert "503" in out["errors"][0]["error"]
+
+
+def test_load_desired_validates_sections(tmp_path):
+    path = tmp_path / "desired.json"
+    path.write_text(json.dumps({"radarr": {"naming": {"renameMovies": True}}}))
+    assert load_desired(str(path)) == {"radarr": {"naming": {"renameMovies": True}}}
+    with pytest.raises(ValueError, match="Unknown sonarr section"):
+        load_desired('{"sonarr": {"profiles": []}}')
+    with pytest.raises(ValueError, match="must map each service"):
+        load_desired("[1, 2]")
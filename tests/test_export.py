@@ -0,0 +1,173 @@
+"""Streaming export: field selection, formats, compression, paging, CLI."""
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from arr_mcp import export
+from arr_mcp.mcp import mcp_export
+
+
+def _movie(i):
+    return {
+        "id": i,
+        "title": f"Movie {i}",
+        "year": 2000 + i % 20,
+        "statistics": {"sizeOnDisk": i * 1000},
+        "tags": [1, i],
+    }
+
+
+class FakeRadarr:
+    def __init__(self, movies=100, events=25):
+        self.movies = [_movie(i) for i in range(1, movies + 1)]
+        self.events = [{"id": i, "eventType": "grabbed"} for i in range(events)]
+        self.pages = []
+
+    def get_movie(self):
+        return {"result": self.movies}
+
+    def get_history(self, page, pageSize, **params):
+        self.pages.append(page)
+        start = (page - 1) * pageSize
+        return {
+            "records": self.events[start : start + pageSize],
+            "totalRecords": len(self.events),
+        }
+
+
+def test_ndjson_field_selection(tmp_path):
+    rows = export.iter_records(FakeRadarr(), "radarr", "library")
+    result = export.export(
+        rows,
+        str(tmp_path / "movies.ndjson"),
+        fields=["id", "statistics.sizeOnDisk", "missing.field"],
+        batch_size=30,
+    )
+    assert result["rows"] == 100
+    assert result["batches"] == 4
+    lines = (tmp_path / "movies.ndjson").read_text().splitlines()
+    assert json.loads(lines[1]) == {
+        "id": 2,
+        "statistics.sizeOnDisk": 2000,
+        "missing.field": None,
+    }
+    assert not (tmp_path / "movies.ndjson.part").exists()
+
+
+def test_csv_flattens_and_compresses(tmp_path):
+    path = tmp_path / "movies.csv.gz"
+    rows = export.iter_records(FakeRadarr(movies=3), "radarr", "library")
+    export.export(rows, str(path), fmt="csv", compression="gzip")
+    with gzip.open(path, "rt", newline="") as f:
+        table = list(csv.DictReader(f))
+    assert list(table[0]) == ["id", "title", "year", "statistics.sizeOnDisk", "tags"]
+    assert table[2]["tags"] == "[1,3]"
+
+
+def test_history_is_paged(tmp_path):
+    radarr = FakeRadarr(events=25)
+    rows = export.iter_records(radarr, "radarr", "history", page_size=10)
+    result = export.export(rows, str(tmp_path / "h.ndjson"), batch_size=7)
+    assert result["rows"] == 25
+    assert radarr.pages == [1, 2, 3]
+
+
+def test_history_since_stops_paging_past_the_date(tmp_path):
+    radarr = FakeRadarr(events=0)
+    radarr.events = [
+        {"id": i, "date": f"2024-05-{30 - i:02d}T12:00:00Z"} for i in range(25)
+    ]
+    rows = export.iter_records(
+        radarr, "radarr", "history", since="2024-05-20", page_size=4
+    )
+    assert [r["id"] for r in rows] == list(range(11))
+    assert radarr.pages == [1, 2, 3]
+
+
+def test_keys_after_the_schema_sample_are_reported(tmp_path):
+    rows = [{"id": i} for i in range(5)] + [{"id": 5, "late": "x"}]
+    result = export.export(
+        rows, str(tmp_path / "x.csv"), fmt="csv", batch_size=2, schema_sample=3
+    )
+    assert result["rows"] == 6
+    assert result["dropped_fields"] == {"late": 1}
+    sampled = export.export(
+        rows, str(tmp_path / "y.csv"), fmt="csv", batch_size=2, schema_sample=10
+    )
+    assert sampled["dropped_fields"] == {}
+    assert "late" in (tmp_path / "y.csv").read_text().splitlines()[0]
+
+
+def test_parquet_types_come_from_the_sample_and_survive_later_changes(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "x.parquet"
+    rows = [
+        {"id": 1, "size": 1, "note": None},
+        {"id": 2, "size": 2.5, "note": None},
+        {"id": "three", "size": 4, "note": 3},
+    ]
+    result = export.export(
+        rows, str(path), fmt="parquet", batch_size=1, schema_sample=2
+    )
+    assert result["rows"] == 3
+    assert result["mismatched_values"] == {"id": 1}
+    table = pq.read_table(path).to_pylist()
+    assert [r["size"] for r in table] == [1.0, 2.5, 4.0]
+    assert [r["id"] for r in table] == [1, 2, None]
+    # All null in the sample, so a string column.
+    assert [r["note"] for r in table] == [None, None, "3"]
+
+
+def test_failed_export_leaves_no_file(tmp_path):
+    def broken():
+        yield {"id": 1}
+        raise RuntimeError("connection reset")
+
+    path = tmp_path / "out.ndjson"
+    with pytest.raises(RuntimeError):
+        export.export(broken(), str(path), batch_size=1)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rejects_unknown_dataset_and_format(tmp_path):
+    with pytest.raises(ValueError, match="Cannot export"):
+        export.iter_records(FakeRadarr(), "radarr", "requests")
+    with pytest.raises(ValueError, match="Unknown format"):
+        export.export([], str(tmp_path / "x"), fmt="xlsx")
+
+
+def test_parquet_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "movies.parquet"
+    rows = export.iter_records(FakeRadarr(), "radarr", "library")
+    export.export(rows, str(path), fmt="parquet", compression="gzip", batch_size=40)
+    meta = pq.ParquetFile(path).metadata
+    assert meta.num_rows == 100
+    assert meta.num_row_groups == 3
+    assert pq.read_table(path).column("statistics.sizeOnDisk")[4].as_py() == 5000
+
+
+def test_zstd_text(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "movies.ndjson.zst"
+    rows = export.iter_records(FakeRadarr(movies=5), "radarr", "library")
+    export.export(rows, str(path), compression="zstd")
+    with open(path, "rb") as f:
+        text = zstandard.ZstdDecompressor().stream_reader(f).read().decode()
+    assert len(text.splitlines()) == 5
+
+
+def test_cli(tmp_path, monkeypatch, capsys):
+    monkeypatch.setitem(mcp_export.CLIENT_FACTORIES, "radarr", FakeRadarr)
+    out = tmp_path / "movies.csv"
+    code = mcp_export.export_cli(
+        ["radarr", "library", "-o", str(out), "-f", "csv", "--fields", "id,title"]
+    )
+    assert code == 0
+    assert json.loads(capsys.readouterr().out)["rows"] == 100
+    header = next(csv.reader(io.StringIO(out.read_text())))
+    assert header == ["id", "title"]
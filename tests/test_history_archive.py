@@ -0,0 +1,130 @@
+"""History archive: incremental sync, dedupe, indexed filters and group-bys."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from arr_mcp.history_archive import HistoryArchive
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc).timestamp()
+
+
+def _event(i, date, event_type="grabbed", indexer="NZBgeek", group="FLUX"):
+    return {
+        "id": i,
+        "movieId": 100 + i % 3,
+        "date": date,
+        "eventType": event_type,
+        "downloadId": f"dl{i}",
+        "sourceTitle": f"Movie.{i}.1080p-{group}",
+        "quality": {"quality": {"name": "WEBDL-1080p"}},
+        "data": {"indexer": indexer, "releaseGroup": group},
+    }
+
+
+class FakeRadarr:
+    def __init__(self, events):
+        self.events = events
+        self.since = []
+
+    def get_history_since(self, date):
+        self.since.append(date)
+        return {"result": [e for e in self.events if e["date"] >= date]}
+
+
+class FakeProwlarr:
+    def get_history_since(self, date):
+        return {
+            "result": [
+                {
+                    "id": 1,
+                    "indexerId": 7,
+                    "date": "2024-05-30T00:00:00Z",
+                    "eventType": "releaseGrabbed",
+                    "data": {"title": "x"},
+                }
+            ]
+        }
+
+    def get_indexer(self):
+        return {"result": [{"id": 7, "name": "NZBgeek"}]}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return HistoryArchive(str(tmp_path / "history.sqlite3"))
+
+
+def test_incremental_sync_resumes_from_cursor(archive):
+    radarr = FakeRadarr(
+        [_event(1, "2024-05-01T10:00:00Z"), _event(2, "2024-05-20T10:00:00Z")]
+    )
+    first = archive.sync({"radarr": radarr}, backfill_days=90, clock=lambda: NOW)
+    assert first["services"]["radarr"]["new"] == 2
+    assert radarr.since == ["2024-03-03T00:00:00Z"]
+
+    radarr.events.append(_event(3, "2024-05-25T10:00:00Z", "downloadFailed"))
+    second = archive.sync({"radarr": radarr}, clock=lambda: NOW + 10)
+    assert radarr.since[-1] == "2024-05-20T10:00:00Z"
+    assert second["services"]["radarr"] == {
+        "fetched": 2,
+        "new": 1,
+        "cursor": "2024-05-25T10:00:00Z",
+    }
+
+
+def test_events_survive_upstream_pruning(archive):
+    radarr = FakeRadarr([_event(1, "2024-05-01T10:00:00Z")])
+    archive.sync({"radarr": radarr}, clock=lambda: NOW)
+    radarr.events = [_event(2, "2024-05-02T10:00:00Z")]
+    archive.sync({"radarr": radarr}, clock=lambda: NOW)
+    assert archive.query()["total"] == 2
+
+
+def test_min_interval_skips_recent_services(archive):
+    radarr = FakeRadarr([])
+    archive.sync({"radarr": radarr}, clock=lambda: NOW)
+    archive.sync({"radarr": radarr}, min_interval=300, clock=lambda: NOW + 60)
+    assert len(radarr.since) == 1
+
+
+def test_filters_and_group_by(archive):
+    events = [
+        _event(1, "2024-05-01T10:00:00Z", indexer="NZBgeek", group="FLUX"),
+        _event(2, "2024-05-02T10:00:00Z", indexer="NZBgeek", group="NTb"),
+        _event(3, "2024-05-03T10:00:00Z", indexer="DrunkenSlug", group="FLUX"),
+        _event(4, "2024-05-04T10:00:00Z", "downloadFailed", group="FLUX"),
+        _event(5, "2024-05-05T10:00:00Z", "downloadFailed", group="NTb"),
+        _event(6, "2024-05-06T10:00:00Z", "downloadFailed", group="FLUX"),
+    ]
+    archive.sync({"radarr": FakeRadarr(events)}, clock=lambda: NOW)
+
+    by_indexer = archive.query(event_types=["grabbed"], group_by=["indexer"])
+    assert by_indexer["groups"] == [
+        {"indexer": "NZBgeek", "count": 2},
+        {"indexer": "DrunkenSlug", "count": 1},
+    ]
+    failed = archive.query(event_types=["DownloadFailed"], group_by=["release_group"])
+    assert failed["groups"][0] == {"release_group": "FLUX", "count": 2}
+
+    window = archive.query(since="2024-05-02", until="2024-05-04", limit=10)
+    assert [e["id"] for e in window["events"]] == [3, 2]
+    assert archive.query(download_id="dl5")["events"][0]["event_type"] == (
+        "downloadfailed"
+    )
+    with pytest.raises(ValueError, match="Unknown group key"):
+        archive.query(group_by=["colour"])
+
+
+def test_prowlarr_indexer_names_and_errors(archive):
+    class Broken:
+        def get_history_since(self, date):
+            raise RuntimeError("401 Unauthorized")
+
+    report = archive.sync(
+        {"prowlarr": FakeProwlarr(), "sonarr": Broken()}, clock=lambda: NOW
+    )
+    assert report["errors"] == {"sonarr": "401 Unauthorized"}
+    event = archive.query(services=["prowlarr"])["events"][0]
+    assert (event["indexer"], event["entity_id"]) == ("NZBgeek", 7)
+    assert archive.stats()["prowlarr"]["events"] == 1
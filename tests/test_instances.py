@@ -0,0 +1,103 @@
+"""Named instances: discovery, per-instance clients and concurrent fan-out."""
+
+import pytest
+
+from arr_mcp.auth import get_radarr_client, instance_prefix, list_instances
+from arr_mcp.mcp.routing import run_action
+
+
+@pytest.fixture
+def sonarrs(monkeypatch):
+    for key in ("SONARR_BASE_URL", "SONARR__4K__BASE_URL", "SONARR__ANIME__BASE_URL"):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setenv("SONARR_BASE_URL", "http://sonarr:8989")
+    monkeypatch.setenv("SONARR__4K__BASE_URL", "http://sonarr-4k:8989")
+    monkeypatch.setenv("SONARR__4K__TOKEN", "k4")
+    monkeypatch.setenv("SONARR__ANIME__BASE_URL", "http://sonarr-anime:8989")
+
+
+class FakeSonarr:
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+
+    def get_series(self):
+        if self.fail:
+            raise Exception("API error: 401 - Unauthorized")
+        return {"result": [{"id": 1, "title": f"Show on {self.name}"}]}
+
+    def get_system_status(self):
+        return {"version": "4.0", "instanceName": self.name}
+
+    def delete_series_id(self, id):
+        raise AssertionError("must not fan out writes")
+
+
+def test_instances_are_discovered_from_settings(sonarrs):
+    assert list_instances("sonarr") == ["default", "4k", "anime"]
+    assert instance_prefix("sonarr", None) == "SONARR_"
+    assert instance_prefix("sonarr", "default") == "SONARR_"
+    assert instance_prefix("sonarr", "4k") == "SONARR__4K__"
+
+
+def test_named_instance_client(monkeypatch):
+    monkeypatch.setenv("RADARR__UHD__BASE_URL", "http://radarr-uhd:7878")
+    monkeypatch.setenv("RADARR__UHD__TOKEN", "uhd-token")
+    client = get_radarr_client("uhd")
+    assert (client.base_url, client.token) == ("http://radarr-uhd:7878", "uhd-token")
+    with pytest.raises(RuntimeError, match="RADARR__NOPE__BASE_URL not set"):
+        get_radarr_client("nope")
+
+
+def test_all_merges_listings_tagged_by_instance(sonarrs):
+    clients = {
+        "default": FakeSonarr("default"),
+        "4k": FakeSonarr("4k"),
+        "anime": FakeSonarr("anime", fail=True),
+    }
+    merged = run_action(lambda name: clients[name], "sonarr", "get_series", {}, "all")
+    assert [(r["instance"], r["title"]) for r in merged["result"]] == [
+        ("default", "Show on default"),
+        ("4k", "Show on 4k"),
+    ]
+    assert merged["instances"]["4k"] == {"count": 1}
+    assert "401" in merged["instances"]["anime"]["error"]
+
+    status = run_action(
+        lambda name: clients[name], "sonarr", "get_system_status", {}, "ALL"
+    )
+    assert status["result"] == []
+    assert status["instances"]["4k"]["result"]["instanceName"] == "4k"
+
+
+def test_all_refuses_write_actions(sonarrs):
+    with pytest.raises(ValueError, match="only runs read actions"):
+        run_action(FakeSonarr, "sonarr", "delete_series_id", {"id": 1}, "all")
+
+
+def test_single_instance_routing():
+    calls = []
+
+    def factory(*args):
+        calls.append(args)
+        return FakeSonarr(args[0] if args else "default")
+
+    assert run_action(factory, "sonarr", "get_series", {})["result"][0]["title"] == (
+        "Show on default"
+    )
+    run_action(factory, "sonarr", "get_series", {}, "4k")
+    assert calls == [(), ("4k",)]
+
+
+@pytest.mark.parametrize(
+    "action", ["search_series_subtitles", "search_movie_subtitles"]
+)
+def test_all_refuses_subtitle_searches(monkeypatch, action):
+    monkeypatch.setenv("BAZARR_BASE_URL", "http://bazarr:6767")
+    monkeypatch.setenv("BAZARR__4K__BASE_URL", "http://bazarr-4k:6767")
+
+    def factory(name=None):
+        raise AssertionError("must not build a client for a search")
+
+    with pytest.raises(ValueError, match="only runs read actions"):
+        run_action(factory, "bazarr", action, {"series_id": 1}, "all")
@@ -0,0 +1,170 @@
+"""Columnar library stats: loading, filters, group-by, percentiles, top-N."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from fastmcp import Client, FastMCP  # noqa: E402
+
+from arr_mcp.library_stats import FileTable, load_files  # noqa: E402
+from arr_mcp.mcp import mcp_stats  # noqa: E402
+
+GB = 1024**3
+
+
+def _file(movie_id, size_gb, quality, resolution, codec="x265", cutoff=False):
+    return {
+        "movieId": movie_id,
+        "size": int(size_gb * GB),
+        "quality": {
+            "quality": {"name": quality, "source": "bluray", "resolution": resolution}
+        },
+        "mediaInfo": {"videoCodec": codec},
+        "languages": [{"name": "English"}],
+        "dateAdded": f"202{movie_id % 4}-06-01T00:00:00Z",
+        "qualityCutoffNotMet": cutoff,
+        "path": f"/m/{movie_id}.mkv",
+    }
+
+
+class FakeRadarr:
+    def __init__(self):
+        self.movies = [
+            {"id": 1, "title": "A", "rootFolderPath": "/movies4k"},
+            {"id": 2, "title": "B", "rootFolderPath": "/movies4k"},
+            {"id": 3, "title": "C", "rootFolderPath": "/movies"},
+            {"id": 4, "title": "D", "rootFolderPath": "/movies"},
+        ]
+        self.files = {
+            1: _file(1, 60, "Remux-2160p", 2160),
+            2: _file(2, 40, "Remux-2160p", 2160),
+            3: _file(3, 25, "Bluray-1080p", 1080, codec="x264", cutoff=True),
+            4: _file(4, 5, "WEBDL-1080p", 1080, cutoff=True),
+        }
+        self.file_calls = 0
+
+    def get_movie(self):
+        return {"result": self.movies}
+
+    def get_moviefile(self, movieId):
+        self.file_calls += 1
+        return {"result": [self.files[i] for i in movieId]}
+
+
+@pytest.fixture
+def table():
+    return load_files({"radarr": FakeRadarr()})
+
+
+def test_load_batches_file_listings():
+    radarr = FakeRadarr()
+    table = load_files({"radarr": radarr})
+    assert len(table) == 4
+    assert radarr.file_calls == 1
+    assert table.errors == {}
+
+
+def test_failed_file_listings_are_reported():
+    class FakeSonarr:
+        def get_series(self):
+            return [{"id": 1, "title": "S1"}, {"id": 2, "title": "S2"}]
+
+        def get_episodefile(self, seriesId):
+            if seriesId == 2:
+                raise Exception("API error: 500 - Internal Server Error")
+            return [{"seriesId": 1, "size": GB, "path": "/tv/s1/e1.mkv"}]
+
+    class BrokenRadarr(FakeRadarr):
+        def get_moviefile(self, movieId):
+            raise Exception("API error: 503 - Service Unavailable")
+
+    table = load_files({"sonarr": FakeSonarr(), "radarr": BrokenRadarr()})
+    assert len(table) == 1
+    assert table.errors == {
+        "sonarr get_episodefile seriesId=2": "API error: 500 - Internal Server Error",
+        "radarr get_moviefile movieId=1..4": "API error: 503 - Service Unavailable",
+    }
+
+
+async def test_library_stats_tool_loads_and_summarizes(monkeypatch):
+    monkeypatch.setattr(
+        mcp_stats, "get_clients", lambda services: {"radarr": FakeRadarr()}
+    )
+    monkeypatch.setattr(mcp_stats, "_table", None)
+    mcp = FastMCP("stats")
+    mcp_stats.register_stats_tools(mcp)
+    async with Client(mcp) as client:
+        result = await client.call_tool(
+            "library_stats", {"group_by": "resolution", "codec": "x265"}
+        )
+    assert result.data["files"] == 3
+    assert [(g["resolution"], g["files"]) for g in result.data["groups"]] == [
+        (2160, 2),
+        (1080, 1),
+    ]
+
+
+def test_group_by_root_folder_for_4k_remuxes(table):
+    result = table.summarize(group_by=["root_folder"], quality=["remux-2160p"])
+    assert result["files"] == 2
+    assert result["groups"] == [
+        {
+            "root_folder": "/movies4k",
+            "files": 2,
+            "size_gb": 100.0,
+            "mean_gb": 50.0,
+            "share": 1.0,
+        }
+    ]
+
+
+def test_cutoff_and_size_filters_with_top_and_percentiles(table):
+    result = table.summarize(
+        cutoff_not_met=True, min_size_gb=20, top=5, percentiles=[50]
+    )
+    assert result["files"] == 1
+    assert result["top"][0]["title"] == "C"
+    assert result["percentiles"] == {"p50": 25.0}
+
+
+def test_multi_key_group_by_and_added_year(table):
+    groups = table.summarize(group_by=["resolution", "codec"])["groups"]
+    assert [(g["resolution"], g["codec"], g["files"]) for g in groups] == [
+        (2160, "x265", 2),
+        (1080, "x264", 1),
+        (1080, "x265", 1),
+    ]
+    years = {
+        g["added_year"]: g["files"]
+        for g in table.summarize(group_by=["added_year"])["groups"]
+    }
+    assert years == {2021: 1, 2022: 1, 2023: 1, 2020: 1}
+    with pytest.raises(ValueError):
+        table.summarize(group_by=["nope"])
+
+
+def test_vectorized_summary_scales():
+    n = 200_000
+    rows = [
+        {
+            "service": "sonarr",
+            "size": (i % 97) * GB,
+            "quality": ("HDTV-720p", "WEBDL-1080p", "Bluray-2160p")[i % 3],
+            "source": "web",
+            "resolution": (720, 1080, 2160)[i % 3],
+            "codec": "x265",
+            "root_folder": f"/tv{i % 4}",
+            "language": "English",
+            "added": 1.6e9 + i,
+            "cutoff_not_met": i % 5 == 0,
+            "title": f"S{i}",
+            "path": f"/tv/{i}",
+        }
+        for i in range(n)
+    ]
+    table = FileTable(rows)
+    result = table.summarize(
+        group_by=["root_folder", "quality"], percentiles=[50, 99], top=3, min_size_gb=1
+    )
+    assert result["of_files"] == n
+    assert len(result["groups"]) == 12
@@ -0,0 +1,160 @@
+"""Log tailing: entry-id cursors, ranged file reads, rotation, filters and caps."""
+
+import re
+
+import pytest
+
+from arr_mcp.log_tail import CursorStore, LogFilter, tail_entries, tail_file
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.text = content.decode()
+
+
+class FakeSession:
+    def __init__(self, ranged=True):
+        self.body = b""
+        self.ranged = ranged
+        self.requests = []
+
+    def get(self, url, headers):
+        wanted = headers["Range"]
+        self.requests.append(wanted)
+        size = len(self.body)
+        if not self.ranged:
+            return FakeResponse(200, self.body)
+        first, last = re.match(r"bytes=(\d*)-(\d*)", wanted).groups()
+        if not first:
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start, end = int(first), min(int(last or size - 1), size - 1)
+        if start >= size:
+            return FakeResponse(416, headers={"Content-Range": f"bytes */{size}"})
+        return FakeResponse(
+            206,
+            self.body[start : end + 1],
+            {"Content-Range": f"bytes {start}-{end}/{size}"},
+        )
+
+
+class FakeRadarr:
+    base_url = "http://radarr:7878"
+
+    def __init__(self, ranged=True):
+        self._session = FakeSession(ranged)
+        self.entries = []
+        self.log_pages = 0
+
+    def request_raw(self, method, endpoint, headers=None):
+        assert (method, endpoint) == ("GET", "/api/v3/log/file/radarr.txt")
+        return self._session.get(endpoint, headers)
+
+    def write(self, *lines):
+        text = "".join(line + "\n" for line in lines)
+        self._session.body += text.encode()
+
+    def get_log(self, page, pageSize, sortKey, sortDirection):
+        self.log_pages += 1
+        newest = sorted(self.entries, key=lambda e: -e["id"])
+        return {"records": newest[(page - 1) * pageSize : page * pageSize]}
+
+
+def _line(n, level="Info", logger="RssSyncService", message=None):
+    return f"2024-05-01 10:00:{n:02d}.0|{level}|{logger}|{message or f'msg {n}'}"
+
+
+def test_entries_resume_from_last_id():
+    radarr = FakeRadarr()
+    radarr.entries = [
+        {"id": i, "level": "info", "message": f"m{i}"} for i in range(1, 11)
+    ]
+    first = tail_entries(radarr, None, initial=3)
+    assert [e["id"] for e in first["entries"]] == [8, 9, 10]
+    radarr.entries += [{"id": 11, "level": "error", "message": "boom"}]
+    second = tail_entries(radarr, first["cursor"], LogFilter(level="warn"))
+    assert [e["id"] for e in second["entries"]] == [11]
+    assert second["cursor"] == 11
+    assert tail_entries(radarr, 11)["entries"] == []
+
+
+def test_entries_cap_leaves_cursor_at_last_returned():
+    radarr = FakeRadarr()
+    radarr.entries = [{"id": i, "level": "info", "message": "x"} for i in range(1, 21)]
+    result = tail_entries(radarr, 10, limit=4)
+    assert [e["id"] for e in result["entries"]] == [11, 12, 13, 14]
+    assert result["cursor"] == 14 and result["truncated"]
+
+
+def test_file_tail_reads_only_new_bytes_with_ranges():
+    radarr = FakeRadarr()
+    radarr.write(*[_line(n) for n in range(40)])
+    first = tail_file(radarr, "radarr", "radarr.txt", None, initial_bytes=150)
+    assert first["ranged"] and first["entries"][-1]["message"] == "msg 39"
+    assert first["cursor"] == len(radarr._session.body)
+
+    radarr.write(
+        _line(40, "Error", "DownloadService", "Import failed"),
+        "System.IO.IOException: disk full",
+        "   at Foo.Bar()",
+        _line(41),
+    )
+    radarr._session.requests.clear()
+    second = tail_file(radarr, "radarr", "radarr.txt", first["cursor"])
+    assert radarr._session.requests == [
+        f"bytes={first['cursor']}-{first['cursor'] + 262143}"
+    ]
+    assert second["downloaded"] == len(radarr._session.body) - first["cursor"]
+    error = second["entries"][0]
+    assert error["level"] == "error"
+    assert error["message"].endswith("   at Foo.Bar()")
+    assert [e["message"] for e in second["entries"][1:]] == ["msg 41"]
+
+
+def test_file_tail_filters_chunks_and_partial_lines():
+    radarr = FakeRadarr()
+    radarr.write(*[_line(n, "Warn" if n % 10 == 0 else "Info") for n in range(60)])
+    radarr._session.body += b"2024-05-01 10:01:00.0|Warn|Part"
+    result = tail_file(
+        radarr, "radarr", "radarr.txt", 0, LogFilter(level="warn"), chunk_size=200
+    )
+    assert [e["message"] for e in result["entries"]] == [
+        f"msg {n}" for n in (0, 10, 20, 30, 40, 50)
+    ]
+    assert len(radarr._session.requests) > 5
+    assert result["cursor"] == radarr._session.body.rindex(b"\n") + 1
+
+
+def test_file_tail_detects_rotation_and_handles_unranged_servers():
+    radarr = FakeRadarr(ranged=False)
+    radarr.write(_line(1), _line(2))
+    result = tail_file(radarr, "radarr", "radarr.txt", 10_000)
+    assert result["rotated"] and not result["ranged"]
+    assert [e["message"] for e in result["entries"]] == ["msg 1", "msg 2"]
+
+
+def test_file_tail_cap_resumes_without_loss():
+    radarr = FakeRadarr()
+    radarr.write(*[_line(n) for n in range(10)])
+    first = tail_file(radarr, "radarr", "radarr.txt", 0, limit=4)
+    assert first["truncated"] and len(first["entries"]) == 4
+    second = tail_file(radarr, "radarr", "radarr.txt", first["cursor"])
+    assert [e["message"] for e in second["entries"]] == [
+        f"msg {n}" for n in range(4, 10)
+    ]
+
+
+def test_filter_validation_and_cursor_store(tmp_path):
+    with pytest.raises(ValueError, match="Unknown level"):
+        LogFilter(level="loud")
+    assert LogFilter(logger="rss", pattern="msg \\d$").matches(
+        {"logger": "RssSyncService", "message": "msg 5"}
+    )
+    store = CursorStore(str(tmp_path / "cursors.sqlite3"))
+    store.set("radarr", "entries", 42)
+    assert store.get("radarr", "entries") == 42
+    store.clear("radarr")
+    assert store.get("radarr", "entries") is None
@@ -0,0 +1,93 @@
+"""Owned-media trigram index and find_owned fallback behaviour."""
+
+from unittest.mock import MagicMock
+
+from arr_mcp import owned_index
+from arr_mcp.owned_index import TitleIndex, find_owned, normalize
+
+
+def _radarr_client():
+    client = MagicMock()
+    client.base_url = "http://radarr.local"
+    client.get_movie.return_value = {
+        "result": [
+            {
+                "id": 1,
+                "movieMetadataId": 11,
+                "title": "Dune",
+                "year": 2021,
+                "tmdbId": 438631,
+                "imdbId": "tt1160419",
+            },
+            {"id": 2, "movieMetadataId": 12, "title": "Dune", "year": 1984},
+            {"id": 3, "movieMetadataId": 13, "title": "Amélie", "year": 2001},
+        ]
+    }
+    client.get_alttitle.return_value = {
+        "result": [
+            {"movieMetadataId": 13, "title": "Le Fabuleux Destin d'Amélie Poulain"}
+        ]
+    }
+    client.get_movie_lookup.return_value = {"result": [{"title": "Heat"}]}
+    return client
+
+
+def test_normalize_folds_accents_and_punctuation():
+    assert normalize("Amélie: The Movie!") == "amelie the movie"
+
+
+def test_year_breaks_ties_between_same_titles():
+    index = TitleIndex()
+    index.add({"title": "Dune", "year": 2021}, ["Dune"])
+    index.add({"title": "Dune", "year": 1984}, ["Dune"])
+    top = index.search("dune 1984")[0]
+    assert top["year"] == 1984
+
+
+def test_find_owned_matches_alt_titles_and_ids():
+    owned_index.invalidate()
+    clients = {"radarr": _radarr_client()}
+
+    res = find_owned(clients, "fabuleux destin amelie")
+    assert res["source"] == "index"
+    assert res["matches"][0]["id"] == 3
+
+    res = find_owned(clients, "tt1160419")
+    assert [m["id"] for m in res["matches"]] == [1]
+
+    # The library is fetched once and then served from the cached index.
+    assert clients["radarr"].get_movie.call_count == 1
+
+
+def test_find_owned_falls_back_to_lookup_on_miss():
+    owned_index.invalidate()
+    client = _radarr_client()
+    res = find_owned({"radarr": client}, "zzzz qqqq")
+    assert res["source"] == "lookup"
+    client.get_movie_lookup.assert_called_once_with(term="zzzz qqqq")
+    assert res["matches"][0]["title"] == "Heat"
+
+
+def test_goodreads_ids_resolve_chaptarr_authors_and_books():
+    owned_index.invalidate()
+    client = MagicMock()
+    client.base_url = "http://chaptarr.local"
+    client.get_author.return_value = {
+        "result": [
+            {"id": 4, "authorName": "Ursula K. Le Guin", "foreignAuthorId": "874602"}
+        ]
+    }
+    client.get_book.return_value = {
+        "result": [
+            {
+                "id": 9,
+                "authorId": 4,
+                "title": "The Dispossessed",
+                "foreignBookId": "13651",
+            }
+        ]
+    }
+    res = find_owned({"chaptarr": client}, "goodreads:13651")
+    assert [(m["type"], m["id"]) for m in res["matches"]] == [("book", 9)]
+    res = find_owned({"chaptarr": client}, "gr:874602")
+    assert [(m["type"], m["id"]) for m in res["matches"]] == [("author", 4)]
@@ -0,0 +1,82 @@
+"""Queue snapshotter: normalization, paging, versioned deltas and tombstones."""
+
+from unittest.mock import MagicMock
+
+from arr_mcp.paging import iter_pages
+from arr_mcp.queue_snapshot import QueueSnapshotter, normalize_entry
+
+
+def _paged(queue):
+    def get_queue(page, pageSize, **_):
+        start = (page - 1) * pageSize
+        return {"records": queue[start : start + pageSize], "totalRecords": len(queue)}
+
+    return get_queue
+
+
+def test_iter_pages_stops_at_total_records():
+    fetch = MagicMock(side_effect=_paged(list(range(5))))
+    assert list(iter_pages(fetch, page_size=2)) == [0, 1, 2, 3, 4]
+    assert fetch.call_count == 3
+
+
+def test_normalize_entry_titles_episode_and_progress():
+    entry = normalize_entry(
+        "sonarr",
+        {
+            "id": 4,
+            "title": "Show.S01E02.1080p",
+            "size": 200,
+            "sizeleft": 50,
+            "timeleft": "00:05:00",
+            "trackedDownloadState": "downloading",
+            "series": {"title": "Show"},
+            "episode": {"seasonNumber": 1, "episodeNumber": 2},
+        },
+    )
+    assert entry["key"] == "sonarr:4"
+    assert entry["media"] == "Show S01E02"
+    assert entry["progress"] == 75.0
+    assert entry["trackedDownloadState"] == "downloading"
+
+
+def test_since_version_returns_only_changes_and_removals():
+    radarr_queue = [
+        {"id": 1, "title": "A", "size": 100, "sizeleft": 100, "movie": {"title": "A"}},
+        {"id": 2, "title": "B", "size": 100, "sizeleft": 10, "movie": {"title": "B"}},
+    ]
+    sonarr = MagicMock()
+    sonarr.get_queue.side_effect = _paged([])
+    radarr = MagicMock()
+    radarr.get_queue.side_effect = lambda **kw: _paged(radarr_queue)(**kw)
+    snap = QueueSnapshotter({"radarr": radarr, "sonarr": sonarr, "seerr": object()})
+
+    first = snap.overview()
+    assert first["full"] is True
+    assert [e["key"] for e in first["entries"]] == ["radarr:2", "radarr:1"]
+    assert set(first["services"]) == {"radarr", "sonarr"}
+
+    radarr_queue[0] = {**radarr_queue[0], "sizeleft": 40}
+    del radarr_queue[1]
+    snap.refresh()
+    delta = snap.overview(since_version=first["version"])
+    assert delta["full"] is False
+    assert [e["progress"] for e in delta["entries"]] == [60.0]
+    assert delta["removed"] == ["radarr:2"]
+
+    snap.refresh()
+    assert snap.version == delta["version"]
+    assert snap.overview(since_version=delta["version"])["entries"] == []
+    assert snap.overview(since_version=999)["full"] is True
+
+
+def test_failed_refresh_keeps_last_entries():
+    radarr = MagicMock()
+    radarr.get_queue.side_effect = _paged([{"id": 1, "size": 1, "sizeleft": 0}])
+    snap = QueueSnapshotter({"radarr": radarr})
+    snap.refresh()
+    radarr.get_queue.side_effect = Exception("API error: 503")
+    snap.refresh()
+    out = snap.overview()
+    assert [e["key"] for e in out["entries"]] == ["radarr:1"]
+    assert out["services"]["radarr"]["error"] == "API error: 503"
@@ -0,0 +1,96 @@
+"""Prowlarr fan-out search: completion-order streaming, timeouts, dedupe, ranking."""
+
+import time
+from unittest.mock import MagicMock
+
+from arr_mcp.release_search import (
+    IndexerResult,
+    ReleaseMerger,
+    fanout_search,
+    rank_key,
+)
+
+
+def _prowlarr(delays, answers):
+    client = MagicMock()
+    client.get_indexer.return_value = {
+        "result": [
+            {"id": 1, "name": "fast", "enable": True},
+            {"id": 2, "name": "slow", "enable": True},
+            {"id": 3, "name": "hung", "enable": True},
+            {"id": 4, "name": "off", "enable": False},
+        ]
+    }
+
+    def get_search(indexerIds, **_):
+        (indexer_id,) = indexerIds
+        time.sleep(delays[indexer_id])
+        return {"result": answers.get(indexer_id, [])}
+
+    client.get_search.side_effect = get_search
+    return client
+
+
+def test_fanout_streams_in_completion_order_and_drops_stragglers():
+    answers = {
+        1: [{"infoHash": "ABC", "title": "A", "seeders": 5, "indexerId": 1}],
+        2: [
+            {"infoHash": "abc", "title": "A", "seeders": 9, "indexerId": 2},
+            {"guid": "g-2", "title": "B", "seeders": 50, "indexerId": 2},
+        ],
+    }
+    client = _prowlarr({1: 0.0, 2: 0.1, 3: 5.0}, answers)
+    seen = []
+    out = fanout_search(
+        client,
+        "dune",
+        timeout=0.5,
+        on_result=lambda result, done, total, merger: seen.append(
+            (result.name, done, total, len(merger))
+        ),
+    )
+
+    assert seen == [("fast", 1, 3, 1), ("slow", 2, 3, 2), ("hung", 3, 3, 2)]
+    assert out["indexers"][2]["error"] == "timeout"
+    assert out["elapsed_s"] < 2
+    assert out["total"] == 2
+    assert [r["title"] for r in out["releases"]] == ["B", "A"]
+    merged = out["releases"][1]
+    assert merged["indexers"] == ["fast", "slow"]
+    assert merged["seeders"] == 9
+
+
+def test_rank_prefers_seeders_then_age_then_size():
+    releases = [
+        {"seeders": 1, "ageMinutes": 10, "size": 1},
+        {"seeders": 1, "ageMinutes": 5, "size": 1},
+        {"seeders": 1, "ageMinutes": 5, "size": 9},
+        {"grabs": 20, "age": 1},
+    ]
+    ordered = sorted(releases, key=rank_key)
+    assert ordered == [releases[3], releases[2], releases[1], releases[0]]
+
+
+def test_merger_counts_only_new_releases():
+    merger = ReleaseMerger()
+    assert merger.add(IndexerResult(1, "a", [{"guid": "x"}, {"guid": "y"}])) == 2
+    assert merger.add(IndexerResult(2, "b", [{"guid": "x"}])) == 0
+    assert len(merger) == 2
+
+
+def test_hung_indexer_gives_its_slot_to_the_next_one():
+    client = _prowlarr(
+        {1: 0.0, 2: 0.0, 3: 5.0}, {1: [{"guid": "a"}], 2: [{"guid": "b"}]}
+    )
+    client.get_indexer.return_value["result"].insert(
+        0, client.get_indexer.return_value["result"].pop(2)
+    )
+    began = time.monotonic()
+    out = fanout_search(client, "dune", timeout=0.3, concurrency=1)
+    assert time.monotonic() - began < 2
+    assert [(i["name"], i.get("error")) for i in out["indexers"]] == [
+        ("hung", "timeout"),
+        ("fast", None),
+        ("slow", None),
+    ]
+    assert out["total"] == 2
@@ -0,0 +1,119 @@
+"""Seerr ↔ Radarr/Sonarr fulfillment join."""
+
+from arr_mcp.request_join import classify, join_requests
+
+
+def _movie_request(rid, tmdb, status=2):
+    return {"id": rid, "status": status, "type": "movie", "media": {"tmdbId": tmdb}}
+
+
+class FakeSeerr:
+    def __init__(self, requests):
+        self.requests = requests
+
+    def get_request(self, take=20, skip=0, filter=None, sort="added"):
+        return {"results": self.requests[skip : skip + take]}
+
+
+class FakeArr:
+    def __init__(self, library, queue=(), grabbed=()):
+        self.library = library
+        self.queue = list(queue)
+        self.grabbed = list(grabbed)
+        self.calls = 0
+
+    def get_movie(self):
+        self.calls += 1
+        return {"result": self.library}
+
+    get_series = get_movie
+
+    def get_queue(self, page=1, pageSize=250):
+        self.calls += 1
+        return {"records": self.queue, "totalRecords": len(self.queue)}
+
+    def get_history_since(self, date=None, eventType=None):
+        self.calls += 1
+        return {"result": self.grabbed}
+
+
+def test_join_classifies_every_stage_with_bulk_fetches_only():
+    seerr = FakeSeerr(
+        [
+            _movie_request(1, 100, status=1),
+            _movie_request(2, 200),
+            _movie_request(3, 300),
+            _movie_request(4, 400),
+            _movie_request(5, 500),
+            _movie_request(6, 600),
+            _movie_request(7, 700, status=3),
+            {
+                "id": 8,
+                "status": 2,
+                "type": "tv",
+                "media": {"tvdbId": 81},
+                "seasons": [{"seasonNumber": 1}],
+            },
+        ]
+    )
+    radarr = FakeArr(
+        [
+            {"id": 30, "tmdbId": 300, "hasFile": True},
+            {"id": 40, "tmdbId": 400, "hasFile": False, "monitored": True},
+            {"id": 50, "tmdbId": 500, "hasFile": False, "monitored": True},
+            {"id": 60, "tmdbId": 600, "hasFile": False, "monitored": False},
+        ],
+        queue=[{"movieId": 40}],
+        grabbed=[{"movieId": 50, "eventType": "grabbed"}],
+    )
+    sonarr = FakeArr(
+        [
+            {
+                "id": 8,
+                "tvdbId": 81,
+                "seasons": [
+                    {
+                        "seasonNumber": 1,
+                        "statistics": {"episodeFileCount": 10, "episodeCount": 10},
+                    },
+                    {
+                        "seasonNumber": 2,
+                        "statistics": {"episodeFileCount": 0, "episodeCount": 8},
+                    },
+                ],
+            }
+        ]
+    )
+    result = join_requests(seerr, radarr, sonarr, stages=None)
+    stages = {row["id"]: row["stage"] for row in result["requests"]}
+    assert stages == {
+        1: "pending_approval",
+        2: "not_in_arr",
+        3: "available",
+        4: "downloading",
+        5: "grabbed_not_imported",
+        6: "unmonitored",
+        7: "declined",
+        8: "available",
+    }
+    assert result["stuck"] == 3
+    assert radarr.calls == 3 and sonarr.calls == 3
+
+
+def test_stuck_filter_and_unconfigured_service():
+    seerr = FakeSeerr(
+        [
+            _movie_request(1, 100),
+            {"id": 2, "status": 2, "type": "tv", "media": {"tvdbId": 5}},
+        ]
+    )
+    result = join_requests(seerr, FakeArr([]), None, stages=["stuck"])
+    assert [row["id"] for row in result["requests"]] == [1]
+    assert result["counts"] == {"not_in_arr": 1, "unknown": 1}
+
+
+def test_partial_series_without_season_request():
+    item = {"id": 1, "statistics": {"episodeFileCount": 3, "episodeCount": 10}}
+    request = {"status": 2, "type": "tv"}
+    assert classify(request, item, set(), set()) == "partially_available"
+    assert classify(request, item, {1}, set()) == "downloading"
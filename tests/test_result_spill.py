@@ -0,0 +1,84 @@
+"""Result spilling: thresholds, chunking by size, cursors, expiry and bounds."""
+
+import pytest
+
+from arr_mcp.result_spill import ResultStore, fetch_more, spill
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _movies(n):
+    return {"result": [{"id": i, "title": f"Movie {i:04d}"} for i in range(n)]}
+
+
+def test_small_results_pass_through():
+    store = ResultStore()
+    result = _movies(3)
+    assert spill(result, store, threshold=10_000, chunk_bytes=100) is result
+    assert spill(result, store, threshold=0, chunk_bytes=1) is result
+    assert store.stats()["results"] == 0
+
+
+def test_large_result_pages_through_every_record():
+    store = ResultStore()
+    first = spill(_movies(1000), store, threshold=4096, chunk_bytes=2048)
+    assert first["total"] == 1000 and first["offset"] == 0
+    assert 0 < first["returned"] < 1000
+    seen = list(first["result"])
+    cursor = first["cursor"]
+    while cursor:
+        page = fetch_more(store, cursor, chunk_bytes=2048)
+        assert page["offset"] == len(seen)
+        seen += page["result"]
+        cursor = page["cursor"]
+    assert [m["id"] for m in seen] == list(range(1000))
+
+
+def test_envelope_fields_are_kept():
+    store = ResultStore()
+    paged = {"records": _movies(500)["result"], "totalRecords": 500, "page": 1}
+    first = spill(paged, store, threshold=1000, chunk_bytes=1000)
+    assert first["totalRecords"] == 500 and first["page"] == 1
+    assert "records" in first and "result" not in first
+
+
+def test_bare_lists_and_blobs_without_lists():
+    store = ResultStore()
+    first = spill(_movies(200)["result"], store, threshold=500, chunk_bytes=500)
+    assert len(first["result"]) == first["returned"]
+    blob = {"status": "success", "text": "x" * 5000}
+    chunked = spill(blob, store, threshold=1000, chunk_bytes=2000)
+    pieces = list(chunked["text"])
+    cursor = chunked["cursor"]
+    while cursor:
+        page = fetch_more(store, cursor, 2000)
+        pieces += page["text"]
+        cursor = page["cursor"]
+    assert chunked["format"] == "json"
+    assert "".join(pieces) == '{"status":"success","text":"' + "x" * 5000 + '"}'
+
+
+def test_expiry_and_bounds():
+    clock = FakeClock()
+    store = ResultStore(ttl=60, max_results=2, clock=clock)
+    cursors = [spill(_movies(300), store, 100, 100)["cursor"] for _ in range(3)]
+    assert store.stats()["results"] == 2 and store.stats()["evicted"] == 1
+    with pytest.raises(ValueError, match="expired"):
+        fetch_more(store, cursors[0], 100)
+    fetch_more(store, cursors[2], 100)
+    clock.now = 61
+    with pytest.raises(ValueError, match="expired"):
+        fetch_more(store, cursors[2], 100)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        fetch_more(store, "nonsense", 100)
+
+    small = ResultStore(max_bytes=30_000)
+    for _ in range(5):
+        spill(_movies(500), small, 100, 100)
+    assert small.stats()["bytes"] <= 30_000 or small.stats()["results"] == 1
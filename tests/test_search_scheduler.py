@@ -0,0 +1,172 @@
+"""Backlog search scheduler: budget, checkpoints, busy queue and cycle rest."""
+
+import threading
+
+from arr_mcp.search_scheduler import SearchScheduler
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRadarr:
+    def __init__(self, wanted, commands=()):
+        self.wanted = wanted
+        self.commands = list(commands)
+        self.posted = []
+        self.pages = []
+
+    def get_wanted_missing(self, page, pageSize, **_):
+        self.pages.append(page)
+        start = (page - 1) * pageSize
+        return {
+            "records": [
+                {"id": i, "sortTitle": f"movie {i:03}"}
+                for i in self.wanted[start : start + pageSize]
+            ],
+            "totalRecords": len(self.wanted),
+        }
+
+    get_wanted_cutoff = get_wanted_missing
+
+    def get_command(self):
+        return self.commands
+
+    def post_command(self, data):
+        self.posted.append(data)
+        return {"id": len(self.posted)}
+
+
+def _scheduler(tmp_path, client, clock, **kwargs):
+    return SearchScheduler(
+        str(tmp_path / "backlog.sqlite3"),
+        {"radarr": client},
+        clock=clock,
+        **kwargs,
+    )
+
+
+def _start(scheduler):
+    # Mark the job running without spawning the background thread.
+    scheduler.ensure_running = lambda: None
+    scheduler.start(["radarr"], ["missing"])
+
+
+def test_budget_shrinks_batches_then_blocks_until_the_hour_rolls(tmp_path):
+    client, clock = FakeRadarr(list(range(1, 30))), FakeClock()
+    scheduler = _scheduler(tmp_path, client, clock, budget_per_hour=7, batch_size=5)
+    _start(scheduler)
+
+    scheduler.tick()
+    scheduler.tick()
+    scheduler.tick()
+    assert [p["movieIds"] for p in client.posted] == [[1, 2, 3, 4, 5], [6, 7]]
+    assert scheduler.remaining_budget() == 0
+
+    clock.now += 3601
+    scheduler.tick()
+    assert client.posted[-1] == {"name": "MoviesSearch", "movieIds": [8, 9, 10, 11, 12]}
+
+
+def test_checkpoint_survives_a_new_scheduler_on_the_same_file(tmp_path):
+    client, clock = FakeRadarr(list(range(1, 30))), FakeClock()
+    first = _scheduler(tmp_path, client, clock, batch_size=4)
+    _start(first)
+    first.tick()
+
+    second = _scheduler(tmp_path, client, clock, batch_size=4)
+    assert second.has_running_jobs()
+    second.tick()
+    assert client.posted[-1]["movieIds"] == [5, 6, 7, 8]
+    (job,) = second.status()["jobs"]
+    assert job["offset"] == 8
+    assert job["searched"] == 8
+    assert job["total"] == 29
+
+
+def test_grabbed_items_leaving_the_list_are_not_skipped(tmp_path):
+    client, clock = FakeRadarr(list(range(1, 41))), FakeClock()
+    scheduler = _scheduler(tmp_path, client, clock, batch_size=3)
+    _start(scheduler)
+    for _ in range(4):
+        scheduler.tick()
+    # The first three batches were grabbed and dropped off the wanted list.
+    client.wanted = [i for i in client.wanted if i > 9]
+    client.pages.clear()
+    scheduler.tick()
+    scheduler.tick()
+
+    assert [p["movieIds"] for p in client.posted[-3:]] == [
+        [10, 11, 12],
+        [13, 14, 15],
+        [16, 17, 18],
+    ]
+    (job,) = scheduler.status()["jobs"]
+    assert (job["last_id"], job["offset"]) == (18, 9)
+    # A few lookups find where the checkpoint moved, not a rescan from the top.
+    assert len(client.pages) <= 6
+
+
+def test_requests_run_outside_the_lock_against_a_booked_budget(tmp_path):
+    client = FakeRadarr([1, 2])
+    scheduler = _scheduler(tmp_path, client, FakeClock())
+    _start(scheduler)
+    seen = []
+    post = client.post_command
+
+    def post_command(data):
+        reader = threading.Thread(
+            target=lambda: seen.append(scheduler.status()["budget_remaining"])
+        )
+        reader.start()
+        reader.join(timeout=5)
+        return post(data)
+
+    client.post_command = post_command
+    scheduler.tick()
+    # A full batch is booked while the command is posted, then trimmed to use.
+    assert seen == [50]
+    assert scheduler.remaining_budget() == 58
+
+
+def test_busy_command_queue_skips_the_tick(tmp_path):
+    client = FakeRadarr(
+        [1, 2], commands=[{"name": "MoviesSearch", "status": "started"}]
+    )
+    scheduler = _scheduler(tmp_path, client, FakeClock())
+    _start(scheduler)
+    scheduler.tick()
+    assert client.posted == []
+
+    client.commands[0]["status"] = "completed"
+    scheduler.tick()
+    assert client.posted[0]["movieIds"] == [1, 2]
+
+
+def test_end_of_list_rests_then_rescans_from_the_top(tmp_path):
+    client, clock = FakeRadarr([1, 2, 3]), FakeClock()
+    scheduler = _scheduler(tmp_path, client, clock, batch_size=3, cycle_interval=100)
+    _start(scheduler)
+    scheduler.tick()
+    scheduler.tick()
+    (job,) = scheduler.status()["jobs"]
+    assert (job["offset"], job["cycles"]) == (0, 1)
+
+    scheduler.tick()
+    assert len(client.posted) == 1
+    clock.now += 101
+    scheduler.tick()
+    assert client.posted[-1]["movieIds"] == [1, 2, 3]
+
+
+def test_errors_are_recorded_per_job(tmp_path):
+    client = FakeRadarr([1])
+    client.get_command = lambda: (_ for _ in ()).throw(RuntimeError("down"))
+    scheduler = _scheduler(tmp_path, client, FakeClock())
+    _start(scheduler)
+    scheduler.tick()
+    assert scheduler.status()["jobs"][0]["last_error"] == "down"
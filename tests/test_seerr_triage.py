@@ -0,0 +1,110 @@
+"""Seerr triage: paging, rule evaluation, cached lookups and concurrent apply."""
+
+import pytest
+
+from arr_mcp.cache import MemoryCache
+from arr_mcp.seerr_triage import TriageRule, iter_requests, triage
+
+
+def _request(rid, user, media_type="movie", tmdb=100, is4k=False):
+    return {
+        "id": rid,
+        "status": 1,
+        "type": media_type,
+        "is4k": is4k,
+        "createdAt": f"2024-01-{rid:02d}T00:00:00Z",
+        "requestedBy": {"id": rid * 10, "displayName": user},
+        "media": {"tmdbId": tmdb, "mediaType": media_type},
+    }
+
+
+class FakeSeerr:
+    base_url = "http://seerr"
+
+    def __init__(self, requests, available=()):
+        self.requests = requests
+        self.available = set(available)
+        self.pages = 0
+        self.lookups = []
+        self.approved = []
+        self.declined = []
+
+    def get_request(self, take=20, skip=0, filter=None, sort="added"):
+        self.pages += 1
+        return {
+            "pageInfo": {"results": len(self.requests)},
+            "results": self.requests[skip : skip + take],
+        }
+
+    def _details(self, tmdb_id):
+        self.lookups.append(tmdb_id)
+        status = 5 if tmdb_id in self.available else 2
+        return {"title": f"Title {tmdb_id}", "mediaInfo": {"status": status}}
+
+    def get_movie_id(self, movie_id):
+        return self._details(movie_id)
+
+    def get_tv_id(self, tv_id):
+        return self._details(tv_id)
+
+    def post_request_id_approve(self, request_id):
+        self.approved.append(request_id)
+
+    def post_request_id_decline(self, request_id):
+        if request_id == 99:
+            raise Exception("API error: 500 - boom")
+        self.declined.append(request_id)
+
+
+def test_iter_requests_pages_with_take_and_skip():
+    client = FakeSeerr([_request(i, "a") for i in range(1, 6)])
+    assert [r["id"] for r in iter_requests(client, take=2)] == [1, 2, 3, 4, 5]
+    assert client.pages == 3
+
+
+def test_triage_first_matching_rule_wins_and_lookups_are_shared():
+    client = FakeSeerr(
+        [
+            _request(1, "alice", tmdb=100),
+            _request(2, "bob", tmdb=100),
+            _request(3, "bob", "tv", tmdb=200),
+            _request(4, "mallory", tmdb=300, is4k=True),
+            _request(5, "carol", tmdb=400),
+        ],
+        available=[100],
+    )
+    rules = [
+        TriageRule.from_dict({"action": "decline", "available": True}),
+        TriageRule.from_dict({"action": "decline", "is4k": True}),
+        TriageRule.from_dict({"action": "approve", "requester": ["BOB", 10]}),
+    ]
+    store = MemoryCache()
+    result = triage(client, rules, concurrency=4, details_store=store)
+
+    assert sorted(client.lookups) == [100, 200, 300, 400]
+    assert result["counts"] == {"approve": 1, "decline": 3, "skip": 1}
+    assert sorted(client.declined) == [1, 2, 4]
+    assert client.approved == [3]
+    assert {d["id"]: d["rule"] for d in result["decisions"]}[5] == "default"
+
+    # A second call reuses the cached details.
+    again = triage(client, rules, dry_run=True, details_store=store)
+    assert again["lookups"] == 0
+    assert len(client.lookups) == 4
+
+
+def test_triage_without_availability_rules_skips_lookups_and_reports_errors():
+    client = FakeSeerr([_request(99, "eve"), _request(2, "eve")])
+    result = triage(client, [TriageRule(action="decline", requesters=["eve"])])
+    assert client.lookups == []
+    assert client.declined == [2]
+    assert result["errors"] == [{"id": 99, "error": "API error: 500 - boom"}]
+
+
+def test_dry_run_and_rule_validation():
+    client = FakeSeerr([_request(1, "a")])
+    result = triage(client, [], default_action="approve", dry_run=True)
+    assert result["counts"]["approve"] == 1
+    assert client.approved == []
+    with pytest.raises(ValueError):
+        TriageRule.from_dict({"action": "ignore"})
@@ -0,0 +1,118 @@
+"""Bazarr wanted-subtitle batch processor: paging, throttling, attempt log."""
+
+import threading
+
+from arr_mcp.subtitle_batch import (
+    AttemptLog,
+    ProviderThrottle,
+    iter_wanted,
+    process_wanted,
+)
+
+
+class FakeBazarr:
+    def __init__(self, episodes=(), movies=(), fail=()):
+        self.episodes = [
+            {"sonarrSeriesId": 7, "sonarrEpisodeId": i, "seriesTitle": "Show"}
+            for i in episodes
+        ]
+        self.movies = [{"radarrId": i, "title": f"Movie {i}"} for i in movies]
+        self.fail = set(fail)
+        self.searched = []
+        self.pages = 0
+        self._lock = threading.Lock()
+
+    def _page(self, items, page, page_size):
+        self.pages += 1
+        start = (page - 1) * page_size
+        return {"data": items[start : start + page_size], "total": len(items)}
+
+    def get_wanted_series(self, page=1, page_size=20):
+        return self._page(self.episodes, page, page_size)
+
+    def get_wanted_movies(self, page=1, page_size=20):
+        return self._page(self.movies, page, page_size)
+
+    def get_enabled_providers(self):
+        return {"result": [{"name": "opensubtitlescom"}, {"name": "podnapisi"}]}
+
+    def search_series_subtitles(self, series_id, episode_id=None):
+        with self._lock:
+            self.searched.append(("episode", series_id, episode_id))
+
+    def search_movie_subtitles(self, movie_id):
+        if movie_id in self.fail:
+            raise Exception("API error: 500 - provider down")
+        with self._lock:
+            self.searched.append(("movie", movie_id))
+
+
+def _unthrottled():
+    return ProviderThrottle(per_minute=0)
+
+
+def test_iter_wanted_stops_at_total():
+    client = FakeBazarr(movies=range(1, 6))
+    items = [item["radarrId"] for item, _ in iter_wanted(client, "movies", 2)]
+    assert items == [1, 2, 3, 4, 5]
+    assert client.pages == 3
+
+
+def test_throttle_spaces_searches_to_the_tightest_provider():
+    now, slept = [0.0], []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    throttle = ProviderThrottle(
+        per_minute=60, limits={"slow": 6}, clock=lambda: now[0], sleep=sleep
+    )
+    for _ in range(3):
+        throttle.acquire(["fast", "slow"])
+    assert slept == [10.0, 10.0]
+    assert throttle.waited == 20.0
+
+
+def test_process_wanted_searches_all_and_records_attempts(tmp_path):
+    client = FakeBazarr(episodes=range(1, 4), movies=[10, 11], fail=[11])
+    attempts = AttemptLog(str(tmp_path / "subs.sqlite3"))
+    progress = []
+    result = process_wanted(
+        client,
+        attempts,
+        throttle=_unthrottled(),
+        page_size=2,
+        on_progress=lambda d, t, m: progress.append((d, t)),
+    )
+    assert result["providers"] == ["opensubtitlescom", "podnapisi"]
+    assert (result["searched"], result["succeeded"], result["failed"]) == (5, 4, 1)
+    assert result["errors"][0]["id"] == 11
+    assert sorted(s for s in client.searched if s[0] == "episode") == [
+        ("episode", 7, 1),
+        ("episode", 7, 2),
+        ("episode", 7, 3),
+    ]
+    assert progress[-1] == (5, 5)
+
+    # A second run (even with a fresh log on the same file) skips them all.
+    again = process_wanted(
+        client, AttemptLog(attempts.path), throttle=_unthrottled(), page_size=2
+    )
+    assert again["searched"] == 0
+    assert again["skipped_recent"] == 5
+
+
+def test_process_wanted_limit_and_retry_window(tmp_path):
+    client = FakeBazarr(movies=range(1, 6))
+    attempts = AttemptLog(str(tmp_path / "subs.sqlite3"))
+    first = process_wanted(
+        client, attempts, kinds=["movies"], throttle=_unthrottled(), limit=2
+    )
+    assert first["searched"] == 2
+    rest = process_wanted(client, attempts, kinds=["movies"], throttle=_unthrottled())
+    assert (rest["searched"], rest["skipped_recent"]) == (3, 2)
+    expired = process_wanted(
+        client, attempts, kinds=["movies"], throttle=_unthrottled(), retry_after=-1
+    )
+    assert expired["searched"] == 5
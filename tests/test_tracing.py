@@ -0,0 +1,235 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from agent_utilities.mcp_utilities import run_blocking
+from fastmcp import Client, FastMCP
+
+from arr_mcp import tracing
+from arr_mcp.api.api_client_sonarr import Api as SonarrApi
+from arr_mcp.cache import MemoryCache, Namespace
+from arr_mcp.concurrency import bounded_map
+from arr_mcp.mcp.telemetry import TracingMiddleware, parent_context, tool_attributes
+
+SPAN_KIND_CLIENT = 3
+
+
+class Collector(ThreadingHTTPServer):
+    """Local OTLP/HTTP collector that also answers as a tiny Sonarr."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.spans = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=b"", content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith("/api/v3/series/"):
+            series_id = int(self.path.rsplit("/", 1)[1])
+            self._reply(200, json.dumps({"id": series_id, "title": "Dark"}).encode())
+        else:
+            self._reply(404, b"Not Found", "text/plain")
+
+    def do_POST(self):
+        from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+            ExportTraceServiceRequest,
+        )
+
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        request = ExportTraceServiceRequest.FromString(body)
+        for resource in request.resource_spans:
+            for scope in resource.scope_spans:
+                self.server.spans.extend(scope.spans)
+        self._reply(200, b"", "application/x-protobuf")
+
+
+def attributes(span):
+    values = {}
+    for kv in span.attributes:
+        value = kv.value
+        kind = value.WhichOneof("value")
+        if kind == "array_value":
+            values[kv.key] = [v.string_value for v in value.array_value.values]
+        else:
+            values[kv.key] = getattr(value, kind)
+    return values
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    pytest.importorskip("opentelemetry.sdk.trace")
+    pytest.importorskip("opentelemetry.exporter.otlp.proto.http.trace_exporter")
+    # The agent startup tests leave OTEL_SDK_DISABLED=true behind.
+    monkeypatch.setenv("OTEL_SDK_DISABLED", "false")
+    server = Collector()
+    provider = tracing.build_tracer_provider(
+        "arr-mcp-test", endpoint=f"{server.url}/v1/traces"
+    )
+    monkeypatch.setattr(tracing, "_provider", provider)
+
+    def collected():
+        provider.force_flush()
+        return {span.name: span for span in server.spans}
+
+    server.collected = collected
+    server.provider = provider
+    yield server
+    provider.shutdown()
+    server.shutdown()
+    server.server_close()
+
+
+def test_path_templates_and_tool_attributes():
+    assert tracing.path_template("/api/v3/series/12/episodes?x=1") == (
+        "/api/v3/series/{id}/episodes"
+    )
+    uuid = "0f0e6a7c-3b3a-4d1e-9d2f-2b7d1c9e8a10"
+    assert tracing.path_template(f"/api/v1/request/{uuid}") == "/api/v1/request/{id}"
+    assert tracing.path_template(f"/api/v1/indexer/{'ab' * 20}").endswith("/{id}")
+
+    attrs = tool_attributes(
+        "sonarr_action",
+        {
+            "action": "get_series",
+            "params_json": '{"seriesId": 12, "includeSeasonImages": true}',
+            "instance": None,
+        },
+    )
+    assert attrs["arr.service"] == "sonarr" and attrs["arr.action"] == "get_series"
+    assert attrs["arr.param_keys"] == ["includeSeasonImages", "seriesId"]
+    assert attrs["arr.argument_keys"] == ["action", "params_json"]
+    attrs = tool_attributes("find_action", {"service": "radarr", "query": "x"})
+    assert attrs["arr.service"] == "radarr" and attrs["arr.param_keys"] is None
+
+
+def test_tracing_is_off_unless_enabled(monkeypatch):
+    monkeypatch.delenv("ARR_OTEL_ENABLED", raising=False)
+    assert tracing.configure_tracing() is False
+    with tracing.span("unexported") as span:
+        span.set_attribute("k", 1)
+
+
+def test_api_request_spans_reach_the_collector(collector):
+    api = SonarrApi(base_url=collector.url, token="key")
+    assert api.request("GET", "/api/v3/series/12") == {"id": 12, "title": "Dark"}
+    with pytest.raises(Exception, match="API error: 404"):
+        api.request("GET", "/api/v3/missing")
+
+    spans = collector.collected()
+    ok = spans["GET /api/v3/series/{id}"]
+    assert ok.kind == SPAN_KIND_CLIENT
+    assert attributes(ok) == {
+        "http.request.method": "GET",
+        "url.template": "/api/v3/series/{id}",
+        "server.address": "127.0.0.1",
+        "server.port": int(collector.url.rsplit(":", 1)[1]),
+        "arr.service": "sonarr",
+        "http.response.status_code": 200,
+        "http.response.body.size": len(b'{"id": 12, "title": "Dark"}'),
+    }
+    failed = spans["GET /api/v3/missing"]
+    assert attributes(failed)["http.response.status_code"] == 404
+    assert failed.status.code == 2 and failed.events[0].name == "exception"
+
+
+def test_raw_requests_are_traced_and_return_the_response(collector):
+    api = SonarrApi(base_url=collector.url, token="key")
+    response = api.request_raw(
+        "GET", "/api/v3/log/file/sonarr.txt", headers={"Range": "bytes=0-9"}
+    )
+    assert response.status_code == 404
+
+    raw = collector.collected()["GET /api/v3/log/file/sonarr.txt"]
+    assert raw.kind == SPAN_KIND_CLIENT
+    assert attributes(raw)["http.response.status_code"] == 404
+
+
+def test_cache_and_fan_out_spans_nest_under_the_caller(collector):
+    api = SonarrApi(base_url=collector.url, token="key")
+    cache = Namespace(MemoryCache(), "lookup")
+    with tracing.get_tracer().start_as_current_span("caller"):
+        cache.get("k")
+        cache.set("k", 1)
+        cache.get("k")
+        outcomes = bounded_map(
+            lambda i: api.request("GET", f"/api/v3/series/{i}"), range(4), limit=2
+        )
+    assert [result["id"] for _, result, _ in outcomes] == [0, 1, 2, 3]
+
+    provider_spans = collector.collected()
+    caller, fan_out = provider_spans["caller"], provider_spans["fan out"]
+    assert attributes(fan_out) == {"arr.fan_out.items": 4, "arr.fan_out.workers": 2}
+    assert fan_out.parent_span_id == caller.span_id
+    gets = [s for s in collector.spans if s.name == "GET /api/v3/series/{id}"]
+    waits = [s for s in collector.spans if s.name == "queue wait"]
+    assert len(gets) == len(waits) == 4
+    assert {s.parent_span_id for s in gets + waits} == {fan_out.span_id}
+    results = [
+        attributes(s)["arr.cache.result"]
+        for s in collector.spans
+        if s.name == "cache get"
+    ]
+    assert results == ["miss", "hit"]
+
+
+async def test_tool_span_continues_the_agent_trace(collector):
+    api = SonarrApi(base_url=collector.url, token="key")
+    mcp = FastMCP("traced")
+    mcp.add_middleware(TracingMiddleware())
+
+    @mcp.tool
+    async def sonarr_action(action: str, params_json: str = "{}") -> dict:
+        series_id = json.loads(params_json)["seriesId"]
+        return await run_blocking(api.request, "GET", f"/api/v3/series/{series_id}")
+
+    agent_tracer = collector.provider.get_tracer("agent")
+    with agent_tracer.start_as_current_span("agent turn") as turn:
+        async with Client(mcp) as client:
+            await client.call_tool(
+                "sonarr_action",
+                {"action": "get_series", "params_json": '{"seriesId": 7}'},
+            )
+
+    spans = collector.collected()
+    tool, get = spans["sonarr.get_series"], spans["GET /api/v3/series/{id}"]
+    assert tool.trace_id == turn.get_span_context().trace_id.to_bytes(16, "big")
+    assert get.parent_span_id == tool.span_id
+    attrs = attributes(tool)
+    assert attrs["arr.param_keys"] == ["seriesId"]
+    assert attrs["arr.action"] == "get_series" and "arr.threads.busy" in attrs
+
+
+def test_http_trace_headers_join_the_agent_trace(collector):
+    from opentelemetry import propagate
+
+    tracer = collector.provider.get_tracer("test")
+    with tracer.start_as_current_span("agent"):
+        carrier = {}
+        propagate.inject(carrier)
+    with tracer.start_as_current_span("server request") as local:
+        parent, links = parent_context(carrier)
+        assert links[0].context == local.get_span_context()
+        with tracing.span("tool", context=parent):
+            pass
+        assert parent_context({}) == (None, [])
+    spans = collector.collected()
+    assert spans["tool"].trace_id == spans["agent"].trace_id
+    assert spans["tool"].parent_span_id == spans["agent"].span_id
@@ -0,0 +1,152 @@
+"""Multi-worker serving: shared rate limits, shared spilled results, supervision."""
+
+import asyncio
+import importlib
+import threading
+
+import pytest
+from fastmcp.server.middleware.rate_limiting import RateLimitingMiddleware
+
+from arr_mcp import result_spill, workers
+from arr_mcp.rate_limit import (
+    SharedTokenBuckets,
+    apply_rate_limit_settings,
+    share_rate_limits,
+)
+from arr_mcp.result_spill import SharedResultStore, fetch_more, spill
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_buckets_are_shared_between_processes(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / "ratelimit.sqlite3")
+    # Two handles on one file stand in for two worker processes.
+    first = SharedTokenBuckets(path, clock)
+    second = SharedTokenBuckets(path, clock)
+    taken = [b.consume("global", 4, 2.0) for b in (first, second, first, second)]
+    assert taken == [True] * 4
+    assert not first.consume("global", 4, 2.0)
+    assert not second.consume("global", 4, 2.0)
+    clock.now += 1.0
+    assert [second.consume("global", 4, 2.0) for _ in range(3)] == [True, True, False]
+    assert first.consume("other", 4, 2.0)
+
+
+def test_rate_limit_middleware_uses_shared_buckets(tmp_path):
+    path = str(tmp_path / "ratelimit.sqlite3")
+    workers_mw = [RateLimitingMiddleware(max_requests_per_second=1, burst_capacity=2)]
+    other_mw = [RateLimitingMiddleware(max_requests_per_second=1, burst_capacity=2)]
+    assert share_rate_limits(workers_mw + ["not a limiter"], SharedTokenBuckets(path))
+    share_rate_limits(other_mw, SharedTokenBuckets(path))
+
+    async def consume(middleware):
+        return await middleware.limiters["global"].consume()
+
+    results = [asyncio.run(consume(mw[0])) for mw in (workers_mw, other_mw) * 2]
+    assert results == [True, True, False, False]
+
+
+def test_rate_limit_settings():
+    limiter = RateLimitingMiddleware(max_requests_per_second=10, burst_capacity=20)
+    kept = apply_rate_limit_settings([limiter, "other"], rate=50.0, burst=100)
+    assert kept == [limiter, "other"]
+    assert (limiter.max_requests_per_second, limiter.burst_capacity) == (50.0, 100)
+    assert apply_rate_limit_settings([limiter, "other"], rate=0, burst=1) == ["other"]
+
+
+def test_spilled_results_follow_cursor_across_processes(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    writer, reader = SharedResultStore(path), SharedResultStore(path)
+    movies = {"result": [{"id": i, "title": f"Movie {i}"} for i in range(500)]}
+    page = spill(movies, writer, threshold=1024, chunk_bytes=1024)
+    seen = list(page["result"])
+    while page["cursor"]:
+        page = fetch_more(reader, page["cursor"], 1024)
+        seen += page["result"]
+    assert seen == movies["result"]
+    assert reader.stats()["results"] == 1
+
+
+def test_shared_results_decode_each_result_once_per_process(tmp_path, monkeypatch):
+    store = SharedResultStore(str(tmp_path / "results.sqlite3"), decoded=1)
+    movies = {"result": [{"id": i} for i in range(300)]}
+    first = spill(movies, store, threshold=256, chunk_bytes=256)
+    other = spill(movies, store, threshold=256, chunk_bytes=256)
+    decompress = result_spill.zlib.decompress
+    calls = []
+    monkeypatch.setattr(
+        result_spill.zlib,
+        "decompress",
+        lambda blob: calls.append(1) or decompress(blob),
+    )
+    page = first
+    while page["cursor"]:
+        page = fetch_more(store, page["cursor"], 256)
+    assert len(calls) == 1
+    fetch_more(store, other["cursor"], 256)
+    fetch_more(store, first["cursor"], 256)
+    assert len(calls) == 3
+
+
+def test_shared_results_expire_and_evict(tmp_path):
+    clock = FakeClock()
+    store = SharedResultStore(
+        str(tmp_path / "results.sqlite3"), ttl=60, max_results=2, clock=clock
+    )
+    big = {"result": [{"id": i} for i in range(200)]}
+    cursors = [spill(big, store, 64, 64)["cursor"] for _ in range(3)]
+    assert store.stats()["results"] == 2 and store.evicted == 1
+    with pytest.raises(ValueError, match="expired"):
+        fetch_more(store, cursors[0], 64)
+    fetch_more(store, cursors[2], 64)
+    clock.now += 61
+    with pytest.raises(ValueError, match="expired"):
+        fetch_more(store, cursors[2], 64)
+
+
+def test_state_is_shared_only_with_several_workers(monkeypatch, tmp_path):
+    monkeypatch.setenv("WORKER_STATE_PATH", str(tmp_path))
+    monkeypatch.delenv("MCP_WORKERS", raising=False)
+    assert workers.worker_count() == 1 and not workers.is_multi_worker()
+    monkeypatch.setenv("MCP_WORKERS", "4")
+    assert workers.is_multi_worker()
+    assert workers.state_path("x.sqlite3") == str(tmp_path / "x.sqlite3")
+
+
+@pytest.mark.parametrize(
+    "module, getter",
+    [
+        ("mcp_queue", "get_snapshotter"),
+        ("mcp_backlog", "get_scheduler"),
+        ("mcp_subtitles", "get_subtitle_state"),
+    ],
+)
+def test_per_process_tools_refuse_several_workers(monkeypatch, module, getter):
+    tool = importlib.import_module(f"arr_mcp.mcp.{module}")
+    monkeypatch.setenv("MCP_WORKERS", "2")
+    with pytest.raises(ValueError, match="MCP_WORKERS=2"):
+        getattr(tool, getter)()
+
+
+def test_reuse_port_sockets_share_a_port():
+    first = workers.reuse_port_socket("127.0.0.1", 0)
+    port = first.getsockname()[1]
+    second = workers.reuse_port_socket("127.0.0.1", port)
+    assert second.getsockname()[1] == port
+    first.close()
+    second.close()
+
+
+def test_supervisor_gives_up_on_workers_that_keep_dying(monkeypatch):
+    monkeypatch.setattr(workers, "MAX_FAILED_STARTS", 2)
+    # print(index, host, port) returns at once, like a worker that fails to bind.
+    stop = threading.Event()
+    assert workers.supervise(2, "127.0.0.1", 0, print, poll=0.05, stop=stop) == 1
+    assert stop.is_set()